@@ -0,0 +1,562 @@
+"""
+PolyVox headless command line: book file -> audiobook without the GUI.
+
+    python -m app.cli run book.epub --out runs/book --voice-map voices.json --device cuda:0,cuda:1 --workers 2
+
+Each stage is also its own subcommand and works inside the --out folder:
+
+    detect      book file            -> chapters.json
+    attribute   chapters.json        -> attribution/chapter_NNN.json, characters.json
+    synthesize  attribution + voices -> audio/<chapter>/line_NNNN.wav (+ manifest.json)
+    assemble    line WAVs            -> <chapter>.mp3 and <book>.m4b
+
+The voice map is the Voices tab's selections file: {"Speaker": "voice label or id", ...}, with
+an optional "*" entry as the default voice. A value may also be a full voice entry
+({"voice_file": ..., "language": ...}). Voices are looked up in --voices-file.
+
+With --resume, work whose output already exists is skipped, so an interrupted run can be
+restarted with the same command. Every stage records its timings and counts in
+run_report.json.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from app.core.assembly import encode_chapters, merge_to_m4b, safe_name
+
+DEFAULT_VOICES_FILE = "voices_complete_xtts.json"
+DEFAULT_VOICE_KEY = "*"
+# XTTS handles at most ~250 chars of English per call (same limit as the Audio Processing tab)
+MAX_TTS_CHARS = 249
+CHAPTERS_FILE = "chapters.json"
+CHARACTERS_FILE = "characters.json"
+REPORT_FILE = "run_report.json"
+MANIFEST_FILE = "manifest.json"
+
+
+class CliError(Exception):
+    """A problem with the inputs that should end the run with a message, not a traceback."""
+
+
+# ---------- Files ----------
+def _write_json(path: str, data):
+    """Write JSON atomically (temp file + rename) so a killed run never leaves half a file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class Workdir:
+    """Paths of one run's output folder."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def chapters(self) -> str:
+        return os.path.join(self.root, CHAPTERS_FILE)
+
+    @property
+    def characters(self) -> str:
+        return os.path.join(self.root, CHARACTERS_FILE)
+
+    @property
+    def report(self) -> str:
+        return os.path.join(self.root, REPORT_FILE)
+
+    def attribution(self, index: int) -> str:
+        folder = os.path.join(self.root, "attribution")
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, f"chapter_{index + 1:03d}.json")
+
+    def audio_dir(self, chapter: Dict) -> str:
+        folder = os.path.join(self.root, "audio", chapter_dir_name(chapter))
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    def chapter_mp3(self, chapter: Dict) -> str:
+        return os.path.join(self.root, f"{chapter_dir_name(chapter)}.mp3")
+
+    def load_chapters(self) -> List[Dict]:
+        if not os.path.exists(self.chapters):
+            raise CliError(f"{self.chapters} not found; run the detect stage first")
+        return _read_json(self.chapters)
+
+
+def chapter_dir_name(chapter: Dict) -> str:
+    # The index prefix keeps folders unique and in reading order
+    return f"{chapter['index'] + 1:03d}_{safe_name(chapter['title'])}"
+
+
+# ---------- Run report ----------
+class RunReport:
+    """run_report.json: per-stage status, wall time and counts, rewritten after every stage."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = _read_json(path) if os.path.exists(path) else {"stages": {}}
+        self.data.setdefault("stages", {})
+
+    def set(self, key: str, value):
+        self.data[key] = value
+        self.save()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a stage; the body fills the yielded dict with counts."""
+        info = {"status": "running", "started": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        self.data["stages"][name] = info
+        self.save()
+        t0 = time.perf_counter()
+        try:
+            yield info
+        except BaseException as e:
+            info["status"] = "failed"
+            info["error"] = str(e) or type(e).__name__
+            raise
+        else:
+            info["status"] = "ok"
+        finally:
+            info["seconds"] = round(time.perf_counter() - t0, 3)
+            self.save()
+            print(f"[cli] {name}: {info['status']} in {info['seconds']:.1f}s")
+
+    def save(self):
+        _write_json(self.path, self.data)
+
+
+# ---------- Options ----------
+def parse_chapter_selection(spec: Optional[str], count: int) -> List[int]:
+    """'1,3-5' (1-based, inclusive) -> [0, 2, 3, 4]; None/'' -> every chapter."""
+    if not spec:
+        return list(range(count))
+    picked = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                lo, hi = (int(x) for x in part.split("-", 1))
+            else:
+                lo = hi = int(part)
+        except ValueError:
+            raise CliError(f"Bad chapter selection: {part!r}")
+        picked.update(i - 1 for i in range(lo, hi + 1) if 1 <= i <= count)
+    return sorted(picked)
+
+
+def parse_devices(spec: str) -> List[str]:
+    """'auto' | 'cpu' | 'cuda' | 'cuda:0,cuda:1' -> list of device strings."""
+    devices = [d.strip() for d in (spec or "auto").split(",") if d.strip()]
+    for d in devices:
+        if d not in ("auto", "cpu", "cuda") and not (d.startswith("cuda:") and d[5:].isdigit()):
+            raise CliError(f"Bad device: {d!r} (use auto, cpu, cuda or cuda:N)")
+    return devices or ["auto"]
+
+
+def apply_device(device: str):
+    """Pin this process to one device; must run before torch is imported."""
+    if "torch" in sys.modules and device != "auto":
+        print(f"[cli] warning: torch already imported, --device {device} may not take effect")
+    if device == "cpu":
+        os.environ["CUDA_VISIBLE_DEVICES"] = ""
+    elif device.startswith("cuda:"):
+        os.environ["CUDA_VISIBLE_DEVICES"] = device[5:]
+
+
+def _pool(workers: int, devices: List[str]):
+    """Spawned worker processes, each pinned to one of devices (round-robin)."""
+    ctx = multiprocessing.get_context("spawn")
+    slots = ctx.Queue()
+    for i in range(workers):
+        slots.put(devices[i % len(devices)])
+    return ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(slots,))
+
+
+@contextmanager
+def _no_pool():
+    yield None
+
+
+def _init_worker(slots):
+    apply_device(slots.get())
+
+
+# ---------- Voice map ----------
+def load_voice_map(path: str, voices_file: str = DEFAULT_VOICES_FILE) -> Dict[str, Dict]:
+    """{speaker: voice entry} from a voice-map JSON; "*" holds the default entry, if any."""
+    if not os.path.exists(path):
+        raise CliError(f"Voice map not found: {path}")
+    selections = _read_json(path)
+    if not isinstance(selections, dict):
+        raise CliError(f"Voice map must be a JSON object: {path}")
+
+    library = {}
+    if os.path.exists(voices_file):
+        data = _read_json(voices_file)
+        for entry in (data.get("narrators", []) or []) + (data.get("voices", []) or []):
+            for key in (entry.get("id"), entry.get("label")):
+                if key:
+                    library.setdefault(key, entry)
+
+    resolved, missing = {}, []
+    for speaker, choice in selections.items():
+        if isinstance(choice, dict):
+            resolved[speaker] = choice
+        elif choice in library:
+            resolved[speaker] = library[choice]
+        else:
+            missing.append(f"{speaker} -> {choice}")
+    if missing:
+        raise CliError(f"Voices not found in {voices_file}: " + "; ".join(missing))
+    return resolved
+
+
+def voice_for(voice_map: Dict[str, Dict], speaker: str) -> Optional[Dict]:
+    return voice_map.get(speaker) or voice_map.get(DEFAULT_VOICE_KEY)
+
+
+# ---------- Stages ----------
+def stage_detect(args, work: Workdir, report: RunReport):
+    from app.core.chapter_chunker import load_chapters
+
+    with report.stage("detect") as info:
+        report.set("book", os.path.abspath(args.input))
+        if args.resume and os.path.exists(work.chapters):
+            info["skipped"] = True
+            info["chapters"] = len(work.load_chapters())
+            return
+        detected = load_chapters(
+            args.input, min_chapter_length=args.min_chapter_length, max_chunk_size=args.max_chunk_size
+        )
+        chapters = [{"index": i, "title": c["title"], "text": c["text"]} for i, c in enumerate(detected)]
+        _write_json(work.chapters, chapters)
+        info["chars"] = sum(len(c["text"]) for c in chapters)
+        info["chapters"] = len(chapters)
+
+
+def _attribute_one(index: int, text: str, model: str, additions, perf_mode=None, window_tokens=None, executor=None):
+    """Attribution for one chapter (runs in-process or in a pool worker); also returns its seconds."""
+    from app.core import nlp_segments
+
+    t0 = time.perf_counter()
+    rows = nlp_segments.attribute_chapter(
+        text, model=model, registry=additions, perf_mode=perf_mode, max_tokens=window_tokens, executor=executor
+    )
+    return index, rows or [], additions, time.perf_counter() - t0
+
+
+def stage_attribute(args, work: Workdir, report: RunReport):
+    from app.core.character_registry import CharacterRegistry
+
+    chapters = work.load_chapters()
+    selected = parse_chapter_selection(args.chapters, len(chapters))
+    registry = CharacterRegistry()
+    if args.resume and os.path.exists(work.characters):
+        registry = CharacterRegistry.from_dict(_read_json(work.characters))
+
+    perf_mode = True if args.perf else None
+    with report.stage("attribute") as info:
+        todo = [i for i in selected if not (args.resume and os.path.exists(work.attribution(i)))]
+        info.update(chapters=len(selected), skipped=len(selected) - len(todo), rows=0, per_chapter={})
+
+        def _finish(index, rows, seconds):
+            chapter = chapters[index]
+            _write_json(work.attribution(index), {"index": index, "title": chapter["title"], "results": rows})
+            info["rows"] += len(rows)
+            info["per_chapter"][str(index + 1)] = {"rows": len(rows), "seconds": round(seconds, 3)}
+            print(f"[cli] attributed chapter {index + 1}/{len(chapters)}: {len(rows)} rows")
+
+        if args.workers <= 1 or len(todo) <= 1:
+            apply_device(parse_devices(args.device)[0])
+            # a single chapter over the window budget spreads its windows over the workers
+            with _pool(args.workers, parse_devices(args.device)) if args.workers > 1 else _no_pool() as pool:
+                for index in todo:
+                    additions = registry.begin_chapter(index)
+                    _, rows, additions, seconds = _attribute_one(
+                        index, chapters[index]["text"], args.model, additions, perf_mode, args.window_tokens, pool
+                    )
+                    registry.commit(additions)
+                    _finish(index, rows, seconds)
+        else:
+            # Chapters run side by side against one registry snapshot; commit_all merges
+            # their additions in chapter order, so the result does not depend on timing
+            batch = []
+            with _pool(args.workers, parse_devices(args.device)) as pool:
+                futures = [
+                    pool.submit(
+                        _attribute_one,
+                        i,
+                        chapters[i]["text"],
+                        args.model,
+                        registry.begin_chapter(i),
+                        perf_mode,
+                        args.window_tokens,
+                    )
+                    for i in todo
+                ]
+                for fut in futures:
+                    index, rows, additions, seconds = fut.result()
+                    batch.append(additions)
+                    _finish(index, rows, seconds)
+            registry.commit_all(batch)
+
+        _write_json(work.characters, registry.to_dict())
+        info["characters"] = len(registry)
+
+
+def _chapter_lines(rows: List[Dict]):
+    """(speaker, text) pairs the way the Characters tab hands them to the Voices tab."""
+    for r in rows:
+        if isinstance(r, dict):
+            speaker = r.get("speaker", "Unknown")
+            text = r.get("text", "")
+            if speaker and text:
+                yield speaker, text
+
+
+def _synthesize_chapter(chapter: Dict, rows: List[Dict], voice_map: Dict[str, Dict], out_dir: str, resume: bool):
+    """Synthesize one chapter's lines into out_dir; returns counts for the report."""
+    from app.core.voices import synthesize_text
+    from app.engine.text_preprocessor import TextPreprocessor
+
+    splitter = TextPreprocessor()
+    t0 = time.perf_counter()
+    manifest, stats = [], {"lines": 0, "synthesized": 0, "reused": 0, "failed": 0, "no_voice": 0}
+    n = 0
+    for speaker, text in _chapter_lines(rows):
+        voice = voice_for(voice_map, speaker)
+        if not voice:
+            stats["no_voice"] += 1
+            continue
+        pieces = splitter.split_long_text(text, max_chars=MAX_TTS_CHARS) if len(text) > MAX_TTS_CHARS + 1 else [text]
+        for piece in pieces:
+            n += 1
+            stats["lines"] += 1
+            out_path = os.path.join(out_dir, f"line_{n:04d}.wav")
+            entry = {"n": n, "speaker": speaker, "voice": voice.get("label") or voice.get("id"), "text": piece}
+            if resume and os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+                stats["reused"] += 1
+            else:
+                try:
+                    synthesize_text(voice, piece, out_path, job_idx=n)
+                    stats["synthesized"] += 1
+                except Exception as e:
+                    stats["failed"] += 1
+                    print(f"[cli] {chapter['title']} line {n} failed: {e}")
+                    continue
+            entry["file"] = os.path.basename(out_path)
+            manifest.append(entry)
+    _write_json(os.path.join(out_dir, MANIFEST_FILE), {"chapter": chapter["title"], "lines": manifest})
+    stats["seconds"] = round(time.perf_counter() - t0, 3)
+    return chapter["index"], stats
+
+
+def stage_synthesize(args, work: Workdir, report: RunReport):
+    chapters = work.load_chapters()
+    selected = parse_chapter_selection(args.chapters, len(chapters))
+    voice_map = load_voice_map(args.voice_map, args.voices_file)
+    if args.engine:
+        from app.engine.base import ENGINE_ENV, set_active_engine
+
+        # through the environment so spawned workers pick the same engine
+        os.environ[ENGINE_ENV] = args.engine
+        set_active_engine(None)
+
+    jobs = []
+    for i in selected:
+        path = work.attribution(i)
+        if not os.path.exists(path):
+            raise CliError(f"{path} not found; run the attribute stage first")
+        rows = _read_json(path).get("results", [])
+        jobs.append((chapters[i], rows, voice_map, work.audio_dir(chapters[i]), args.resume))
+
+    with report.stage("synthesize") as info:
+        totals = {"lines": 0, "synthesized": 0, "reused": 0, "failed": 0, "no_voice": 0}
+        info.update(chapters=len(jobs), per_chapter={})
+
+        def _collect(index, stats):
+            for k in totals:
+                totals[k] += stats[k]
+            info["per_chapter"][str(index + 1)] = stats
+            print(f"[cli] synthesized chapter {index + 1}/{len(chapters)}: {stats}")
+
+        devices = parse_devices(args.device)
+        if args.workers <= 1 or len(jobs) <= 1:
+            apply_device(devices[0])
+            for job in jobs:
+                _collect(*_synthesize_chapter(*job))
+        else:
+            with _pool(args.workers, devices) as pool:
+                for index, stats in pool.map(_synthesize_chapter, *zip(*jobs)):
+                    _collect(index, stats)
+        info.update(totals)
+        if totals["failed"]:
+            raise CliError(f"{totals['failed']} line(s) failed to synthesize")
+
+
+def _chapter_wavs(chapter: Dict, audio_dir: str, mp3_path: str, resume: bool):
+    """(status, line WAVs) for one chapter; the WAVs are only listed when it needs encoding."""
+    manifest_path = os.path.join(audio_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return "missing", []
+    if resume and os.path.exists(mp3_path):
+        return "reused", []
+    lines = sorted(_read_json(manifest_path).get("lines", []), key=lambda e: e["n"])
+    wavs = [os.path.join(audio_dir, e["file"]) for e in lines if e.get("file")]
+    return ("pending" if wavs else "empty"), wavs
+
+
+def stage_assemble(args, work: Workdir, report: RunReport):
+    chapters = work.load_chapters()
+    selected = [chapters[i] for i in parse_chapter_selection(args.chapters, len(chapters))]
+
+    with report.stage("assemble") as info:
+        results, jobs = {}, []
+        for c in selected:
+            status, wavs = _chapter_wavs(c, work.audio_dir(c), work.chapter_mp3(c), args.resume)
+            results[c["index"]] = status
+            if status == "pending":
+                jobs.append((c["index"], wavs, work.chapter_mp3(c)))
+        # One encoder process per chapter; --workers caps them, otherwise one per core
+        workers = args.workers if args.workers > 1 else None
+        durations = {}
+        for index, mp3_path, duration, error in encode_chapters(jobs, workers=workers):
+            if error is not None:
+                results[index] = "failed"
+                print(f"[cli] encoding chapter {index + 1} failed: {error}", file=sys.stderr)
+            else:
+                results[index] = "encoded"
+                durations[str(index + 1)] = round(duration, 3)
+                print(f"[cli] encoded {mp3_path} ({duration:.1f}s)")
+        info["chapters"] = {str(i + 1): status for i, status in sorted(results.items())}
+        info["durations"] = durations
+        failed = sum(1 for status in results.values() if status == "failed")
+        if failed:
+            # an M4B without these chapters would look complete; stop before building it
+            raise CliError(f"{failed} chapter(s) failed to encode")
+
+        mp3s = [work.chapter_mp3(c) for c in selected if results.get(c["index"]) in ("encoded", "reused")]
+        if not args.no_m4b and mp3s:
+            book = report.data.get("book") or work.root
+            m4b = os.path.join(work.root, safe_name(os.path.splitext(os.path.basename(book))[0]) + ".m4b")
+            merge_to_m4b(mp3s, m4b)
+            info["m4b"] = m4b
+
+
+def cmd_run(args, work, report):
+    stage_detect(args, work, report)
+    stage_attribute(args, work, report)
+    if not args.voice_map:
+        print("[cli] no --voice-map given; stopping after attribution")
+        return
+    stage_synthesize(args, work, report)
+    stage_assemble(args, work, report)
+
+
+# ---------- Entry point ----------
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m app.cli", description="PolyVox headless audiobook pipeline")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--out", required=True, help="run folder (created if missing)")
+    common.add_argument("--resume", action="store_true", help="skip work whose output already exists")
+    common.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="parallel chapters (processes for attribute/synthesize; assemble defaults to one per core)",
+    )
+    common.add_argument(
+        "--device", default="auto", help="auto, cpu, cuda or cuda:N[,cuda:M...] (round-robin over workers)"
+    )
+    common.add_argument("--chapters", help="1-based chapter selection, e.g. 1,3-5 (default: all)")
+
+    detect_opts = argparse.ArgumentParser(add_help=False)
+    detect_opts.add_argument("input", help="book file (.txt, .epub or .pdf)")
+    detect_opts.add_argument("--min-chapter-length", type=int, default=1000)
+    detect_opts.add_argument("--max-chunk-size", type=int, default=50000)
+
+    attribute_opts = argparse.ArgumentParser(add_help=False)
+    attribute_opts.add_argument("--model", default="big", help="BookNLP model size")
+    attribute_opts.add_argument("--perf", action="store_true", help="skip debug logging and row-level trace files")
+    attribute_opts.add_argument(
+        "--window-tokens",
+        type=int,
+        help="attribute chapters over this many tokens in overlapping windows "
+        "(default: $POLYVOX_NLP_WINDOW_TOKENS or off)",
+    )
+
+    voice_opts = argparse.ArgumentParser(add_help=False)
+    voice_opts.add_argument("--voices-file", default=DEFAULT_VOICES_FILE, help="voice library JSON")
+    voice_opts.add_argument(
+        "--engine", help="TTS engine spec, e.g. xtts or fake:latency=0.05 (default: $POLYVOX_TTS_ENGINE or xtts)"
+    )
+
+    assemble_opts = argparse.ArgumentParser(add_help=False)
+    assemble_opts.add_argument("--no-m4b", action="store_true", help="only write chapter MP3s")
+
+    sub.add_parser("detect", parents=[common, detect_opts], help="split a book into chapters")
+    sub.add_parser("attribute", parents=[common, attribute_opts], help="speaker attribution per chapter")
+    p = sub.add_parser("synthesize", parents=[common, voice_opts], help="synthesize every attributed line")
+    p.add_argument("--voice-map", required=True, help="speaker -> voice JSON")
+    sub.add_parser("assemble", parents=[common, assemble_opts], help="merge line audio into MP3/M4B")
+    p = sub.add_parser(
+        "run", parents=[common, detect_opts, attribute_opts, voice_opts, assemble_opts], help="all stages"
+    )
+    p.add_argument("--voice-map", help="speaker -> voice JSON (without it the run stops after attribution)")
+    return ap
+
+
+COMMANDS = {
+    "detect": stage_detect,
+    "attribute": stage_attribute,
+    "synthesize": stage_synthesize,
+    "assemble": stage_assemble,
+    "run": cmd_run,
+}
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    work = Workdir(args.out)
+    report = RunReport(work.report)
+    report.set("command", " ".join(sys.argv[1:] if argv is None else argv))
+    t0 = time.perf_counter()
+    try:
+        COMMANDS[args.command](args, work, report)
+        status = 0
+    except CliError as e:
+        print(f"[cli] error: {e}", file=sys.stderr)
+        status = 1
+    except KeyboardInterrupt:
+        print("[cli] interrupted; rerun with --resume to continue", file=sys.stderr)
+        status = 130
+    except Exception:
+        traceback.print_exc()
+        status = 1
+    report.data["seconds"] = round(time.perf_counter() - t0, 3)
+    report.data["exit_code"] = status
+    report.save()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Audiobook Assembly
+Turns synthesized line WAVs into chapter MP3s and chapter MP3s into one M4B; used by the
+Audio Processing tab and the headless CLI
+"""
+
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_BITRATE = "192k"
+READ_FRAMES = 1 << 16  # frames copied to the encoder per read
+DURATION_TOLERANCE = 0.02  # share of the expected length an encoded chapter may be off by (at least 0.5 s)
+
+# wave sample width -> ffmpeg raw PCM format
+_PCM_FORMATS = {1: "u8", 2: "s16le", 3: "s24le", 4: "s32le"}
+
+
+class EncodeError(RuntimeError):
+    """The encoder failed or produced a file of the wrong length."""
+
+
+def safe_name(name: str) -> str:
+    """A file/folder-safe version of a chapter or speaker name (max 80 chars)."""
+    name = (name or "").strip() or "untitled"
+    name = re.sub(r"[^\w\-\. ]+", "_", name)
+    name = re.sub(r"\s+", "_", name)
+    return name[:80]
+
+
+def merge_wavs(wav_files: Iterable[str], out_path: str, fmt: str = "mp3", bitrate: str = DEFAULT_BITRATE) -> str:
+    """Concatenate WAV files in order and export them as one file; returns out_path.
+
+    Raises ValueError when there is nothing to merge; pydub/ffmpeg errors propagate.
+    """
+    from pydub import AudioSegment
+
+    wav_files = list(wav_files)
+    if not wav_files:
+        raise ValueError(f"No WAV files to merge for {out_path}")
+    combined = AudioSegment.empty()
+    for wf in wav_files:
+        combined += AudioSegment.from_wav(wf)
+    combined.export(out_path, format=fmt, codec="libmp3lame", bitrate=bitrate)
+    return out_path
+
+
+def _bitrate_bps(bitrate: str) -> int:
+    bitrate = bitrate.strip().lower()
+    return int(float(bitrate[:-1]) * 1000) if bitrate.endswith("k") else int(bitrate)
+
+
+def _pcm_params(wav_files: List[str]) -> Optional[Tuple[int, int, int]]:
+    """(channels, sample width, rate) shared by every file, or None if they differ or aren't PCM."""
+    params = None
+    for wf in wav_files:
+        try:
+            with wave.open(wf, "rb") as w:
+                p = (w.getnchannels(), w.getsampwidth(), w.getframerate())
+        except (wave.Error, EOFError):
+            return None
+        if params is None:
+            params = p
+        elif p != params:
+            return None
+    return params if params and params[1] in _PCM_FORMATS else None
+
+
+def probe_duration(path: str, bitrate: str = DEFAULT_BITRATE) -> Optional[float]:
+    """An MP3's duration in seconds from its metadata (ffprobe), else estimated from its size."""
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe:
+        try:
+            out = subprocess.run(
+                [ffprobe, "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", path],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+            return float(out.stdout.strip())
+        except (OSError, ValueError, subprocess.SubprocessError):
+            return None
+    # constant bitrate: the size says how long it is (give or take the header)
+    return os.path.getsize(path) * 8 / _bitrate_bps(bitrate)
+
+
+def encode_chapter(wav_files: Iterable[str], out_path: str, bitrate: str = DEFAULT_BITRATE) -> float:
+    """Concatenate WAV files into one MP3 through a single ffmpeg/LAME process; returns its duration.
+
+    The PCM frames are streamed into the encoder without decoding the WAVs into memory. The
+    result is checked by the encoder's exit status and by comparing the MP3's duration with
+    the frames written, then moved into place, so out_path is never a half-written file.
+    WAVs that aren't plain PCM in one shared format go through merge_wavs instead.
+    """
+    wav_files = list(wav_files)
+    if not wav_files:
+        raise ValueError(f"No WAV files to merge for {out_path}")
+    params = _pcm_params(wav_files)
+    ffmpeg = shutil.which("ffmpeg")
+    if params is None or ffmpeg is None:
+        merge_wavs(wav_files, out_path, fmt="mp3", bitrate=bitrate)
+        return probe_duration(out_path, bitrate) or 0.0
+
+    channels, width, rate = params
+    part = out_path + ".part"
+    cmd = [
+        ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", _PCM_FORMATS[width], "-ar", str(rate), "-ac", str(channels), "-i", "pipe:0",
+        "-c:a", "libmp3lame", "-b:a", bitrate, "-f", "mp3", part,
+    ]
+    frames = 0
+    with tempfile.TemporaryFile() as errors:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=errors)
+        try:
+            for wf in wav_files:
+                with wave.open(wf, "rb") as w:
+                    while True:
+                        chunk = w.readframes(READ_FRAMES)
+                        if not chunk:
+                            break
+                        proc.stdin.write(chunk)
+                        frames += len(chunk) // (width * channels)
+        except BrokenPipeError:
+            pass
+        finally:
+            proc.stdin.close()
+            code = proc.wait()
+        if code != 0:
+            errors.seek(0)
+            message = errors.read().decode("utf-8", "replace").strip()
+            if os.path.exists(part):
+                os.remove(part)
+            raise EncodeError(f"ffmpeg exited with {code} for {out_path}: {message}")
+
+    expected = frames / rate
+    actual = probe_duration(part, bitrate)
+    if actual is not None and abs(actual - expected) > max(0.5, DURATION_TOLERANCE * expected):
+        os.remove(part)
+        raise EncodeError(f"{out_path}: encoded {actual:.1f}s, expected {expected:.1f}s")
+    os.replace(part, out_path)
+    return expected
+
+
+def _encode_job(key, wav_files: List[str], out_path: str, bitrate: str):
+    return key, out_path, encode_chapter(wav_files, out_path, bitrate)
+
+
+def encoder_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool for encode_chapter jobs (default: one process per core)."""
+    ctx = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max(1, workers or os.cpu_count() or 1), mp_context=ctx)
+
+
+def encode_chapters(
+    jobs: Iterable[Tuple[object, List[str], str]], workers: Optional[int] = None, bitrate: str = DEFAULT_BITRATE
+) -> Iterator[Tuple[object, str, Optional[float], Optional[Exception]]]:
+    """Encode (key, wav files, out path) jobs side by side, one process per chapter.
+
+    At most workers (default: one per core) chapters run at once. Yields (key, out path,
+    duration, None) or (key, out path, None, error) as each chapter finishes.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        for key, wav_files, out_path in jobs:
+            try:
+                yield key, out_path, encode_chapter(wav_files, out_path, bitrate), None
+            except Exception as e:
+                yield key, out_path, None, e
+        return
+    with encoder_pool(workers) as pool:
+        futures = {
+            pool.submit(_encode_job, key, list(wav_files), out_path, bitrate): (key, out_path)
+            for key, wav_files, out_path in jobs
+        }
+        for fut in as_completed(futures):
+            key, out_path = futures[fut]
+            try:
+                _, _, duration = fut.result()
+                yield key, out_path, duration, None
+            except Exception as e:
+                yield key, out_path, None, e
+
+
+def merge_to_m4b(chapter_files: Iterable[str], out_file: str, bitrate: str = DEFAULT_BITRATE) -> List[str]:
+    """Concatenate chapter MP3s (skipping missing ones) into an AAC .m4b; returns the files used."""
+    from pydub import AudioSegment
+
+    used = []
+    combined = AudioSegment.empty()
+    for path in chapter_files:
+        if os.path.exists(path):
+            combined += AudioSegment.from_file(path, format="mp3")
+            used.append(path)
+    combined.export(out_file, format="ipod", codec="aac", bitrate=bitrate)
+    return used
@@ -0,0 +1,318 @@
+"""
+Attribution Verb Lexicon
+Speech/attribution verbs ("said", "asked", "went on", ...) and a compiler that turns any verb
+set into a trie-shaped regex, so the big alternations used by the attribution passes share
+prefixes ("sa(?:id|ys)") instead of trying every verb in turn. Compiled patterns are cached
+per verb set, so every caller asking for the same set gets the same instance
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# Core speech verbs, base/3sg/past; the conservative default when a richer list is missing
+CORE_SPEECH_VERBS = frozenset({
+    "said", "says", "say",
+    "ask", "asks", "asked",
+    "reply", "replies", "replied",
+    "answer", "answers", "answered",
+    "tell", "tells", "told",
+    "called", "yelled", "shouted", "cried", "whispered", "murmured", "muttered",
+    "snapped", "retorted", "laughed", "sobbed", "hissed",
+    "noted", "observed", "remarked", "insisted", "countered", "agreed",
+    "warned", "offered", "begged", "demanded", "protested", "announced",
+    "explained", "declared", "argued", "suggested", "continued",
+    "interjected", "interrupted", "conceded", "promised", "pleaded",
+    "rejoined", "stated", "blurted",
+})
+
+# Verbs that end a quote's attribution tail ('"...," whispered Bob.'); used by book_processor
+TAIL_ATTRIB_VERBS = (
+    "said", "asked", "replied", "whispered", "shouted", "muttered", "cried", "called",
+    "answered", "hissed", "breathed", "growled", "moaned", "went on", "told", "explained",
+    "snapped", "laughed", "reminded", "queried", "continued", "responded", "added",
+    "insisted", "agreed", "noted", "remarked", "observed", "demanded", "protested",
+    "announced", "declared", "yelled", "murmured",
+)
+
+# Phrasal dialogue verbs in base form; expand_verb_forms() adds the 3sg/past forms
+MULTIWORD_VERB_BASES = (
+    "snap back", "shout back", "yell back", "call back", "shoot back", "fire back",
+    "whisper back", "hiss back", "bark back",
+    "blurt out", "call out", "cry out", "yell out", "shout out", "spit out", "bark out",
+    "hiss out", "sing out",
+    "speak up", "pipe up",
+    "chime in", "butt in", "cut in", "break in", "pipe in", "put in", "jump in",
+    "chip in", "weigh in",
+    "go on", "carry on",
+    "ring out", "read out",
+)
+
+_IRREG_PAST = {
+    "shoot": ["shot"],
+    "spit": ["spat", "spit"],
+    "cut": ["cut"],
+    "shut": ["shut"],
+    "read": ["read"],
+    "ring": ["rang"],
+    "sing": ["sang"],
+    "go": ["went"],
+    "speak": ["spoke"],
+    "tell": ["told"],
+    "say": ["said"],
+    "ask": ["asked"],
+}
+
+
+def _s_form(v: str) -> str:
+    if re.search(r"(s|sh|ch|x|z|o)$", v):
+        return v + "es"
+    if re.search(r"[^aeiou]y$", v):
+        return v[:-1] + "ies"
+    return v + "s"
+
+
+def _ed_form(v: str) -> Optional[str]:
+    if v in _IRREG_PAST:
+        return None
+    if v.endswith("e"):
+        return v + "d"
+    if re.search(r"[^aeiou]y$", v):
+        return v[:-1] + "ied"
+    return v + "ed"
+
+
+def expand_verb_forms(base_list: Iterable[str]) -> List[str]:
+    """Base, 3sg and past forms of each (possibly multiword) verb; the head word is inflected."""
+    out, seen = [], set()
+
+    def _add(cand):
+        if cand not in seen:
+            seen.add(cand)
+            out.append(cand)
+
+    for phrase in base_list:
+        parts = phrase.split()
+        if not parts:
+            continue
+        head, tail = parts[0], parts[1:]
+        base = head.lower()
+        for word in {head, _s_form(base)}:
+            _add(" ".join([word] + tail))
+        for past in _IRREG_PAST.get(base, []):
+            _add(" ".join([past] + tail))
+        rpast = _ed_form(base)
+        if rpast:
+            _add(" ".join([rpast] + tail))
+    return out
+
+
+# Tight core for attribution fragments (", said Zack."); the fragment regexes' default set
+FRAGMENT_ATTRIB_VERBS = frozenset({
+    "said", "says", "ask", "asks", "asked", "reply", "replies", "replied",
+    "answer", "answers", "answered", "called", "yelled", "shouted", "cried", "whispered",
+    "murmured", "muttered", "snapped", "retorted", "laughed", "sobbed", "hissed", "breathed",
+    "noted", "observed", "remarked", "insisted", "countered", "agreed", "warned", "offered",
+    "begged", "demanded", "protested", "announced", "explained", "declared", "continued",
+    "interjected", "interrupted", "conceded", "promised", "pleaded", "went", "went on", "rejoined",
+    "stated",
+})
+
+# Tail/line attribution verbs, kept tight so narration isn't mistaken for attribution
+STRICT_ATTRIB_VERBS = frozenset({
+    "said", "asked", "replied", "told", "added", "explained", "continued", "went on", "murmured",
+    "whispered", "yelled", "shouted", "cried", "called", "answered", "retorted", "insisted",
+    "agreed", "warned", "demanded", "begged", "protested", "announced", "declared", "stated",
+    "remarked", "observed", "suggested", "interjected", "interrupted", "rejoined", "pleaded",
+    "inquired", "admitted", "noted", "joked", "quipped",
+})
+
+# Broad list of attribution verbs and set phrases; the LOOSE checks are built from it
+LOOSE_ATTRIB_VERBS = (
+    "said", "asked", "replied", "whispered", "shouted", "cried", "muttered", "continued",
+    "responded", "told", "called", "answered", "added", "hissed", "growled", "yelled", "snapped",
+    "barked", "ordered", "pleaded", "exclaimed", "protested", "remarked", "murmured", "stated",
+    "announced", "insisted", "suggested", "observed", "agreed", "retorted", "inquired",
+    "interjected", "mused", "snorted", "grunted", "explained", "reminded", "nodded", "laughed",
+    "smiled", "grinned", "shrugged", "sneered", "sighed", "rejoined", "countered", "noted",
+    "admitted", "moaned", "clarified", "counseled", "jabbered", "yapped", "refuted", "pondered",
+    "surmised", "verified", "guffawed", "tittered", "avowed", "convinced", "implored", "prodded",
+    "insulted", "provoked", "smirked", "tempted", "grilled", "declared", "maintained", "vowed",
+    "quizzed", "wondered", "hesitated", "warned", "croaked", "heaved", "lisped", "rattled on",
+    "shrilled", "stuttered", "caterwauled", "condemned", "fumed", "raged", "scolded", "snarled",
+    "threatened", "grimaced", "sniffed", "spluttered", "prayed", "squeaked", "worried", "whinged",
+    "cackled", "congratulated", "gushed", "simpered", "whooped", "flattered", "purred", "swooned",
+    "mumbled", "wished", "consoled", "sobbed", "wept", "marveled", "marvelled", "yelped", "yawned",
+    "alliterated", "described", "emphasized", "imitated", "mouthed", "offered", "pressed",
+    "recalled", "remembered", "rhymed", "tried", "accepted", "acknowledged", "affirmed", "assumed",
+    "conferred", "confessed", "confirmed", "justified", "settled", "understood", "undertook",
+    "accused", "bossed", "carped", "censured", "criticized", "gawped", "glowered", "grumbled",
+    "remonstrated", "reprimanded", "scoffed", "seethed", "ticked off", "told off", "upbraided",
+    "contemplated", "addressed", "advertised", "articulated", "bragged", "commanded", "confided",
+    "decided", "dictated", "ended", "exacted", "finished", "informed", "made known",
+    "necessitated", "pointed out", "promised", "reassured", "reported", "specified", "attracted",
+    "requested", "wanted", "beamed", "blurted", "broadcasted", "burst", "cheered", "chortled",
+    "chuckled", "cried out", "crooned", "crowed", "emitted", "giggled", "hollered", "howled",
+    "praised", "preached", "presented", "proclaimed", "professed", "promulgated", "quaked",
+    "ranted", "rejoiced", "roared", "screamed", "shrieked", "swore", "thundered", "trilled",
+    "trumpeted", "vociferated", "wailed", "yawped", "yowled", "cautioned", "shuddered", "trembled",
+    "comforted", "empathized", "invited", "proffered", "released", "volunteered", "advised",
+    "alleged", "appealed", "asserted", "assured", "avered", "beckoned", "begged", "beseeched",
+    "cajoled", "claimed", "conceded", "concluded", "concurred", "contended", "defended",
+    "disposed", "encouraged", "entreated", "held", "hinted", "implied", "importuned", "inclined",
+    "indicated", "postulated", "premised", "presupposed", "stressed", "touted", "vouched for",
+    "wheedled", "chimed in", "circulated", "disseminated", "distributed", "expressed",
+    "made public", "passed on", "publicized", "published", "put forth", "put out", "quipped",
+    "quoted", "reckoned that", "required", "requisitioned", "taunted", "teased", "exposed",
+    "joked", "leered", "lied", "mimicked", "mocked", "agonized", "bawled", "blubbered", "grieved",
+    "groaned", "lamented", "mewled", "mourned", "puled", "denoted", "disclosed", "divulged",
+    "imparted", "proposed", "revealed", "shared", "solicited", "sought", "testified",
+    "transferred", "transmitted", "doubted", "faltered", "fretted", "guessed", "hypothesized",
+    "lilted", "quavered", "queried", "questioned", "speculated", "supposed", "trailed off",
+    "breathed", "choked", "drawled", "echoed", "keened", "panted", "sang", "sniffled", "sniveled",
+    "uttered", "voiced", "whimpered", "whined", "probed", "backtracked", "communicated",
+    "considered", "elaborated", "enunciated", "expounded", "greeted", "mentioned", "orated",
+    "persisted", "predicted", "pronounced", "recited", "reckoned", "related", "slurred",
+    "vocalized", "approved", "bubbled", "chattered", "complimented", "effused", "thanked",
+    "yammered", "apologized", "cursed", "exploded", "screeched", "spat", "bleated", "exhaled",
+    "groused", "gulped", "squalled", "warbled", "bloviated", "exhorted", "gloated", "moralized",
+    "sermonized", "swaggered", "swallowed", "vacillated", "derided", "jeered", "heckled",
+    "lampooned", "parodied", "ridiculed", "satirized", "scorned", "spoofed", "snickered",
+    "challenged", "interrogated", "puzzled", "prattled", "preened", "cooed", "bantered",
+    "blathered", "blithered", "hooted", "jested", "soothed", "chorused", "piped", "yakked",
+    "gurgled", "disparaged", "rejected", "griped", "reproached", "berated", "sassed", "chided",
+    "clucked", "corrected", "rebuffed", "gawked", "spouted", "let slip", "gaped", "ogled",
+    "gasped", "spilled", "blanched", "spooked", "paled", "brooded", "panicked", "tensed",
+    "cowered", "cringed", "recoiled", "shivered", "depicted", "elucidated", "defined",
+    "illustrated", "delineated", "portrayed", "returned", "advanced", "corroborated", "posited",
+    "attested", "authenticated", "bespoke", "substantiated", "certified", "critiqued", "gauged",
+    "appraised", "estimated", "assayed", "evaluated", "interpreted", "assessed", "examined",
+    "judged", "explicated", "reviewed", "figured", "surveyed", "adumbrated", "alluded", "connoted",
+    "signaled", "foreshadowed", "insinuated", "signified", "forewarned", "intimated", "heralded",
+    "portended", "adjured", "inspected", "perused", "researched", "explored", "searched", "owned",
+    "recognized", "betrayed", "acquiesced", "bellyached", "bickered", "blabbed", "blabbered",
+    "brayed", "broke in", "coached", "coaxed", "contradicted", "contributed", "deduced",
+    "demurred", "disagreed", "dissented", "dribbled", "droned", "ejaculated", "exulted", "fussed",
+    "gibbered", "gibed", "guaranteed", "harangued", "huffed", "intoned", "joined in", "nattered",
+    "neighed", "nitpicked", "objected", "opined", "pestered", "pled", "pledged", "prated",
+    "resounded", "resumed", "retaliated", "shot", "tattled", "theorized", "toasted", "tutted",
+    "weighed in", "whickered", "whinnied", "brought forth", "denounced", "disrupted", "enjoined",
+    "condescended", "contested", "feared", "foretold", "cracked", "haggled", "hedged", "relented",
+    "petitioned", "inferred", "propounded", "intimidated", "itemized", "proved", "sanctioned",
+    "quibbled", "rambled", "reaffirmed", "reciprocated", "referred", "regretted", "restated",
+    "ruled", "stipulated", "twitted", "whistled", "thought", "wrangled", "went on", "interposed",
+    "urged", "demanded", "began", "spoke up", "went on grimly", "said simply", "said softly",
+)
+
+# Everything find_attrib_verbs() looks for by default
+ATTRIB_VERB_LEXICON = frozenset(
+    set(CORE_SPEECH_VERBS) | set(TAIL_ATTRIB_VERBS) | set(expand_verb_forms(MULTIWORD_VERB_BASES))
+)
+
+# ---------- Trie regex ----------
+_END = None
+_SPACE = r"\s+"
+
+
+def _units(verb: str, flexible_space: bool) -> List[str]:
+    """The regex pieces a verb is spelled with: one escaped char each, or \\s+ between words."""
+    if flexible_space:
+        units = []
+        for i, tok in enumerate(verb.split()):
+            if i:
+                units.append(_SPACE)
+            units.extend(re.escape(ch) for ch in tok)
+        return units
+    return [re.escape(ch) for ch in verb]
+
+
+def _render(node: dict) -> str:
+    alts, chars = [], []
+    for unit in sorted(k for k in node if k is not _END):
+        child = node[unit]
+        if len(child) == 1 and _END in child and len(unit) == 1 and unit.isalnum():
+            chars.append(unit)
+        else:
+            alts.append(unit + _render(child))
+    if len(chars) == 1:
+        alts.append(chars[0])
+    elif chars:
+        alts.append("[%s]" % "".join(chars))
+
+    if not alts:
+        return ""
+    optional = _END in node
+    if len(alts) == 1:
+        single = alts[0]
+        if not optional:
+            return single
+        if len(single) == 1 or (single.startswith("[") and single.endswith("]") and len(chars) > 1):
+            return single + "?"
+        return "(?:%s)?" % single
+    # greedy ? tries the longer continuation first, like a longest-first alternation
+    return "(?:%s)%s" % ("|".join(alts), "?" if optional else "")
+
+
+@lru_cache(maxsize=256)
+def _trie_pattern(verbs: frozenset, flexible_space: bool) -> str:
+    root: dict = {}
+    for verb in verbs:
+        units = _units(verb, flexible_space)
+        if not units:
+            continue
+        node = root
+        for unit in units:
+            node = node.setdefault(unit, {})
+        node[_END] = True
+    if not root:
+        return ""
+    return "(?:%s)" % _render(root)
+
+
+def verb_alternation(verbs: Iterable[str], flexible_space: bool = False) -> str:
+    """Non-capturing regex matching exactly the given verbs, as a prefix trie.
+
+    Drop-in for "(?:%s)" % "|".join(sorted(map(re.escape, verbs), key=len, reverse=True)):
+    it matches the same strings and, where one verb is a prefix of another, still prefers
+    the longer one. With flexible_space the words of a multiword verb are joined by \\s+
+    instead of a literal space. An empty verb set gives a pattern that never matches.
+    """
+    verbs = frozenset(v for v in verbs if v and (v.strip() or not flexible_space))
+    return _trie_pattern(verbs, flexible_space) or r"(?!)"
+
+
+class VerbMatcher:
+    """A compiled, word-bounded, case-insensitive matcher for one verb set."""
+
+    def __init__(self, verbs: Iterable[str]):
+        self.verbs = frozenset(verbs)
+        self.pattern = verb_alternation(self.verbs, flexible_space=True)
+        self.regex = re.compile(r"\b%s\b" % self.pattern, re.IGNORECASE)
+
+    def finditer(self, text: str):
+        return self.regex.finditer(text or "")
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """(start, end, matched text) of every verb in text, left to right."""
+        return [(m.start(), m.end(), m.group(0)) for m in self.regex.finditer(text or "")]
+
+    def search(self, text: str):
+        return self.regex.search(text or "")
+
+
+@lru_cache(maxsize=64)
+def _matcher_for(verbs: frozenset) -> VerbMatcher:
+    return VerbMatcher(verbs)
+
+
+def get_matcher(verbs: Optional[Iterable[str]] = None) -> VerbMatcher:
+    """The shared VerbMatcher for verbs (ATTRIB_VERB_LEXICON by default)."""
+    return _matcher_for(ATTRIB_VERB_LEXICON if verbs is None else frozenset(verbs))
+
+
+def find_attrib_verbs(text: str, verbs: Optional[Iterable[str]] = None) -> List[Tuple[int, int, str]]:
+    """(start, end, matched text) of every attribution verb in text.
+
+    Multiword verbs match across any run of whitespace ("went  on"); matching ignores case.
+    """
+    return get_matcher(verbs).find(text)
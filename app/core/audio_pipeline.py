@@ -0,0 +1,266 @@
+"""
+Audio Pipeline
+Synthesis, post-processing and chapter assembly as concurrent stages:
+
+    feeder -> [synth queue] -> TTS workers -> [post queue] -> quality workers -> assembler -> encoders
+
+The feeder keeps a bounded number of lines waiting for the TTS workers, so they never run
+dry and memory doesn't grow with the book. A line that fails its quality check goes back to
+the TTS workers ahead of new lines. The assembler (the thread that called run()) hands a
+chapter to an encoder process as soon as its last line has cleared post-processing, so
+chapters are encoded while later ones are still being synthesized.
+"""
+
+import itertools
+import queue
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.core.assembly import DEFAULT_BITRATE, encode_chapter, encoder_pool
+
+SYNTH_QUEUE_SIZE = 8  # new lines waiting for a TTS worker
+POST_QUEUE_SIZE = 16  # synthesized lines waiting for post-processing
+
+_RETRY, _NEW, _STOP = 0, 1, 2  # synth queue priorities: retries jump ahead of new lines
+
+
+class LineJob:
+    """One line of one chapter on its way through the pipeline."""
+
+    __slots__ = ("chapter", "n", "text", "voice", "out_path", "attempts", "score", "passed", "error")
+
+    def __init__(self, chapter, n: int, text: str, voice, out_path: str):
+        self.chapter = chapter
+        self.n = n
+        self.text = text
+        self.voice = voice
+        self.out_path = out_path
+        self.attempts = 0
+        self.score: Optional[float] = None
+        self.passed = False
+        self.error: Optional[Exception] = None
+
+
+class _ChapterState:
+    def __init__(self, chapter: Dict):
+        self.key = chapter["key"]
+        self.mp3 = chapter.get("mp3")
+        self.fed = 0
+        self.fully_fed = False
+        self.done: List[LineJob] = []
+
+
+class AudioPipeline:
+    """Runs chapters of lines through synthesis, quality checks and MP3 encoding.
+
+    synthesize(text, voice, out_path) writes one line's WAV. check(out_path, text), if
+    given, returns (passed, score); a line is synthesized up to max_attempts times until it
+    passes (the last attempt is kept either way) or stops raising.
+
+    Callbacks all run on the thread that called run():
+      on_line(job)                            a line is finished (job.error set if it failed)
+      on_chapter(key, jobs)                   all of a chapter's lines are finished
+      on_encoded(key, mp3, duration, error)   a chapter's MP3 is written (or failed)
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[str, object, str], object],
+        check: Optional[Callable[[str, str], tuple]] = None,
+        max_attempts: int = 1,
+        synth_workers: int = 1,
+        post_workers: int = 1,
+        encode_workers: Optional[int] = None,
+        bitrate: str = DEFAULT_BITRATE,
+        on_line: Optional[Callable] = None,
+        on_chapter: Optional[Callable] = None,
+        on_encoded: Optional[Callable] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ):
+        self.synthesize = synthesize
+        self.check = check
+        self.max_attempts = max(1, max_attempts)
+        self.synth_workers = max(1, synth_workers)
+        self.post_workers = max(1, post_workers)
+        self.encode_workers = encode_workers
+        self.bitrate = bitrate
+        self.on_line = on_line
+        self.on_chapter = on_chapter
+        self.on_encoded = on_encoded
+        self.cancel_event = cancel_event or threading.Event()
+
+        self._synth_q: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._synth_slots = threading.Semaphore(SYNTH_QUEUE_SIZE)
+        self._post_q: "queue.Queue" = queue.Queue(POST_QUEUE_SIZE)
+        self._done_q: "queue.Queue" = queue.Queue()
+        self._seq = itertools.count()
+        self._feed_error: Optional[Exception] = None
+
+    def cancel(self):
+        """Stop feeding new lines; lines already queued are dropped, chapters left unencoded."""
+        self.cancel_event.set()
+
+    # ---------- Stages ----------
+    def _feed(self, chapters: Iterable[Dict]):
+        try:
+            for chapter in chapters:
+                state = _ChapterState(chapter)
+                self._done_q.put(("chapter", state))
+                for n, (text, voice, out_path) in enumerate(chapter["lines"], start=1):
+                    while not self._synth_slots.acquire(timeout=0.1):
+                        if self.cancel_event.is_set():
+                            return
+                    if self.cancel_event.is_set():
+                        self._synth_slots.release()
+                        return
+                    state.fed += 1
+                    self._synth_q.put((_NEW, next(self._seq), LineJob(state.key, n, text, voice, out_path)))
+                self._done_q.put(("fed", state))
+        except Exception as e:
+            # raised again by run() once the lines already fed are through
+            self._feed_error = e
+        finally:
+            self._done_q.put(("feeder_done", None))
+
+    def _synth_worker(self):
+        while True:
+            priority, _, job = self._synth_q.get()
+            if priority == _STOP:
+                return
+            if priority == _NEW:
+                self._synth_slots.release()
+            if self.cancel_event.is_set():
+                job.error = job.error or RuntimeError("cancelled")
+                self._done_q.put(("line", job))
+                continue
+            job.attempts += 1
+            try:
+                self.synthesize(job.text, job.voice, job.out_path)
+                job.error = None
+            except Exception as e:
+                job.error = e
+                if job.attempts < self.max_attempts:
+                    self._synth_q.put((_RETRY, next(self._seq), job))
+                else:
+                    self._done_q.put(("line", job))
+                continue
+            self._post_q.put(job)
+
+    def _post_worker(self):
+        while True:
+            job = self._post_q.get()
+            if job is None:
+                return
+            if self.check is None:
+                job.passed, job.score = True, None
+            else:
+                try:
+                    job.passed, job.score = self.check(job.out_path, job.text)
+                except Exception as e:
+                    job.passed, job.score = False, 0.0
+                    job.error = e
+                if not job.passed and job.attempts < self.max_attempts and not self.cancel_event.is_set():
+                    job.error = None
+                    self._synth_q.put((_RETRY, next(self._seq), job))
+                    continue
+                job.error = None  # the last attempt is kept even when it didn't pass
+            self._done_q.put(("line", job))
+
+    # ---------- Assembler ----------
+    def run(self, chapters: Iterable[Dict]) -> Dict[object, Dict]:
+        """Process chapters ({"key", "lines": [(text, voice, wav path)], "mp3": path or None}).
+
+        Returns {key: {"lines", "produced", "failed", "retried", "mp3", "duration", "error"}}
+        for every chapter that was fed completely. An error raised while iterating chapters is
+        raised here, after the chapters fed before it are finished.
+        """
+        feeder = threading.Thread(target=self._feed, args=(chapters,), name="pipeline-feed", daemon=True)
+        synths = [
+            threading.Thread(target=self._synth_worker, name=f"pipeline-tts-{i}", daemon=True)
+            for i in range(self.synth_workers)
+        ]
+        posts = [
+            threading.Thread(target=self._post_worker, name=f"pipeline-post-{i}", daemon=True)
+            for i in range(self.post_workers)
+        ]
+        for t in [feeder] + synths + posts:
+            t.start()
+
+        states: Dict[object, _ChapterState] = {}
+        summary: Dict[object, Dict] = {}
+        encoding = 0
+        feeder_done = False
+        pool = None
+        try:
+            while encoding or not (feeder_done and all(len(s.done) == s.fed for s in states.values())):
+                kind, item = self._done_q.get()
+                if kind == "chapter":
+                    states[item.key] = item
+                elif kind == "feeder_done":
+                    feeder_done = True
+                elif kind == "encoded":
+                    encoding -= 1
+                    self._encoded(summary, *item)
+                else:
+                    if kind == "line":
+                        state = states[item.chapter]
+                        state.done.append(item)
+                        if self.on_line is not None:
+                            self.on_line(item)
+                    else:  # "fed"
+                        state = item
+                        state.fully_fed = True
+                    if not state.fully_fed or len(state.done) != state.fed:
+                        continue
+                    wavs = self._chapter_done(state, summary)
+                    if state.mp3 and wavs and not self.cancel_event.is_set():
+                        if pool is None:
+                            pool = encoder_pool(self.encode_workers)
+                        fut = pool.submit(encode_chapter, wavs, state.mp3, self.bitrate)
+                        fut.add_done_callback(
+                            lambda f, key=state.key, mp3=state.mp3: self._done_q.put(("encoded", (key, mp3, f)))
+                        )
+                        encoding += 1
+        except BaseException:
+            self.cancel_event.set()
+            raise
+        finally:
+            for _ in synths:
+                self._synth_q.put((_STOP, next(self._seq), None))
+            for t in [feeder] + synths:
+                t.join()
+            for _ in posts:
+                self._post_q.put(None)
+            for t in posts:
+                t.join()
+            if pool is not None:
+                pool.shutdown(cancel_futures=self.cancel_event.is_set())
+        if self._feed_error is not None:
+            raise self._feed_error
+        return summary
+
+    def _chapter_done(self, state: _ChapterState, summary: Dict) -> List[str]:
+        """Record a chapter whose lines are all finished; returns its WAVs in reading order."""
+        jobs = sorted(state.done, key=lambda j: j.n)
+        summary[state.key] = {
+            "lines": state.fed,
+            "produced": sum(1 for j in jobs if j.error is None),
+            "failed": sum(1 for j in jobs if j.error is not None or not j.passed),
+            "retried": sum(max(0, j.attempts - 1) for j in jobs),
+            "mp3": None,
+            "duration": None,
+            "error": None,
+        }
+        if self.on_chapter is not None:
+            self.on_chapter(state.key, jobs)
+        return [j.out_path for j in jobs if j.error is None]
+
+    def _encoded(self, summary: Dict, key, mp3: str, fut):
+        try:
+            duration, error = fut.result(), None
+            summary[key].update(mp3=mp3, duration=duration)
+        except BaseException as e:
+            duration, error = None, e
+            summary[key]["error"] = e
+        if self.on_encoded is not None:
+            self.on_encoded(key, mp3, duration, error)
@@ -0,0 +1,199 @@
+"""
+Autosave
+Background persistence for the GUI. Edits only call request(), which is cheap: the latest
+request per key wins and is written once the edits have paused for `delay` seconds (or at
+the latest `max_delay` seconds after the first unsaved edit). pump(), called from the UI
+thread on a timer, takes the snapshots of what is due there, so they are consistent with
+the UI's data, and hands them to a writer thread; the UI never waits on the disk.
+
+Files are replaced atomically (temp file + rename) and, when backups are on, the previous
+versions are kept as <path>.1 ... <path>.N, rotated at most once per backup_interval.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+DEFAULT_DELAY = 2.0  # seconds of quiet before a write
+DEFAULT_MAX_DELAY = 30.0  # longest a continuously edited key stays unsaved
+DEFAULT_BACKUPS = 3
+DEFAULT_BACKUP_INTERVAL = 300.0
+
+
+def backup_path(path: str, n: int) -> str:
+    return f"{path}.{n}"
+
+
+def rotate_backups(path: str, keep: int):
+    """Shift path.1 .. path.(keep-1) up by one (path.keep falls off) to make room for a new path.1."""
+    for n in range(keep - 1, 0, -1):
+        if os.path.exists(backup_path(path, n)):
+            os.replace(backup_path(path, n), backup_path(path, n + 1))
+
+
+def write_atomic(path: str, data, backups: int = 0):
+    """Replace path with data (str or bytes) so readers see the old or the new file, never half of one.
+
+    With backups > 0 the current file is first kept as path.1 (older ones rotated).
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}"
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(tmp, mode, **({} if isinstance(data, bytes) else {"encoding": "utf-8"})) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    if backups > 0 and os.path.exists(path):
+        rotate_backups(path, backups)
+        shutil.copy2(path, backup_path(path, 1))
+    os.replace(tmp, path)
+
+
+def write_json_atomic(path: str, data, backups: int = 0, indent: int = 2):
+    write_atomic(path, json.dumps(data, indent=indent, ensure_ascii=False), backups)
+
+
+class AutosaveService:
+    """Debounced, coalescing writes on one background thread.
+
+    request(key, snapshot, write): snapshot() runs on the thread that calls pump() (or
+    flush()), write(data) on the writer thread. Writes of one key never run out of order,
+    and an older snapshot is dropped when a newer one is waiting.
+    """
+
+    def __init__(
+        self,
+        delay: float = DEFAULT_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        backups: int = DEFAULT_BACKUPS,
+        backup_interval: float = DEFAULT_BACKUP_INTERVAL,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.backups = backups
+        self.backup_interval = backup_interval
+        self.on_error = on_error
+        # key -> (snapshot, write, first request time, last request time)
+        self._requests: Dict[str, Tuple[Callable, Callable, float, float]] = {}
+        # key -> (write, data) waiting for the writer thread
+        self._jobs: Dict[str, Tuple[Callable, object]] = {}
+        self._busy = 0
+        self._last_backup: Dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, **settings):
+        """Change delay, max_delay, backups or backup_interval; applies to later writes."""
+        with self._cond:
+            for name, value in settings.items():
+                if name not in ("delay", "max_delay", "backups", "backup_interval"):
+                    raise TypeError(f"unknown autosave setting: {name}")
+                setattr(self, name, value)
+
+    def request(self, key: str, snapshot: Callable[[], object], write: Callable[[object], None]):
+        """Note that key needs saving; repeated requests before it is written are merged."""
+        now = time.monotonic()
+        with self._cond:
+            first = self._requests[key][2] if key in self._requests else now
+            self._requests[key] = (snapshot, write, first, now)
+
+    def pending(self) -> bool:
+        with self._cond:
+            return bool(self._requests or self._jobs or self._busy)
+
+    def pump(self):
+        """Snapshot every key that is due and queue its write (call from the UI thread)."""
+        now = time.monotonic()
+        with self._cond:
+            due = [
+                key
+                for key, (_, _, first, last) in self._requests.items()
+                if now - last >= self.delay or now - first >= self.max_delay
+            ]
+            taken = [(key, self._requests.pop(key)) for key in due]
+        self._queue(taken)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Snapshot everything requested so far and wait until it is written; False on timeout."""
+        with self._cond:
+            taken = list(self._requests.items())
+            self._requests.clear()
+        self._queue(taken)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._jobs or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        done = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        return done
+
+    def backup_due(self, key: str) -> bool:
+        """Whether key's write should also rotate a backup now (and record that it did)."""
+        if self.backups <= 0:
+            return False
+        now = time.monotonic()
+        with self._cond:
+            last = self._last_backup.get(key)
+            if last is not None and now - last < self.backup_interval:
+                return False
+            self._last_backup[key] = now
+        return True
+
+    def _queue(self, taken):
+        jobs = []
+        for key, (snapshot, write, _, _) in taken:
+            try:
+                jobs.append((key, write, snapshot()))
+            except Exception as e:
+                self._report(key, e)
+        if not jobs:
+            return
+        with self._cond:
+            for key, write, data in jobs:
+                self._jobs[key] = (write, data)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._jobs and not self._closed:
+                    self._cond.wait()
+                if not self._jobs:
+                    return
+                key = next(iter(self._jobs))
+                write, data = self._jobs.pop(key)
+                self._busy += 1
+            try:
+                write(data)
+            except Exception as e:
+                self._report(key, e)
+            finally:
+                with self._cond:
+                    self._busy -= 1
+                    self._cond.notify_all()
+
+    def _report(self, key: str, error: Exception):
+        if self.on_error is not None:
+            try:
+                self.on_error(key, error)
+                return
+            except Exception:
+                pass
+        print(f"[autosave] saving {key} failed: {error}")
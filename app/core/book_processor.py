@@ -40,13 +40,20 @@ Outputs a list of dicts like:
 import re
 from typing import List, Dict
 
+from app.core import pipeline_log
+from app.core.attrib_verbs import TAIL_ATTRIB_VERBS, verb_alternation
+from app.core.source_spans import merge_span, split_span
+
 # --- Heuristics / patterns ---
 QUOTE_PAT = r'(".*?"|“.*?”|‘.*?’|\'[^\']+\')'
-ATTRIB_VERBS = r"(said|asked|replied|whispered|shouted|muttered|cried|called|answered|hissed|breathed|growled|moaned|went\s+on|told|explained|snapped|laughed|reminded|queried|continued|responded|added|insisted|agreed|noted|remarked|observed|demanded|protested|announced|declared|yelled|murmured)"
+ATTRIB_VERBS = r"(%s)" % verb_alternation(TAIL_ATTRIB_VERBS, flexible_space=True)
 ATTRIB_TAIL = re.compile(rf'^\s*,?\s*(?P<verb>{ATTRIB_VERBS})\s+(?P<name>[A-Z][\w\'\-]+)(?:\s+[\w\s]+)?\.?\s*$', re.IGNORECASE)
 ATTRIB_HEAD = re.compile(rf'^\s*([A-Z][\w\'\-]+)\s+{ATTRIB_VERBS}\b', re.IGNORECASE)
 # Pattern to detect attribution starting with quotes: '"he said' or '"she asked' (allow pronouns/short words before verb)
 ATTRIB_QUOTE_PREFIX = re.compile(rf'^["\u201c\u201d\'\u2018\u2019]\s*(?:[a-z]+\s+)?{ATTRIB_VERBS}\b', re.IGNORECASE)
+# A whole line that is one quote plus an optional attribution tail: '"Hi," said Alice.'
+QUOTE_ATTRIB_LINE = re.compile(rf'^(?P<quote>["\u201c\u201d][^"\u201c\u201d]+["\u201c\u201d])\s*(?P<attrib>(,?\s*{ATTRIB_VERBS}\s+[A-Z][\w\'\-]+(?:\s+[\w\s]+)?\.?))?$', re.IGNORECASE)
+ATTRIB_VERB_NAME = re.compile(rf'{ATTRIB_VERBS}\s+([A-Z][\w\'\-]+)')
 BAN_SPEAKERS = {
     "unknown", "unk", "narration", "voice", "speaker",
     "we", "they", "them", "you", "me", "us",
@@ -62,14 +69,13 @@ def parse_booktxt(path: str) -> List[Dict[str, str]]:
         # Improved logic: always emit quoted text as a single row, split glued quote+attribution, never glue narration to character lines
         results = []
         # Regex to match: "quote" [optional attribution]
-        quote_attrib_pat = re.compile(r'^(?P<quote>["\u201c\u201d][^"\u201c\u201d]+["\u201c\u201d])\s*(?P<attrib>(,?\s*(said|asked|replied|whispered|shouted|muttered|cried|called|answered|hissed|breathed|growled|moaned|went\s+on|told|explained|snapped|laughed|reminded|queried|continued|responded|added|insisted|agreed|noted|remarked|observed|demanded|protested|announced|declared|yelled|murmured)\s+[A-Z][\w\'\-]+(?:\s+[\w\s]+)?\.?))?$', re.IGNORECASE)
-        m = quote_attrib_pat.match(text.strip())
+        m = QUOTE_ATTRIB_LINE.match(text.strip())
         if m:
             quote = m.group('quote').strip()
             attrib = m.group('attrib')
             speaker = "Unknown"
             if attrib:
-                name_match = re.search(r'(said|asked|replied|whispered|shouted|muttered|cried|called|answered|hissed|breathed|growled|moaned|went\s+on|told|explained|snapped|laughed|reminded|queried|continued|responded|added|insisted|agreed|noted|remarked|observed|demanded|protested|announced|declared|yelled|murmured)\s+([A-Z][\w\'\-]+)', attrib)
+                name_match = ATTRIB_VERB_NAME.search(attrib)
                 if name_match:
                     speaker = normalize_name(name_match.group(2))
             results.append({"speaker": speaker, "text": quote, "is_quote": True})
@@ -116,9 +122,10 @@ def parse_booktxt(path: str) -> List[Dict[str, str]]:
     with open(path, "r", encoding="utf-8") as f:
         for raw_line in f:
             line = raw_line.strip()
-            # DEBUG: Trace attribution logic for every line
-            is_quote_line_debug = bool(re.match(r'^\s*["\u201c]', line))
-            print(f"[DEBUG] LINE: pending={pending_attribution_speaker}, last={last_attribution_speaker}, is_quote_line={is_quote_line_debug}, text={repr(line)}")
+            # DEBUG: Trace attribution logic for every line (POLYVOX_LOG_LEVEL=trace)
+            if pipeline_log.enabled(pipeline_log.TRACE):
+                is_quote_line_debug = bool(re.match(r'^\s*["\u201c]', line))
+                print(f"[DEBUG] LINE: pending={pending_attribution_speaker}, last={last_attribution_speaker}, is_quote_line={is_quote_line_debug}, text={repr(line)}")
             if not line:
                 continue
 
@@ -287,7 +294,7 @@ def parse_booktxt(path: str) -> List[Dict[str, str]]:
             # If this line is NOT a quote and is a pure attribution, emit as Narrator and DO NOT set continuation speaker
             trailing_clean = text.strip().lstrip("\"\u201c\u201d\u2018\u2019")
             attrib_match = ATTRIB_TAIL.match(trailing_clean)
-            if attrib_match and not is_quote_line:
+            if attrib_match and not is_quote_line and pipeline_log.enabled(pipeline_log.TRACE):
                 print(f"[DEBUG] Attribution line treated as Narrator, no continuation speaker set.")
                 print(f"  from attribution: {trailing_clean[:60]}")
 
@@ -525,12 +532,15 @@ def split_embedded_quotes_in_narration(rows: List[Dict[str, str]]) -> List[Dict[
         # Create separate rows for each part
         # Mark parts after the first as "__EMBEDDED_QUOTE__" temporarily
         # so they won't be merged back together by merge_narrator_blocks
+        pos = 0
         for idx, part in enumerate(parts):
-            result.append({
+            child = {
                 'speaker': 'Narrator' if idx == 0 else '__EMBEDDED_QUOTE__',
                 'is_quote': False,
                 'text': part
-            })
+            }
+            pos = split_span(row, child, pos)
+            result.append(child)
     
     return result
 
@@ -567,14 +577,15 @@ def merge_narrator_blocks(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
         if speaker.lower() == 'narrator' and not is_quote_bool:
             if narrator_buffer is None:
                 # Start new narrator buffer
-                narrator_buffer = {
+                narrator_buffer = merge_span({
                     'speaker': 'Narrator',
                     'is_quote': False,
                     'text': row.get('text', '')
-                }
+                }, [row])
             else:
                 # Append to existing narrator buffer with space separation
                 narrator_buffer['text'] += ' ' + row.get('text', '')
+                merge_span(narrator_buffer, [narrator_buffer, row])
         else:
             # This is a quote or non-narrator - flush narrator buffer if exists
             if narrator_buffer:
@@ -590,11 +601,16 @@ def merge_narrator_blocks(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
     return merged
 
 
-def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
+def run_book_processor(booktxt_path: str, source_text: str | None = None) -> List[Dict[str, str]]:
     """
     Main entry point. Given a .book.txt file path, parse and return structured JSON.
     Also merges multi-sentence quotes using BookNLP's .quotes file for quote integrity.
     Also merges consecutive narrator blocks for consolidated narrator voice in TTS.
+
+    source_text is the exact text BookNLP was run on. With it, quote rows are cut straight
+    from the .quotes token ids via the .tokens character offsets, and every row's
+    _char_begin/_char_end index into source_text. Without it (or when the offsets don't
+    fit the text) quotes are aligned against .book.plain.txt by text similarity.
     """
     import os
     try:
@@ -622,12 +638,6 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
 
         def _build_hard_rows_from_quotes(qpath: str, plain_path: str, tokens_path: str | None) -> List[Dict[str, str]]:
             import csv
-            # Read full document plain text once
-            try:
-                with open(plain_path, 'r', encoding='utf-8', errors='replace') as f:
-                    doc_text = f.read()
-            except Exception:
-                return []
 
             # Optional: load characters mapping to prefer canonical names from char_id
             char_id_to_name: dict[int, str] = {}
@@ -662,8 +672,9 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
             except Exception:
                 char_id_to_name = {}
 
-            # Optional: token_id -> (char_begin, char_end)
+            # Optional: token_id -> (char_begin, char_end), plus each token's word to check the offsets
             tok2char = {}
+            tok_words: dict[int, str] = {}
             if tokens_path and os.path.exists(tokens_path):
                 try:
                     with open(tokens_path, 'r', encoding='utf-8', errors='replace') as tf:
@@ -703,8 +714,11 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
                             except Exception:
                                 continue
                             tok2char[tid] = (cb, ce)
+                            if 'word' in row:
+                                tok_words[tid] = row['word']
                 except Exception:
                     tok2char = {}
+                    tok_words = {}
 
             # Helpers for text normalization and glyph expansion
             def _strip_outer_quotes(s: str) -> str:
@@ -752,10 +766,13 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
                 pat = pat.replace('\\"', '["“”]')
                 return pat
 
+            QUOTE_OPEN = {"\u201c", '"', '\u00ab'}  # “, ", «
+            QUOTE_CLOSE = {"\u201d", '"', '\u00bb'}  # ”, ", »
+
             def _expand_glyphs(doc: str, start: int, end: int) -> tuple[int, int]:
                 # Expand [start,end) to include surrounding opening/closing quote glyphs with whitespace in-between
-                OPEN = {"\u201c", '"', '\u00ab'}  # “, ", «
-                CLOSE = {"\u201d", '"', '\u00bb'}  # ”, ", »
+                OPEN = QUOTE_OPEN
+                CLOSE = QUOTE_CLOSE
                 # Look left for opening glyph
                 li = start - 1
                 while li >= 0 and doc[li].isspace():
@@ -778,7 +795,7 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
             # multi-quote rows ("A?" "B...") can be aligned one-by-one with the
             # document text.
             RX_SEGMENT = _re.compile(r'(?:[\u201c"])(?:.*?)(?:[\u201d"])', _re.S)
-            quote_segments = []
+            quote_rows = []
             with open(qpath, newline='', encoding='utf-8', errors='replace') as f:
                 reader = csv.DictReader(f, delimiter='\t')
                 for row_index, r in enumerate(reader):
@@ -791,7 +808,67 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
                         cid = int(cid) if cid not in (None, '', '-1') else None
                     except Exception:
                         cid = None
+                    try:
+                        tok_span = (int(r.get('quote_start')), int(r.get('quote_end')))
+                    except Exception:
+                        tok_span = None
+                    quote_rows.append((row_index, qtext, mention, cid, tok_span))
+
+            def _doc_quotes_from_offsets(text: str):
+                """Quote spans cut from text at the BookNLP token offsets; None if they don't fit."""
+                spans = []
+                for row_index, qtext, mention, cid, tok_span in quote_rows:
+                    if tok_span is None or tok_span[0] not in tok2char or tok_span[1] not in tok2char:
+                        return None
+                    for tid in tok_span:
+                        cb, ce = tok2char[tid]
+                        word = tok_words.get(tid)
+                        if ce > len(text) or (word is not None and text[cb:ce] != word):
+                            return None
+                    qs, qe = tok2char[tok_span[0]][0], tok2char[tok_span[1]][1]
+                    # Pull in quote glyphs the tokens left out, but never a neighbouring quote's glyph
+                    xs, xe = _expand_glyphs(text, qs, qe)
+                    if text[qs:qs + 1] not in QUOTE_OPEN:
+                        qs = xs
+                    if text[qe - 1:qe] not in QUOTE_CLOSE:
+                        qe = xe
+                    # One BookNLP quote can hold several quoted segments ("A?" "B..."); each gets its own row
+                    segs = [(m.start(), m.end()) for m in RX_SEGMENT.finditer(text, qs, qe)] or [(qs, qe)]
+                    for seg_idx, (ss, se) in enumerate(segs):
+                        spans.append({
+                            'start': ss,
+                            'end': se,
+                            'text': text[ss:se],
+                            'char_id': cid,
+                            'mention': mention,
+                            'source_row': row_index,
+                            'source_seg': seg_idx,
+                        })
+                spans.sort(key=lambda dq: dq['start'])
+                doc_quotes = []
+                cursor = 0
+                for dq in spans:
+                    # overlapping BookNLP quotes: the earlier one wins
+                    if dq['start'] < cursor or not _norm_for_match(dq['text']):
+                        continue
+                    doc_quotes.append(dq)
+                    cursor = dq['end']
+                return doc_quotes
+
+            def _align_doc_quotes(plain_path: str):
+                """
+                Fallback for when the token offsets can't be used (no source text, or it was edited):
+                find every quote in .book.plain.txt by regex and align it with the .quotes rows by
+                text. Returns (doc_quotes, doc_text).
+                """
+                try:
+                    with open(plain_path, 'r', encoding='utf-8', errors='replace') as f:
+                        doc_text = f.read()
+                except Exception:
+                    return [], ''
 
+                quote_segments = []
+                for row_index, qtext, mention, cid, _tok_span in quote_rows:
                     matches = list(RX_SEGMENT.finditer(qtext))
                     # If no explicit quote glyphs were detected, treat the entire
                     # field as one quote segment.
@@ -815,78 +892,93 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
                             'source_seg': seg_idx,
                         })
 
-            if not quote_segments:
-                return []
+                if not quote_segments:
+                    return [], doc_text
 
-            # Extract every quoted span from the plain document text.
-            RX_DOC_QUOTE = _re.compile(r'(?:[\u201c"]?)(?:.*?)(?:[\u201d"])', _re.S)
-            doc_quotes = []
-            for match in RX_DOC_QUOTE.finditer(doc_text):
-                chunk_text = match.group(0)
-                norm_chunk = _norm_for_match(chunk_text)
-                if not norm_chunk:
-                    continue
-                doc_quotes.append({
-                    'start': match.start(),
-                    'end': match.end(),
-                    'text': chunk_text,
-                    'norm': norm_chunk,
-                })
-
-            if not doc_quotes:
-                return []
-
-            # Align each document quote with the next best segment from the BookNLP
-            # outputs using exact match first and SequenceMatcher as a soft fallback.
-            seg_idx = 0
-            max_debug_mismatch = 5
-            for dq in doc_quotes:
-                assigned = None
-                assigned_index = None
-                # Try exact match within a limited lookahead window.
-                lookahead_limit = min(len(quote_segments), seg_idx + 12)
-                for candidate_idx in range(seg_idx, lookahead_limit):
-                    seg = quote_segments[candidate_idx]
-                    if dq['norm'] == seg['norm']:
-                        assigned = seg
-                        assigned_index = candidate_idx
-                        break
-                    # Allow prefix/suffix containment when BookNLP truncates or spans
-                    if seg['norm'] and (dq['norm'].startswith(seg['norm']) or seg['norm'].startswith(dq['norm'])):
-                        assigned = seg
-                        assigned_index = candidate_idx
-                        break
+                # Extract every quoted span from the plain document text.
+                RX_DOC_QUOTE = _re.compile(r'(?:[\u201c"]?)(?:.*?)(?:[\u201d"])', _re.S)
+                doc_quotes = []
+                for match in RX_DOC_QUOTE.finditer(doc_text):
+                    chunk_text = match.group(0)
+                    norm_chunk = _norm_for_match(chunk_text)
+                    if not norm_chunk:
+                        continue
+                    doc_quotes.append({
+                        'start': match.start(),
+                        'end': match.end(),
+                        'text': chunk_text,
+                        'norm': norm_chunk,
+                    })
 
-                if assigned is None:
-                    # Soft match using SequenceMatcher ratio.
-                    best_score = 0.0
-                    best_seg = None
-                    best_idx = None
+                if not doc_quotes:
+                    return [], doc_text
+
+                # Align each document quote with the next best segment from the BookNLP
+                # outputs using exact match first and SequenceMatcher as a soft fallback.
+                seg_idx = 0
+                max_debug_mismatch = 5
+                for dq in doc_quotes:
+                    assigned = None
+                    assigned_index = None
+                    # Try exact match within a limited lookahead window.
+                    lookahead_limit = min(len(quote_segments), seg_idx + 12)
                     for candidate_idx in range(seg_idx, lookahead_limit):
                         seg = quote_segments[candidate_idx]
-                        score = difflib.SequenceMatcher(None, dq['norm'], seg['norm']).ratio()
-                        if score > best_score:
-                            best_score = score
-                            best_seg = seg
-                            best_idx = candidate_idx
-                        if score >= 0.995:  # practically identical
+                        if dq['norm'] == seg['norm']:
+                            assigned = seg
+                            assigned_index = candidate_idx
+                            break
+                        # Allow prefix/suffix containment when BookNLP truncates or spans
+                        if seg['norm'] and (dq['norm'].startswith(seg['norm']) or seg['norm'].startswith(dq['norm'])):
+                            assigned = seg
+                            assigned_index = candidate_idx
                             break
-                    if best_seg is not None and best_score >= 0.72:
-                        assigned = best_seg
-                        assigned_index = best_idx
-
-                if assigned is not None:
-                    dq['char_id'] = assigned['char_id']
-                    dq['mention'] = assigned['mention']
-                    dq['source_row'] = assigned['source_row']
-                    dq['source_seg'] = assigned['source_seg']
-                    seg_idx = assigned_index + 1
+
+                    if assigned is None:
+                        # Soft match using SequenceMatcher ratio.
+                        best_score = 0.0
+                        best_seg = None
+                        best_idx = None
+                        for candidate_idx in range(seg_idx, lookahead_limit):
+                            seg = quote_segments[candidate_idx]
+                            score = difflib.SequenceMatcher(None, dq['norm'], seg['norm']).ratio()
+                            if score > best_score:
+                                best_score = score
+                                best_seg = seg
+                                best_idx = candidate_idx
+                            if score >= 0.995:  # practically identical
+                                break
+                        if best_seg is not None and best_score >= 0.72:
+                            assigned = best_seg
+                            assigned_index = best_idx
+
+                    if assigned is not None:
+                        dq['char_id'] = assigned['char_id']
+                        dq['mention'] = assigned['mention']
+                        dq['source_row'] = assigned['source_row']
+                        dq['source_seg'] = assigned['source_seg']
+                        seg_idx = assigned_index + 1
+                    else:
+                        dq['char_id'] = None
+                        dq['mention'] = ''
+                        if max_debug_mismatch > 0:
+                            print(f"[DEBUG] Unmatched quote segment: {dq['text'][:80]!r}")
+                            max_debug_mismatch -= 1
+
+                return doc_quotes, doc_text
+
+            doc_quotes = None
+            if source_text is not None and tok2char and quote_rows:
+                doc_quotes = _doc_quotes_from_offsets(source_text)
+                if doc_quotes is None:
+                    print("[BookProcessor] Token offsets don't match the source text; aligning quotes by text")
                 else:
-                    dq['char_id'] = None
-                    dq['mention'] = ''
-                    if max_debug_mismatch > 0:
-                        print(f"[DEBUG] Unmatched quote segment: {dq['text'][:80]!r}")
-                        max_debug_mismatch -= 1
+                    doc_text = source_text
+
+            if doc_quotes is None:
+                doc_quotes, doc_text = _align_doc_quotes(plain_path)
+            if not doc_quotes:
+                return []
 
             # Emit narration/quote rows sequentially.
             rows_out: List[Dict[str, str]] = []
@@ -898,6 +990,9 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
                     narr = doc_text[nbeg:nend]
                     narr_s = narr.strip()
                     if narr_s:
+                        # offsets of the stripped text, so text == doc_text[_char_begin:_char_end]
+                        nbeg += len(narr) - len(narr.lstrip())
+                        nend = nbeg + len(narr_s)
                         rows_out.append({
                             'speaker': 'Narrator',
                             'text': narr_s,
@@ -933,6 +1028,8 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
                 tail = doc_text[nbeg:nend]
                 tail_s = tail.strip()
                 if tail_s:
+                    nbeg += len(tail) - len(tail.lstrip())
+                    nend = nbeg + len(tail_s)
                     rows_out.append({
                         'speaker': 'Narrator',
                         'text': tail_s,
@@ -942,6 +1039,11 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
                         '_char_end': nend,
                     })
 
+            if doc_text is not source_text:
+                # offsets into .book.plain.txt, not the chapter text; place_spans re-anchors these rows
+                for r in rows_out:
+                    r.pop('_char_begin', None)
+                    r.pop('_char_end', None)
             return rows_out
 
         # Try to locate tokens file alongside
@@ -952,7 +1054,7 @@ def run_book_processor(booktxt_path: str) -> List[Dict[str, str]]:
             tokens_path = alt if os.path.exists(alt) else None
 
         hard_rows: List[Dict[str, str]] = []
-        if os.path.exists(quotes_path) and os.path.exists(plain_path):
+        if os.path.exists(quotes_path) and (source_text is not None or os.path.exists(plain_path)):
             hard_rows = _build_hard_rows_from_quotes(quotes_path, plain_path, tokens_path)
             if hard_rows:
                 print(f"[BookProcessor] Built {len(hard_rows)} hard-quote rows from {os.path.basename(quotes_path)}")
@@ -1,7 +1,18 @@
 # app/core/chapter_chunker.py
 
+import hashlib
+import importlib.util
+import json
+import multiprocessing
 import os
 import re
+from collections import deque
+
+
+PDF_BATCH_PAGES = 32  # pages per worker task (and per cache file)
+PDF_POOL_MIN_PAGES = 64  # smaller PDFs are read in-process; a pool isn't worth starting
+CACHE_DIR_ENV = "POLYVOX_CACHE_DIR"  # default: output/cache
+EPUB_MIN_CHAPTER_CHARS = 100  # shorter spine documents (cover, copyright page) aren't chapters
 
 
 def load_book(path: str) -> str:
@@ -12,38 +23,292 @@ def load_book(path: str) -> str:
     if ext == ".txt":
         with open(path, "r", encoding="utf-8", errors="ignore") as f:
             return f.read()
+    return "\n".join(block["text"] for block in iter_book(path))
+
+
+def iter_book(path: str, workers: int | None = None, cache_dir: str | None = None):
+    """
+    Yield a book's text lazily as blocks of {"title", "text", "kind"}:
+    - txt:  one "text" block
+    - epub: one "chapter" block per spine document, titled from the TOC
+    - pdf:  one "page" block per page; large files are extracted across a process pool
+            and the page text is cached on disk under the file's hash (see iter_pdf_pages)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".txt":
+        yield {"title": os.path.basename(path), "text": load_book(path), "kind": "text"}
     elif ext == ".epub":
-        try:
-            from ebooklib import epub
-            from bs4 import BeautifulSoup
-        except ImportError:
-            raise ImportError("Please install ebooklib and beautifulsoup4 for EPUB support.")
-        book = epub.read_epub(path)
-        text_parts = []
-        for item in book.get_items():
-            if item.get_type() == 9:  # DOCUMENT
-                soup = BeautifulSoup(item.get_body_content(), "html.parser")
-                text_parts.append(soup.get_text())
-        return "\n".join(text_parts)
+        yield from iter_epub_chapters(path)
     elif ext == ".pdf":
-        try:
-            import PyPDF2
-        except ImportError:
-            raise ImportError("Please install PyPDF2 for PDF support.")
-        text_parts = []
-        with open(path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text_parts.append(page.extract_text() or "")
-        return "\n".join(text_parts)
+        for page_no, text in iter_pdf_pages(path, workers=workers, cache_dir=cache_dir):
+            yield {"title": f"Page {page_no}", "text": text, "kind": "page"}
     else:
         raise ValueError(f"Unsupported file type: {ext}")
 
 
+def load_chapters(path: str, min_chapter_length: int = 1000, max_chunk_size: int = 50000):
+    """
+    Chapters of a book file as [{"title", "text"}].
+
+    EPUBs use their spine/TOC directly, without regex chapter detection (documents shorter
+    than EPUB_MIN_CHAPTER_CHARS are dropped); everything else, and EPUBs that keep the whole
+    book in one document, goes through smart_chapter_detection.
+    """
+    if os.path.splitext(path)[1].lower() == ".epub":
+        blocks = list(iter_epub_chapters(path))
+        chapters = [
+            {"title": b["title"], "text": b["text"]}
+            for b in blocks
+            if len(b["text"].strip()) >= EPUB_MIN_CHAPTER_CHARS
+        ]
+        if len(chapters) > 1:
+            print(f"[ChapterChunker] Using {len(chapters)} chapter(s) from the EPUB spine")
+            return chapters
+        text = "\n".join(b["text"] for b in blocks)
+    else:
+        text = load_book(path)
+    return smart_chapter_detection(text, min_chapter_length=min_chapter_length, max_chunk_size=max_chunk_size)
+
+
+# ---------- EPUB ----------
+def _html_to_text(content: bytes) -> str:
+    """Visible text of an (X)HTML document body; lxml when installed, else BeautifulSoup."""
+    try:
+        import lxml.html
+    except ImportError:
+        from bs4 import BeautifulSoup
+
+        return BeautifulSoup(content, "html.parser").get_text()
+    if not content or not content.strip():
+        return ""
+    try:
+        return lxml.html.fromstring(content).text_content()
+    except Exception:
+        from bs4 import BeautifulSoup
+
+        return BeautifulSoup(content, "html.parser").get_text()
+
+
+def _epub_toc_titles(toc) -> dict:
+    """Document href (without #fragment) -> first TOC title pointing into it."""
+    titles = {}
+
+    def _walk(entries):
+        for entry in entries:
+            if isinstance(entry, (tuple, list)):
+                section, children = entry[0], entry[1] if len(entry) > 1 else []
+                href = getattr(section, "href", None)
+                if href:
+                    titles.setdefault(href.split("#")[0], getattr(section, "title", None))
+                _walk(children)
+            else:
+                href = getattr(entry, "href", None)
+                if href:
+                    titles.setdefault(href.split("#")[0], getattr(entry, "title", None))
+
+    _walk(toc or [])
+    return titles
+
+
+def iter_epub_chapters(path: str):
+    """One {"title", "text", "kind": "chapter"} block per EPUB spine document, in reading order."""
+    try:
+        from ebooklib import epub
+    except ImportError:
+        raise ImportError("Please install ebooklib and beautifulsoup4 for EPUB support.")
+    if importlib.util.find_spec("lxml") is None and importlib.util.find_spec("bs4") is None:
+        raise ImportError("Please install ebooklib and beautifulsoup4 for EPUB support.")
+
+    book = epub.read_epub(path)
+    titles = _epub_toc_titles(book.toc)
+    by_basename = {os.path.basename(href): title for href, title in titles.items()}
+    seen = set()
+    number = 0
+    for idref, *_ in book.spine:
+        item = book.get_item_with_id(idref)
+        if item is None or item.get_type() != 9 or idref in seen:  # 9 = DOCUMENT
+            continue
+        seen.add(idref)
+        text = _html_to_text(item.get_body_content())
+        if not text.strip():
+            continue
+        number += 1
+        name = item.get_name()
+        title = titles.get(name) or by_basename.get(os.path.basename(name)) or f"Section {number}"
+        yield {"title": title.strip(), "text": text, "kind": "chapter"}
+
+
+# ---------- PDF ----------
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _pdf_reader(f):
+    try:
+        import PyPDF2
+    except ImportError:
+        raise ImportError("Please install PyPDF2 for PDF support.")
+    return PyPDF2.PdfReader(f)
+
+
+def _extract_pdf_pages(path: str, start: int, end: int) -> list:
+    """Text of pages [start, end); runs in pool workers, so it opens the file itself."""
+    with open(path, "rb") as f:
+        reader = _pdf_reader(f)
+        return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def _read_cached_batch(cache_path: str | None):
+    if not cache_path or not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_cached_batch(cache_path: str | None, pages: list):
+    if not cache_path:
+        return
+    try:
+        tmp = cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(pages, f, ensure_ascii=False)
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        print(f"[ChapterChunker] Could not write PDF text cache {cache_path}: {e}")
+
+
+def iter_pdf_pages(path: str, workers: int | None = None, cache_dir: str | None = None):
+    """
+    Yield (page_number, text) for every page, in order, with bounded memory.
+
+    Pages are extracted in batches of PDF_BATCH_PAGES: in-process for small files, else
+    across a process pool with at most 2 * workers batches in flight. Each batch is cached as
+    JSON under <cache_dir>/pdf_text/<sha256 of the file>/, so re-importing the same file
+    (or resuming an interrupted import) skips extraction. cache_dir defaults to
+    $POLYVOX_CACHE_DIR or output/cache; pass "" to disable caching.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV) or os.path.join("output", "cache")
+    book_cache = None
+    if cache_dir:
+        book_cache = os.path.join(cache_dir, "pdf_text", _file_digest(path))
+        os.makedirs(book_cache, exist_ok=True)
+
+    with open(path, "rb") as f:
+        page_count = len(_pdf_reader(f).pages)
+    batches = [(s, min(s + PDF_BATCH_PAGES, page_count)) for s in range(0, page_count, PDF_BATCH_PAGES)]
+
+    def _cache_path(start):
+        return os.path.join(book_cache, f"{start:06d}.json") if book_cache else None
+
+    if workers is None:
+        workers = max(1, min(8, (os.cpu_count() or 2) - 1))
+    def _cached(start):
+        return book_cache is not None and os.path.exists(_cache_path(start))
+
+    todo = [b for b in batches if not _cached(b[0])]
+    if workers <= 1 or len(todo) * PDF_BATCH_PAGES < PDF_POOL_MIN_PAGES:
+        for start, end in batches:
+            pages = _read_cached_batch(_cache_path(start))
+            if pages is None:
+                pages = _extract_pdf_pages(path, start, end)
+                _write_cached_batch(_cache_path(start), pages)
+            for offset, text in enumerate(pages):
+                yield start + offset + 1, text
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"[ChapterChunker] Extracting {page_count} PDF pages with {workers} worker(s)")
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        pending = deque()
+        queue = iter(batches)
+
+        def _submit_next():
+            for start, end in queue:
+                if _cached(start):
+                    pending.append((start, end, None))
+                else:
+                    pending.append((start, end, pool.submit(_extract_pdf_pages, path, start, end)))
+                return True
+            return False
+
+        while len(pending) < 2 * workers and _submit_next():
+            pass
+        while pending:
+            start, end, future = pending.popleft()
+            if future is None:
+                pages = _read_cached_batch(_cache_path(start))
+                if pages is None:  # unreadable cache file
+                    pages = _extract_pdf_pages(path, start, end)
+                    _write_cached_batch(_cache_path(start), pages)
+            else:
+                pages = future.result()
+                _write_cached_batch(_cache_path(start), pages)
+            _submit_next()
+            for offset, text in enumerate(pages):
+                yield start + offset + 1, text
+
+
+_NUMBER_WORDS = (
+    "one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen"
+    "|sixteen|seventeen|eighteen|nineteen|twenty"
+)
+
+# One pass over the raw text finds every line that could open a chapter. [^\S\n] is
+# "whitespace within the line", so no alternative can run across a line break.
+CHAPTER_MARKER_RX = re.compile(
+    r"^[^\S\n]*(?:"
+    # "CHAPTER 1", "Chapter One", "chapter IV: The Storm" (trailing content allowed)
+    rf"(?P<main>(?i:chapter[^\S\n]+(?:[IVXLCDM]+|\d+|{_NUMBER_WORDS})"
+    r"|part[^\S\n]+(?:[IVXLCDM]+|\d+|one|two|three|four|five)))"
+    # special sections, alone on their line
+    r"|(?P<special>(?i:prologue|epilogue|preface|introduction|foreword|afterword|interlude))[^\S\n]*$"
+    # standalone Roman numerals / numbers: "IV", "12.", "3)"
+    r"|(?P<standalone>(?:[IVXLCDM]{1,8}|\d{1,3})[.):]?)[^\S\n]*$"
+    r")",
+    re.MULTILINE,
+)
+
+
+def iter_chapter_markers(text: str):
+    """
+    Yield (line_start, line_end, title) for each line that opens a chapter, in one linear scan.
+
+    Main/special markers must be under 100 characters; standalone numbers must be under 20
+    and follow an empty line (or they'd catch list items and page numbers).
+    """
+    for m in CHAPTER_MARKER_RX.finditer(text):
+        line_start = m.start()
+        line_end = text.find("\n", line_start)
+        if line_end < 0:
+            line_end = len(text)
+        title = text[line_start:line_end].strip()
+        if m.group("standalone") is not None:
+            if len(title) >= 20 or line_start == 0:
+                continue
+            prev_start = text.rfind("\n", 0, line_start - 1) + 1
+            if text[prev_start:line_start - 1].strip():
+                continue
+        elif len(title) >= 100:
+            continue
+        yield line_start, line_end, title
+
+
 def detect_chapters(text: str, min_chapter_length: int = 100):
     """
     Detect chapters using multiple common formats.
-    Returns list of {"title": str, "text": str, "start_pos": int}
+    Returns list of {"title": str, "text": str, "start": int, "end": int, "start_line": int}
+    where text == source[start:end].
     
     Supported formats:
     - "CHAPTER 1", "CHAPTER ONE", "Chapter 1:", "Chapter I"
@@ -52,110 +317,90 @@ def detect_chapters(text: str, min_chapter_length: int = 100):
     - "Prologue", "Epilogue", "Preface", "Introduction"
     - Numbered sections like "1", "2", "3" when centered or standalone
     """
-    
     chapters = []
-    lines = text.split('\n')
-    
-    # Multiple chapter detection patterns
-    patterns = [
-        # Standard chapter formats (more flexible - matches trailing content)
-        r'^\s*CHAPTER\s+([IVXLCDM]+|\d+|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty)',
-        r'^\s*Chapter\s+([IVXLCDM]+|\d+|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty)',
-        r'^\s*chapter\s+([IVXLCDM]+|\d+|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty)',
-        
-        # Part formats
-        r'^\s*PART\s+([IVXLCDM]+|\d+|one|two|three|four|five)',
-        r'^\s*Part\s+([IVXLCDM]+|\d+|one|two|three|four|five)',
-        
-        # Special sections (exact match)
-        r'^\s*(Prologue|Epilogue|Preface|Introduction|Foreword|Afterword|Interlude)\s*$',
-    ]
-    
-    # Compile all patterns
-    compiled_patterns = [re.compile(p, re.IGNORECASE) for p in patterns]
-    
-    # Special pattern for standalone Roman numerals or numbers (be more careful with these)
-    standalone_patterns = [
-        re.compile(r'^\s*([IVXLCDM]{1,8})[\.\):]?\s*$'),  # Roman numerals I, II, III, etc.
-        re.compile(r'^\s*(\d{1,3})[\.\):]?\s*$'),          # Arabic numbers 1, 2, 3, etc.
-    ]
-    
-    current_chapter = {"title": "Opening", "text": [], "start_line": 0}
-    last_was_empty = False
-    
-    for line_idx, line in enumerate(lines):
-        is_chapter_marker = False
-        chapter_title = None
-        
-        stripped = line.strip()
-        
-        # Skip completely empty lines
-        if not stripped:
-            current_chapter["text"].append(line)
-            last_was_empty = True
-            continue
-        
-        # Check main patterns first
-        for pattern in compiled_patterns:
-            match = pattern.match(stripped)
-            if match:
-                # Length validation: chapter headers are usually short
-                if len(stripped) < 100:
-                    is_chapter_marker = True
-                    chapter_title = stripped
-                    break
-        
-        # Check standalone patterns only if preceded by empty line (more strict)
-        if not is_chapter_marker and last_was_empty and len(stripped) < 20:
-            for pattern in standalone_patterns:
-                match = pattern.match(stripped)
-                if match:
-                    is_chapter_marker = True
-                    chapter_title = stripped
-                    break
-        
-        if is_chapter_marker and len(current_chapter["text"]) > 0:
-            # Save previous chapter if it has content
-            chapter_text = '\n'.join(current_chapter["text"])
-            text_length = len(chapter_text.strip())
-            
-            # Only save if meets minimum length
-            if text_length >= min_chapter_length:
-                chapters.append({
-                    "title": current_chapter["title"],
-                    "text": chapter_text,
-                    "start_line": current_chapter["start_line"]
-                })
-            elif text_length > 0:
-                # If below minimum, might be just whitespace or title page
-                # Include it in next chapter as preamble
-                pass
-            
-            # Start new chapter
-            current_chapter = {
-                "title": chapter_title if chapter_title else f"Chapter {len(chapters) + 1}",
-                "text": [line],
-                "start_line": line_idx
-            }
-        else:
-            current_chapter["text"].append(line)
-        
-        last_was_empty = (not stripped)
-    
-    # Add final chapter
-    if current_chapter["text"]:
-        chapter_text = '\n'.join(current_chapter["text"])
+
+    def _add(title, start, end, start_line):
+        # a chapter runs up to (not including) the newline before the next marker
+        chapter_text = text[start:end]
+        # Only save if meets minimum length; shorter bits (title pages, whitespace) are dropped
         if len(chapter_text.strip()) >= min_chapter_length:
             chapters.append({
-                "title": current_chapter["title"],
+                "title": title,
                 "text": chapter_text,
-                "start_line": current_chapter["start_line"]
+                "start": start,
+                "end": end,
+                "start_line": start_line,
             })
-    
+
+    title, start, start_line = "Opening", 0, 0
+    line_no, counted_to = 0, 0
+    for line_start, _line_end, marker in iter_chapter_markers(text):
+        if line_start == 0:
+            # a marker on the very first line just becomes part of the opening
+            continue
+        line_no += text.count("\n", counted_to, line_start)
+        counted_to = line_start
+        _add(title, start, line_start - 1, start_line)
+        title, start, start_line = marker, line_start, line_no
+
+    _add(title, start, len(text), start_line)
     return chapters
 
 
-def chunk_by_size(text: str, target_chunk_size: int = 50000, overlap: int = 500):
+SENTENCE_END_RX = re.compile(r"[.!?]+\s+")  # rough sentence ends: terminal punctuation + whitespace
+
+
+def iter_sentence_spans(text: str):
+    """Yield (start, end) of each sentence; the whitespace after a sentence belongs to it."""
+    start = 0
+    for m in SENTENCE_END_RX.finditer(text):
+        yield start, m.end()
+        start = m.end()
+    if start < len(text):
+        yield start, len(text)
+
+
+def iter_chunk_spans(text: str, target_chunk_size: int = 50000, overlap_sentences: int = 0):
+    """
+    Yield (start, end) offsets of size-based chunks, cut between sentences.
+
+    A chunk grows sentence by sentence until the next one would take it past
+    target_chunk_size (a single longer sentence still makes a chunk of its own). Each chunk
+    after the first starts with the last overlap_sentences sentences of the one before, but
+    never all of them, so every chunk brings new text. Only offsets are kept, so memory
+    does not grow with the text.
+    """
+    recent = deque(maxlen=max(overlap_sentences, 1))  # starts of the current chunk's own sentences
+    chunk_start, own = None, 0
+    for start, end in iter_sentence_spans(text):
+        if chunk_start is None:
+            chunk_start = start
+        elif end - chunk_start > target_chunk_size and own:
+            yield chunk_start, start
+            keep = min(overlap_sentences, own - 1)
+            chunk_start = recent[-keep] if keep else start
+            recent.clear()
+            own = 0
+        recent.append(start)
+        own += 1
+    if chunk_start is not None:
+        yield chunk_start, len(text)
+
+
+def iter_chunks(text: str, target_chunk_size: int = 50000, overlap_sentences: int = 5):
+    """Lazily yield {"title", "text", "chunk_num", "start", "end"} per size-based chunk."""
+    spans = iter_chunk_spans(text, target_chunk_size, overlap_sentences)
+    for chunk_num, (start, end) in enumerate(spans, 1):
+        yield {
+            "title": f"Section {chunk_num}",
+            "text": text[start:end],
+            "chunk_num": chunk_num,
+            "start": start,
+            "end": end,
+        }
+
+
+def chunk_by_size(text: str, target_chunk_size: int = 50000, overlap_sentences: int = 5):
     """
     Split text into manageable chunks by size when no chapters are detected.
     Uses sentence boundaries to avoid breaking mid-sentence.
@@ -163,59 +408,12 @@ def chunk_by_size(text: str, target_chunk_size: int = 50000, overlap: int = 500)
     Args:
         text: The text to chunk
         target_chunk_size: Target size in characters (default ~50K chars)
-        overlap: Number of characters to overlap between chunks for context
+        overlap_sentences: Sentences repeated from the end of the previous chunk for context
     
     Returns:
-        List of {"title": str, "text": str, "chunk_num": int}
+        List of {"title": str, "text": str, "chunk_num": int, "start": int, "end": int}
     """
-    chunks = []
-    
-    # Split into sentences (rough approximation)
-    sentence_endings = re.compile(r'([.!?]+[\s\n]+)')
-    sentences = sentence_endings.split(text)
-    
-    # Recombine sentences with their punctuation
-    combined_sentences = []
-    for i in range(0, len(sentences) - 1, 2):
-        if i + 1 < len(sentences):
-            combined_sentences.append(sentences[i] + sentences[i + 1])
-        else:
-            combined_sentences.append(sentences[i])
-    
-    current_chunk = []
-    current_length = 0
-    chunk_num = 1
-    
-    for sentence in combined_sentences:
-        sentence_len = len(sentence)
-        
-        if current_length + sentence_len > target_chunk_size and current_chunk:
-            # Save current chunk
-            chunk_text = ''.join(current_chunk)
-            chunks.append({
-                "title": f"Section {chunk_num}",
-                "text": chunk_text,
-                "chunk_num": chunk_num
-            })
-            
-            # Start new chunk with overlap
-            overlap_text = chunk_text[-overlap:] if len(chunk_text) > overlap else chunk_text
-            current_chunk = [overlap_text, sentence]
-            current_length = len(overlap_text) + sentence_len
-            chunk_num += 1
-        else:
-            current_chunk.append(sentence)
-            current_length += sentence_len
-    
-    # Add final chunk
-    if current_chunk:
-        chunks.append({
-            "title": f"Section {chunk_num}",
-            "text": ''.join(current_chunk),
-            "chunk_num": chunk_num
-        })
-    
-    return chunks
+    return list(iter_chunks(text, target_chunk_size, overlap_sentences))
 
 
 def smart_chapter_detection(text: str, min_chapter_length: int = 1000, 
@@ -255,7 +453,9 @@ def smart_chapter_detection(text: str, min_chapter_length: int = 1000,
     for chapter in chapters:
         final_chunks.append({
             "title": chapter["title"],
-            "text": chapter["text"]
+            "text": chapter["text"],
+            "start": chapter["start"],
+            "end": chapter["end"],
         })
         # Just log if chapter is large, but don't split it
         if len(chapter["text"]) > max_chunk_size:
@@ -19,6 +19,7 @@ def merge_attrib_fragments_with_quotes(rows, max_attrib_len=120):
             # Merge with previous quote row
             prev = out.pop() if out else rows[i-1]
             prev["text"] = (prev.get("text", "") + " " + row.get("text", "")).strip()
+            merge_span(prev, (prev, row))
             out.append(prev)
             i += 1
             continue
@@ -33,6 +34,7 @@ def merge_attrib_fragments_with_quotes(rows, max_attrib_len=120):
             # Merge with next quote row
             next_row = rows[i+1]
             next_row["text"] = (row.get("text", "") + " " + next_row.get("text", "")).strip()
+            merge_span(next_row, (row, next_row))
             out.append(next_row)
             i += 2
             continue
@@ -185,10 +187,12 @@ def split_multi_quote_rows(rows):
             log(f"[split_multi] Found {len(matches)} quotes in row with speaker={row.get('speaker')}: {text[:100]}")
         
         # Multiple quotes found - split them and mark to prevent re-merging
+        pos = 0
         for i, match in enumerate(matches):
             new_row = dict(row)
             # Include the quotes in the text
             new_row["text"] = text[match.start():match.end()]
+            pos = split_span(row, new_row, pos)
             # First quote keeps original speaker, others get Unknown
             if i > 0:
                 new_row["speaker"] = "Unknown"
@@ -198,8 +202,8 @@ def split_multi_quote_rows(rows):
             result.append(new_row)
             
             # DEBUG
-            if "Because it" in text or "What?" in text:
-                log(f"[split_multi]   Created row {i}: speaker={new_row['speaker']} _was_multi_span=True text={new_row['text']}")
+            if ("Because it" in text or "What?" in text) and log_enabled(TRACE):
+                log(f"[split_multi]   Created row {i}: speaker={new_row['speaker']} _was_multi_span=True text={new_row['text']}", level=TRACE)
     
     return result
 
@@ -247,13 +251,15 @@ def split_attribution_from_quotes(rows):
             quote_row["text"] = quote_text
             quote_row["speaker"] = speaker
             quote_row["is_quote"] = True
-            result.append(quote_row)
             
             # Create attribution row AFTER (Narrator)
             attrib_row = dict(row)
             attrib_row["text"] = attrib_text
             attrib_row["speaker"] = "Narrator"
             attrib_row["is_quote"] = False
+            # the attribution comes first in the source
+            split_span(row, quote_row, split_span(row, attrib_row))
+            result.append(quote_row)
             result.append(attrib_row)
             continue
         
@@ -276,6 +282,7 @@ def split_attribution_from_quotes(rows):
             quote_row["text"] = quote_text
             quote_row["speaker"] = speaker
             quote_row["is_quote"] = True
+            pos = split_span(row, quote_row)
             result.append(quote_row)
             
             # Create attribution row AFTER (Narrator)
@@ -283,6 +290,7 @@ def split_attribution_from_quotes(rows):
             attrib_row["text"] = attrib_text
             attrib_row["speaker"] = "Narrator"
             attrib_row["is_quote"] = False
+            split_span(row, attrib_row, pos)
             result.append(attrib_row)
             continue
         
@@ -329,6 +337,7 @@ def ensure_strict_quote_narration_separation(rows):
         
         # Process text with quotes - split into narration and dialogue parts
         last_end = 0
+        pos = 0
         
         for match in matches:
             # Text before this quote (narration)
@@ -342,6 +351,7 @@ def ensure_strict_quote_narration_separation(rows):
                 narr_row["speaker"] = "Narrator"
                 narr_row["is_quote"] = False
                 narr_row["text"] = before_text
+                pos = split_span(row, narr_row, pos)
                 result.append(narr_row)
             
             # The quoted text itself (character dialogue)
@@ -356,6 +366,7 @@ def ensure_strict_quote_narration_separation(rows):
                 # Keep original speaker if it exists and isn't Narrator
                 if not quote_row.get("speaker") or quote_row.get("speaker") == "Narrator":
                     quote_row["speaker"] = "Unknown"
+                pos = split_span(row, quote_row, pos)
                 result.append(quote_row)
             
             last_end = quote_end
@@ -367,6 +378,7 @@ def ensure_strict_quote_narration_separation(rows):
             narr_row["speaker"] = "Narrator"
             narr_row["is_quote"] = False
             narr_row["text"] = after_text
+            split_span(row, narr_row, pos)
             result.append(narr_row)
     
     return result
@@ -444,6 +456,7 @@ def finalize_quote_narration_blocks(rows):
                 narr_buffer["is_quote"] = False
             else:
                 narr_buffer["text"] = (narr_buffer.get("text", "") + " " + row.get("text", "")).strip()
+                merge_span(narr_buffer, (narr_buffer, row))
     
     # Flush remaining buffers
     if quote_buffer:
@@ -468,6 +481,7 @@ def _merge_consecutive_narrator_rows(rows):
                 buffer = dict(row)
             else:
                 buffer["text"] = (buffer["text"] + "\n" + (row.get("text") or "")).strip()
+                merge_span(buffer, (buffer, row))
         else:
             if buffer is not None:
                 merged.append(buffer)
@@ -479,9 +493,9 @@ def _merge_consecutive_narrator_rows(rows):
 # Consolidated imports moved here by tools/move_imports_top.py
 import codecs
 import csv
-import datetime
 import difflib
 import html
+import io
 import json
 import math
 import os
@@ -490,11 +504,26 @@ import shutil
 import tempfile
 import time
 import uuid
+import zlib
 from collections import Counter, defaultdict
+from functools import cached_property, lru_cache
 from pathlib import Path
 
+from app.core.attrib_verbs import (
+    CORE_SPEECH_VERBS,
+    FRAGMENT_ATTRIB_VERBS,
+    LOOSE_ATTRIB_VERBS,
+    MULTIWORD_VERB_BASES,
+    STRICT_ATTRIB_VERBS,
+    expand_verb_forms,
+    get_matcher,
+    verb_alternation,
+)
+from app.core import pipeline_log
 from app.core.book_processor import run_book_processor
 from app.core.booknlp_runner import run_booknlp
+from app.core.pipeline_log import DEBUG, TRACE, PipelineLog
+from app.core.source_spans import SourceText, merge_span, place_spans, split_span
 
 
 # ===================== MISCELLANEOUS UTILITIES =====================
@@ -513,7 +542,7 @@ def _glyph_budget(rows):
 
 def _profile(stage_name, fn, rows, output_dir, prefix, *args):
     t0 = time.time()
-    out = fn(rows, *args)
+    out = _place_spans(fn(rows, *args))
     dt = int((time.time() - t0) * 1000)
     trace_stage(stage_name, out, output_dir, prefix, t_ms=dt)
     return out
@@ -524,6 +553,11 @@ def _safe_excerpt(text: str, n: int = 120) -> str:
     return t if len(t) <= n else t[: n - 1] + "…"
 
 
+def _place_spans(rows):
+    """Re-anchor rows a pass rebuilt or re-cut to their source offsets (see app.core.source_spans)."""
+    return place_spans(rows, DBG.get("_source"))
+
+
 def _row_rid(row: dict) -> str:
     """Best-effort row id for logging."""
     if not isinstance(row, dict):
@@ -886,78 +920,24 @@ SHORT_DIALOGUE = {
 MAX_ATTRIB_FRAGMENT_LEN = 120  # characters; keep short tails like "— said Zack."
 MAX_ATTRIB_FRAGMENT_WORDS = 24  # words; longer is probably narration, not a tail
 
-# Build the verb set from your global list if available; else a tight core
-_AF_VERBS = set(globals().get("_ATTRIB_VERBS", [])) or {
-    "said",
-    "says",
-    "ask",
-    "asks",
-    "asked",
-    "reply",
-    "replies",
-    "replied",
-    "answer",
-    "answers",
-    "answered",
-    "called",
-    "yelled",
-    "shouted",
-    "cried",
-    "whispered",
-    "murmured",
-    "muttered",
-    "snapped",
-    "retorted",
-    "laughed",
-    "sobbed",
-    "hissed",
-    "breathed",
-    "noted",
-    "observed",
-    "remarked",
-    "insisted",
-    "countered",
-    "agreed",
-    "warned",
-    "offered",
-    "begged",
-    "demanded",
-    "protested",
-    "announced",
-    "explained",
-    "declared",
-    "continued",
-    "interjected",
-    "interrupted",
-    "conceded",
-    "promised",
-    "pleaded",
-    "went",
-    "went on",
-    "rejoined",
-    "stated",
-}
+# Attribution-fragment verbs; _ensure_attrib_fragment_regexes() widens them once the big lists exist
+_AF_VERBS = set(FRAGMENT_ATTRIB_VERBS)
 
-# Compile the shared patterns only once
-if "_AF_VERB_NAME_RX" not in globals():
-    _AF_VERBS_RX = r"(?:%s)" % "|".join(
-        sorted(map(re.escape, _AF_VERBS), key=len, reverse=True)
-    )
-    _AF_FILLER = (
-        r"(?:\s+(?:[a-z]{1,12}|then|again|softly|quietly|firmly|simply|just)){0,3}"
-    )
-    _AF_PROPER = r"[A-Z][A-Za-z'’\-]+(?:\s+[A-Z][A-Za-z'’\-]+){0,2}"
+# Shared patterns
+_AF_VERBS_RX = verb_alternation(_AF_VERBS)
+_AF_FILLER = r"(?:\s+(?:[a-z]{1,12}|then|again|softly|quietly|firmly|simply|just)){0,3}"
+_AF_PROPER = r"[A-Z][A-Za-z'’\-]+(?:\s+[A-Z][A-Za-z'’\-]+){0,2}"
 
-    # Verb → Name  (e.g., ", said softly John Smith.")
-    _AF_VERB_NAME_RX = re.compile(
-        rf"^[—\-–—,\s]*(?P<verb>{_AF_VERBS_RX}){_AF_FILLER}\s+(?P<who>{_AF_PROPER})[\s,.\-–—:;!?]*$",
-        re.IGNORECASE,
-    )
-    # Name → Verb  (e.g., ", John Smith said softly.")
-    _AF_NAME_VERB_RX = re.compile(
-        rf"^[—\-–—,\s]*(?P<who>{_AF_PROPER})\s+(?P<verb>{_AF_VERBS_RX}){_AF_FILLER}[\s,.\-–—:;!?]*$",
-        re.IGNORECASE,
-    )
+# Verb → Name  (e.g., ", said softly John Smith.")
+_AF_VERB_NAME_RX = re.compile(
+    rf"^[—\-–—,\s]*(?P<verb>{_AF_VERBS_RX}){_AF_FILLER}\s+(?P<who>{_AF_PROPER})[\s,.\-–—:;!?]*$",
+    re.IGNORECASE,
+)
+# Name → Verb  (e.g., ", John Smith said softly.")
+_AF_NAME_VERB_RX = re.compile(
+    rf"^[—\-–—,\s]*(?P<who>{_AF_PROPER})\s+(?P<verb>{_AF_VERBS_RX}){_AF_FILLER}[\s,.\-–—:;!?]*$",
+    re.IGNORECASE,
+)
 
 # --- Canonical character whitelist from characters_simple.json ---
 CANON_WHITELIST = set()
@@ -996,41 +976,52 @@ def _qa_safe_log(msg: str):
 def _qa_stage_snapshot(stage: str, results: list[dict]) -> list[dict]:
     """
     Build a compact snapshot for the evaluator: one dict per row with metrics
-    we care about. Uses existing helpers in your module.
+    we care about (a row's index is its position in the list). Rows unchanged since
+    the previous stage share the previous entry, so a stage costs one list of references
+    plus entries for the rows it changed.
     """
+    prev_cache = DBG.get("_qa_series_cache") or {}
+    cache = {}
     snap = []
     for idx, r in enumerate(results or []):
         txt = r.get("text") or ""
-        tnorm = _norm_unicode_quotes(txt)
-        spans = _quote_spans(tnorm) or []
-        span_cnt = len(spans)
-        glyph_cnt = (
-            tnorm.count("“")
-            + tnorm.count("”")
-            + tnorm.count('"')
-            + tnorm.count("«")
-            + tnorm.count("»")
-        )
-        # 'balanced' means at least one matched span on this row; else 'none'
-        bal = "balanced" if span_cnt > 0 else "none"
         rid = r.get("_rid")
         # Fallback RID so report still renders if upstream didn't assign _rid
         if rid is None:
             rid = f"idx:{idx}"
-        snap.append(
-            {
-                "stage": stage,
+        key = (
+            rid,
+            txt,
+            r.get("speaker") or "",
+            bool(r.get("is_quote")),
+            bool(r.get("_qa_demoted_quote")),
+        )
+        entry = cache.get(key) or prev_cache.get(key)
+        if entry is None:
+            feats = _text_features(txt)
+            tnorm = feats.norm
+            span_cnt = len(feats.spans)
+            glyph_cnt = (
+                tnorm.count("“")
+                + tnorm.count("”")
+                + tnorm.count('"')
+                + tnorm.count("«")
+                + tnorm.count("»")
+            )
+            entry = {
                 "rid": rid,
-                "idx": idx,
-                "is_quote": bool(r.get("is_quote")),
+                "is_quote": key[3],
                 "span_cnt": int(span_cnt),
                 "glyph_cnt": int(glyph_cnt),
-                "bal": bal,
-                "speaker": (r.get("speaker") or ""),
-                "qa_demoted": bool(r.get("_qa_demoted_quote")),
+                # 'balanced' means at least one matched span on this row; else 'none'
+                "bal": "balanced" if span_cnt > 0 else "none",
+                "speaker": key[2],
+                "qa_demoted": key[4],
                 "txt": txt,
             }
-        )
+        cache[key] = entry
+        snap.append(entry)
+    DBG["_qa_series_cache"] = cache
     return snap
 
 
@@ -1068,10 +1059,10 @@ def _qa_emit_quote_report(output_dir: str, prefix: str):
                 "stage\trid\tidx\tis_quote\tspan_cnt\tglyph_cnt\tbal\tspeaker\texcerpt\n"
             )
             for stage, snap in series:
-                for row in snap:
+                for idx, row in enumerate(snap):
                     ex = (row["txt"] or "").replace("\t", " ").replace("\n", "\\n")
                     f.write(
-                        f"{stage}\t{row['rid']}\t{row['idx']}\t{int(row['is_quote'])}\t"
+                        f"{stage}\t{row['rid']}\t{idx}\t{int(row['is_quote'])}\t"
                         f"{row['span_cnt']}\t{row['glyph_cnt']}\t{row['bal']}\t"
                         f"{row['speaker']}\t{ex[:200]}\n"
                     )
@@ -1493,6 +1484,18 @@ HARD_FAIL_ON_QUOTE_LOSS = False  # raise on first suspicious change
 AUTO_RESTORE_ON_QUOTE_LOSS = True  # try to revert to prior text if quotes vanish
 AUDIT_MAX_EXCERPT = 160  # how much text to show in logs
 AUDIT_FILE_BASENAME = ".quote_audit.tsv"  # saved next to other outputs
+AUDIT_SAMPLE_RATE = 1.0  # share of changed RIDs checked per stage (1.0 = all of them)
+AUDIT_SAMPLE_DEFAULT = 0.1  # rate for POLYVOX_QUOTE_AUDIT=sample
+
+# POLYVOX_QUOTE_AUDIT=off | sample | sample:<rate> | full
+_audit_env = os.environ.get("POLYVOX_QUOTE_AUDIT", "").strip().lower()
+if _audit_env == "off":
+    AUDIT_QUOTES = False
+elif _audit_env.startswith("sample"):
+    try:
+        AUDIT_SAMPLE_RATE = float(_audit_env.partition(":")[2] or AUDIT_SAMPLE_DEFAULT)
+    except ValueError:
+        AUDIT_SAMPLE_RATE = AUDIT_SAMPLE_DEFAULT
 
 
 def _qa_log(msg: str):
@@ -1547,84 +1550,105 @@ def _qa_excerpt(t: str):
 
 
 def _qa_assign_row_ids(results):
-    """Ensure each row has a stable _rid."""
+    """Ensure each row has a stable _rid (set in place; split/copied rows inherit it)."""
     rid_counter = DBG.get("_qa_next_rid", 1)
-    out = []
     for r in results:
-        rr = dict(r)
-        if "_rid" not in rr:
-            rr["_rid"] = rid_counter
+        if "_rid" not in r:
+            r["_rid"] = rid_counter
             rid_counter += 1
-        out.append(rr)
     DBG["_qa_next_rid"] = rid_counter
-    return out
+    return results
 
 
 def _qa_snapshot(stage: str, results):
-    """Build a compact snapshot for comparison."""
+    """Build a compact snapshot for comparison.
+
+    Entries are reused from the previous snapshot for rows whose rid, text and speaker
+    are unchanged, so untouched rows cost a dict lookup and keep the same entry object;
+    _qa_changed_rids() relies on that identity to find what a stage changed.
+    """
+    prev_cache = DBG.get("_qa_entry_cache") or {}
+    cache = {}
     snap = []
-    for idx, r in enumerate(results):
+    for r in results:
         txt = r.get("text") or ""
-        isq = bool(looks_like_direct_speech(txt))
-        spans = _quote_spans(_norm_unicode_quotes(txt))
-        counts = _qa_quote_counts(txt)
-        bal = _qa_balance_status(txt)
-        snap.append(
-            {
-                "i": idx,
-                "rid": r.get("_rid"),
-                "is_quote": isq,
-                "span_cnt": len(spans),
-                "glyph_cnt": counts[-1],
-                "bal": bal,
-                "speaker": r.get("speaker") or "",
+        speaker = r.get("speaker") or ""
+        key = (r.get("_rid"), txt, speaker)
+        entry = cache.get(key) or prev_cache.get(key)
+        if entry is None:
+            feats = _text_features(txt)
+            entry = {
+                "rid": key[0],
+                "is_quote": bool(txt) and feats.direct_speech,
+                "span_cnt": len(feats.spans),
+                "glyph_cnt": feats.qa_counts[-1],
+                "bal": feats.balance,
+                "speaker": speaker,
                 "txt": txt,
             }
-        )
+        cache[key] = entry
+        snap.append(entry)
+    DBG["_qa_entry_cache"] = cache
     return snap
 
 
-def _qa_compare(prev_stage: str, prev, stage: str, cur, outdir=None, prefix=""):
+def _qa_group(snap):
+    """rid -> list of that rid's entries, in row order."""
+    groups = {}
+    for entry in snap or ():
+        groups.setdefault(entry.get("rid"), []).append(entry)
+    return groups
+
+
+def _qa_sampled(rid) -> bool:
+    """Whether rid is in the audited sample (stable across stages)."""
+    if AUDIT_SAMPLE_RATE >= 1.0:
+        return True
+    return zlib.crc32(str(rid).encode("utf-8")) % 10000 < AUDIT_SAMPLE_RATE * 10000
+
+
+def _qa_changed_rids(prev_g, cur_g):
+    """RIDs present in both stages whose entries changed (and that are in the sample)."""
+    changed = []
+    for rid, cur_rows in cur_g.items():
+        prev_rows = prev_g.get(rid)
+        if prev_rows is None:
+            continue
+        if len(prev_rows) == len(cur_rows) and all(a is b for a, b in zip(prev_rows, cur_rows)):
+            continue
+        if _qa_sampled(rid):
+            changed.append(rid)
+    return changed
+
+
+def _qa_compare(prev_stage: str, prev, stage: str, cur, outdir=None, prefix="", rids=None, groups=None):
     """
     RID-aware comparison between audit snapshots.
     Flags 'lost_spans' ONLY when a RID that previously had spans now has zero spans across
     ALL of its current rows AND it was not an intentional demotion (_qa_demoted_quote=True).
+    rids limits the check to those RIDs (e.g. the ones a stage changed); groups passes
+    already-built (_qa_group(prev), _qa_group(cur)).
     """
     if not (prev and cur):
         return
 
-    from collections import defaultdict
-
-    def _group(snap):
-        g = defaultdict(list)
-        for row in snap:
-            g[row.get("rid")].append(row)
-        return g
-
-    prev_g = _group(prev)
-    cur_g = _group(cur)
+    prev_g, cur_g = groups or (_qa_group(prev), _qa_group(cur))
+    if rids is None:
+        rids = [rid for rid in prev_g if rid in cur_g]
 
     tsv_path = None
     if outdir:
         tsv_path = os.path.join(outdir, f"{prefix}{AUDIT_FILE_BASENAME}")
 
     def _write_tsv_row(fields):
-        if not tsv_path:
+        # the header comes from _qa_ensure_audit_header at the start of the run
+        if not tsv_path or not pipeline_log.row_tracing():
             return
-        try:
-            exists = os.path.exists(tsv_path)
-            with open(tsv_path, "a", encoding="utf-8") as f:
-                if not exists:
-                    f.write(
-                        "prev_stage\tstage\trid\tissue\tspan_prev\tspan_cur\tglyph_prev\tglyph_cur\tbal_prev\tbal_cur\tisq_prev\tisq_cur\tspeaker_prev\tspeaker_cur\texcerpt_prev\texcerpt_cur\n"
-                    )
-                f.write("\t".join(map(str, fields)) + "\n")
-        except Exception as e:
-            _qa_log(f"tsv write failed: {e}")
+        pipeline_log.get_writer().write(tsv_path, "\t".join(map(str, fields)) + "\n")
 
     lost_spans = lost_glyph = bal_drop = flag_flip = 0
 
-    for rid in set(prev_g.keys()) & set(cur_g.keys()):
+    for rid in rids:
         prev_rows = prev_g[rid]
         cur_rows = cur_g[rid]
 
@@ -1738,55 +1762,55 @@ def _qaudit(stage: str, results, outdir=None, prefix=""):
     # Ensure stable IDs so we can track rows across stages
     results = _qa_assign_row_ids(results)
 
-    # NEW: collect a stage snapshot for the evaluator (RID-aware)
-    try:
-        _qa_collect_stage(stage, results)
-    except Exception as e:
-        _qa_safe_log(f"[qa] collect@{stage} failed: {e}")
+    # Evaluator series (report TSVs only; skipped when row-level tracing is off)
+    if pipeline_log.row_tracing():
+        try:
+            _qa_collect_stage(stage, results)
+        except Exception as e:
+            _qa_safe_log(f"[qa] collect@{stage} failed: {e}")
 
-    # Build the index-aligned audit snapshot for compare/auto-restore
+    # Build the audit snapshot; rows this stage didn't touch keep their entries
     cur = _qa_snapshot(stage, results)
 
-    # Compare to previous snapshot (RID-aware summary + TSV logging)
     prev = DBG.get("_qa_prev_snap")
     prev_stage = DBG.get("_qa_prev_stage", "start")
-    _qa_compare(prev_stage, prev, stage, cur, outdir, prefix)
-
-    # Robust auto-restore by _rid (safer than index-based restore)
-    if AUTO_RESTORE_ON_QUOTE_LOSS and prev:
-        # map current positions by rid
-        cur_pos_by_rid = {r["rid"]: idx for idx, r in enumerate(cur)}
-        prev_by_rid = {r["rid"]: r for r in prev}
-
-        restores = 0
-        for rid, a in prev_by_rid.items():
-            idx = cur_pos_by_rid.get(rid)
-            if idx is None:
-                # row removed/merged; we can't restore it here
-                continue
-            b = cur[idx]
-            # restore only when previous had spans and current has none + glyph drop
-            if (
-                (a["span_cnt"] > 0)
-                and (b["span_cnt"] == 0)
-                and (a["glyph_cnt"] > b["glyph_cnt"])
-            ):
-                try:
-                    results[idx]["text"] = a["txt"]
-                    results[idx]["is_quote"] = a["is_quote"]
-                    restores += 1
-                    _qa_log(f"{stage}: AUTO-RESTORE rid={rid} idx={idx}")
-                except Exception as e:
-                    _qa_log(f"{stage}: restore failed rid={rid} idx={idx}: {e}")
-
-        if restores:
-            # refresh the audit snapshot so the next comparison uses restored text
-            cur = _qa_snapshot(stage + " (restored)", results)
-            # NEW: also collect a post-restore snapshot for the evaluator
-            try:
-                _qa_collect_stage(stage + " (restored)", results)
-            except Exception as e:
-                _qa_safe_log(f"[qa] collect@{stage} (restored) failed: {e}")
+    if prev:
+        # Only RIDs whose rows changed can have lost anything since the last stage
+        prev_g, cur_g = _qa_group(prev), _qa_group(cur)
+        changed = _qa_changed_rids(prev_g, cur_g)
+        DBG["qa_rids_checked"] = DBG.get("qa_rids_checked", 0) + len(changed)
+        _qa_compare(prev_stage, prev, stage, cur, outdir, prefix, rids=changed, groups=(prev_g, cur_g))
+
+        # Robust auto-restore by _rid (safer than index-based restore)
+        if AUTO_RESTORE_ON_QUOTE_LOSS and changed:
+            cur_pos_by_rid = {e["rid"]: idx for idx, e in enumerate(cur)}
+            restores = 0
+            for rid in changed:
+                a = prev_g[rid][-1]
+                idx = cur_pos_by_rid[rid]
+                b = cur[idx]
+                # restore only when previous had spans and current has none + glyph drop
+                if (
+                    (a["span_cnt"] > 0)
+                    and (b["span_cnt"] == 0)
+                    and (a["glyph_cnt"] > b["glyph_cnt"])
+                ):
+                    try:
+                        results[idx]["text"] = a["txt"]
+                        results[idx]["is_quote"] = a["is_quote"]
+                        restores += 1
+                        _qa_log(f"{stage}: AUTO-RESTORE rid={rid} idx={idx}")
+                    except Exception as e:
+                        _qa_log(f"{stage}: restore failed rid={rid} idx={idx}: {e}")
+
+            if restores:
+                # refresh the audit snapshot so the next comparison uses restored text
+                cur = _qa_snapshot(stage + " (restored)", results)
+                if pipeline_log.row_tracing():
+                    try:
+                        _qa_collect_stage(stage + " (restored)", results)
+                    except Exception as e:
+                        _qa_safe_log(f"[qa] collect@{stage} (restored) failed: {e}")
 
     DBG["_qa_prev_snap"] = cur
     DBG["_qa_prev_stage"] = stage
@@ -1827,7 +1851,7 @@ def _metrics(rows):
     total = len(rows)
     qrows = sum(1 for r in rows if r.get("is_quote"))
     narr_has_dq = sum(
-        1 for r in rows if (not r.get("is_quote")) and _has_dq(r.get("text"))
+        1 for r in rows if (not r.get("is_quote")) and row_features(r).dq_count > 0
     )
     unknown_q = sum(
         1
@@ -1837,11 +1861,11 @@ def _metrics(rows):
     narr_q = sum(
         1 for r in rows if r.get("is_quote") and (r.get("speaker") == "Narrator")
     )
-    glyphs = sum(_dq_count(r.get("text")) for r in rows)
+    glyphs = sum(row_features(r).dq_count for r in rows)
     multi_span_quotes = sum(
         1
         for r in rows
-        if r.get("is_quote") and len(_quote_spans_simple(r.get("text"))) > 1
+        if r.get("is_quote") and row_features(r).simple_span_count > 1
     )
     return {
         "rows": total,
@@ -1943,15 +1967,13 @@ def trace_init(output_dir, prefix, rows):
 
 def trace_stage(stage, rows, output_dir, prefix, t_ms=None, sample_limit=12):
     """Record metrics + a few suspicious rows. Returns rows unchanged."""
+    _report_stage(stage)
+    if not pipeline_log.row_tracing():
+        return rows
     m = _metrics(rows)
-    with open(
+    _append_tsv(
         os.path.join(output_dir, f"{prefix}.trace.tsv"),
-        "a",
-        encoding="utf-8",
-        newline="",
-    ) as f:
-        w = csv.writer(f, delimiter="\t")
-        w.writerow(
+        [
             [
                 stage,
                 m["rows"],
@@ -1962,76 +1984,62 @@ def trace_stage(stage, rows, output_dir, prefix, t_ms=None, sample_limit=12):
                 m["multi_span_quote_rows"],
                 t_ms or 0,
             ]
-        )
+        ],
+    )
     # suspects: narration that contains quotes, or quote rows with no glyphs, or narrator as quote
     sus = []
     for i, r in enumerate(rows or []):
         t = (r.get("text") or "").strip()
         if not t:
             continue
-        if (not r.get("is_quote")) and _has_dq(t):
+        dq = _text_features(t).dq_count
+        if (not r.get("is_quote")) and dq > 0:
             sus.append((i, "narr_with_quote_glyph", r))
-        elif r.get("is_quote") and _dq_count(t) == 0:
+        elif r.get("is_quote") and dq == 0:
             sus.append((i, "quote_without_glyph", r))
         elif r.get("is_quote") and (r.get("speaker") == "Narrator"):
             sus.append((i, "quote_speaker_is_narrator", r))
         if len(sus) >= sample_limit:
             break
-    if sus:
-        with open(
-            os.path.join(output_dir, f"{prefix}.suspects.tsv"),
-            "a",
-            encoding="utf-8",
-            newline="",
-        ) as f:
-            w = csv.writer(f, delimiter="\t")
-            for i, reason, r in sus:
-                w.writerow(
-                    [
-                        stage,
-                        i,
-                        reason,
-                        r.get("speaker", ""),
-                        int(bool(r.get("is_quote"))),
-                        (r.get("text") or "")[:180],
-                    ]
-                )
+    _append_tsv(
+        os.path.join(output_dir, f"{prefix}.suspects.tsv"),
+        [
+            [
+                stage,
+                i,
+                reason,
+                r.get("speaker", ""),
+                int(bool(r.get("is_quote"))),
+                (r.get("text") or "")[:180],
+            ]
+            for i, reason, r in sus
+        ],
+    )
     # seams (no behavior change)
-    seam_hits = 0
-    with open(
-        os.path.join(output_dir, f"{prefix}.seams.tsv"),
-        "a",
-        encoding="utf-8",
-        newline="",
-    ) as f:
-        w = csv.writer(f, delimiter="\t")
-        for i, r in enumerate(rows or []):
-            t = r.get("text") or ""
-            if _SEAM_RX.search(t):
-                w.writerow(
-                    [
-                        stage,
-                        i,
-                        r.get("speaker", ""),
-                        int(bool(r.get("is_quote"))),
-                        t[
-                            max(0, _SEAM_RX.search(t).start() - 20) : _SEAM_RX.search(
-                                t
-                            ).end()
-                            + 40
-                        ].replace("\n", " "),
-                    ]
-                )
-                seam_hits += 1
-                if seam_hits >= sample_limit:
-                    break
+    seams = []
+    for i, r in enumerate(rows or []):
+        t = r.get("text") or ""
+        hit = _SEAM_RX.search(t)
+        if hit:
+            seams.append(
+                [
+                    stage,
+                    i,
+                    r.get("speaker", ""),
+                    int(bool(r.get("is_quote"))),
+                    t[max(0, hit.start() - 20) : hit.end() + 40].replace("\n", " "),
+                ]
+            )
+            if len(seams) >= sample_limit:
+                break
+    _append_tsv(os.path.join(output_dir, f"{prefix}.seams.tsv"), seams)
     return rows
 
 
 # Optional lightweight timer wrapper (no kwargs issues)
 def _profile(stage_name, fn, rows, output_dir, prefix, *args):
     t0 = time.time()
-    out = fn(rows, *args)
+    out = _place_spans(fn(rows, *args))
     dt = int((time.time() - t0) * 1000)
     trace_stage(stage_name, out, output_dir, prefix, t_ms=dt)
     return out
@@ -2064,78 +2072,6 @@ MAX_ATTRIB_FRAGMENT_WORDS = 24  # words; longer is probably narration, not a tai
 MAX_ATTRIB_FRAGMENT_LEN = globals().get("MAX_ATTRIB_FRAGMENT_LEN", 120)
 MAX_ATTRIB_FRAGMENT_WORDS = globals().get("MAX_ATTRIB_FRAGMENT_WORDS", 24)
 
-# Build the verb set from your global list if available; else a tight core
-_AF_VERBS = set(globals().get("_ATTRIB_VERBS", [])) or {
-    "said",
-    "says",
-    "ask",
-    "asks",
-    "asked",
-    "reply",
-    "replies",
-    "replied",
-    "answer",
-    "answers",
-    "answered",
-    "called",
-    "yelled",
-    "shouted",
-    "cried",
-    "whispered",
-    "murmured",
-    "muttered",
-    "snapped",
-    "retorted",
-    "laughed",
-    "sobbed",
-    "hissed",
-    "breathed",
-    "noted",
-    "observed",
-    "remarked",
-    "insisted",
-    "countered",
-    "agreed",
-    "warned",
-    "offered",
-    "begged",
-    "demanded",
-    "protested",
-    "announced",
-    "explained",
-    "declared",
-    "continued",
-    "interjected",
-    "interrupted",
-    "conceded",
-    "promised",
-    "pleaded",
-    "went",
-    "went on",
-    "rejoined",
-    "stated",
-}
-
-# Compile the shared patterns only once
-if "_AF_VERB_NAME_RX" not in globals():
-    _AF_VERBS_RX = r"(?:%s)" % "|".join(
-        sorted(map(re.escape, _AF_VERBS), key=len, reverse=True)
-    )
-    _AF_FILLER = (
-        r"(?:\s+(?:[a-z]{1,12}|then|again|softly|quietly|firmly|simply|just)){0,3}"
-    )
-    _AF_PROPER = r"[A-Z][A-Za-z'’\-]+(?:\s+[A-Z][A-Za-z'’\-]+){0,2}"
-
-    # Verb → Name  (e.g., ", said softly John Smith.")
-    _AF_VERB_NAME_RX = re.compile(
-        rf"^[—\-–—,\s]*(?P<verb>{_AF_VERBS_RX}){_AF_FILLER}\s+(?P<who>{_AF_PROPER})[\s,.\-–—:;!?]*$",
-        re.IGNORECASE,
-    )
-    # Name → Verb  (e.g., ", John Smith said softly.")
-    _AF_NAME_VERB_RX = re.compile(
-        rf"^[—\-–—,\s]*(?P<who>{_AF_PROPER})\s+(?P<verb>{_AF_VERBS_RX}){_AF_FILLER}[\s,.\-–—:;!?]*$",
-        re.IGNORECASE,
-    )
 
 
 _KINSHIP = {
@@ -2253,642 +2189,34 @@ def _is_attrib_fragment_local(text: str, max_words: int = 24) -> bool:
 
 
 # Expanded set of common attribution verbs
-_ATTRIB_VERBS = [
-    "said",
-    "asked",
-    "replied",
-    "whispered",
-    "shouted",
-    "cried",
-    "muttered",
-    "continued",
-    "responded",
-    "told",
-    "called",
-    "answered",
-    "added",
-    "hissed",
-    "growled",
-    "yelled",
-    "snapped",
-    "barked",
-    "ordered",
-    "pleaded",
-    "exclaimed",
-    "protested",
-    "remarked",
-    "murmured",
-    "stated",
-    "announced",
-    "insisted",
-    "suggested",
-    "observed",
-    "agreed",
-    "retorted",
-    "inquired",
-    "interjected",
-    "mused",
-    "snorted",
-    "grunted",
-    "explained",
-    "reminded",
-    "nodded",
-    "laughed",
-    "smiled",
-    "grinned",
-    "shrugged",
-    "sneered",
-    "sighed",
-    "rejoined",
-    "countered",
-    "noted",
-    "admitted",
-    "moaned",
-    "clarified",
-    "counseled",
-    "jabbered",
-    "yapped",
-    "refuted",
-    "pondered",
-    "surmised",
-    "verified",
-    "guffawed",
-    "tittered",
-    "avowed",
-    "convinced",
-    "implored",
-    "prodded",
-    "insulted",
-    "provoked",
-    "smirked",
-    "tempted",
-    "grilled",
-    "declared",
-    "maintained",
-    "vowed",
-    "quizzed",
-    "wondered",
-    "hesitated",
-    "warned",
-    "croaked",
-    "heaved",
-    "lisped",
-    "rattled on",
-    "shrilled",
-    "stuttered",
-    "caterwauled",
-    "condemned",
-    "fumed",
-    "raged",
-    "scolded",
-    "snarled",
-    "threatened",
-    "grimaced",
-    "sniffed",
-    "spluttered",
-    "prayed",
-    "squeaked",
-    "worried",
-    "whinged",
-    "cackled",
-    "congratulated",
-    "gushed",
-    "simpered",
-    "whooped",
-    "flattered",
-    "purred",
-    "swooned",
-    "mumbled",
-    "wished",
-    "consoled",
-    "sobbed",
-    "wept",
-    "marveled",
-    "marvelled",
-    "yelped",
-    "yawned",
-    "alliterated",
-    "described",
-    "emphasized",
-    "imitated",
-    "mouthed",
-    "offered",
-    "pressed",
-    "recalled",
-    "remembered",
-    "rhymed",
-    "tried",
-    "accepted",
-    "acknowledged",
-    "affirmed",
-    "assumed",
-    "conferred",
-    "confessed",
-    "confirmed",
-    "justified",
-    "settled",
-    "understood",
-    "undertook",
-    "accused",
-    "bossed",
-    "carped",
-    "censured",
-    "criticized",
-    "gawped",
-    "glowered",
-    "grumbled",
-    "remonstrated",
-    "reprimanded",
-    "scoffed",
-    "seethed",
-    "ticked off",
-    "told off",
-    "upbraided",
-    "contemplated",
-    "addressed",
-    "advertised",
-    "articulated",
-    "bragged",
-    "commanded",
-    "confided",
-    "decided",
-    "dictated",
-    "ended",
-    "exacted",
-    "finished",
-    "informed",
-    "made known",
-    "necessitated",
-    "pointed out",
-    "promised",
-    "reassured",
-    "reported",
-    "specified",
-    "attracted",
-    "requested",
-    "wanted",
-    "beamed",
-    "blurted",
-    "broadcasted",
-    "burst",
-    "cheered",
-    "chortled",
-    "chuckled",
-    "cried out",
-    "crooned",
-    "crowed",
-    "emitted",
-    "giggled",
-    "hollered",
-    "howled",
-    "praised",
-    "preached",
-    "presented",
-    "proclaimed",
-    "professed",
-    "promulgated",
-    "quaked",
-    "ranted",
-    "rejoiced",
-    "roared",
-    "screamed",
-    "shrieked",
-    "swore",
-    "thundered",
-    "trilled",
-    "trumpeted",
-    "vociferated",
-    "wailed",
-    "yawped",
-    "yowled",
-    "cautioned",
-    "shuddered",
-    "trembled",
-    "comforted",
-    "empathized",
-    "invited",
-    "proffered",
-    "released",
-    "volunteered",
-    "advised",
-    "alleged",
-    "appealed",
-    "asserted",
-    "assured",
-    "avered",
-    "beckoned",
-    "begged",
-    "beseeched",
-    "cajoled",
-    "claimed",
-    "conceded",
-    "concluded",
-    "concurred",
-    "contended",
-    "defended",
-    "disposed",
-    "encouraged",
-    "entreated",
-    "held",
-    "hinted",
-    "implied",
-    "importuned",
-    "inclined",
-    "indicated",
-    "pleaded",
-    "postulated",
-    "premised",
-    "presupposed",
-    "stressed",
-    "touted",
-    "vouched for",
-    "wheedled",
-    "chimed in",
-    "circulated",
-    "disseminated",
-    "distributed",
-    "expressed",
-    "made public",
-    "passed on",
-    "publicized",
-    "published",
-    "put forth",
-    "put out",
-    "quipped",
-    "quoted",
-    "reckoned that",
-    "required",
-    "requisitioned",
-    "taunted",
-    "teased",
-    "exposed",
-    "joked",
-    "leered",
-    "lied",
-    "mimicked",
-    "mocked",
-    "agonized",
-    "bawled",
-    "blubbered",
-    "grieved",
-    "groaned",
-    "lamented",
-    "mewled",
-    "mourned",
-    "puled",
-    "denoted",
-    "disclosed",
-    "divulged",
-    "imparted",
-    "proposed",
-    "revealed",
-    "shared",
-    "solicited",
-    "sought",
-    "testified",
-    "transferred",
-    "transmitted",
-    "doubted",
-    "faltered",
-    "fretted",
-    "guessed",
-    "hypothesized",
-    "lilted",
-    "quavered",
-    "queried",
-    "questioned",
-    "speculated",
-    "supposed",
-    "trailed off",
-    "breathed",
-    "choked",
-    "drawled",
-    "echoed",
-    "keened",
-    "panted",
-    "sang",
-    "sniffled",
-    "sniveled",
-    "uttered",
-    "voiced",
-    "whimpered",
-    "whined",
-    "probed",
-    "backtracked",
-    "communicated",
-    "considered",
-    "elaborated",
-    "enunciated",
-    "expounded",
-    "greeted",
-    "mentioned",
-    "orated",
-    "persisted",
-    "predicted",
-    "pronounced",
-    "recited",
-    "reckoned",
-    "related",
-    "slurred",
-    "vocalized",
-    "approved",
-    "bubbled",
-    "chattered",
-    "complimented",
-    "effused",
-    "thanked",
-    "yammered",
-    "apologized",
-    "cursed",
-    "exploded",
-    "screeched",
-    "spat",
-    "bleated",
-    "exhaled",
-    "groused",
-    "gulped",
-    "squalled",
-    "warbled",
-    "bloviated",
-    "exhorted",
-    "gloated",
-    "moralized",
-    "sermonized",
-    "swaggered",
-    "swallowed",
-    "vacillated",
-    "derided",
-    "jeered",
-    "heckled",
-    "lampooned",
-    "parodied",
-    "ridiculed",
-    "satirized",
-    "scorned",
-    "spoofed",
-    "snickered",
-    "challenged",
-    "interrogated",
-    "puzzled",
-    "prattled",
-    "preened",
-    "cooed",
-    "bantered",
-    "blathered",
-    "blithered",
-    "hooted",
-    "jested",
-    "soothed",
-    "chorused",
-    "piped",
-    "yakked",
-    "gurgled",
-    "disparaged",
-    "rejected",
-    "griped",
-    "reproached",
-    "berated",
-    "sassed",
-    "chided",
-    "clucked",
-    "corrected",
-    "rebuffed",
-    "gawked",
-    "spouted",
-    "let slip",
-    "gaped",
-    "ogled",
-    "gasped",
-    "spilled",
-    "blanched",
-    "spooked",
-    "paled",
-    "brooded",
-    "panicked",
-    "tensed",
-    "cowered",
-    "quaked",
-    "cringed",
-    "recoiled",
-    "shivered",
-    "depicted",
-    "elucidated",
-    "defined",
-    "illustrated",
-    "delineated",
-    "portrayed",
-    "returned",
-    "advanced",
-    "corroborated",
-    "posited",
-    "attested",
-    "authenticated",
-    "bespoke",
-    "substantiated",
-    "certified",
-    "critiqued",
-    "gauged",
-    "appraised",
-    "estimated",
-    "assayed",
-    "evaluated",
-    "interpreted",
-    "assessed",
-    "examined",
-    "judged",
-    "explicated",
-    "reviewed",
-    "figured",
-    "surveyed",
-    "adumbrated",
-    "alluded",
-    "connoted",
-    "signaled",
-    "foreshadowed",
-    "insinuated",
-    "signified",
-    "forewarned",
-    "intimated",
-    "heralded",
-    "portended",
-    "adjured",
-    "inspected",
-    "perused",
-    "researched",
-    "explored",
-    "searched",
-    "owned",
-    "recognized",
-    "betrayed",
-    "acquiesced",
-    "bellyached",
-    "bickered",
-    "blabbed",
-    "blabbered",
-    "brayed",
-    "broke in",
-    "coached",
-    "coaxed",
-    "contradicted",
-    "contributed",
-    "deduced",
-    "demurred",
-    "disagreed",
-    "dissented",
-    "dribbled",
-    "droned",
-    "ejaculated",
-    "exulted",
-    "fussed",
-    "gibbered",
-    "gibed",
-    "guaranteed",
-    "harangued",
-    "huffed",
-    "intoned",
-    "joined in",
-    "nattered",
-    "neighed",
-    "nitpicked",
-    "objected",
-    "opined",
-    "pestered",
-    "pled",
-    "pledged",
-    "prated",
-    "resounded",
-    "resumed",
-    "retaliated",
-    "shot",
-    "tattled",
-    "theorized",
-    "toasted",
-    "tutted",
-    "weighed in",
-    "whickered",
-    "whinnied",
-    "brought forth",
-    "denounced",
-    "disrupted",
-    "enjoined",
-    "condescended",
-    "contested",
-    "feared",
-    "foretold",
-    "cracked",
-    "haggled",
-    "hedged",
-    "relented",
-    "petitioned",
-    "inferred",
-    "propounded",
-    "intimidated",
-    "itemized",
-    "proved",
-    "sanctioned",
-    "quibbled",
-    "rambled",
-    "reaffirmed",
-    "reciprocated",
-    "referred",
-    "regretted",
-    "restated",
-    "ruled",
-    "stipulated",
-    "twitted",
-    "whistled",
-    "thought",
-    "wrangled",
-    "went on",
-    "interposed",
-    "urged",
-    "demanded",
-    "began",
-    "spoke up",
-    "went on grimly",
-    "said simply",
-    "said softly",
-]
-
-# ======= VERB REGEX BUILDER  =======
-
-
-# ---- Attribution fragment regexes (single source of truth) -------------------
-def _ensure_attrib_fragment_regexes():
-    """
-    Initializes shared regexes used by _speaker_from_attrib_fragment and
-    _speaker_verb_from_attrib_fragment. Safe to call multiple times.
-    Also aliases _SVAF_* to _AF_* for backward-compatibility.
-
-    Notes:
-      - Rebuilds patterns if the underlying verb list changes (tracked by _AF_VERBS_KEY).
-      - Uses _ATTRIB_VERBS ∪ _MULTIWORD_VERBS_SAFE ∪ _MULTIWORD_VERBS_PREP.
-      - Blocks prepositional objects in VERB→NAME ('said to X', 'yelled at Y').
-    """
-    import re
-
-    global _NAME_RX, _ATTRIB_VERBS_RX_STRICT
-    global _AF_VERB_NAME_RX, _AF_NAME_VERB_RX
-    global _SVAF_VERB_NAME_RX, _SVAF_NAME_VERB_RX
-    global _AF_VERBS_KEY
-
-    proper_token = r"[A-Z][A-Za-z'’\-]+"
-    _NAME_RX = rf"{proper_token}(?:\s+{proper_token}){{0,2}}"
-
-    _verbs_fallback = {
-        "said",
-        "says",
-        "say",
-        "ask",
-        "asks",
-        "asked",
-        "reply",
-        "replies",
-        "replied",
-        "answer",
-        "answers",
-        "answered",
-        "tell",
-        "tells",
-        "told",
-        "called",
-        "yelled",
-        "shouted",
-        "cried",
-        "whispered",
-        "murmured",
-        "muttered",
-        "snapped",
-        "retorted",
-        "laughed",
-        "sobbed",
-        "hissed",
-        "noted",
-        "observed",
-        "remarked",
-        "insisted",
-        "countered",
-        "agreed",
-        "warned",
-        "offered",
-        "begged",
-        "demanded",
-        "protested",
-        "announced",
-        "explained",
-        "declared",
-        "argued",
-        "suggested",
-        "continued",
-        "interjected",
-        "interrupted",
-        "conceded",
-        "promised",
-        "pleaded",
-        "rejoined",
-        "stated",
-        "blurted",
-    }
+_ATTRIB_VERBS = list(LOOSE_ATTRIB_VERBS)
+
+# ======= VERB REGEX BUILDER  =======
+
+
+# ---- Attribution fragment regexes (single source of truth) -------------------
+def _ensure_attrib_fragment_regexes():
+    """
+    Initializes shared regexes used by _speaker_from_attrib_fragment and
+    _speaker_verb_from_attrib_fragment. Safe to call multiple times.
+    Also aliases _SVAF_* to _AF_* for backward-compatibility.
+
+    Notes:
+      - Rebuilds patterns if the underlying verb list changes (tracked by _AF_VERBS_KEY).
+      - Uses _ATTRIB_VERBS ∪ _MULTIWORD_VERBS_SAFE ∪ _MULTIWORD_VERBS_PREP.
+      - Blocks prepositional objects in VERB→NAME ('said to X', 'yelled at Y').
+    """
+    import re
+
+    global _NAME_RX
+    global _AF_VERB_NAME_RX, _AF_NAME_VERB_RX
+    global _SVAF_VERB_NAME_RX, _SVAF_NAME_VERB_RX
+    global _AF_VERBS_KEY
+
+    proper_token = r"[A-Z][A-Za-z'’\-]+"
+    _NAME_RX = rf"{proper_token}(?:\s+{proper_token}){{0,2}}"
+
+    _verbs_fallback = set(CORE_SPEECH_VERBS)
     union = (
         set(globals().get("_ATTRIB_VERBS", []))
         | set(globals().get("_MULTIWORD_VERBS_SAFE", []))
@@ -2904,19 +2232,17 @@ def _ensure_attrib_fragment_regexes():
         return
     _AF_VERBS_KEY = verbs_key
 
-    _ATTRIB_VERBS_RX_STRICT = r"(?:%s)" % "|".join(
-        sorted(map(re.escape, union), key=len, reverse=True)
-    )
+    verbs_rx = verb_alternation(union)
 
     # Filler between verb and name that EXCLUDES prepositions leading to an object (to/at/with/…)
     filler = r"(?:\s+(?!(?:to|at|with|toward|towards|into|onto|upon|of|about)\b)[a-z]{2,12}){0,3}"
 
     _AF_VERB_NAME_RX = re.compile(
-        rf"^[—\-–—,\s]*(?P<verb>{_ATTRIB_VERBS_RX_STRICT}){filler}\s+(?P<who>{_NAME_RX})[\s,.\-–—:;!?]*$",
+        rf"^[—\-–—,\s]*(?P<verb>{verbs_rx}){filler}\s+(?P<who>{_NAME_RX})[\s,.\-–—:;!?]*$",
         re.IGNORECASE,
     )
     _AF_NAME_VERB_RX = re.compile(
-        rf"^[—\-–—,\s]*(?P<who>{_NAME_RX})\s+(?P<verb>{_ATTRIB_VERBS_RX_STRICT}){filler}[\s,.\-–—:;!?]*$",
+        rf"^[—\-–—,\s]*(?P<who>{_NAME_RX})\s+(?P<verb>{verbs_rx}){filler}[\s,.\-–—:;!?]*$",
         re.IGNORECASE,
     )
 
@@ -2924,29 +2250,6 @@ def _ensure_attrib_fragment_regexes():
     _SVAF_NAME_VERB_RX = _AF_NAME_VERB_RX
 
 
-def _verbs_to_regex(verbs_iterable):
-    """
-    Build a regex alternation that:
-      • escapes tokens,
-      • uses \s+ between tokens for multiword phrases,
-      • adds \b word boundaries,
-      • sorts longest-first to avoid shadowing.
-    """
-    parts = []
-    for v in verbs_iterable:
-        v = (v or "").strip()
-        if not v:
-            continue
-        toks = [re.escape(tok) for tok in v.split()]
-        if len(toks) == 1:
-            parts.append(r"\b" + toks[0] + r"\b")
-        else:
-            parts.append(r"\b" + r"\s+".join(toks) + r"\b")
-    # de-dup + sort longest-first
-    parts = sorted(set(parts), key=len, reverse=True)
-    return r"(?:%s)" % "|".join(parts) if parts else r"(?:$a)"  # $a => never matches
-
-
 # Define multiword verb phrases (can be empty; keep conservative to avoid false positives)
 _MULTIWORD_VERBS = list(globals().get("_MULTIWORD_VERBS", [])) or [
     "went on",
@@ -3027,68 +2330,15 @@ def _verbs_union_for_loose():
 
 
 # Conservative fallback in case nothing is defined yet
-_FALLBACK_VERBS = {
-    "said",
-    "says",
-    "say",
-    "ask",
-    "asks",
-    "asked",
-    "reply",
-    "replies",
-    "replied",
-    "answer",
-    "answers",
-    "answered",
-    "tell",
-    "tells",
-    "told",
-    "called",
-    "yelled",
-    "shouted",
-    "cried",
-    "whispered",
-    "murmured",
-    "muttered",
-    "snapped",
-    "retorted",
-    "laughed",
-    "sobbed",
-    "hissed",
-    "noted",
-    "observed",
-    "remarked",
-    "insisted",
-    "countered",
-    "agreed",
-    "warned",
-    "offered",
-    "begged",
-    "demanded",
-    "protested",
-    "announced",
-    "explained",
-    "declared",
-    "argued",
-    "suggested",
-    "continued",
-    "interjected",
-    "interrupted",
-    "conceded",
-    "promised",
-    "pleaded",
-    "rejoined",
-    "stated",
-    "blurted",
-}
+_FALLBACK_VERBS = set(CORE_SPEECH_VERBS)
 
 
 def _make_rx_from_verbs(verbs: set[str] | list[str]) -> str:
     vs = set(verbs) if verbs else set()
     if not vs:
         vs = set(_FALLBACK_VERBS)
-    # Longest-first to prefer multiword phrases
-    return "(?:%s)" % "|".join(sorted(map(re.escape, vs), key=len, reverse=True))
+    # Prefix trie; like a longest-first alternation it prefers multiword phrases
+    return verb_alternation(vs)
 
 
 # Define the loose regex string and keep the legacy alias
@@ -3286,63 +2536,7 @@ def _sanitize_multiword_verb_list(phrases):
 
 # Expand multiword verbs to simple inflections (base/3sg/past with a few irregulars)
 def _expand_multiword_verbs(base_list):
-    import re
-
-    _IRREG_PAST = {
-        "shoot": ["shot"],
-        "spit": ["spat", "spit"],
-        "cut": ["cut"],
-        "shut": ["shut"],
-        "read": ["read"],
-        "ring": ["rang"],
-        "sing": ["sang"],
-        "go": ["went"],
-        "speak": ["spoke"],
-        "tell": ["told"],
-        "say": ["said"],
-        "ask": ["asked"],
-    }
-
-    def _s_form(v):
-        if re.search(r"(s|sh|ch|x|z|o)$", v):
-            return v + "es"
-        if re.search(r"[^aeiou]y$", v):
-            return v[:-1] + "ies"
-        return v + "s"
-
-    def _ed_form(v):
-        if v in _IRREG_PAST:
-            return None
-        if v.endswith("e"):
-            return v + "d"
-        if re.search(r"[^aeiou]y$", v):
-            return v[:-1] + "ied"
-        return v + "ed"
-
-    out, seen = [], set()
-    for phrase in base_list:
-        parts = phrase.split()
-        if not parts:
-            continue
-        head, tail = parts[0], parts[1:]
-        base = head.lower()
-        for word in {head, _s_form(base)}:
-            cand = " ".join([word] + tail)
-            if cand not in seen:
-                seen.add(cand)
-                out.append(cand)
-        for past in _IRREG_PAST.get(base, []):
-            cand = " ".join([past] + tail)
-            if cand not in seen:
-                seen.add(cand)
-                out.append(cand)
-        rpast = _ed_form(base)
-        if rpast:
-            cand = " ".join([rpast] + tail)
-            if cand not in seen:
-                seen.add(cand)
-                out.append(cand)
-    return out
+    return expand_verb_forms(base_list)
 
 
 try:
@@ -3364,95 +2558,13 @@ _ATTRIB_VERBS_LOOSE = list(
 # --- Robust multiword / phrasal dialogue verbs --------------------------------
 # Curated base forms (we auto-expand to past/3sg where sensible).
 # Keep these conservative to avoid false positives on non-speech senses.
-_MULTIWORD_VERBS_BASE = [
-    # back
-    "snap back",
-    "shout back",
-    "yell back",
-    "call back",
-    "shoot back",
-    "fire back",
-    "whisper back",
-    "hiss back",
-    "bark back",
-    # out
-    "blurt out",
-    "call out",
-    "cry out",
-    "yell out",
-    "shout out",
-    "spit out",
-    "bark out",
-    "hiss out",
-    "sing out",
-    # up
-    "speak up",
-    "pipe up",
-    # in
-    "chime in",
-    "butt in",
-    "cut in",
-    "break in",
-    "pipe in",
-    "put in",
-    "jump in",
-    "chip in",
-    "weigh in",
-    # on (continuations)
-    "go on",
-    "carry on",
-    # misc (ring/sing/read... out often mark a loud/clear utterance)
-    "ring out",
-    "read out",
-]
+_MULTIWORD_VERBS_BASE = list(MULTIWORD_VERB_BASES)
 
-# STRICT core for line/tail attribution (kept tight to avoid false positives)
-_ATTRIB_VERBS_STRICT = {
-    "said",
-    "asked",
-    "replied",
-    "told",
-    "added",
-    "explained",
-    "continued",
-    "went on",
-    "murmured",
-    "whispered",
-    "yelled",
-    "shouted",
-    "cried",
-    "called",
-    "answered",
-    "retorted",
-    "insisted",
-    "agreed",
-    "warned",
-    "demanded",
-    "begged",
-    "protested",
-    "announced",
-    "declared",
-    "stated",
-    "remarked",
-    "observed",
-    "suggested",
-    "interjected",
-    "interrupted",
-    "rejoined",
-    "pleaded",
-    "inquired",
-    "admitted",
-    "noted",
-    "joked",
-    "quipped",
-}
-# Keep only items that really exist in LOSE (plus multi-words)
+# STRICT core for line/tail attribution, limited to verbs the LOOSE list (or a multiword verb) has
 _ATTRIB_VERBS_STRICT = {
-    v
-    for v in _ATTRIB_VERBS_STRICT
-    if (v in _ATTRIB_VERBS_LOOSE) or (v in _MULTIWORD_VERBS)
+    v for v in STRICT_ATTRIB_VERBS if (v in _ATTRIB_VERBS_LOOSE) or (v in _MULTIWORD_VERBS)
 }
-_ATTRIB_VERBS_RX_STRICT = _verbs_to_regex(_ATTRIB_VERBS_STRICT)
+_ATTRIB_VERBS_RX_STRICT = r"(?:\b%s\b)" % get_matcher(_ATTRIB_VERBS_STRICT).pattern
 
 # For compatibility with the rest of your code:
 #  - Use the LOOSE set where you previously used _VERBS_RX (broad checks)
@@ -4661,168 +3773,109 @@ NAME_STOPWORDS = {
 STRICT_DIALOGUE_RULE = False
 ADDRESS_HEURISTIC = True  # enable the “mention name ⇒ other speaker” rule
 ADDRESS_WINDOW = 5  # how many quoted lines around to search for the other speaker
-SHORT_QUOTE_MAX_CHARS = (
-    80  # treat short quotes as replies (e.g., “Yes, your life is ruined.”)
-)
-ECHO_MIN_OVERLAP = 0.35  # Jaccard overlap of content words to treat as an echo
-UNKNOWN_SPEAKER = "Unknown"  # used when a quoted line has no reliable speaker
-FINALIZE_TRUST_QSCORE = (
-    0.65  # if a quote matched .quotes this well, prefer keeping its speaker
-)
-
-# ---- Atomic quotes mode: never break / demote quoted text ----
-QUOTES_ARE_ATOMIC = True  # hard "do not split quote rows"
-GLUE_DANGLING_TO_NEXT = False  # optional: if a quote opens but doesn’t close, glue the next short non-quote line
-MAX_GLUE_TAIL_CHARS = 80  # safety cap for the glue step
-
-
-# --- Quote detection settings (must exist before runtime uses of _quote_spans) ---
-if "MIN_QUOTE_CHARS" not in globals():
-    MIN_QUOTE_CHARS = 1  # allow very short quotes like "No."
-
-# If you already define these elsewhere, keep only one definition.
-if "OPEN_Q" not in globals():
-    OPEN_Q = {"“", '"', "‘"}
-if "CLOSE_Q" not in globals():
-    CLOSE_Q = {"”", '"', "’"}
-
-# (Optional) unify if you use QUOTE_CHARS in other helpers
-if "QUOTE_CHARS" not in globals():
-    QUOTE_CHARS = OPEN_Q | CLOSE_Q
-
-
-# --- Logging Setup ---
-def get_log_path():
-    log_dir = os.path.join("output", "logs")
-    os.makedirs(log_dir, exist_ok=True)
-    run_id = uuid.uuid4().hex[:8]
-    return os.path.join(log_dir, f"character_detection_{run_id}.log")
-
-
-LOG_PATH = get_log_path()
-
-
-def log(msg: str):
-    """Append debug info to the log file."""
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] {msg}\n")
-
-
-def _explicit_name_from_any(text: str):
-    m = _ATTRIB_LINE_RX.match((text or "").strip())
-    if not m:
-        return None
-    name = m.group("name1") or m.group("name2")
-    return normalize_name(name).title() if name else None
-
-
-# === Speaker extractor for your attribution fragment detector ===
-# Minimal core in case _ATTRIB_VERBS isn't populated yet
-CORE_ATTRIB_VERBS = {
-    "said",
-    "says",
-    "ask",
-    "asks",
-    "asked",
-    "reply",
-    "replies",
-    "replied",
-    "answer",
-    "answers",
-    "answered",
-    "added",
-    "add",
-    "adds",
-    "yell",
-    "yells",
-    "yelled",
-    "shout",
-    "shouts",
-    "shouted",
-    "cry",
-    "cries",
-    "cried",
-    "whisper",
-    "whispers",
-    "whispered",
-    "murmur",
-    "murmurs",
-    "murmured",
-    "mutter",
-    "mutters",
-    "muttered",
-    "remark",
-    "remarks",
-    "remarked",
-    "observe",
-    "observes",
-    "observed",
-    "state",
-    "states",
-    "stated",
-    "declare",
-    "declares",
-    "declared",
-    "insist",
-    "insists",
-    "insisted",
-    "explain",
-    "explains",
-    "explained",
-    "retort",
-    "retorts",
-    "retorted",
-    "warn",
-    "warns",
-    "warned",
-    "agree",
-    "agrees",
-    "agreed",
-    "interject",
-    "interjects",
-    "interjected",
-    "interrupt",
-    "interrupts",
-    "interrupted",
-    "continue",
-    "continues",
-    "continued",
-    "went on",
-    "go on",
-    "goes on",
-}
+SHORT_QUOTE_MAX_CHARS = (
+    80  # treat short quotes as replies (e.g., “Yes, your life is ruined.”)
+)
+ECHO_MIN_OVERLAP = 0.35  # Jaccard overlap of content words to treat as an echo
+UNKNOWN_SPEAKER = "Unknown"  # used when a quoted line has no reliable speaker
+FINALIZE_TRUST_QSCORE = (
+    0.65  # if a quote matched .quotes this well, prefer keeping its speaker
+)
 
-# If you already defined _ATTRIB_VERBS (your big list), this will use it.
-try:
-    _ATTRIB_VERBS  # may exist
-except NameError:
-    _ATTRIB_VERBS = set()
+# ---- Atomic quotes mode: never break / demote quoted text ----
+QUOTES_ARE_ATOMIC = True  # hard "do not split quote rows"
+GLUE_DANGLING_TO_NEXT = False  # optional: if a quote opens but doesn’t close, glue the next short non-quote line
+MAX_GLUE_TAIL_CHARS = 80  # safety cap for the glue step
 
-# Strict verb regex (supports multi-word verbs; longest first to avoid substrings)
-_VERB_SET_FOR_RX = _ATTRIB_VERBS or CORE_ATTRIB_VERBS
-_ATTRIB_VERBS_RX_STRICT = r"(?:%s)" % "|".join(
-    sorted(map(re.escape, _VERB_SET_FOR_RX), key=len, reverse=True)
-)
 
-# Proper-name: 1–3 capitalized tokens
-_NAME_RX = r"[A-Z][A-Za-z'’\-]+(?:\s+[A-Z][A-Za-z'’\-]+){0,2}"
+# --- Quote detection settings (must exist before runtime uses of _quote_spans) ---
+if "MIN_QUOTE_CHARS" not in globals():
+    MIN_QUOTE_CHARS = 1  # allow very short quotes like "No."
 
-# Allow up to 3 adverbs/fillers after the verb
-_AF_FILLER = r"(?:\s+(?:\w+ly|then|again|softly|quietly|firmly|evenly|calmly|angrily|sharply|dryly|simply)){0,3}"
+# If you already define these elsewhere, keep only one definition.
+if "OPEN_Q" not in globals():
+    OPEN_Q = {"“", '"', "‘"}
+if "CLOSE_Q" not in globals():
+    CLOSE_Q = {"”", '"', "’"}
 
-# Verb → Name  (e.g., ", said softly John Smith.")
-_AF_VERB_NAME_RX = re.compile(
-    rf"^[—\-–—,\s]*(?P<verb>{_ATTRIB_VERBS_RX_STRICT}){_AF_FILLER}\s+(?P<who>{_NAME_RX})[\s,.\-–—:;!?]*$",
-    re.IGNORECASE,
-)
+# (Optional) unify if you use QUOTE_CHARS in other helpers
+if "QUOTE_CHARS" not in globals():
+    QUOTE_CHARS = OPEN_Q | CLOSE_Q
 
-# Name → Verb  (e.g., ", John Smith said softly.")
-_AF_NAME_VERB_RX = re.compile(
-    rf"^[—\-–—,\s]*(?P<who>{_NAME_RX})\s+(?P<verb>{_ATTRIB_VERBS_RX_STRICT}){_AF_FILLER}[\s,.\-–—:;!?]*$",
-    re.IGNORECASE,
-)
-_AF_VERBS_RX = _ATTRIB_VERBS_RX_STRICT  # backwards-compat alias
+
+# --- Logging Setup ---
+def get_log_path():
+    log_dir = os.path.join("output", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    run_id = uuid.uuid4().hex[:8]
+    return os.path.join(log_dir, f"character_detection_{run_id}.log")
+
+
+LOG_PATH = get_log_path()
+_LOG = PipelineLog(LOG_PATH)
+
+
+def log(msg: str, *args, level: int = DEBUG):
+    """Queue a line for the log file (written by the pipeline_log background thread).
+
+    With args, msg is %-formatted only if the level is enabled; guard loops that build
+    per-row messages with log_enabled().
+    """
+    _LOG.log(msg, *args, level=level)
+
+
+def log_enabled(level: int = DEBUG) -> bool:
+    return pipeline_log.enabled(level)
+
+
+def _tsv_line(fields) -> str:
+    buf = io.StringIO()
+    csv.writer(buf, delimiter="\t").writerow(fields)
+    return buf.getvalue()
+
+
+def _append_tsv(path: str, rows):
+    """Queue TSV rows for path on the background writer."""
+    text = "".join(_tsv_line(fields) for fields in rows)
+    if text:
+        pipeline_log.get_writer().write(path, text)
+
+
+# --- Run progress / cancellation ---
+class AttributionCancelled(BaseException):
+    """Raised out of run_attribution when its cancel_event is set.
+
+    Derives from BaseException so the many defensive ``except Exception`` blocks in the
+    passes don't swallow it.
+    """
+
+
+# Set for the duration of a run_attribution call (the pipeline is module-global, one run at a time)
+_RUN_PROGRESS = None
+_RUN_CANCEL = None
+
+
+def _report_stage(stage: str):
+    """Tell the caller which stage just finished, or stop the run if it was cancelled."""
+    if _RUN_CANCEL is not None and _RUN_CANCEL.is_set():
+        raise AttributionCancelled(stage)
+    if _RUN_PROGRESS is not None:
+        try:
+            _RUN_PROGRESS(stage)
+        except Exception as e:
+            log(f"[progress] callback failed at '{stage}': {e}")
+
+
+def _explicit_name_from_any(text: str):
+    m = _ATTRIB_LINE_RX.match((text or "").strip())
+    if not m:
+        return None
+    name = m.group("name1") or m.group("name2")
+    return normalize_name(name).title() if name else None
+
+
+# Proper-name: 1–3 capitalized tokens
+_NAME_RX = r"[A-Z][A-Za-z'’\-]+(?:\s+[A-Z][A-Za-z'’\-]+){0,2}"
 
 
 def _speaker_from_attrib_fragment(text: str, alias_inv: dict | None = None):
@@ -5002,7 +4055,7 @@ def _looks_like_attribution_fragment(text: str) -> bool:
         "said simply",
         "said softly",
     }
-    vpat = r"(?:%s)" % "|".join(sorted(map(re.escape, verbs), key=len, reverse=True))
+    vpat = verb_alternation(verbs)
 
     # Proper with optional possessive/modifier (his/her/their)
     modifier = r"(?:his|her|their|the)\s+"
@@ -5030,7 +4083,7 @@ def _looks_like_attribution_fragment(text: str) -> bool:
     # No separate action_rx needed now
 
     # Disqualify too many commas without verb
-    if t.count(",") >= 2 and not re.search(rf"\b{vpat}\b", t, re.IGNORECASE):
+    if t.count(",") >= 2 and not get_matcher(verbs).search(t):
         return False
 
     return bool(head_tail_rx.match(t))
@@ -5447,12 +4500,12 @@ _NAME_RX = r"[A-Z][\w'\-]+(?:\s+[A-Z][\w'\-]+){0,2}"
 
 # verb-first end-of-sentence: "… explained Smith."
 _ATTRIB_NARR_RX = re.compile(
-    rf'\b(?:{ "|".join(re.escape(v) for v in _ATTRIB_VERBS_COMMON) })\b\s+{_NAME_RX}\s*[.!?]$',
+    rf'\b(?:{verb_alternation(_ATTRIB_VERBS_COMMON)})\b\s+{_NAME_RX}\s*[.!?]$',
     re.IGNORECASE,
 )
 # name-first end-of-sentence: "… Smith nodded."
 _NAME_FIRST_BEAT_RX = re.compile(
-    rf'\b{_NAME_RX}\s+\b(?:{ "|".join(re.escape(v) for v in (_ATTRIB_VERBS_COMMON + _ACTION_VERBS_COMMON)) })\b\s*[.!?]$',
+    rf'\b{_NAME_RX}\s+\b(?:{verb_alternation(_ATTRIB_VERBS_COMMON + _ACTION_VERBS_COMMON)})\b\s*[.!?]$',
     re.IGNORECASE,
 )
 
@@ -5694,29 +4747,6 @@ def _edge_peel_pass_inplace(results, alias_inv):
     return results
 
 
-def _reassert_quote_flags_inplace(results):
-    """
-    If a row has any real quote span, force is_quote=True.
-    This collapses residual bleed where a narrator row still contains quotes.
-    """
-    if not results:
-        return results
-    changes = 0
-    out = results
-    for r in out:
-        t = _norm_unicode_quotes(r.get("text") or "")
-        spans = _quote_spans(t)
-        if spans and not r.get("is_quote", False):
-            r["is_quote"] = True
-            changes += 1
-    try:
-        DBG.setdefault("reassert_flag_changes", 0)
-        DBG["reassert_flag_changes"] += changes
-    except Exception:
-        pass
-    return out
-
-
 def _split_results_on_multiple_quote_spans(rows, alias_inv=None):
     """
     Split any row that contains >1 opening→closing quote spans into alternating
@@ -5737,7 +4767,7 @@ def _split_results_on_multiple_quote_spans(rows, alias_inv=None):
 
     for r in rows:
         base = dict(r)
-        t_norm = _norm_unicode_quotes(base.get("text") or "")
+        t_norm = _text_features(base.get("text") or "").norm
         spans = _quote_spans_balanced(t_norm)
 
         # 0 or 1 span → passthrough
@@ -6139,9 +5169,7 @@ _LEAD_ATTRIB_VERBS = [
     "said simply",
     "said softly",
 ]
-_LEAD_ATTRIB_VERBS_RX = r"(?:%s)" % "|".join(
-    re.escape(v) for v in sorted(set(_LEAD_ATTRIB_VERBS), key=len, reverse=True)
-)
+_LEAD_ATTRIB_VERBS_RX = verb_alternation(_LEAD_ATTRIB_VERBS)
 _LEAD_NAME_RX = r"[A-Z][\w'\-]+(?:\s+[A-Z][\w'\-]+){0,2}"
 
 _LEADING_ATTRIB_RXES = [
@@ -6897,9 +5925,7 @@ def _split_midquote_attrib_clauses_early(rows, *_args):
         pass
 
     # sort longest-first to keep multiword verbs like "went on" intact
-    vpat = r"(?:%s)" % "|".join(
-        sorted(map(re.escape, base_verbs), key=len, reverse=True)
-    )
+    vpat = verb_alternation(base_verbs)
 
     # Tail starts with optional punctuation, then one of:
     #   Name-first:  Smith said ...
@@ -7162,7 +6188,7 @@ def _final_peel_narration_from_quotes(rows: list[dict]) -> list[dict]:
             out.append(rr)
             continue
 
-        txt = _norm_unicode_quotes(rr.get("text") or "")
+        txt = _text_features(rr.get("text") or "").norm
 
         # --- NEW: skip peel when quotes are unbalanced (open monologue line) ---
         try:
@@ -7702,73 +6728,6 @@ def _promote_pre_quote_attrib(rows, *_args):
     return out
 
 
-def _debug_assert_noquote_text_marked_quote(rows):
-    for i, r in enumerate(rows):
-        t = r.get("text") or ""
-        if r.get("is_quote") and not _has_any_quote_char(t):
-            log(
-                f"[debug-noquote-marked-quote] idx={i} speaker={r.get('speaker')} >>> {t[:90]}..."
-            )
-    return rows
-
-
-def _reassert_quote_flags_strict(results):
-    """
-    Strictly recompute is_quote from glyph spans, BUT preserve only very specific
-    promotions that are intended to be “dialogue with no visible glyphs”.
-    Never preserve the generic _promoted_quote flag, and NEVER leave Narrator as quote.
-    """
-    if not results:
-        return results
-
-    def _has_quote_span(txt: str) -> bool:
-        try:
-            return bool(_quote_spans(_norm_unicode_quotes(txt or "")))
-        except Exception:
-            return False
-
-    # Only these promotions deserve preservation as dialogue-without-glyphs
-    # (they come from deliberate pre/post/triplet promotions):
-    PRESERVE_KEYS = (
-        "_post_quote_promoted",
-        "_pre_quote_promoted",
-        "_attrib_triplet_promoted",
-        "_midquote_tail_promoted",  # keep only if you truly want tails as dialogue
-    )
-
-    out = []
-    for r in results:
-        rr = dict(r)
-        txt = rr.get("text") or ""
-
-        has_spans = _has_quote_span(txt)
-        preserve = any(rr.get(k) for k in PRESERVE_KEYS)
-
-        if has_spans:
-            rr["is_quote"] = True
-            # quotes can’t be Narrator unless explicitly locked on purpose
-            if rr.get("speaker") == "Narrator" and not rr.get("_lock_speaker"):
-                rr["speaker"] = "Unknown"
-        elif preserve:
-            # preserved promotions ≠ Narrator
-            rr["is_quote"] = True
-            if rr.get("speaker") == "Narrator" and not rr.get("_lock_speaker"):
-                rr["speaker"] = "Unknown"
-        else:
-            # no glyphs and no special promotion → narration
-            rr["is_quote"] = False
-            if rr.get("speaker") not in (
-                None,
-                "",
-                "Unknown",
-                "Narrator",
-            ) and not rr.get("_lock_speaker"):
-                rr["speaker"] = "Narrator"
-
-        out.append(rr)
-    return out
-
-
 def _looks_like_direct_speech_strict(text: str) -> bool:
     """
     Very strict: return True only if there is an actual quoted span,
@@ -8175,9 +7134,7 @@ def attach_inline_attrib_to_adjacent_unknown(results, *args, **kwargs):
         or set(globals().get("_ATTRIB_VERBS", []))
         or _verbs_fallback
     )
-    vpat = r"\b(?:%s)\b" % "|".join(
-        sorted(map(re.escape, verbs), key=len, reverse=True)
-    )
+    vpat = r"\b%s\b" % verb_alternation(verbs)
 
     # permissive filler: up to 3 small words (pronouns/preps/adverbs), and an optional 'in a/the …' adjunct
     FILLER = (
@@ -8491,7 +7448,7 @@ def _fix_lonely_quote_rows(rows: list[dict]) -> list[dict]:
     i = 0
     while i < n:
         cur = dict(rows[i])
-        t = _norm_unicode_quotes(cur.get("text") or "").strip()
+        t = _text_features(cur.get("text") or "").norm.strip()
         if t in ('""', "“”"):
             prev_is_speech = bool(out) and looks_like_direct_speech(
                 out[-1].get("text") or ""
@@ -8789,9 +7746,7 @@ def _demote_quoted_action_sentences(results):
         "cleared",
         "coughed",
     }
-    _VERB = r"(?:%s)" % "|".join(
-        sorted(map(re.escape, ACTION_VERBS), key=len, reverse=True)
-    )
+    _VERB = verb_alternation(ACTION_VERBS)
     _NAME = r"[A-Z][A-Za-z'’\-]+(?:\s+[A-Z][A-Za-z'’\-]+){0,2}"
     RX = re.compile(rf'^\s*[“"]\s*(?:{_NAME})\s+{_VERB}\b[^“”"]*[.!?””"]\s*[”"]\s*$')
 
@@ -8810,7 +7765,7 @@ def _demote_quoted_action_sentences(results):
         if any(row.get(k) for k in PRESERVE_KEYS):
             continue  # <-- critical: don’t undo our promotions
 
-        t = _norm_unicode_quotes(row.get("text") or "")
+        t = _text_features(row.get("text") or "").norm
         if RX.match(t):
             old = row.get("speaker")
             row["is_quote"] = False
@@ -9066,7 +8021,7 @@ def _demote_nonquote_character_rows(rows):
         txt = rr.get("text") or ""
 
         # Authoritative span check (normalize first, then detect)
-        has_span = bool(_quote_spans(_norm_unicode_quotes(txt)))
+        has_span = bool(_text_features(txt).spans)
 
         if not has_span:
             sp = (rr.get("speaker") or "").strip()
@@ -9169,7 +8124,7 @@ def _final_resplit_multiquote_rows(rows):
     out = []
     resplit = 0
     for r in rows:
-        t = _norm_unicode_quotes(r.get("text") or "")
+        t = _text_features(r.get("text") or "").norm
         spans = _quote_spans(t) if r.get("is_quote") else []
         if len(spans) > 1:
             splitted = _split_results_on_multiple_quote_spans([r])
@@ -9413,7 +8368,7 @@ def _force_split_adjacent_quotes(results):
     splits = 0
 
     for r in results:
-        t = _norm_unicode_quotes(r.get("text") or "")
+        t = _text_features(r.get("text") or "").norm
         if not r.get("is_quote") or not t:
             out.append(r)
             continue
@@ -9477,12 +8432,12 @@ def _repair_empty_quote_followed_by_speech(rows):
 
     while i < n:
         cur = dict(rows[i])
-        tcur = _norm_unicode_quotes(cur.get("text") or "").strip()
+        tcur = _text_features(cur.get("text") or "").norm.strip()
         if cur.get("is_quote") and tcur in ('""', "“”"):
             # Prefer to promote the *next* row when it looks like speech content
             if i + 1 < n:
                 nxt = dict(rows[i + 1])
-                tnxt = _norm_unicode_quotes(nxt.get("text") or "").strip()
+                tnxt = _text_features(nxt.get("text") or "").norm.strip()
                 if tnxt and nxt.get("speaker") == "Narrator":
                     # Promote next row to a quoted row
                     if not (tnxt.startswith('"') or tnxt.startswith("“")):
@@ -9519,7 +8474,7 @@ def _rehydrate_quote_rows_without_spans(rows):
     for r in rows or []:
         rr = dict(r)
         if rr.get("is_quote") and not _quote_spans(
-            _norm_unicode_quotes(rr.get("text") or "", keep_curly=True)
+            _text_features(rr.get("text") or "").norm_curly
         ):
             s = (rr.get("text") or "").strip()
             if s and s not in ('""', "“”"):
@@ -9569,7 +8524,7 @@ def _propagate_quote_context(rows):
 
     for r in rows:
         rr = dict(r)
-        t = _norm_unicode_quotes(rr.get("text") or "")
+        t = _text_features(rr.get("text") or "").norm
         is_q = looks_like_direct_speech(t)
 
         if is_q:
@@ -9617,7 +8572,7 @@ def _apply_name_colon_rule(rows, alias_inv):
     out = []
     n = len(rows)
     for i, r in enumerate(rows):
-        t = _norm_unicode_quotes(r.get("text") or "")
+        t = _text_features(r.get("text") or "").norm
         m = _NAME_COLON_RX.match(t)
         if not m:
             out.append(r)
@@ -9707,7 +8662,6 @@ def trace_note(stage: str, msg: str) -> None:
     """
     Lightweight trace line. Writes to log and <prefix>.stage_stats.tsv if trace_init ran.
     """
-    import csv
     import os
 
     # log
@@ -9720,10 +8674,9 @@ def trace_note(stage: str, msg: str) -> None:
     try:
         outdir = DBG.get("_trace_outdir")
         pref = DBG.get("_trace_prefix")
-        if outdir and pref:
+        if outdir and pref and pipeline_log.row_tracing():
             p = os.path.join(outdir, f"{pref}.stage_stats.tsv")
-            with open(p, "a", encoding="utf-8", newline="") as f:
-                csv.writer(f, delimiter="\t").writerow([stage, "NOTE", msg])
+            _append_tsv(p, [[stage, "NOTE", msg]])
     except Exception as e:
         try:
             log(f"[trace-note] write-failed: {e}")
@@ -9859,7 +8812,7 @@ def _split_inline_tail_attrib_in_quotes(rows, *args):
         or set(globals().get("_ATTRIB_VERBS", []))
         or _verbs_fallback
     )
-    vpat = r"(?:%s)" % "|".join(sorted(map(re.escape, verbs), key=len, reverse=True))
+    vpat = verb_alternation(verbs)
 
     # Proper names or pronouns (no change)
     proper = r"(?:[A-Z][A-Za-z'’\-]+(?:\s+[A-Z][A-Za-z'’\-]+){0,2}|he|she|they|we|i|him|her|them|He|She|They|We|I)"
@@ -10100,7 +9053,7 @@ def _demote_misquoted_attrib_rows(results):
         "announced",
         "groaned",
     }
-    vpat = r"(?:%s)" % "|".join(sorted(map(re.escape, verbs)))
+    vpat = verb_alternation(verbs)
     RX_QATTR = re.compile(
         rf'^\s*["“]\s*(?:{vpat})\s+{proper}\s*[.!?]?\s*["”]\s*$', re.IGNORECASE
     )
@@ -10171,16 +9124,6 @@ def _demote_misquoted_attrib_rows(results):
     return out
 
 
-def _debug_assert_quote_flag_consistency(rows):
-    for i, r in enumerate(rows):
-        t = r.get("text") or ""
-        if any(q in t for q in ('"', "“", "”", "‘", "’")) and not r.get("is_quote"):
-            log(
-                f"[debug-quote-flag] idx={i} has quote char but is_quote=False | {t[:80]}…"
-            )
-    return rows
-
-
 def _two_party_fill_unknowns(results):
     """If a quoted line is Unknown and flanked by two different speakers in quoted lines, fill with the next speaker."""
     if not results:
@@ -10725,7 +9668,14 @@ def looks_like_direct_speech(txt: str) -> bool:
     Strict dialogue detector:
       • must contain at least one balanced opener→closer span
       • ignore leading/trailing narrator junk when counting
+    (memoized per text, see _TextFeatures)
     """
+    if not txt:
+        return False
+    return _text_features(txt).direct_speech
+
+
+def _looks_like_direct_speech_uncached(txt: str) -> bool:
     if not txt:
         return False
     s = _norm_unicode_quotes(txt, keep_curly=True)
@@ -11153,7 +10103,7 @@ def _finalize_speakers(results):
         return next(iter(cands)) if len(cands) == 1 else None
 
     for r in results:
-        txt = _norm_unicode_quotes(r.get("text") or "")
+        txt = _text_features(r.get("text") or "").norm
         
         # Apply normalize_name to detect descriptive speakers FIRST
         # This catches speakers like "A Police Dispatcher In...", but preserves "The Guard"
@@ -12539,8 +11489,8 @@ _SPEECH_VERBS_SET = {
     "promised",
 }
 
-# Build the regex alternation once (sorted for deterministic pattern)
-_INLINED_ATTRIB_VERBS = "|".join(sorted(_SPEECH_VERBS_SET))
+# Build the regex alternation once (prefix trie, deterministic pattern)
+_INLINED_ATTRIB_VERBS = verb_alternation(_SPEECH_VERBS_SET)
 
 # Optional adverb(s) we allow between verb/name to keep precision (<=2 “-ly” or whitelisted adverbs)
 _ADVERB_GAP = r"(?:\s+(?:\w+ly|softly|quietly|calmly|firmly|gently|slowly|dryly|coldly|sharply|evenly|lightly|boldly)){0,2}"
@@ -13113,7 +12063,7 @@ def _recover_balanced_quotes_from_narration(rows):
 
 def _has_quote_span(txt: str) -> bool:
     try:
-        return bool(_quote_spans(_norm_unicode_quotes(txt or "", keep_curly=True)))
+        return bool(_text_features(txt or "").curly_spans)
     except Exception:
         return False
 
@@ -13304,7 +12254,7 @@ def _rehydrate_monologue_gaps(rows: list[dict], window: int = 2) -> list[dict]:
         if _is_dialogue(left) and not _is_dialogue(mid) and _is_dialogue(right):
             S = (left.get("speaker") or "").strip()
             if S and S not in ("Narrator", "Unknown") and not mid.get("_lock_speaker"):
-                tmid = _norm_unicode_quotes(mid.get("text") or "", keep_curly=True)
+                tmid = _text_features(mid.get("text") or "").norm_curly
                 if _is_plain_sentence(tmid) and not _is_attrib_like(tmid):
                     # wrap and flip to quote by S
                     q = tmid
@@ -13567,7 +12517,7 @@ def _demote_quoted_attrib_fragments(results, alias_inv):
             out.append(r)
             continue
 
-        t = _norm_unicode_quotes(r.get("text") or "")
+        t = _text_features(r.get("text") or "").norm
         has_q = _has_q(t)
         spans = _quote_spans(t) or []
 
@@ -13660,6 +12610,76 @@ def _balanced_quote_count(s: str) -> bool:
     return (q % 2) == 0
 
 
+# ===================== ROW FEATURE CACHE =====================
+# Nearly every pass re-derives the same facts from row["text"] (normalized text, quote spans,
+# glyph counts, balance, direct-speech). They are pure functions of the text, so they are
+# memoized per text string: copies made with dict(r) share the entry, and any pass that
+# rewrites row["text"] gets a fresh one automatically. Nothing is stored on the row dicts,
+# so the rows handed to the UI (and saved as JSON) are unchanged.
+ROW_FEATURE_CACHE_SIZE = 65536
+
+
+class _TextFeatures:
+    """Lazily computed quote/shape facts about one text string."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @cached_property
+    def norm(self) -> str:
+        return _norm_unicode_quotes(self.text)
+
+    @cached_property
+    def norm_curly(self) -> str:
+        return _norm_unicode_quotes(self.text, keep_curly=True)
+
+    @cached_property
+    def spans(self) -> tuple:
+        return tuple(_quote_spans(self.norm))
+
+    @cached_property
+    def curly_spans(self) -> tuple:
+        return tuple(_quote_spans(self.norm_curly))
+
+    @cached_property
+    def simple_span_count(self) -> int:
+        return len(_quote_spans_simple(self.text))
+
+    @cached_property
+    def dq_count(self) -> int:
+        return _dq_count(self.text)
+
+    @cached_property
+    def has_any_quote_char(self) -> bool:
+        return _has_any_quote_char(self.text)
+
+    @cached_property
+    def qa_counts(self) -> tuple:
+        return _qa_quote_counts(self.text)
+
+    @cached_property
+    def balance(self) -> str:
+        return _qa_balance_status(self.text)
+
+    @cached_property
+    def direct_speech(self) -> bool:
+        return _looks_like_direct_speech_uncached(self.text)
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+
+@lru_cache(maxsize=ROW_FEATURE_CACHE_SIZE)
+def _text_features(text: str) -> _TextFeatures:
+    return _TextFeatures(text)
+
+
+def row_features(row: dict) -> _TextFeatures:
+    """Cached features of row["text"]; recomputed only when the text itself changes."""
+    return _text_features(row.get("text") or "")
+
+
 def _force_nonquote_when_no_glyphs(rows):
     """
     Very late safety net: any row marked is_quote=True but containing NO visible
@@ -13799,41 +12819,135 @@ def smooth_dialogue_turns(results, window=6):
     return res
 
 
-def _enforce_locked_speakers(rows: list[dict]) -> list[dict]:
+# --- Fused invariant sweep ---
+# One traversal reasserts the quote flags, restores locked speakers and runs the debug flag
+# checks, which used to be separate passes over the rows. Each row it normalizes gets an
+# "_inv" mark holding its resulting state; a later sweep skips rows whose mark still matches
+# (the stages in between didn't touch them), and copies only rows it changes.
+# POLYVOX_INVARIANTS_FULL=1 re-checks every row and logs any mark that went stale.
+INVARIANTS_FULL_CHECK = os.environ.get("POLYVOX_INVARIANTS_FULL", "").strip().lower() in (
+    "1",
+    "true",
+    "yes",
+    "on",
+)
+
+# promotions the strict flags keep as dialogue even without quote glyphs
+_INV_PRESERVE_KEYS = (
+    "_post_quote_promoted",
+    "_pre_quote_promoted",
+    "_attrib_triplet_promoted",
+    "_midquote_tail_promoted",
+)
+
+
+def _inv_state(r: dict, flags, locks: bool) -> tuple:
+    """Everything the sweep reads from a row, plus the sweep's own settings."""
+    return (
+        flags,
+        locks,
+        r.get("text") or "",
+        r.get("is_quote"),
+        r.get("speaker"),
+        r.get("_lock_speaker"),
+        r.get("_locked_to"),
+        any(r.get(k) for k in _INV_PRESERVE_KEYS),
+    )
+
+
+def _inv_fixes(r: dict, flags, locks: bool) -> dict:
+    """Field updates that bring one row back in line with the invariants (empty if none)."""
+    fixes = {}
+    spans = row_features(r).spans
+    speaker = r.get("speaker")
+    locked = r.get("_lock_speaker")
+
+    if flags == "strict":
+        if spans or any(r.get(k) for k in _INV_PRESERVE_KEYS):
+            want_quote = True
+            # quotes can't be Narrator unless explicitly locked on purpose
+            if speaker == "Narrator" and not locked:
+                fixes["speaker"] = speaker = "Unknown"
+        else:
+            # no glyphs and no special promotion -> narration
+            want_quote = False
+            if speaker not in (None, "", "Unknown", "Narrator") and not locked:
+                fixes["speaker"] = speaker = "Narrator"
+        if r.get("is_quote") is not want_quote:
+            fixes["is_quote"] = want_quote
+    elif flags == "pure":
+        if r.get("is_quote") is not bool(spans):
+            fixes["is_quote"] = bool(spans)
+    elif flags == "promote":
+        if spans and not r.get("is_quote", False):
+            fixes["is_quote"] = True
+            DBG["reassert_flag_changes"] = DBG.get("reassert_flag_changes", 0) + 1
+
+    if locks and locked:
+        target = r.get("_locked_to")
+        if target and speaker != target:
+            snippet = (r.get("text") or "").replace("\n", " ")[:60]
+            log(f"[lock] restoring '{target}' over '{speaker}' | {snippet}…")
+            fixes["speaker"] = target
+    return fixes
+
+
+def _normalize_invariants(
+    rows, flags="strict", locks=False, check=True, check_noquote=False
+):
     """
-    Late pass: if any row is 'locked', ensure its speaker equals the locked target.
-    If a heuristic flipped it, restore the original locked speaker.
+    Keep quote flags (and optionally locked speakers) consistent in one sweep.
+
+    flags: "strict" (is_quote from glyph spans or a kept promotion; quote rows can't be
+           Narrator and narration rows can't be a character unless locked), "pure"
+           (is_quote from glyph spans only), "promote" (rows with spans become quotes,
+           none are demoted) or None (leave flags alone).
+    locks: also restore locked speakers to their _locked_to target.
+    check / check_noquote: log rows with quote glyphs that aren't quotes / quote rows
+           without any quote glyph.
     """
     if not rows:
         return rows
+    if flags == "strict":
+        DBG["reassert_strict_runs"] = DBG.get("reassert_strict_runs", 0) + 1
 
     out = []
-    for r in rows:
-        rr = dict(r)
-        if rr.get("_lock_speaker"):
-            target = rr.get("_locked_to")
-            if target and rr.get("speaker") != target:
-                # PRECOMPUTE the snippet to avoid backslashes inside f-string expr
-                txt = rr.get("text") or ""
-                snippet = txt.replace("\n", " ")[:60]
+    visited = 0
+    for i, r in enumerate(rows):
+        mark = r.get("_inv")
+        if mark is not None and not INVARIANTS_FULL_CHECK and mark == _inv_state(r, flags, locks):
+            out.append(r)
+            continue
+        visited += 1
+        fixes = _inv_fixes(r, flags, locks)
+        if fixes:
+            if mark is not None and mark == _inv_state(r, flags, locks):
+                log(f"[invariants] stale mark idx={i} rid={_row_rid(r)} fixes={sorted(fixes)}")
+            r = dict(r)
+            r.update(fixes)
+        if check or check_noquote:
+            feats = row_features(r)
+            t = r.get("text") or ""
+            if check_noquote and r.get("is_quote") and not feats.has_any_quote_char:
                 log(
-                    f"[lock] restoring '{target}' over '{rr.get('speaker')}' | {snippet}…"
+                    f"[debug-noquote-marked-quote] idx={i} speaker={r.get('speaker')} >>> {t[:90]}..."
                 )
-                rr["speaker"] = target
-        out.append(rr)
+            if check and feats.has_any_quote_char and not r.get("is_quote"):
+                log(
+                    f"[debug-quote-flag] idx={i} has quote char but is_quote=False | {t[:80]}…"
+                )
+        r["_inv"] = _inv_state(r, flags, locks)
+        out.append(r)
+
+    DBG["inv_rows_visited"] = DBG.get("inv_rows_visited", 0) + visited
+    DBG["inv_rows_skipped"] = DBG.get("inv_rows_skipped", 0) + len(rows) - visited
     return out
 
 
-# --- PURE reassert: recompute is_quote from spans; DO NOT touch speaker here ---
-def _reassert_quote_flags(rows):
-    out = []
-    for r in rows:
-        rr = dict(r)
-        txt = _norm_unicode_quotes(rr.get("text") or "")
-        spans = _quote_spans(txt)
-        rr["is_quote"] = bool(spans and len(spans) > 0)
-        out.append(rr)
-    return out
+def _strip_invariant_marks(rows):
+    for r in rows or ():
+        r.pop("_inv", None)
+    return rows
 
 
 def _hard_separate_quotes_and_narration(rows, qmap, alias_inv):
@@ -13848,7 +12962,7 @@ def _hard_separate_quotes_and_narration(rows, qmap, alias_inv):
         return rows
     out = []
     for r in rows:
-        t = _norm_unicode_quotes(r.get("text") or "")
+        t = _text_features(r.get("text") or "").norm
         spans = _quote_spans(t)
 
         # keep as-is if no quotes, or exactly one span that covers all text
@@ -13867,6 +12981,8 @@ def _hard_separate_quotes_and_narration(rows, qmap, alias_inv):
 
 
 def _audit_quotes(stage: str, rows: list[dict]):
+    if not log_enabled(DEBUG):
+        return
     # Count rows that contain any visible quote char
     def qcount(t: str) -> int:
         t = t or ""
@@ -13886,7 +13002,7 @@ def _assert_no_broken_quotes(rows):
     errs = 0
     open_run = False
     for i, r in enumerate(rows):
-        s = _norm_unicode_quotes(r.get("text") or "", keep_curly=True)
+        s = _text_features(r.get("text") or "").norm_curly
         if re.match(r'^\s*[“"]', s) and not re.search(r'[”"]\s*$', s):
             open_run = True
         elif open_run and r.get("is_quote") and re.search(r'[”"]\s*$', s):
@@ -14410,7 +13526,7 @@ def _merge_quote_runs_by_speaker(rows: list[dict], max_chars: int = 4000) -> lis
                 out.append(r)
             continue
 
-        merged = dict(run[0])
+        merged = merge_span(dict(run[0]), run)
         merged["text"] = merged_text
         merged["is_quote"] = True
         merged["speaker"] = speaker_of(run[0]) or "Unknown"
@@ -14499,7 +13615,7 @@ def _merge_meta_keep_best(base: dict, other: dict) -> dict:
         r["_cid"] = other["_cid"]
     if r.get("_src") is None and other.get("_src") is not None:
         r["_src"] = other["_src"]
-    return r
+    return merge_span(r, (base, other))
 
 
 # --- Adjacent dedupe using normalized text + speaker confidence (instrumented) ---
@@ -14948,6 +14064,77 @@ def _build_alias_map_strict(output_dir: str, prefix: str, qmap=None) -> dict:
     return alias_inv
 
 
+# ===================== BOOK CHARACTER REGISTRY =====================
+def _apply_registry_snapshot(snapshot):
+    """
+    Fold the book registry into this chapter's whitelist, before the alias/surname maps
+    are built. Chapter canonicals the book already knows under another spelling are renamed
+    to the book's canonical, and the book's characters and unique alias tokens are added, so
+    a character met in an earlier chapter keeps the same name here.
+    """
+    global CANON_WHITELIST, WH_ALIAS, CJ_MAP
+    if not len(snapshot):
+        return
+
+    renames = {}
+    for name in CANON_WHITELIST:
+        can = snapshot.resolve(name)
+        if can != name:
+            renames[name] = can
+    if renames:
+        CANON_WHITELIST = {renames.get(n, n) for n in CANON_WHITELIST}
+        WH_ALIAS = {t: renames.get(n, n) for t, n in WH_ALIAS.items()}
+        CJ_MAP = {cid: renames.get(n, n) for cid, n in CJ_MAP.items()}
+
+    CANON_WHITELIST |= snapshot.canonicals
+    for tok, can in snapshot.alias_tokens().items():
+        WH_ALIAS.setdefault(tok, can)
+
+    log(
+        f"[registry] book canonicals={len(snapshot)} renamed={len(renames)} whitelist={len(CANON_WHITELIST)}"
+    )
+
+
+def _registry_name_maps(additions):
+    """
+    (SURNAME_TO_CANON, ALIAS_INV_CACHE) for the current whitelist, reusing the maps the
+    registry already holds and building only the part for names new to the book.
+    """
+    snapshot = additions.snapshot
+    new_names = sorted(n for n in CANON_WHITELIST if n not in snapshot)
+    surname_frag = _build_surname_map(new_names)
+    inv_frag = build_alias_map(new_names)
+    additions.surname_map = surname_frag
+    additions.alias_inv = inv_frag
+
+    surname_map = snapshot.surname_map()
+    for k, names in surname_frag.items():
+        surname_map.setdefault(k, set()).update(names)
+    alias_inv = snapshot.alias_inv()
+    alias_inv.update(inv_frag)
+    return surname_map, alias_inv
+
+
+def _record_registry_additions(additions, rows, cj=None):
+    """Record this chapter's canonicals, alias tokens, genders and line counts."""
+    genders = {}
+    for c in (cj or {}).get("characters", []) or []:
+        name = c.get("canonical_name") or c.get("normalized_name") or c.get("name")
+        gender = c.get("inferred_gender")
+        if name and gender:
+            genders.setdefault(additions.snapshot.resolve(name), gender)
+
+    for name in sorted(CANON_WHITELIST):
+        additions.add_canonical(name, genders.get(name))
+    for tok, can in (WH_ALIAS or {}).items():
+        if can in CANON_WHITELIST:
+            additions.add_alias_token(tok, can)
+    for r in rows or []:
+        sp = r.get("speaker")
+        if sp in CANON_WHITELIST:
+            additions.count_line(sp)
+
+
 # Ensure globals exist
 if "CANON_WHITELIST" not in globals():
     CANON_WHITELIST = set()
@@ -15279,8 +14466,7 @@ def enforce_dialogue_narration_rule(results, qmap, alias_inv):
 
     def _has_quote_span(txt: str) -> bool:
         try:
-            spans = _quote_spans(_norm_unicode_quotes(txt or ""))
-            return bool(spans)
+            return bool(_text_features(txt or "").spans)
         except Exception:
             return False
 
@@ -15388,6 +14574,8 @@ def dump_gui_rows_txt(rows, path):
     """
     Write exactly what will be sent to the GUI so we can diff it easily.
     """
+    if not pipeline_log.row_tracing():
+        return
     try:
         os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     except Exception:
@@ -15437,25 +14625,24 @@ def emit_stage_stats(output_dir: str, prefix: str):
         if not output_dir or not series:
             return
         path = os.path.join(output_dir, f"{prefix}.stage_stats.tsv")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(
-                "stage\trows\tquote_rows\tunknown_quote_rows\tnarrator_quote_rows\tglyphs\n"
+        lines = ["stage\trows\tquote_rows\tunknown_quote_rows\tnarrator_quote_rows\tglyphs\n"]
+        for stage, snap in series:
+            rows = len(snap)
+            qrows = sum(1 for r in snap if r.get("is_quote"))
+            unknown_q = sum(
+                1
+                for r in snap
+                if r.get("is_quote") and (r.get("speaker") in (None, "", "Unknown"))
             )
-            for stage, snap in series:
-                rows = len(snap)
-                qrows = sum(1 for r in snap if r.get("is_quote"))
-                unknown_q = sum(
-                    1
-                    for r in snap
-                    if r.get("is_quote") and (r.get("speaker") in (None, "", "Unknown"))
-                )
-                narr_q = sum(
-                    1
-                    for r in snap
-                    if r.get("is_quote") and r.get("speaker") == "Narrator"
-                )
-                glyphs = sum(int(r.get("glyph_cnt") or 0) for r in snap)
-                f.write(f"{stage}\t{rows}\t{qrows}\t{unknown_q}\t{narr_q}\t{glyphs}\n")
+            narr_q = sum(
+                1
+                for r in snap
+                if r.get("is_quote") and r.get("speaker") == "Narrator"
+            )
+            glyphs = sum(int(r.get("glyph_cnt") or 0) for r in snap)
+            lines.append(f"{stage}\t{rows}\t{qrows}\t{unknown_q}\t{narr_q}\t{glyphs}\n")
+        # through the writer, so it replaces the file only after any queued trace notes
+        pipeline_log.get_writer().write(path, "".join(lines), truncate=True)
     except Exception as e:
         try:
             log(f"[stage_stats] failed: {e}")
@@ -15464,10 +14651,33 @@ def emit_stage_stats(output_dir: str, prefix: str):
 
 
 # --- Main Attribution ---
-def run_attribution(text, model="big", pipeline="entity,quote,coref"):
+def run_attribution(
+    text,
+    model="big",
+    pipeline="entity,quote,coref",
+    progress=None,
+    cancel_event=None,
+    registry=None,
+    perf_mode=None,
+):
     """
     Run BookNLP and process results into ordered speaker/text segments.
-    """
+
+    progress, if given, is called with the name of each pipeline stage as it completes.
+    cancel_event (a threading.Event) is checked between stages; once set, the run stops
+    by raising AttributionCancelled.
+    registry, if given, is the ChapterAdditions of a book-level CharacterRegistry: names from
+    earlier chapters are reused through its snapshot and this chapter's findings are
+    recorded on it for the caller to commit.
+    perf_mode=True skips row-level tracing (trace/suspect/audit TSVs, row dumps) and
+    DEBUG logging for this run; None keeps the POLYVOX_PERF_MODE setting.
+    """
+    global _RUN_PROGRESS, _RUN_CANCEL
+    _RUN_PROGRESS = progress
+    _RUN_CANCEL = cancel_event
+    previous_perf_mode = pipeline_log.perf_mode()
+    if perf_mode is not None:
+        pipeline_log.set_perf_mode(perf_mode)
     tmpdir = tempfile.mkdtemp(prefix="booknlp_")
     try:
         input_path = os.path.join(tmpdir, "book_input.txt")
@@ -15494,6 +14704,8 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             "coalesce_skipped_quote2quote": 0,
             "coalesce_skipped_attribfrag": 0,
             "coalesce_merges": 0,
+            # source text for the rows' _char_begin/_char_end (see _place_spans)
+            "_source": SourceText(text),
         }
         
         # Reset character detection state
@@ -15509,6 +14721,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         log(f"Model={model}, Pipeline={pipeline}")
         log(f"TempDir={tmpdir}, OutputDir={output_dir}, Prefix={prefix}")
 
+        _report_stage("start")
         run_booknlp(
             input_path=input_path,
             output_dir=output_dir,
@@ -15516,6 +14729,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             model=model,
             pipeline=pipeline,
         )
+        _report_stage("booknlp")
 
         book_file = os.path.join(output_dir, prefix + ".book.txt")
         if not os.path.exists(book_file):
@@ -15617,6 +14831,10 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             if added:
                 log(f"[whitelist] augmented with {added} cluster canonical names")
 
+        # Book-level registry: keep the names earlier chapters settled on
+        if registry is not None:
+            _apply_registry_snapshot(registry.snapshot)
+
         # ------------------------------
         # Quotes map (normalize + cache)
         # ------------------------------
@@ -15648,18 +14866,22 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             f"[alias] canonicals={len(CANON_WHITELIST)} unique_tokens={len(alias_inv)} cj={len(CJ_MAP)}"
         )
 
-        SURNAME_TO_CANON = _build_surname_map(
-            sorted(CANON_WHITELIST)
-        )  # optional; safe if unused
+        if registry is not None:
+            # only the names this chapter adds are mapped; the rest come from the registry
+            SURNAME_TO_CANON, ALIAS_INV_CACHE = _registry_name_maps(registry)
+        else:
+            SURNAME_TO_CANON = _build_surname_map(
+                sorted(CANON_WHITELIST)
+            )  # optional; safe if unused
 
-        # NEW: cache for finalizer rescue (already declared global at top of function)
-        ALIAS_INV_CACHE = build_alias_map(CANON_WHITELIST)  # last/first → canonical
+            # NEW: cache for finalizer rescue (already declared global at top of function)
+            ALIAS_INV_CACHE = build_alias_map(CANON_WHITELIST)  # last/first → canonical
         log(f"[alias] built inv map: {len(ALIAS_INV_CACHE)} tokens")
 
         # ------------------------------
         # Raw rows from processor (unchanged)
         # ------------------------------
-        results = run_book_processor(book_file)
+        results = _place_spans(run_book_processor(book_file, source_text=text))
         log(f"Raw results: {len(results)} lines")
         if DEBUG_AUDIT:
             _audit_quotes(
@@ -15676,16 +14898,18 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         # Merge consecutive Narrator lines early, before further processing
         log(f"[early-merge] BEFORE _merge_consecutive_narrator_rows: {len(results)} rows")
         # DEBUG: Check for "said Smith" before merge
-        for i, row in enumerate(results):
-            if "said Smith" in row.get("text", ""):
-                log(f"[early-merge-before] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')}")
+        if log_enabled(TRACE):
+            for i, row in enumerate(results):
+                if "said Smith" in row.get("text", ""):
+                    log(f"[early-merge-before] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')}", level=TRACE)
         
         results = _merge_consecutive_narrator_rows(results)
         log(f"[early-merge] AFTER _merge_consecutive_narrator_rows: {len(results)} rows")
         # DEBUG: Check for "said Smith" after merge
-        for i, row in enumerate(results):
-            if "said Smith" in row.get("text", ""):
-                log(f"[early-merge-after] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:100]}")
+        if log_enabled(TRACE):
+            for i, row in enumerate(results):
+                if "said Smith" in row.get("text", ""):
+                    log(f"[early-merge-after] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:100]}", level=TRACE)
 
 
         # ------------------------------
@@ -15695,17 +14919,19 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         # 0) Early cleanup/normalization
         log(f"[clean] BEFORE clean_results: {len(results)} rows")
         # DEBUG: Check for "said Smith" before clean
-        for i, row in enumerate(results):
-            if "said Smith" in row.get("text", ""):
-                log(f"[clean-before] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:80]}")
+        if log_enabled(TRACE):
+            for i, row in enumerate(results):
+                if "said Smith" in row.get("text", ""):
+                    log(f"[clean-before] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:80]}", level=TRACE)
         
         results = clean_results(results, qmap, alias_inv)
         
         log(f"[clean] AFTER clean_results: {len(results)} rows")
         # DEBUG: Check for "said Smith" after clean
-        for i, row in enumerate(results):
-            if "said Smith" in row.get("text", ""):
-                log(f"[clean-after] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:80]}")
+        if log_enabled(TRACE):
+            for i, row in enumerate(results):
+                if "said Smith" in row.get("text", ""):
+                    log(f"[clean-after] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:80]}", level=TRACE)
         
         # NEW: Ensure strict separation between quoted and non-quoted text
         log(f"[strict-sep] BEFORE ensure_strict_quote_narration_separation: {len(results)} rows")
@@ -15773,13 +14999,15 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         # 0b) Strict reassert + sanity before any splits/peels
         results = _profile(
             "after reassert_quote_flags_strict (early)",
-            _reassert_quote_flags_strict,
+            _normalize_invariants,
             results,
             output_dir,
             prefix,
+            "strict",
+            False,
+            True,
+            True,
         )
-        results = _debug_assert_noquote_text_marked_quote(results)
-        results = _debug_assert_quote_flag_consistency(results)
         results = trace_stage(
             "after reassert_quote_flags_strict (early)", results, output_dir, prefix
         )
@@ -15810,8 +15038,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         results = trace_stage(
             "after force_split_adjacent_quotes", results, output_dir, prefix
         )
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
         results = _profile(
             "after split_midquote_attrib_clauses_early",
             _split_midquote_attrib_clauses_early,
@@ -15881,8 +15108,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         results = _qaudit(
             "after final_guard_no_narrator_quotes_1a", results, output_dir, prefix
         )
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
         results = trace_stage(
             "after final_guard+reassert (early)", results, output_dir, prefix
         )
@@ -15909,8 +15135,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             output_dir,
             prefix,
         )
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
         results = trace_stage(
             "after glue_softwrapped_quotes", results, output_dir, prefix
         )
@@ -15995,7 +15220,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             prefix,
             alias_inv,
         )
-        results = _reassert_quote_flags_inplace(results)
+        results = _normalize_invariants(results, "promote", check=False)
         results = trace_stage(
             "after edge_peel_pass_inplace", results, output_dir, prefix
         )
@@ -16055,7 +15280,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         )
 
         # keep flags sane
-        results = _reassert_quote_flags_strict(results)
+        results = _normalize_invariants(results, check=False)
 
         # NEW: if a tiny quoted attribution slipped through, demote it to narration
         results = _demote_misquoted_attrib_rows(results)
@@ -16064,8 +15289,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         )
 
         # keep flags sane before continuing
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
 
         # 2c) Heal any single-quote oddities early
         results = _profile(
@@ -16136,9 +15360,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         )
         _attrib_eval_snapshot(results, "after_harvest", outdir=DBG.get("OUTDIR"))
         # -------------------------------------------------
-        results = _reassert_quote_flags_strict(results)
-        results = _enforce_locked_speakers(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results, locks=True)
         results = trace_stage(
             "after attach_inline_attrib_to_adjacent_unknown",
             results,
@@ -16154,8 +15376,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             output_dir,
             prefix,
         )
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
         log(
             f"[strict] reassert_runs={DBG.get('reassert_strict_runs',0)} flag_changes={DBG.get('reassert_flag_changes',0)} lonely_stripped={DBG.get('lonely_quote_stripped',0)} narr_tail_splits={DBG.get('narr_tail_splits',0)}"
         )
@@ -16328,8 +15549,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             prefix,
             6,
         )
-        results = _enforce_locked_speakers(results)
-        results = _reassert_quote_flags(results)
+        results = _normalize_invariants(results, "pure", locks=True, check=False)
         results = _profile(
             "after demote_nonquote_character_rows",
             _demote_nonquote_character_rows,
@@ -16349,8 +15569,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             qmap,
             alias_inv,
         )
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
         results = trace_stage(
             "after hard_separate_quotes_and_narration", results, output_dir, prefix
         )
@@ -16438,8 +15657,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             "after final_peel_narration_from_quotes", results, output_dir, prefix
         )
 
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
         results = trace_stage(
             "after final_peel_narration_from_quotes", results, output_dir, prefix
         )
@@ -16505,8 +15723,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             output_dir,
             prefix,
         )
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
 
         # --- late cleanups to fix quote-flagged beats without glyphs ---
         results = _profile(
@@ -16543,7 +15760,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         )
 
         # Reassert, then (optionally) re-harvest attrib fragments so nearby Unknown quotes get locked
-        results = _reassert_quote_flags_strict(results)
+        results = _normalize_invariants(results, check=False)
         results = _profile(
             "after attach_action_fragments [post-flip]",
             attach_action_fragments,
@@ -16552,7 +15769,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             prefix,
             alias_inv,
         )
-        results = _reassert_quote_flags_strict(results)
+        results = _normalize_invariants(results, check=False)
 
         # 6g) Post-merge sanity
         results = _profile(
@@ -16624,7 +15841,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         log(
             f"[dedupe] pairs_eval={DBG.get('dedupe_pairs_evaluated',0)} merged={DBG.get('dedupe_pairs_merged',0)} conf_wins={DBG.get('dedupe_length_wins',0)}"
         )
-        results = _enforce_locked_speakers(results)
+        results = _normalize_invariants(results, None, locks=True, check=False)
         results = trace_stage(
             "after dedupe_adjacent_quotes", results, output_dir, prefix
         )
@@ -16693,8 +15910,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             output_dir,
             prefix,
         )
-        results = _reassert_quote_flags(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results, "pure")
         results = trace_stage(
             "after drop_empty_quote_rows", results, output_dir, prefix
         )
@@ -16702,7 +15918,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         results = _profile(
             "after finalize_speakers", _finalize_speakers, results, output_dir, prefix
         )
-        results = _reassert_quote_flags(results)
+        results = _normalize_invariants(results, "pure", check=False)
         results = trace_stage("after finalize_speakers", results, output_dir, prefix)
 
         # Final guard again (safety net)
@@ -16723,8 +15939,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             output_dir,
             prefix,
         )
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
 
         # last-chance cleanup before writing anything to disk ---
         results = _profile(
@@ -16742,8 +15957,7 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         )  # then do same-kind near-dup compaction
 
         # Reassert once more so flags are perfectly consistent for the UI/auditor
-        results = _reassert_quote_flags_strict(results)
-        results = _debug_assert_quote_flag_consistency(results)
+        results = _normalize_invariants(results)
 
         # DISABLED FOR AUDIOBOOK: _final_never_break_quotes was merging 274 → 198 rows (28% reduction!).
         # For audiobook TTS, we need sentence-level granularity, not merged quote blocks.
@@ -16754,7 +15968,6 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         #     output_dir,
         #     prefix,
         # )
-        results = _reassert_quote_flags_strict(results)
         # remove stray edge quotes on narration (optional)
         results = _profile(
             "after strip_stray_edge_quotes",
@@ -16843,6 +16056,9 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
         except Exception as e:
             log(f"[stage_stats] emit failed: {e}")
 
+        # sweep marks are only meaningful inside this run; keep them out of the rows we return
+        _strip_invariant_marks(results)
+        results = _place_spans(results)
 
         # FINALIZE: fix misclassified attribution, then merge same-speaker quotes + narration
         # Character lines = is_quote=True (dialogue only, gets character voice)
@@ -16852,17 +16068,18 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             log(f"[finalize] Starting finalization pipeline with {len(results)} rows...")
             
             # DEBUG: Check for "said Smith" before finalization
-            said_hatfield_count = 0
-            for i, row in enumerate(results):
-                if "said Smith" in row.get("text", ""):
-                    said_hatfield_count += 1
-                    log(f"[finalize-pre] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:80]}")
-            log(f"[finalize-pre] Found {said_hatfield_count} rows with 'said Smith'")
-            
-            # DEBUG: Check for rows containing "Because it's expected"
-            for i, row in enumerate(results):
-                if "Because it" in row.get("text", ""):
-                    log(f"[finalize-debug] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:100]}")
+            if log_enabled(TRACE):
+                said_hatfield_count = 0
+                for i, row in enumerate(results):
+                    if "said Smith" in row.get("text", ""):
+                        said_hatfield_count += 1
+                        log(f"[finalize-pre] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:80]}", level=TRACE)
+                log(f"[finalize-pre] Found {said_hatfield_count} rows with 'said Smith'", level=TRACE)
+
+                # DEBUG: Check for rows containing "Because it's expected"
+                for i, row in enumerate(results):
+                    if "Because it" in row.get("text", ""):
+                        log(f"[finalize-debug] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:100]}", level=TRACE)
             
             final_rows = fix_misclassified_attribution_fragments(results)
             log(f"[finalize] After fix_misclassified: {len(final_rows)} rows")
@@ -16871,20 +16088,23 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             log(f"[finalize] After split_multi_quote_rows: {len(final_rows)} rows")
             
             # DEBUG: Check for rows containing "Because it's expected" after split_multi_quote
-            for i, row in enumerate(final_rows):
-                if "Because it" in row.get("text", ""):
-                    log(f"[finalize-debug-multi] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} _was_multi_span={row.get('_was_multi_span')} text={row.get('text')[:100]}")
+            if log_enabled(TRACE):
+                for i, row in enumerate(final_rows):
+                    if "Because it" in row.get("text", ""):
+                        log(f"[finalize-debug-multi] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} _was_multi_span={row.get('_was_multi_span')} text={row.get('text')[:100]}", level=TRACE)
             
             final_rows = split_attribution_from_quotes(final_rows)  # Split "said X."quote" patterns
             log(f"[finalize] After split_attribution_from_quotes: {len(final_rows)} rows")
             
             # DEBUG: Check for rows containing "Because it's expected" after split_attribution
-            for i, row in enumerate(final_rows):
-                if "Because it" in row.get("text", ""):
-                    log(f"[finalize-debug-attrib] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:100]}")
+            if log_enabled(TRACE):
+                for i, row in enumerate(final_rows):
+                    if "Because it" in row.get("text", ""):
+                        log(f"[finalize-debug-attrib] ROW {i}: speaker={row.get('speaker')} is_quote={row.get('is_quote')} text={row.get('text')[:100]}", level=TRACE)
             
             final_rows = finalize_quote_narration_blocks(final_rows)
             log(f"[finalize] After finalize_quote_narration_blocks: {len(final_rows)} rows")
+            final_rows = _place_spans(final_rows)
             
             dump_gui_rows_txt(
                 final_rows,
@@ -16905,7 +16125,15 @@ def run_attribution(text, model="big", pipeline="entity,quote,coref"):
             except:
                 pass
 
+        if registry is not None:
+            _record_registry_additions(registry, results, cj)
+
         return results
 
     finally:
+        _RUN_PROGRESS = None
+        _RUN_CANCEL = None
         shutil.rmtree(tmpdir, ignore_errors=True)
+        pipeline_log.set_perf_mode(previous_perf_mode)
+        # the run's logs and trace files are complete once it returns
+        pipeline_log.flush()
@@ -0,0 +1,249 @@
+"""
+Book-level Character Registry
+Character identity shared by all chapters of a book: canonical names, unique alias tokens,
+surname map, gender and per-chapter line counts. Chapters read a frozen snapshot and record
+their additions separately; the registry folds those in after each chapter
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+UNKNOWN_GENDER = "unknown"
+
+
+class RegistrySnapshot:
+    """Read-only view of the registry as it was when a chapter started.
+
+    Chapters running side by side all see the same snapshot, so what one of them finds
+    cannot change how another one names its characters.
+    """
+
+    def __init__(self, canonicals, alias_tokens, alias_inv, surname_map, genders):
+        self.canonicals: frozenset = frozenset(canonicals)
+        self._alias_tokens: Dict[str, str] = dict(alias_tokens)
+        self._alias_inv: Dict[str, str] = dict(alias_inv)
+        self._surname_map: Dict[str, frozenset] = {k: frozenset(v) for k, v in surname_map.items()}
+        self._genders: Dict[str, str] = dict(genders)
+        self._by_lower: Dict[str, str] = {name.lower(): name for name in sorted(self.canonicals)}
+
+    def __len__(self) -> int:
+        return len(self.canonicals)
+
+    def __contains__(self, name) -> bool:
+        return name in self.canonicals
+
+    def resolve(self, name: str) -> str:
+        """The book's canonical name for name, or name itself if it is new to the book.
+
+        Exact and case-insensitive matches win; a single token is resolved through the unique
+        alias tokens (e.g. "Smith" -> "John Smith" when no other Smith is known).
+        """
+        if not name or name in self.canonicals:
+            return name
+        key = " ".join(name.split()).lower()
+        if key in self._by_lower:
+            return self._by_lower[key]
+        if " " not in key:
+            return self._alias_tokens.get(key, name)
+        return name
+
+    def alias_tokens(self) -> Dict[str, str]:
+        """Unique alias token -> canonical (lowercase tokens)."""
+        return dict(self._alias_tokens)
+
+    def alias_inv(self) -> Dict[str, str]:
+        """The build_alias_map() inverse map for every known canonical."""
+        return dict(self._alias_inv)
+
+    def surname_map(self) -> Dict[str, Set[str]]:
+        """Lowercase surname -> set of canonical names (as _build_surname_map returns it)."""
+        return {k: set(v) for k, v in self._surname_map.items()}
+
+    def gender(self, name: str) -> str:
+        return self._genders.get(name, UNKNOWN_GENDER)
+
+
+class ChapterAdditions:
+    """What one chapter learned about the book's characters, pending a commit."""
+
+    def __init__(self, key, snapshot: RegistrySnapshot):
+        self.key = key
+        self.snapshot = snapshot
+        self.canonicals: Set[str] = set()
+        self.alias_tokens: Dict[str, str] = {}
+        self.alias_inv: Dict[str, str] = {}
+        self.surname_map: Dict[str, Set[str]] = {}
+        self.genders: Dict[str, str] = {}
+        self.line_counts: Dict[str, int] = {}
+
+    def add_canonical(self, name: str, gender: Optional[str] = None):
+        if not name:
+            return
+        if name not in self.snapshot:
+            self.canonicals.add(name)
+        if gender and gender != UNKNOWN_GENDER:
+            self.genders.setdefault(name, gender)
+
+    def add_alias_token(self, token: str, name: str):
+        token = (token or "").lower()
+        if token and name:
+            self.alias_tokens.setdefault(token, name)
+
+    def count_line(self, name: str, n: int = 1):
+        if name:
+            self.line_counts[name] = self.line_counts.get(name, 0) + n
+
+    def merge(self, other: "ChapterAdditions", renames: Optional[Dict[str, str]] = None):
+        """Fold in what another run over part of this chapter found (e.g. one NLP window).
+
+        renames maps names that run used to the names this chapter settled on.
+        """
+        renames = renames or {}
+        for name in sorted(other.canonicals):
+            self.add_canonical(renames.get(name, name))
+        for token, name in sorted(other.alias_tokens.items()):
+            self.add_alias_token(token, renames.get(name, name))
+        for token, root in other.alias_inv.items():
+            self.alias_inv.setdefault(token, renames.get(root, root))
+        for surname, names in other.surname_map.items():
+            self.surname_map.setdefault(surname, set()).update(renames.get(n, n) for n in names)
+        for name, gender in sorted(other.genders.items()):
+            self.add_canonical(renames.get(name, name), gender)
+        for name, n in other.line_counts.items():
+            self.count_line(renames.get(name, name), n)
+
+
+class CharacterRegistry:
+    """Canonical characters of one book, built up chapter by chapter.
+
+    Typical use, one chapter at a time or several in parallel:
+
+        additions = registry.begin_chapter(chapter_index)
+        rows = run_attribution(text, registry=additions)
+        registry.commit(additions)          # or commit_all([...]) after a parallel batch
+
+    commit_all() applies additions in chapter-key order, so the result does not depend on
+    which chapter finished first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def clear(self):
+        """Forget everything (a new book was loaded)."""
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self._canonicals: List[str] = []
+        self._alias_tokens: Dict[str, str] = {}
+        self._ambiguous_tokens: Set[str] = set()
+        self._alias_inv: Dict[str, str] = {}
+        self._surname_map: Dict[str, Set[str]] = {}
+        self._genders: Dict[str, str] = {}
+        self._chapter_counts: Dict[str, Dict[str, int]] = {}
+        self._snapshot: Optional[RegistrySnapshot] = None
+
+    def __len__(self) -> int:
+        return len(self._canonicals)
+
+    # ---------- Chapters ----------
+    def snapshot(self) -> RegistrySnapshot:
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = RegistrySnapshot(
+                    self._canonicals, self._alias_tokens, self._alias_inv, self._surname_map, self._genders
+                )
+            return self._snapshot
+
+    def begin_chapter(self, key) -> ChapterAdditions:
+        """Additions for chapter key, recorded against the current snapshot."""
+        return ChapterAdditions(key, self.snapshot())
+
+    def commit(self, additions: ChapterAdditions):
+        """Fold one chapter's additions into the registry."""
+        self.commit_all([additions])
+
+    def commit_all(self, batch: Iterable[ChapterAdditions]):
+        """Fold several chapters' additions in, ordered by chapter key."""
+        batch = sorted(batch, key=lambda a: a.key)
+        with self._lock:
+            for additions in batch:
+                self._apply(additions)
+            self._snapshot = None
+
+    def _apply(self, additions: ChapterAdditions):
+        known = set(self._canonicals)
+        for name in sorted(additions.canonicals):
+            if name not in known:
+                self._canonicals.append(name)
+                known.add(name)
+
+        for token, name in sorted(additions.alias_tokens.items()):
+            if token in self._ambiguous_tokens:
+                continue
+            current = self._alias_tokens.get(token)
+            if current is None:
+                self._alias_tokens[token] = name
+            elif current != name:
+                # A token that names two characters is no longer an alias for either
+                del self._alias_tokens[token]
+                self._ambiguous_tokens.add(token)
+
+        for token, root in sorted(additions.alias_inv.items()):
+            self._alias_inv.setdefault(token, root)
+        for surname, names in additions.surname_map.items():
+            self._surname_map.setdefault(surname, set()).update(names)
+
+        for name, gender in sorted(additions.genders.items()):
+            if self._genders.get(name, UNKNOWN_GENDER) == UNKNOWN_GENDER:
+                self._genders[name] = gender
+
+        counts = self._chapter_counts.setdefault(str(additions.key), {})
+        counts.clear()
+        counts.update(additions.line_counts)
+
+    # ---------- Queries ----------
+    def characters(self) -> List[Dict]:
+        """One dict per canonical character, in the order they were first seen."""
+        with self._lock:
+            out = []
+            for name in self._canonicals:
+                per_chapter = {
+                    key: counts[name] for key, counts in self._chapter_counts.items() if name in counts
+                }
+                out.append({
+                    "name": name,
+                    "gender": self._genders.get(name, UNKNOWN_GENDER),
+                    "aliases": sorted(t for t, n in self._alias_tokens.items() if n == name),
+                    "chapter_counts": per_chapter,
+                    "total": sum(per_chapter.values()),
+                })
+            return out
+
+    # ---------- Persistence ----------
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "canonicals": list(self._canonicals),
+                "alias_tokens": dict(self._alias_tokens),
+                "ambiguous_tokens": sorted(self._ambiguous_tokens),
+                "alias_inv": dict(self._alias_inv),
+                "surname_map": {k: sorted(v) for k, v in self._surname_map.items()},
+                "genders": dict(self._genders),
+                "chapter_counts": {k: dict(v) for k, v in self._chapter_counts.items()},
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CharacterRegistry":
+        registry = cls()
+        data = data or {}
+        registry._canonicals = list(data.get("canonicals") or [])
+        registry._alias_tokens = dict(data.get("alias_tokens") or {})
+        registry._ambiguous_tokens = set(data.get("ambiguous_tokens") or [])
+        registry._alias_inv = dict(data.get("alias_inv") or {})
+        registry._surname_map = {k: set(v) for k, v in (data.get("surname_map") or {}).items()}
+        registry._genders = dict(data.get("genders") or {})
+        registry._chapter_counts = {k: dict(v) for k, v in (data.get("chapter_counts") or {}).items()}
+        return registry
@@ -25,14 +25,18 @@ import os
 from app.core.pipelines import Token
 
 import random
+import numpy as np
 
 class GenderEM:
 
-	def __init__(self, outfile=None, tokens=None, entities=None, entityFiles=None, tokenFiles=None, hyperparameterFile=None, distance=25, num_epochs=25, refs=None, upper=10, use_tagged_pronouns_only=True, genders=[["he", "him", "his"],["she", "her"],	["they", "them", "their"]] ):
+	def __init__(self, outfile=None, tokens=None, entities=None, entityFiles=None, tokenFiles=None, hyperparameterFile=None, distance=25, num_epochs=25, tolerance=1e-6, refs=None, upper=10, use_tagged_pronouns_only=True, genders=[["he", "him", "his"],["she", "her"],	["they", "them", "their"]] ):
 
 		# Number of epochs for EM
 		self.num_epochs=num_epochs
 
+		# Stop EM early once no t(f|e) moves by more than this between epochs (None/0 = always run num_epochs)
+		self.tolerance=tolerance
+
 		# Candidates entities must within this number of preceding tokens of pronouns
 		self.distance=distance
 
@@ -289,16 +293,8 @@ class GenderEM:
 
 		X, Y=self.process(tokens, entities, refs)	
 
-		for epoch in range(self.num_epochs):
-			
-			for e, f in zip(X, Y):
-				self.update(e,f)
-
-			self.maximization()
-			if epoch < self.num_epochs-1:
-				self.delete_counts()
-				self.add_hyperparameters_to_counts(refs=refs, entities=entities, tokens=tokens)
-
+		vocab=list(self.vocab)
+		self.run_em(vocab, X, Y, refs=refs, entities=entities, tokens=tokens)
 
 		genders={}
 		for e, f in self.t_f_e:
@@ -328,6 +324,77 @@ class GenderEM:
 
 		return genders
 
+	def run_em(self, vocab, X, Y, refs=None, entities=None, tokens=None):
+
+		"""
+		Vectorized equivalent of the update()/maximization() loop used by tagFromFile, run over an
+		entity x gender count matrix. Each (pronoun, candidate entity) pair becomes one entry in flat
+		index arrays, so an epoch is a gather, two bincounts and a row normalization.
+		"""
+
+		num_e=len(vocab)
+		num_g=self.num_genders
+		index={e:i for i, e in enumerate(vocab)}
+
+		# the pseudocounts are rebuilt identically before every epoch but the first, so compute them once
+		self.delete_counts()
+		self.add_hyperparameters_to_counts(refs=refs, entities=entities, tokens=tokens)
+		prior=self._counts_to_matrix(vocab, self.joint_e_f_counts)
+		t=self._counts_to_matrix(vocab, self.t_f_e)
+
+		pair_e=[]
+		pair_f=[]
+		pair_row=[]
+		num_rows=0
+		for e_seq, f_seq in zip(X, Y):
+			for f in f_seq:
+				for e in e_seq:
+					pair_e.append(index[e])
+					pair_f.append(f)
+					pair_row.append(num_rows)
+				num_rows+=1
+
+		pair_e=np.array(pair_e, dtype=np.intp)
+		pair_f=np.array(pair_f, dtype=np.intp)
+		pair_row=np.array(pair_row, dtype=np.intp)
+		flat=pair_e*num_g + pair_f
+
+		# counts were zeroed after initialization, so the first epoch sees no pseudocounts
+		counts=np.zeros((num_e, num_g))
+
+		for epoch in range(self.num_epochs):
+
+			# E-step: distribute each pronoun over the candidate entities preceding it
+			weights=t[pair_e, pair_f]
+			totals=np.bincount(pair_row, weights=weights, minlength=num_rows)
+			deltas=weights/totals[pair_row]
+			expected=np.bincount(flat, weights=deltas, minlength=num_e*num_g).reshape(num_e, num_g)
+
+			counts=expected if epoch == 0 else prior + expected
+
+			# M-step
+			e_counts=counts.sum(axis=1, keepdims=True)
+			new_t=np.divide(counts, e_counts, out=np.zeros_like(counts), where=e_counts > 0)
+
+			change=np.abs(new_t - t).max(initial=0.)
+			t=new_t
+
+			if epoch > 0 and self.tolerance and change < self.tolerance:
+				break
+
+		for i, e in enumerate(vocab):
+			self.e_counts[e]=counts[i].sum()
+			for f in range(num_g):
+				self.joint_e_f_counts[e,f]=counts[i,f]
+				self.t_f_e[e,f]=t[i,f]
+
+	def _counts_to_matrix(self, vocab, table):
+		matrix=np.zeros((len(vocab), self.num_genders))
+		for i, e in enumerate(vocab):
+			for f in range(self.num_genders):
+				matrix[i,f]=table.get((e,f), 0)
+		return matrix
+
 	def print(self, epoch):
 		with open("%s.%s" % (self.outfile, epoch), "w", encoding="utf-8") as out:
 			valstr=[]
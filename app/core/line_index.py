@@ -0,0 +1,208 @@
+"""
+Search Index for Attributed Lines
+Per-session index over the result rows shown in the Characters tab, so text search and
+speaker filtering don't re-scan and re-lowercase every row on each query
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+_TOKEN_RX = re.compile(r"\w+")
+
+
+class LineIndex:
+    """Lowercased text, speaker postings and a token inverted index over result rows.
+
+    Rows are the result dicts stored in ``chapter["results"]``; they are identified by object
+    identity and given integer row ids. Build once with rebuild(), then keep it current with
+    add()/remove()/update() as rows are merged, split, reassigned or deleted.
+    """
+
+    def __init__(self):
+        self.rebuild([])
+
+    # ---------- Building ----------
+    def rebuild(self, chapters: List[Dict]):
+        """Index every result row of chapters from scratch."""
+        self._chapters = chapters
+        self._next_rid = 0
+        self._rid_by_obj: Dict[int, int] = {}   # id(result) -> rid
+        self._rows: Dict[int, Dict] = {}        # rid -> result
+        self._lowered: Dict[int, str] = {}      # rid -> stripped, lowercased text
+        self._tokens: Dict[int, Set[str]] = {}  # rid -> tokens of the lowered text
+        self._speaker_of: Dict[int, str] = {}
+        self._by_speaker: Dict[str, Set[int]] = {}
+        self._by_token: Dict[str, Set[int]] = {}
+        self._order: List[int] = []
+        self._position: Dict[int, int] = {}
+        self._order_dirty = False
+
+        for result in self._iter_results():
+            self._index(result)
+        self._order_dirty = True
+
+    def add(self, result: Dict) -> int:
+        """Index a new row (its display position is picked up from the chapters lazily)."""
+        rid = self._rid_by_obj.get(id(result))
+        if rid is not None:
+            self.update(result)
+            return rid
+        self._order_dirty = True
+        return self._index(result)
+
+    def remove(self, result: Dict):
+        """Drop a row that was deleted or replaced."""
+        rid = self._rid_by_obj.pop(id(result), None)
+        if rid is None:
+            return
+        self._unindex_text(rid)
+        self._unindex_speaker(rid)
+        del self._rows[rid]
+        self._order_dirty = True
+
+    def update(self, result: Dict):
+        """Re-index a row whose speaker and/or text changed in place."""
+        rid = self._rid_by_obj.get(id(result))
+        if rid is None:
+            self.add(result)
+            return
+
+        speaker = result.get("speaker", "Unknown")
+        if speaker != self._speaker_of[rid]:
+            self._unindex_speaker(rid)
+            self._index_speaker(rid, speaker)
+
+        lowered = (result.get("text", "") or "").strip().lower()
+        if lowered != self._lowered[rid]:
+            self._unindex_text(rid)
+            self._index_text(rid, lowered)
+
+    def replace_rows(self, old_rows: Iterable[Dict], new_rows: Iterable[Dict]):
+        """Swap one set of rows for another (e.g. a chapter's results after re-detection)."""
+        for result in old_rows or []:
+            if isinstance(result, dict):
+                self.remove(result)
+        for result in new_rows or []:
+            if isinstance(result, dict):
+                self.add(result)
+
+    # ---------- Queries ----------
+    def __len__(self) -> int:
+        self._ensure_order()
+        return len(self._order)
+
+    def speakers(self) -> List[str]:
+        """Every speaker with at least one row."""
+        self._ensure_order()
+        return list(self._by_speaker)
+
+    def query(self, search_text: str = "", speaker: Optional[str] = None) -> List[Dict]:
+        """Rows (in display order) whose text contains search_text and, if given, spoken by speaker.
+
+        Matches the old ``search_text in text.lower()`` test exactly: the token index only narrows
+        the candidates, which are then confirmed against the lowercased text.
+        """
+        self._ensure_order()
+        search_text = (search_text or "").lower().strip()
+
+        candidates: Optional[Set[int]] = None
+        if speaker is not None:
+            candidates = set(self._by_speaker.get(speaker, ()))
+
+        if search_text:
+            for token in _TOKEN_RX.findall(search_text):
+                postings = self._token_candidates(token)
+                candidates = postings if candidates is None else candidates & postings
+                if not candidates:
+                    return []
+
+        if candidates is None:
+            rids = self._order
+        elif len(candidates) * 8 < len(self._order):
+            rids = sorted(candidates, key=self._position.__getitem__)
+        else:
+            rids = [rid for rid in self._order if rid in candidates]
+
+        if search_text:
+            lowered = self._lowered
+            rids = [rid for rid in rids if search_text in lowered[rid]]
+
+        rows = self._rows
+        return [rows[rid] for rid in rids]
+
+    # ---------- Internals ----------
+    def _iter_results(self):
+        for chapter in self._chapters:
+            results = chapter.get("results")
+            if isinstance(results, list):
+                for result in results:
+                    if isinstance(result, dict):
+                        yield result
+
+    def _index(self, result: Dict) -> int:
+        rid = self._next_rid
+        self._next_rid += 1
+        self._rid_by_obj[id(result)] = rid
+        self._rows[rid] = result
+        self._index_speaker(rid, result.get("speaker", "Unknown"))
+        self._index_text(rid, (result.get("text", "") or "").strip().lower())
+        return rid
+
+    def _index_speaker(self, rid: int, speaker: str):
+        self._speaker_of[rid] = speaker
+        self._by_speaker.setdefault(speaker, set()).add(rid)
+
+    def _unindex_speaker(self, rid: int):
+        speaker = self._speaker_of.pop(rid)
+        postings = self._by_speaker.get(speaker)
+        if postings is not None:
+            postings.discard(rid)
+            if not postings:
+                del self._by_speaker[speaker]
+
+    def _index_text(self, rid: int, lowered: str):
+        tokens = set(_TOKEN_RX.findall(lowered))
+        self._lowered[rid] = lowered
+        self._tokens[rid] = tokens
+        for token in tokens:
+            self._by_token.setdefault(token, set()).add(rid)
+
+    def _unindex_text(self, rid: int):
+        del self._lowered[rid]
+        for token in self._tokens.pop(rid):
+            postings = self._by_token.get(token)
+            if postings is not None:
+                postings.discard(rid)
+                if not postings:
+                    del self._by_token[token]
+
+    def _token_candidates(self, token: str) -> Set[int]:
+        """Rows with an indexed token containing token (query words may be partial words)."""
+        postings = self._by_token.get(token)
+        exact = set(postings) if postings else set()
+        for vocab_token, rids in self._by_token.items():
+            if token in vocab_token and vocab_token != token:
+                exact |= rids
+        return exact
+
+    def _ensure_order(self):
+        """Refresh display positions after rows were added or removed.
+
+        Rows found in the chapters but never added are indexed here, and indexed rows that are
+        no longer in any chapter are dropped, so a missed add()/remove() can't leave it stale.
+        """
+        if not self._order_dirty:
+            return
+        order = []
+        rid_by_obj = self._rid_by_obj
+        for result in self._iter_results():
+            rid = rid_by_obj.get(id(result))
+            if rid is None:
+                rid = self._index(result)
+            order.append(rid)
+        self._order = order
+        self._position = {rid: pos for pos, rid in enumerate(order)}
+
+        for rid in [rid for rid in self._rows if rid not in self._position]:
+            self.remove(self._rows[rid])
+        self._order_dirty = False
@@ -8,12 +8,42 @@ import sys
 import itertools
 import pkg_resources
 import re
+import os
+import threading
+from functools import lru_cache
 
-class NameCoref:
+HONORIFICS={"mr":1, "mr.":1, "mrs":1, "mrs.":1, "miss":1, "uncle":1, "aunt":1, "lady":1, "lord":1, "monsieur":1, "master":1, "mistress":1}
 
-	def __init__(self, aliasFile):
-		self.honorifics={"mr":1, "mr.":1, "mrs":1, "mrs.":1, "miss":1, "uncle":1, "aunt":1, "lady":1, "lord":1, "monsieur":1, "master":1, "mistress":1}
-		self.aliases={}
+# longest ordered subset of a name's parts that get_variants emits
+MAX_VARIANT_SIZE=7
+
+# number of distinct (normalized) names whose variants are memoized
+VARIANT_CACHE_SIZE=4096
+
+_HYPHEN_SPLIT_RX=re.compile(r"[\-’'`]+")
+
+# alias tables are shared by every NameCoref instance, keyed by absolute path and parsed on first use
+_ALIAS_TABLES={}
+_ALIAS_LOCK=threading.Lock()
+
+
+def load_aliases(aliasFile):
+
+	"""
+	Return the {nickname -> {canonical: 1}} table for aliasFile (all lowercased), reading the
+	file only the first time it is requested in this process.
+	"""
+
+	key=os.path.abspath(aliasFile)
+	aliases=_ALIAS_TABLES.get(key)
+	if aliases is not None:
+		return aliases
+
+	with _ALIAS_LOCK:
+		if key in _ALIAS_TABLES:
+			return _ALIAS_TABLES[key]
+
+		aliases={}
 		with open(aliasFile) as file:
 			for line in file:
 				cols=line.rstrip().split("\t")
@@ -21,42 +51,46 @@ class NameCoref:
 				nicknames=cols[1:]
 				for nickname in nicknames:
 
-					if nickname.lower() not in self.aliases:
-						self.aliases[nickname.lower()]={}
-					self.aliases[nickname.lower()][canonical.lower()]=1
+					if nickname.lower() not in aliases:
+						aliases[nickname.lower()]={}
+					aliases[nickname.lower()][canonical.lower()]=1
 
-	def get_variants(self, parts):
-		# HYAPH_SPLIT_PATCH: split hyphens/apostrophes into sub-tokens for robust variants
-		_parts = []
-		for _p in parts:
-			_parts.extend(re.split(r"[\-’'`]+", _p))
-		parts = [t for t in _parts if t]
+		_ALIAS_TABLES[key]=aliases
+		return aliases
 
-		variants={}
-		for i in range(len(parts)):
-			if parts[i].lower() not in self.honorifics:
-				variants[parts[i]]=1
 
-			for j in range(i+1, len(parts)):
-				variants["%s %s" % (parts[i], parts[j])]=1
+@lru_cache(maxsize=VARIANT_CACHE_SIZE)
+def _ordered_variants(parts):
 
-				for k in range(j+1, len(parts)):
-					variants["%s %s %s" % (parts[i], parts[j], parts[k])]=1
+	"""
+	All ordered subsets (up to MAX_VARIANT_SIZE parts) of the normalized token tuple `parts`,
+	excluding honorifics as unigram variants.
+	"""
 
-					for l in range(k+1, len(parts)):
-						variants["%s %s %s %s" % (parts[i], parts[j], parts[k], parts[l])]=1
+	variants=[]
+	for size in range(1, min(len(parts), MAX_VARIANT_SIZE)+1):
+		for combo in itertools.combinations(parts, size):
+			if size == 1 and combo[0].lower() in HONORIFICS:
+				continue
+			variants.append(' '.join(combo))
 
-						for m in range(l+1, len(parts)):
-							variants["%s %s %s %s %s" % (parts[i], parts[j], parts[k], parts[l], parts[m])]=1
+	return tuple(variants)
 
-							for n in range(m+1, len(parts)):
-								variants["%s %s %s %s %s %s" % (parts[i], parts[j], parts[k], parts[l], parts[m], parts[n])]=1
 
-								for o in range(n+1, len(parts)):
-									variants["%s %s %s %s %s %s %s" % (parts[i], parts[j], parts[k], parts[l], parts[m], parts[n], parts[o])]=1
-									
+class NameCoref:
+
+	def __init__(self, aliasFile):
+		self.honorifics=HONORIFICS
+		self.aliases=load_aliases(aliasFile)
+
+	def get_variants(self, parts):
+		# HYAPH_SPLIT_PATCH: split hyphens/apostrophes into sub-tokens for robust variants
+		_parts = []
+		for _p in parts:
+			_parts.extend(_HYPHEN_SPLIT_RX.split(_p))
+		parts = tuple(t for t in _parts if t)
 
-		return variants
+		return dict.fromkeys(_ordered_variants(parts), 1)
 
 	def get_canonical(self, name_tokens):
 
@@ -133,26 +167,43 @@ class NameCoref:
 			* "Em Smith" -> "Emma Smith"
 		"""
 
+		# canonical expansions are looked up once per distinct name and reused below
+		canonical_cache={}
+		def get_canonical(name_tokens):
+			key=tuple(name_tokens)
+			if key not in canonical_cache:
+				canonical_cache[key]=self.get_canonical(name_tokens)
+			return canonical_cache[key]
+
+		# index every canonical token set by the tokens it contains, so each name is only compared
+		# against the names that could possibly be a superset of it
+		canonical_sets={}
+		token_index={}
+		for name in uniq:
+			canonical_sets[name]=[set(canonical) for canonical in get_canonical(name.split(" "))]
+			for name_set in canonical_sets[name]:
+				for tok in name_set:
+					if tok not in token_index:
+						token_index[tok]=[]
+					token_index[tok].append((name, name_set))
+
 		subsets={}
-		for name1 in uniq:
-			canonicals1=self.get_canonical(name1.split(" "))
-			for canonical1 in canonicals1:
-				name1set=set(canonical1)
-				for name2 in uniq:
+		for name2 in uniq:
+			for name2set in canonical_sets[name2]:
+				if name2 in subsets or len(name2set) == 0:
+					break
+
+				for name1, name1set in token_index[next(iter(name2set))]:
 
 					if name1 == name2:
 						continue
 
-					canonicals=self.get_canonical(name2.split(" "))
-					for canonical in canonicals:
-
-						name2set=set(canonical)
-
-						if ' '.join(name1set) == ' '.join(name2set):
-							continue
+					if ' '.join(name1set) == ' '.join(name2set):
+						continue
 
-						if name1set.issuperset(name2set):
-							subsets[name2]=1
+					if name1set.issuperset(name2set):
+						subsets[name2]=1
+						break
 
 		name_subpart_index={}
 
@@ -176,7 +227,7 @@ class NameCoref:
 			if name in subsets:
 				continue
 
-			canonicals=self.get_canonical(name.split(" "))
+			canonicals=get_canonical(name.split(" "))
 			for canonical in canonicals:
 				variants=self.get_variants(canonical)
 
@@ -216,7 +267,7 @@ class NameCoref:
 
 			if val == 1:
 
-				canonicals=self.get_canonical(entities[i])
+				canonicals=get_canonical(entities[i])
 				name=' '.join(entities[i]).lower()
 
 				top=None
@@ -423,7 +474,9 @@ class NameCoref:
 				clusters[ref]=Counter()
 			clusters[ref][' '.join(entities[i])]+=1
 
-		# if two clusters have significant overlap in mention phrases, merge them into one
+		# if two clusters have significant overlap in mention phrases, merge them into one;
+		# merged_into records small -> big so refs can be relabeled in one pass at the end
+		merged_into={}
 		for ref in clusters:
 			for ref2 in clusters:
 				if ref == ref2 or clusters[ref] is None or clusters[ref2] is None or ref == -1 or ref2 == -1 or ref == 0 or ref2 == 0:
@@ -445,12 +498,14 @@ class NameCoref:
 					for k,v in clusters[small].most_common():
 						clusters[big][k]+=v
 
-					for idx, r in enumerate(refs):
-						if r == small:
-							refs[idx]=big
-
+					merged_into[small]=big
 					clusters[small]=None
 
+		for idx, r in enumerate(refs):
+			while r in merged_into:
+				r=merged_into[r]
+			refs[idx]=r
+
 		counts=Counter()
 		for ref in clusters:
 			if clusters[ref] is not None:
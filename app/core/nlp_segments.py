@@ -0,0 +1,274 @@
+"""
+NLP Segments
+Attribution of oversized chapters in windows. BookNLP's cost (and memory) grows faster than
+the text, so a chapter over the token budget is cut at paragraph boundaries into overlapping
+windows, each window is attributed on its own (in a pool, when one is given) and the rows are
+stitched back into one chapter: row spans are shifted to chapter offsets, each overlap is
+handed to one window at a paragraph boundary no row crosses, and a speaker one window only
+knew by a single name is renamed to the full name another window found. The caller still gets
+one list of rows and one ChapterAdditions for the chapter.
+
+    POLYVOX_NLP_WINDOW_TOKENS=<n>    token budget per window (default: 0, chapters run whole)
+    POLYVOX_NLP_WINDOW_OVERLAP=<n>   tokens shared by neighbouring windows (default: 1000)
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from app.core.character_registry import ChapterAdditions
+from app.core.source_spans import BEGIN, END, SourceText, get_span, place_spans
+
+WINDOW_TOKENS_ENV = "POLYVOX_NLP_WINDOW_TOKENS"
+WINDOW_OVERLAP_ENV = "POLYVOX_NLP_WINDOW_OVERLAP"
+DEFAULT_OVERLAP_TOKENS = 1000
+
+# roughly what spaCy counts as tokens: words and single punctuation marks
+_TOKEN_RX = re.compile(r"\w+|[^\w\s]")
+_PARAGRAPH_BREAK_RX = re.compile(r"\n[^\S\n]*\n\s*")
+
+Window = Tuple[int, int]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, "").strip() or default))
+    except ValueError:
+        return default
+
+
+def window_tokens() -> int:
+    """The configured token budget per window; 0 means chapters are never split."""
+    return _env_int(WINDOW_TOKENS_ENV, 0)
+
+
+def window_overlap() -> int:
+    return _env_int(WINDOW_OVERLAP_ENV, DEFAULT_OVERLAP_TOKENS)
+
+
+def count_tokens(text: str) -> int:
+    return len(_TOKEN_RX.findall(text or ""))
+
+
+def paragraphs(text: str) -> List[Tuple[int, int, int]]:
+    """(start, end, tokens) per paragraph; the blank lines after a paragraph belong to it."""
+    out, start = [], 0
+    for m in _PARAGRAPH_BREAK_RX.finditer(text):
+        if m.end() > start:
+            out.append((start, m.end(), count_tokens(text[start:m.start()])))
+            start = m.end()
+    if start < len(text):
+        out.append((start, len(text), count_tokens(text[start:])))
+    return out
+
+
+def plan_windows(text: str, max_tokens: int, overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> List[Window]:
+    """[start, end) windows covering text, cut at paragraph boundaries.
+
+    Each window holds as many whole paragraphs as fit in max_tokens (at least one, so a
+    single huge paragraph makes a window of its own) and starts with the last paragraphs of
+    the previous window, up to overlap_tokens of them.
+    """
+    paras = paragraphs(text)
+    if not paras:
+        return [(0, len(text))]
+    windows, i = [], 0
+    while True:
+        j, tokens = i + 1, paras[i][2]
+        while j < len(paras) and tokens + paras[j][2] <= max_tokens:
+            tokens += paras[j][2]
+            j += 1
+        windows.append((paras[i][0], paras[j - 1][1]))
+        if j >= len(paras):
+            return windows
+        k, shared = j, 0
+        while k - 1 > i and shared + paras[k - 1][2] <= overlap_tokens:
+            k -= 1
+            shared += paras[k][2]
+        i = k
+
+
+def attribute_window(text: str, model: str, additions: Optional[ChapterAdditions], perf_mode=None):
+    """run_attribution for one window (runs in-process or in a pool worker)."""
+    from app.core import character_detection
+
+    rows = character_detection.run_attribution(text, model=model, registry=additions, perf_mode=perf_mode)
+    return rows or [], additions
+
+
+def attribute_chapter(
+    text: str,
+    model: str = "big",
+    registry: Optional[ChapterAdditions] = None,
+    perf_mode=None,
+    progress=None,
+    cancel_event=None,
+    max_tokens: Optional[int] = None,
+    overlap_tokens: Optional[int] = None,
+    executor=None,
+) -> List[Dict]:
+    """Attribute one chapter, in windows when it is over the token budget.
+
+    max_tokens/overlap_tokens default to the environment settings. Windows run one after
+    another in this process, or side by side on executor (a concurrent.futures executor;
+    progress and cancel_event are only passed to in-process runs). registry, as for
+    run_attribution, receives the chapter's additions.
+    """
+    max_tokens = window_tokens() if max_tokens is None else max_tokens
+    overlap_tokens = window_overlap() if overlap_tokens is None else overlap_tokens
+    windows = plan_windows(text, max_tokens, overlap_tokens) if max_tokens and count_tokens(text) > max_tokens else []
+    if len(windows) <= 1:
+        from app.core import character_detection
+
+        return character_detection.run_attribution(
+            text, model=model, progress=progress, cancel_event=cancel_event, registry=registry, perf_mode=perf_mode
+        ) or []
+
+    print(f"[segments] {len(text)} chars -> {len(windows)} windows of <= {max_tokens} tokens")
+    parts = []
+    if executor is not None:
+        futures = [
+            executor.submit(attribute_window, text[b:e], model, _window_additions(registry, n), perf_mode)
+            for n, (b, e) in enumerate(windows)
+        ]
+        parts = [f.result() for f in futures]
+    else:
+        from app.core import character_detection
+
+        for n, (b, e) in enumerate(windows):
+            additions = _window_additions(registry, n)
+            rows = character_detection.run_attribution(
+                text[b:e],
+                model=model,
+                progress=progress,
+                cancel_event=cancel_event,
+                registry=additions,
+                perf_mode=perf_mode,
+            )
+            parts.append((rows or [], additions))
+
+    window_rows = [_shift_rows(rows, b) for (rows, _), (b, _) in zip(parts, windows)]
+    rows = stitch_rows(window_rows, windows, text)
+    renames = reconcile_names([a for _, a in parts if a is not None])
+    for r in rows:
+        if r.get("speaker") in renames:
+            r["speaker"] = renames[r["speaker"]]
+    if registry is not None:
+        for _, additions in parts:
+            registry.merge(additions, renames)
+        _recount_lines(registry, rows)
+    return rows
+
+
+def _window_additions(registry: Optional[ChapterAdditions], n: int) -> Optional[ChapterAdditions]:
+    """Fresh additions for window n against the chapter's snapshot, so windows don't see each other."""
+    if registry is None:
+        return None
+    return ChapterAdditions((registry.key, n), registry.snapshot)
+
+
+def _shift_rows(rows: List[Dict], offset: int) -> List[Dict]:
+    """Window rows with chapter offsets; a row without a span is pinned where the previous one ended."""
+    out, cursor = [], offset
+    for r in rows:
+        r = dict(r)
+        span = get_span(r)
+        if span is None:
+            r["_window_pos"] = cursor
+        else:
+            r[BEGIN], r[END] = span[0] + offset, span[1] + offset
+            cursor = r[END]
+        out.append(r)
+    return out
+
+
+def _pos(row: Dict) -> Tuple[int, int]:
+    span = get_span(row)
+    if span is None:
+        return row["_window_pos"], row["_window_pos"]
+    return span
+
+
+def _crossed(rows: List[Dict], cut: int) -> bool:
+    return any(b < cut < e for b, e in map(_pos, rows))
+
+
+def _choose_cut(left: List[Dict], right: List[Dict], lo: int, hi: int, breaks: List[int]) -> int:
+    """The paragraph or row boundary in [lo, hi] nearest the middle that no row of either window crosses."""
+    mid = (lo + hi) // 2
+    starts = [_pos(r)[0] for r in right]
+    candidates = sorted({c for c in breaks + starts if lo <= c <= hi}, key=lambda c: (abs(c - mid), c))
+    for cut in candidates:
+        if not _crossed(left, cut) and not _crossed(right, cut):
+            return cut
+    return candidates[0] if candidates else mid
+
+
+def _trim_front(row: Dict, at: int, text: str) -> Optional[Dict]:
+    """row with its text cut to start at chapter offset at (None if nothing is left)."""
+    _, end = _pos(row)
+    piece = text[at:end]
+    if not piece.strip():
+        return None
+    begin = at + len(piece) - len(piece.lstrip())
+    return dict(row, text=piece.strip(), **{BEGIN: begin, END: begin + len(piece.strip())})
+
+
+def stitch_rows(window_rows: List[List[Dict]], windows: List[Window], text: str) -> List[Dict]:
+    """One chapter's rows from its windows' rows (already in chapter offsets).
+
+    Every overlap is cut once: the left window keeps the rows that start before the cut, the
+    right one the rows that start after whatever the left window kept. When both windows
+    have a row across every boundary in the overlap, the right window's row is trimmed to
+    start where the left window's text ended, so nothing is read twice or dropped.
+    """
+    breaks = [e for _, e, _ in paragraphs(text)]
+    cuts = [
+        _choose_cut(window_rows[n], window_rows[n + 1], windows[n + 1][0], windows[n][1], breaks)
+        for n in range(len(windows) - 1)
+    ]
+    out, kept_until = [], 0
+    for n, rows in enumerate(window_rows):
+        cut = cuts[n] if n < len(cuts) else len(text) + 1
+        for r in rows:
+            begin, end = _pos(r)
+            if kept_until <= begin < cut:
+                out.append(r)
+            elif begin < kept_until < end and kept_until < cut:
+                trimmed = _trim_front(r, kept_until, text)
+                if trimmed is not None:
+                    out.append(trimmed)
+        kept_until = max([cut] + [_pos(r)[1] for r in out[-1:]])
+    for r in out:
+        r.pop("_window_pos", None)
+    return place_spans(out, SourceText(text))
+
+
+def reconcile_names(parts: List[ChapterAdditions]) -> Dict[str, str]:
+    """Single-token names one window settled on -> the one full name another window found for them."""
+    canonicals = set()
+    for additions in parts:
+        canonicals |= additions.canonicals
+    by_token: Dict[str, set] = {}
+    for name in canonicals:
+        tokens = name.split()
+        if len(tokens) > 1:
+            for tok in tokens:
+                by_token.setdefault(tok.lower(), set()).add(name)
+    renames = {}
+    for name in canonicals:
+        if " " in name:
+            continue
+        full = by_token.get(name.lower(), set())
+        if len(full) == 1:
+            renames[name] = next(iter(full))
+    return renames
+
+
+def _recount_lines(registry: ChapterAdditions, rows: List[Dict]):
+    """Line counts from the stitched rows; the windows' own counts include the overlaps twice."""
+    known = registry.canonicals | registry.snapshot.canonicals
+    registry.line_counts.clear()
+    for r in rows:
+        if r.get("speaker") in known:
+            registry.count_line(r["speaker"])
@@ -0,0 +1,197 @@
+"""
+Pipeline Logging
+Leveled, buffered logging for the attribution pipeline. Log lines and trace TSV rows go into
+a bounded in-memory queue; one background thread writes them in batches to files it keeps
+open, so the passes never open/close a file per line. Messages below the current level are
+dropped before they are formatted, and perf mode (one run, or POLYVOX_PERF_MODE=1) turns
+off row-level tracing and everything below INFO.
+
+    POLYVOX_LOG_LEVEL=trace|debug|info|warning|error   (default: debug)
+"""
+
+import atexit
+import datetime
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+TRACE = 5
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+LEVELS = {"trace": TRACE, "debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+
+LOG_LEVEL_ENV = "POLYVOX_LOG_LEVEL"
+PERF_MODE_ENV = "POLYVOX_PERF_MODE"
+
+QUEUE_SIZE = 10000  # pending writes; callers wait when the writer falls this far behind
+BATCH_SIZE = 512  # writes handled per wake-up before the touched files are flushed
+MAX_OPEN_FILES = 32  # least recently written files are closed beyond this
+
+
+def _env_level() -> int:
+    return LEVELS.get(os.environ.get(LOG_LEVEL_ENV, "").strip().lower(), DEBUG)
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+_level = _env_level()
+_perf_mode = _env_flag(PERF_MODE_ENV)
+
+
+def set_level(level: int):
+    global _level
+    _level = level
+
+
+def get_level() -> int:
+    return _level
+
+
+def set_perf_mode(enabled: bool) -> bool:
+    """Turn perf mode on/off; returns the previous setting so callers can restore it."""
+    global _perf_mode
+    previous = _perf_mode
+    _perf_mode = bool(enabled)
+    return previous
+
+
+def perf_mode() -> bool:
+    return _perf_mode
+
+
+def enabled(level: int) -> bool:
+    """Would a message at level be written? Check before building expensive messages."""
+    return level >= (max(_level, INFO) if _perf_mode else _level)
+
+
+def row_tracing() -> bool:
+    """Whether per-row trace output (TSV snapshots, row dumps) should be produced."""
+    return not _perf_mode
+
+
+class AsyncFileWriter:
+    """Appends text to files from a background thread, in order per process.
+
+    write() only enqueues; the writer thread drains up to BATCH_SIZE items at a time,
+    keeps each file open between batches and flushes what it touched. A truncating write
+    replaces the file's content, ordered with the appends queued before it.
+    """
+
+    def __init__(self, maxsize: int = QUEUE_SIZE):
+        self._queue: "queue.Queue" = queue.Queue(maxsize)
+        self._files: "OrderedDict[str, object]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._reported_error = False
+
+    def write(self, path: str, payload, truncate: bool = False):
+        """Queue payload (a str, or a (created, message) log record) for path."""
+        if self._thread is None:
+            self._start()
+        self._queue.put((path, payload, truncate))
+
+    def flush(self):
+        """Block until everything queued so far is on disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        self.flush()
+        for f in self._files.values():
+            try:
+                f.close()
+            except Exception:
+                pass
+        self._files.clear()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pipeline-log", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < BATCH_SIZE:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            touched = set()
+            for path, payload, truncate in batch:
+                try:
+                    self._write_one(path, payload, truncate)
+                    touched.add(path)
+                except Exception as e:
+                    self._report(e)
+            for path in touched:
+                try:
+                    self._files[path].flush()
+                except Exception as e:
+                    self._report(e)
+            while len(self._files) > MAX_OPEN_FILES:
+                _, f = self._files.popitem(last=False)
+                try:
+                    f.close()
+                except Exception as e:
+                    self._report(e)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_one(self, path: str, payload, truncate: bool):
+        f = self._files.get(path)
+        if truncate or f is None:
+            if f is not None:
+                f.close()
+            f = open(path, "w" if truncate else "a", encoding="utf-8", newline="")
+            self._files[path] = f
+        else:
+            self._files.move_to_end(path)
+        if isinstance(payload, tuple):
+            created, msg = payload
+            stamp = datetime.datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S")
+            payload = f"[{stamp}] {msg}\n"
+        f.write(payload)
+
+    def _report(self, error: Exception):
+        if not self._reported_error:
+            self._reported_error = True
+            print(f"[pipeline_log] write failed: {error}", file=sys.stderr)
+
+
+_writer = AsyncFileWriter()
+atexit.register(_writer.close)
+
+
+def get_writer() -> AsyncFileWriter:
+    return _writer
+
+
+def flush():
+    """Wait until all queued log lines and trace rows are written."""
+    _writer.flush()
+
+
+class PipelineLog:
+    """A log file fed through the shared writer; timestamps are formatted by the writer thread."""
+
+    def __init__(self, path: str, writer: Optional[AsyncFileWriter] = None):
+        self.path = path
+        self.writer = writer or _writer
+
+    def log(self, msg: str, *args, level: int = DEBUG):
+        if not enabled(level):
+            return
+        if args:
+            msg = msg % args
+        self.writer.write(self.path, (time.time(), msg))
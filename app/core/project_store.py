@@ -0,0 +1,460 @@
+"""
+Project Store
+One SQLite file per book project: chapters (title, text, detection metadata), attribution
+rows with their source offsets, speaker colors, the speaker -> voice mapping and per-line
+synthesis state. Rows live one per table row, so a save rewrites only the rows that changed
+since the last load or save, and chapter text is read only when something asks for it.
+Projects saved by older versions as one JSON list of chapters are imported with import_json().
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_EXT = ".polyvox"
+SCHEMA_VERSION = 1
+
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+
+# row keys with a column of their own; everything else goes into the row's "extra" JSON
+_ROW_COLUMNS = ("speaker", "text", "is_quote", "_char_begin", "_char_end")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS chapters (
+    idx INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    text_crc INTEGER NOT NULL,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS rows (
+    chapter INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    speaker TEXT,
+    text TEXT,
+    is_quote INTEGER,
+    char_begin INTEGER,
+    char_end INTEGER,
+    extra TEXT,
+    PRIMARY KEY (chapter, pos)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS speakers (name TEXT PRIMARY KEY, color TEXT);
+CREATE TABLE IF NOT EXISTS voices (speaker TEXT PRIMARY KEY, voice TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS synthesis (
+    chapter INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    path TEXT,
+    PRIMARY KEY (chapter, pos)
+) WITHOUT ROWID;
+"""
+
+
+class ProjectError(Exception):
+    """The file is not a project this version can open."""
+
+
+def is_project_file(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def _dumps(data: Dict) -> Optional[str]:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")) if data else None
+
+
+def _row_record(row: Dict) -> Tuple:
+    """The column values a row is stored as (also what saves compare to find changed rows)."""
+    extra = {k: v for k, v in row.items() if k not in _ROW_COLUMNS}
+    is_quote = row.get("is_quote")
+    return (
+        row.get("speaker"),
+        row.get("text"),
+        None if is_quote is None else int(bool(is_quote)),
+        row.get("_char_begin"),
+        row.get("_char_end"),
+        _dumps(extra),
+    )
+
+
+def _row_from_record(speaker, text, is_quote, begin, end, extra) -> Dict:
+    row = json.loads(extra) if extra else {}
+    row["speaker"] = speaker
+    row["text"] = text
+    if is_quote is not None:
+        row["is_quote"] = bool(is_quote)
+    if begin is not None:
+        row["_char_begin"], row["_char_end"] = begin, end
+    return row
+
+
+class ProjectChapter(dict):
+    """A chapter dict whose "text" is read from the store the first time it is used.
+
+    Anything that walks the whole chapter (keys/items/values, iteration, dict(), json, copy)
+    reads the text first, so it always sees a complete chapter.
+    """
+
+    def __init__(self, store: "ProjectStore", idx: int, data: Dict):
+        super().__init__(data)
+        self._store = store
+        self._idx = idx
+
+    def _load_text(self):
+        if not dict.__contains__(self, "text"):
+            dict.__setitem__(self, "text", self._store.chapter_text(self._idx))
+
+    def text_loaded(self) -> bool:
+        return dict.__contains__(self, "text")
+
+    def __getitem__(self, key):
+        if key == "text":
+            self._load_text()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key == "text":
+            self._load_text()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return key == "text" or dict.__contains__(self, key)
+
+    def __len__(self):
+        return dict.__len__(self) + (0 if self.text_loaded() else 1)
+
+    def __iter__(self):
+        self._load_text()
+        return dict.__iter__(self)
+
+    def keys(self):
+        self._load_text()
+        return dict.keys(self)
+
+    def items(self):
+        self._load_text()
+        return dict.items(self)
+
+    def values(self):
+        self._load_text()
+        return dict.values(self)
+
+    def copy(self) -> Dict:
+        self._load_text()
+        return dict(dict.items(self))
+
+    def __reduce_ex__(self, protocol):
+        # copies and pickles are plain, complete dicts; the store itself can't be copied
+        return dict, (self.copy(),)
+
+
+def load_texts(chapters: List[Dict]):
+    """Read the text of every lazy chapter now, e.g. before its store is closed."""
+    for chapter in chapters:
+        if isinstance(chapter, ProjectChapter):
+            chapter._load_text()
+
+
+def snapshot_chapters(chapters: List[Dict], store: Optional["ProjectStore"] = None) -> List[Dict]:
+    """Copies of chapters and their rows that a save on another thread can read while the UI edits.
+
+    Strings are shared, not copied; a ProjectChapter of store whose text was never loaded stays
+    lazy, the text of any other chapter is read now.
+    """
+    out = []
+    for idx, chapter in enumerate(chapters):
+        data = {k: v for k, v in dict.items(chapter) if k != "results"}
+        data["results"] = [dict(r) for r in chapter.get("results") or [] if isinstance(r, dict)]
+        if store is not None and store._text_on_disk(chapter, idx):
+            out.append(ProjectChapter(chapter._store, idx, data))
+        else:
+            if "text" not in data:
+                data["text"] = chapter.get("text") or ""
+            out.append(data)
+    return out
+
+
+class ProjectStore:
+    """An open project file. Safe to share between the UI thread and a saver thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists and not is_project_file(path):
+            raise ProjectError(f"Not a project file: {path}")
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        version = self.get_meta("schema_version")
+        if version is None:
+            self.set_meta("schema_version", str(SCHEMA_VERSION))
+        elif int(version) > SCHEMA_VERSION:
+            self._db.close()
+            raise ProjectError(f"Project {path} was saved by a newer version (schema {version})")
+        # what each chapter looked like at the last load/save: (title, text crc, extra), [row records]
+        self._saved: Dict[int, Tuple[Tuple, List[Tuple]]] = {}
+
+    @classmethod
+    def create(cls, path: str) -> "ProjectStore":
+        """A new, empty project at path (an existing file there is replaced)."""
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        return cls(path)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _transaction(self):
+        return _Transaction(self._db, self._lock)
+
+    # ---------- Meta ----------
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # ---------- Chapters and rows ----------
+    def load_chapters(self) -> List[ProjectChapter]:
+        """All chapters with their rows; each chapter's text is loaded on first access."""
+        with self._lock:
+            heads = self._db.execute("SELECT idx, title, text_crc, extra FROM chapters ORDER BY idx").fetchall()
+            records: Dict[int, List[Tuple]] = {idx: [] for idx, _, _, _ in heads}
+            cursor = self._db.execute(
+                "SELECT chapter, speaker, text, is_quote, char_begin, char_end, extra FROM rows ORDER BY chapter, pos"
+            )
+            for chapter, *record in cursor:
+                records.setdefault(chapter, []).append(tuple(record))
+
+            chapters, saved = [], {}
+            for idx, title, crc, extra in heads:
+                data = json.loads(extra) if extra else {}
+                data["title"] = title
+                data["results"] = [_row_from_record(*r) for r in records[idx]]
+                chapters.append(ProjectChapter(self, idx, data))
+                saved[idx] = ((title, crc, extra), records[idx])
+            self._saved = saved
+        return chapters
+
+    def chapter_text(self, idx: int) -> str:
+        with self._lock:
+            row = self._db.execute("SELECT text FROM chapters WHERE idx = ?", (idx,)).fetchone()
+        return row[0] if row else ""
+
+    def chapter_rows(self, idx: int) -> List[Dict]:
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT speaker, text, is_quote, char_begin, char_end, extra FROM rows WHERE chapter = ? ORDER BY pos",
+                (idx,),
+            )
+            return [_row_from_record(*r) for r in cursor]
+
+    def save_chapters(self, chapters: List[Dict]) -> int:
+        """Write chapters, touching only what changed since the last load/save; returns rows written.
+
+        A chapter whose text was never loaded (a ProjectChapter) keeps the text on disk.
+        """
+        written, saved = 0, {}
+        # the lock spans the write and the new baseline, so another save can't diff against a stale one
+        with self._lock:
+            with self._transaction() as db:
+                for idx, chapter in enumerate(chapters):
+                    n, saved[idx] = self._save_chapter(db, idx, chapter)
+                    written += n
+                db.execute("DELETE FROM chapters WHERE idx >= ?", (len(chapters),))
+                db.execute("DELETE FROM rows WHERE chapter >= ?", (len(chapters),))
+                db.execute("DELETE FROM synthesis WHERE chapter >= ?", (len(chapters),))
+            # only once the transaction went through is this what the file holds
+            self._saved = saved
+        return written
+
+    def _save_chapter(self, db, idx: int, chapter: Dict) -> int:
+        # dict.items: the chapter's own items() would read text that may stay on disk
+        extra = _dumps({k: v for k, v in dict.items(chapter) if k not in ("title", "text", "results")})
+        saved_head, saved_rows = self._saved.get(idx, (None, []))
+        text = None
+        if self._text_on_disk(chapter, idx) and saved_head is not None:
+            crc = saved_head[1]
+        else:
+            text = chapter.get("text") or ""
+            crc = zlib.crc32(text.encode("utf-8"))
+        head = (chapter.get("title") or "", crc, extra)
+        if saved_head is None:
+            db.execute("DELETE FROM rows WHERE chapter = ?", (idx,))
+            db.execute(
+                "INSERT OR REPLACE INTO chapters (idx, title, text, text_crc, extra) VALUES (?, ?, ?, ?, ?)",
+                (idx, head[0], text or "", crc, extra),
+            )
+        elif head != saved_head:
+            if text is not None and crc != saved_head[1]:
+                db.execute(
+                    "UPDATE chapters SET title = ?, text = ?, text_crc = ?, extra = ? WHERE idx = ?",
+                    (head[0], text, crc, extra, idx),
+                )
+            else:
+                db.execute("UPDATE chapters SET title = ?, extra = ? WHERE idx = ?", (head[0], extra, idx))
+
+        records = [_row_record(r) for r in chapter.get("results") or [] if isinstance(r, dict)]
+        changed = [
+            (idx, pos) + rec
+            for pos, rec in enumerate(records)
+            if pos >= len(saved_rows) or saved_rows[pos] != rec
+        ]
+        if changed:
+            db.executemany(
+                "INSERT OR REPLACE INTO rows (chapter, pos, speaker, text, is_quote, char_begin, char_end, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                changed,
+            )
+        if len(records) < len(saved_rows):
+            db.execute("DELETE FROM rows WHERE chapter = ? AND pos >= ?", (idx, len(records)))
+        return len(changed), (head, records)
+
+    def _text_on_disk(self, chapter: Dict, idx: int) -> bool:
+        """Whether chapter is this store's chapter idx with its text still unread."""
+        return (
+            isinstance(chapter, ProjectChapter)
+            and chapter._store is self
+            and chapter._idx == idx
+            and not chapter.text_loaded()
+        )
+
+    def write_rows(self, chapter: int, rows: Dict[int, Dict]):
+        """Write single rows ({pos: row}) right away, e.g. after one line was reassigned."""
+        records = {pos: _row_record(r) for pos, r in rows.items()}
+        with self._lock:
+            with self._transaction() as db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO rows (chapter, pos, speaker, text, is_quote, char_begin, char_end, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(chapter, pos) + rec for pos, rec in records.items()],
+                )
+            saved = self._saved.get(chapter)
+            if saved is not None:
+                for pos, rec in records.items():
+                    if pos < len(saved[1]):
+                        saved[1][pos] = rec
+
+    def backup(self, dest: str):
+        """Copy the project to dest as one consistent snapshot (dest is replaced atomically)."""
+        tmp = f"{dest}.tmp{os.getpid()}"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        target = sqlite3.connect(tmp)
+        try:
+            with self._lock:
+                self._db.backup(target)
+        finally:
+            target.close()
+        os.replace(tmp, dest)
+
+    # ---------- Speakers and voices ----------
+    def speaker_colors(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._db.execute("SELECT name, color FROM speakers WHERE color IS NOT NULL"))
+
+    def save_speaker_colors(self, colors: Dict[str, str]):
+        with self._transaction() as db:
+            db.execute("DELETE FROM speakers")
+            db.executemany("INSERT INTO speakers (name, color) VALUES (?, ?)", sorted(colors.items()))
+
+    def voice_map(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._db.execute("SELECT speaker, voice FROM voices"))
+
+    def set_voice(self, speaker: str, voice: Optional[str]):
+        with self._lock:
+            if voice:
+                self._db.execute("INSERT OR REPLACE INTO voices (speaker, voice) VALUES (?, ?)", (speaker, voice))
+            else:
+                self._db.execute("DELETE FROM voices WHERE speaker = ?", (speaker,))
+
+    def save_voice_map(self, selections: Dict[str, str]):
+        with self._transaction() as db:
+            db.execute("DELETE FROM voices")
+            db.executemany(
+                "INSERT INTO voices (speaker, voice) VALUES (?, ?)",
+                [(k, v) for k, v in sorted(selections.items()) if v],
+            )
+
+    # ---------- Synthesis state ----------
+    def set_synthesis(self, chapter: int, pos: int, status: str, path: Optional[str] = None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO synthesis (chapter, pos, status, path) VALUES (?, ?, ?, ?)",
+                (chapter, pos, status, path),
+            )
+
+    def synthesis_state(self, chapter: int) -> Dict[int, Tuple[str, Optional[str]]]:
+        """{row pos: (status, wav path)} for one chapter."""
+        with self._lock:
+            cursor = self._db.execute("SELECT pos, status, path FROM synthesis WHERE chapter = ?", (chapter,))
+            return {pos: (status, path) for pos, status, path in cursor}
+
+
+class _Transaction:
+    def __init__(self, db: sqlite3.Connection, lock):
+        self._db = db
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        self._db.execute("BEGIN")
+        return self._db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._db.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self._lock.release()
+
+
+def load_json_chapters(path: str) -> List[Dict]:
+    """A legacy JSON save: a list of {"title", "text", "results", ...}."""
+    with open(path, "r", encoding="utf-8") as f:
+        chapters = json.load(f)
+    if not isinstance(chapters, list):
+        raise ProjectError("Invalid file format")
+    for chapter in chapters:
+        if not isinstance(chapter, dict) or "title" not in chapter or "text" not in chapter:
+            raise ProjectError("Invalid chapter structure")
+    return chapters
+
+
+def import_json(json_path: str, project_path: Optional[str] = None, selections_path: Optional[str] = None) -> str:
+    """Convert a legacy JSON save (and optionally a voice selections file) to a project file.
+
+    project_path defaults to the JSON path with PROJECT_EXT. Returns the project path.
+    """
+    chapters = load_json_chapters(json_path)
+    project_path = project_path or os.path.splitext(json_path)[0] + PROJECT_EXT
+    if os.path.exists(project_path):
+        raise ProjectError(f"Project already exists: {project_path}")
+    with ProjectStore(project_path) as store:
+        store.save_chapters(chapters)
+        if selections_path and os.path.exists(selections_path):
+            with open(selections_path, "r", encoding="utf-8") as f:
+                store.save_voice_map(json.load(f) or {})
+        store.set_meta("imported_from", os.path.abspath(json_path))
+    return project_path
+
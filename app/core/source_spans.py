@@ -0,0 +1,121 @@
+"""
+Source Spans
+Every attribution row carries _char_begin/_char_end: the [begin, end) range of the chapter
+text it came from (book_processor sets them from the BookNLP token offsets). Passes that merge
+rows take the union of their spans, passes that split a row place each piece inside the
+parent's span, and place_spans() repairs rows a pass rebuilt without (or with stale) spans, so
+any row can be mapped back to the source in O(1).
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+BEGIN = "_char_begin"
+END = "_char_end"
+
+Span = Tuple[int, int]
+
+# curly quotes/guillemets -> ASCII, one character for one, so offsets survive the folding
+_FOLD = str.maketrans({"“": '"', "”": '"', "«": '"', "»": '"', "‘": "'", "’": "'"})
+
+SEARCH_SLACK = 200  # how far before the previous row's end a row without a span may start
+SEARCH_WINDOW = 2000  # how far past it
+
+
+def get_span(row: dict) -> Optional[Span]:
+    begin, end = row.get(BEGIN), row.get(END)
+    if begin is None or end is None:
+        return None
+    return begin, end
+
+
+def set_span(row: dict, span: Optional[Span]) -> dict:
+    if span is not None:
+        row[BEGIN], row[END] = span
+    return row
+
+
+def merge_span(dst: dict, rows: Iterable[dict]) -> dict:
+    """Give dst the union of the spans of rows (rows without a span are ignored)."""
+    spans = [s for s in (get_span(r) for r in rows) if s is not None]
+    if spans:
+        dst[BEGIN] = min(b for b, _ in spans)
+        dst[END] = max(e for _, e in spans)
+    return dst
+
+
+def sub_span(parent: dict, start: int, end: int) -> Optional[Span]:
+    """Span of parent["text"][start:end], if the parent's text still lines up with its span."""
+    span = get_span(parent)
+    text = parent.get("text") or ""
+    if span is None or span[1] - span[0] != len(text):
+        return None
+    return span[0] + start, span[0] + end
+
+
+def split_span(parent: dict, child: dict, pos: int = 0) -> int:
+    """Place child (a piece cut from parent["text"]) inside the parent's span.
+
+    Pieces are looked up in order from pos; returns where the next piece's search starts.
+    When the piece can't be pinned down exactly the child keeps the parent's span.
+    """
+    text = parent.get("text") or ""
+    piece = (child.get("text") or "").strip()
+    at = text.find(piece, pos) if piece else -1
+    if at < 0:
+        set_span(child, get_span(parent))
+        return pos
+    set_span(child, sub_span(parent, at, at + len(piece)) or get_span(parent))
+    return at + len(piece)
+
+
+class SourceText:
+    """The text a run was attributed from, with a quote-folded copy for lookups."""
+
+    def __init__(self, text: str):
+        self.text = text or ""
+        self.folded = self.text.translate(_FOLD)
+
+    def find(self, piece: str, lo: int, hi: int) -> Optional[Span]:
+        piece = (piece or "").strip().translate(_FOLD)
+        if not piece:
+            return None
+        at = self.folded.find(piece, max(0, lo), min(len(self.folded), hi))
+        if at < 0:
+            return None
+        return at, at + len(piece)
+
+    def matches(self, piece: str, span: Span) -> bool:
+        """Whether the source at span reads piece (up to quote folding and outer whitespace)."""
+        piece = (piece or "").strip().translate(_FOLD)
+        return bool(piece) and self.folded[span[0]:span[1]] == piece
+
+
+def place_spans(rows: List[dict], source: Optional[SourceText]) -> List[dict]:
+    """Fill in missing spans and tighten inexact ones, in place.
+
+    A row whose span reads exactly its stripped text in the source is taken as placed. Others are
+    searched for inside their own span (split pieces that inherited the parent's span), then
+    just after the previous row (rows without a span, or with one measured in another text).
+    A merged row whose text was re-joined and is found nowhere keeps its union span.
+    """
+    if not rows or source is None:
+        return rows
+    cursor = 0
+    for r in rows:
+        text = (r.get("text") or "").strip()
+        span = get_span(r)
+        if span is not None and source.matches(text, span):
+            cursor = max(cursor, span[1])
+            continue
+        found = None
+        if span is not None:
+            lo = max(span[0], min(cursor, span[1]))
+            found = source.find(text, lo, span[1]) or source.find(text, span[0], span[1])
+        if found is None:
+            found = source.find(text, cursor - SEARCH_SLACK, cursor + len(text) + SEARCH_WINDOW)
+        if found is not None:
+            set_span(r, found)
+            cursor = max(cursor, found[1])
+        elif span is not None:
+            cursor = max(cursor, span[1])
+    return rows
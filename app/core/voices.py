@@ -1,9 +1,7 @@
 import os
-import torch
-from TTS.api import TTS
-from app.core.gpu_manager import get_device, release_device
 from app.engine.text_preprocessor import TextPreprocessor
 from app.engine.audio_postprocessor import AudioPostProcessor
+from app.engine.base import TTSEngine, get_active_engine
 
 # Global XTTS model instance (lazy loaded)
 _tts_model = None
@@ -14,6 +12,10 @@ def get_tts_model():
     """Lazy load and return the XTTS model."""
     global _tts_model
     if _tts_model is None:
+        # torch/TTS take seconds to import; keep them off the GUI's startup path
+        import torch
+        from TTS.api import TTS
+
         print("[voices.py] Loading XTTS v2 model...")
         _tts_model = TTS("tts_models/multilingual/multi-dataset/xtts_v2")
         # Move to CUDA if available
@@ -39,11 +41,35 @@ def get_postprocessor():
     return _postprocessor
 
 def synthesize_text(voice_entry, text, out_path, job_idx=0):
+    """
+    Generate speech audio from text with the active TTS engine (XTTS v2 unless
+    POLYVOX_TTS_ENGINE selects another, see app.engine.base).
+    """
+    return get_active_engine().synthesize(text, voice_entry, out_path, {"job_idx": job_idx})
+
+
+class XTTSEngine(TTSEngine):
+    """Coqui XTTS v2 with reference-audio voice cloning."""
+
+    name = "XTTS v2"
+
+    def synthesize(self, text, voice, out_path, settings=None):
+        if not isinstance(voice, dict):
+            raise ValueError(f"XTTS needs a voice entry with a voice_file, got {voice!r}")
+        return _synthesize_xtts(voice, text, out_path, job_idx=(settings or {}).get("job_idx", 0))
+
+    def supports_cloning(self):
+        return True
+
+
+def _synthesize_xtts(voice_entry, text, out_path, job_idx=0):
     """
     Generate speech audio from text using XTTS v2.
     Auto-distributes jobs across available GPUs with automatic CPU fallback.
     Uses GPU manager for intelligent multi-GPU load balancing.
     """
+    from app.core.gpu_manager import get_device, release_device
+
     device_str = None
     try:
         # Get device from GPU manager (handles multi-GPU and CPU fallback)
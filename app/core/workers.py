@@ -3,6 +3,7 @@ from tkinter import filedialog, ttk, messagebox
 import threading
 import os
 import subprocess
+import sys
 
 class ChapterProcessingTab(ttk.Frame):
     def __init__(self, master, *args, **kwargs):
@@ -72,11 +73,12 @@ class ChapterProcessingTab(ttk.Frame):
         mode = self.proc_mode.get()
         gpus = self.gpu_ids.get().strip()
 
-        cmd = ["python", "-m", "app.core.workers", "--input", infile, "--out", outdir]
+        cmd = [sys.executable, "-m", "app.cli", "run", infile, "--out", outdir, "--resume"]
         if mode == "cpu":
-            cmd.append("--cpu")
+            cmd.extend(["--device", "cpu"])
         elif mode == "manual" and gpus:
-            cmd.extend(["--gpus", gpus])
+            ids = [g.strip() for g in gpus.split(",") if g.strip()]
+            cmd.extend(["--device", ",".join(f"cuda:{g}" for g in ids), "--workers", str(len(ids))])
 
         self.status_text.set("Running...")
         self._clear_log()
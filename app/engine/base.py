@@ -1,12 +1,100 @@
-from typing import List, Dict, Any, Optional
+"""
+TTS Engine Interface
+Every speech back end implements TTSEngine. synthesize_text() (app.core.voices) runs the
+active engine, which is XTTS v2 unless POLYVOX_TTS_ENGINE or set_active_engine() picks
+another one, e.g. the offline "fake" engine:
+
+    POLYVOX_TTS_ENGINE=fake
+    POLYVOX_TTS_ENGINE=fake:latency=0.05,failure_rate=0.1,waveform=noise
+"""
+
+import importlib
+import os
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+ENGINE_ENV = "POLYVOX_TTS_ENGINE"
+DEFAULT_ENGINE = "xtts"
+
+# name -> "module:Class"; engines are imported only when first used
+ENGINES: Dict[str, str] = {
+    "xtts": "app.core.voices:XTTSEngine",
+    "fake": "app.engine.fake_engine:FakeTTSEngine",
+}
+
+Voice = Union[str, Dict[str, Any]]
+
 
 class TTSEngine:
     name = "Base"
+
     def list_voices(self) -> List[Dict[str, Any]]:
         return []
-    def synthesize(self, text: str, voice_id: str, out_path: str, settings: Optional[Dict[str,Any]]=None) -> str:
+
+    def synthesize(self, text: str, voice: Voice, out_path: str, settings: Optional[Dict[str, Any]] = None) -> str:
+        """Write speech for text to out_path (WAV) and return out_path.
+
+        voice is a voice entry from the voices file ({"id", "voice_file", "language", ...})
+        or a bare voice id; settings carries per-call options such as job_idx.
+        """
         raise NotImplementedError
+
     def supports_cloning(self) -> bool:
         return False
+
     def clone_voice(self, samples: list[str], out_id: str) -> Dict[str, Any]:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+
+def register_engine(name: str, target: str):
+    """Make an engine available by name; target is "module:Class"."""
+    ENGINES[name.lower()] = target
+
+
+def parse_engine_spec(spec: str):
+    """'fake:latency=0.1,waveform=noise' -> ("fake", {"latency": 0.1, "waveform": "noise"})."""
+    name, _, opts = (spec or DEFAULT_ENGINE).partition(":")
+    options: Dict[str, Any] = {}
+    for item in opts.split(","):
+        key, sep, value = item.partition("=")
+        if not sep or not key.strip():
+            continue
+        value = value.strip()
+        for cast in (int, float):
+            try:
+                value = cast(value)
+                break
+            except ValueError:
+                pass
+        options[key.strip()] = value
+    return name.strip().lower() or DEFAULT_ENGINE, options
+
+
+def create_engine(spec: str) -> TTSEngine:
+    """A new engine from a spec string (see parse_engine_spec)."""
+    name, options = parse_engine_spec(spec)
+    if name not in ENGINES:
+        raise ValueError(f"Unknown TTS engine '{name}' (available: {', '.join(sorted(ENGINES))})")
+    module_name, _, class_name = ENGINES[name].partition(":")
+    engine_cls = getattr(importlib.import_module(module_name), class_name)
+    return engine_cls(**options)
+
+
+_active: Optional[TTSEngine] = None
+_active_lock = threading.Lock()
+
+
+def get_active_engine() -> TTSEngine:
+    """The engine synthesize_text() uses; created from POLYVOX_TTS_ENGINE on first use."""
+    global _active
+    with _active_lock:
+        if _active is None:
+            _active = create_engine(os.environ.get(ENGINE_ENV, DEFAULT_ENGINE))
+        return _active
+
+
+def set_active_engine(engine: Union[TTSEngine, str, None]):
+    """Switch engines (an instance or a spec string); None goes back to the environment default."""
+    global _active
+    with _active_lock:
+        _active = create_engine(engine) if isinstance(engine, str) else engine
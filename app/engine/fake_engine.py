@@ -0,0 +1,140 @@
+"""
+Fake TTS Engine
+Deterministic stand-in for XTTS: writes a tone, noise or silence WAV whose length follows
+the text, with optional simulated latency and failures. Needs no model weights, GPU or
+network, so the processing loop, quality checks, scheduling and merging can run in CI,
+on air-gapped machines and in load tests.
+"""
+
+import math
+import os
+import random
+import struct
+import threading
+import time
+import wave
+import zlib
+from typing import Any, Dict, List, Optional
+
+from app.engine.base import TTSEngine, Voice
+
+WAVEFORMS = ("tone", "noise", "silence")
+
+
+class FakeTTSError(RuntimeError):
+    """A failure injected by FakeTTSEngine (failure_rate)."""
+
+
+class FakeTTSEngine(TTSEngine):
+    """Fake speech: duration = seconds_per_char * len(text) (at least min_seconds).
+
+    The tone's pitch is derived from the voice, so each voice sounds different, and the
+    default level passes AudioQualityChecker. Every call takes latency seconds plus
+    realtime_factor times the audio length, plus up to jitter seconds more. A share
+    failure_rate of calls raise FakeTTSError.
+
+    Results depend only on seed, the voice, the text and how many times that text was
+    asked for before: a retry of a failed line can succeed, and runs are reproducible
+    whatever order the threads call in.
+    """
+
+    name = "Fake"
+
+    def __init__(
+        self,
+        seed: int = 0,
+        sample_rate: int = 22050,
+        seconds_per_char: float = 0.07,
+        min_seconds: float = 0.3,
+        waveform: str = "tone",
+        amplitude: float = 0.2,
+        latency: float = 0.0,
+        realtime_factor: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+    ):
+        if waveform not in WAVEFORMS:
+            raise ValueError(f"waveform must be one of {WAVEFORMS}")
+        self.seed = seed
+        self.sample_rate = int(sample_rate)
+        self.seconds_per_char = float(seconds_per_char)
+        self.min_seconds = float(min_seconds)
+        self.waveform = waveform
+        self.amplitude = float(amplitude)
+        self.latency = float(latency)
+        self.realtime_factor = float(realtime_factor)
+        self.jitter = float(jitter)
+        self.failure_rate = float(failure_rate)
+        self._attempts: Dict[str, int] = {}
+        self._blocks: Dict[int, bytes] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def list_voices(self) -> List[Dict[str, Any]]:
+        return [
+            {"id": f"fake_{i}", "label": f"Fake Voice {i}", "engine": "fake", "language": "en"}
+            for i in range(1, 9)
+        ]
+
+    def duration_for(self, text: str) -> float:
+        return max(self.min_seconds, len(text or "") * self.seconds_per_char)
+
+    def synthesize(self, text: str, voice: Voice, out_path: str, settings: Optional[Dict[str, Any]] = None) -> str:
+        voice_id = _voice_id(voice)
+        key = f"{voice_id}\x00{text}"
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+            self.calls += 1
+        rng = random.Random(f"{self.seed}|{key}|{attempt}")
+
+        seconds = self.duration_for(text)
+        delay = self.latency + self.realtime_factor * seconds + rng.uniform(0.0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if rng.random() < self.failure_rate:
+            with self._lock:
+                self.failures += 1
+            raise FakeTTSError(f"injected failure for voice {voice_id} (attempt {attempt + 1})")
+
+        frames = int(self.sample_rate * seconds)
+        block = self._block(_pitch(voice_id))
+        data = block * (2 * frames // len(block) + 1)
+        folder = os.path.dirname(out_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with wave.open(out_path, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.sample_rate)
+            w.writeframes(data[: 2 * frames])
+        return out_path
+
+    def _block(self, pitch: int) -> bytes:
+        """One second of 16-bit PCM, built once per pitch and tiled for every line."""
+        block = self._blocks.get(pitch)
+        if block is None:
+            peak = int(32767 * self.amplitude)
+            n = self.sample_rate
+            if self.waveform == "tone":
+                samples = [int(peak * math.sin(2 * math.pi * pitch * i / n)) for i in range(n)]
+            elif self.waveform == "noise":
+                rng = random.Random(self.seed * 7919 + pitch)
+                samples = [rng.randint(-peak, peak) for _ in range(n)]
+            else:
+                samples = [0] * n
+            block = struct.pack(f"<{n}h", *samples)
+            self._blocks[pitch] = block
+        return block
+
+
+def _voice_id(voice: Voice) -> str:
+    if isinstance(voice, dict):
+        return str(voice.get("id") or voice.get("label") or voice.get("voice_file") or "default")
+    return str(voice or "default")
+
+
+def _pitch(voice_id: str) -> int:
+    """A stable pitch in 110-329 Hz for a voice (a whole number of Hz, so one second tiles cleanly)."""
+    return 110 + zlib.crc32(voice_id.encode("utf-8")) % 220
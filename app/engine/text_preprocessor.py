@@ -60,3 +60,107 @@ class TextPreprocessor:
                 text = truncated
         
         return text
+
+    def split_long_text(self, text: str, max_chars: int = 200) -> list:
+        """
+        Split long text into chunks at sentence boundaries with expression awareness.
+        Tries to keep chunks under max_chars while respecting sentence boundaries and
+        preserving emotional/expressive punctuation context.
+        
+        Args:
+            text: The text to split
+            max_chars: Maximum characters per chunk (default 250 for XTTS limit)
+            
+        Returns:
+            List of text chunks with continuation markers where needed
+        """
+        if len(text) <= max_chars:
+            return [text]
+        
+        # Split into sentences (handles . ! ? followed by space or end)
+        sentences = re.split(r'([.!?]+[\s"])', text)
+        
+        chunks = []
+        current_chunk = ""
+        
+        for i in range(0, len(sentences), 2):
+            sentence = sentences[i]
+            # Get the punctuation if it exists
+            punctuation = sentences[i + 1] if i + 1 < len(sentences) else ""
+            full_sentence = sentence + punctuation
+            
+            # If adding this sentence would exceed max_chars
+            if len(current_chunk) + len(full_sentence) > max_chars:
+                if current_chunk:
+                    # Save current chunk and start new one
+                    chunks.append(current_chunk.strip())
+                    current_chunk = full_sentence
+                else:
+                    # Single sentence is too long - split with expression awareness
+                    chunks.extend(self._split_long_sentence_smart(full_sentence, max_chars))
+                    current_chunk = ""
+            else:
+                current_chunk += full_sentence
+        
+        # Don't forget the last chunk
+        if current_chunk.strip():
+            chunks.append(current_chunk.strip())
+        
+        return chunks if chunks else [text]
+    
+    def _split_long_sentence_smart(self, sentence: str, max_chars: int) -> list:
+        """
+        Split a long sentence at natural pause points (commas, semicolons, em-dashes)
+        while preserving expression. Falls back to word boundaries if needed.
+        """
+        
+        # Try splitting at natural pause points first: commas, semicolons, em-dashes, colons, hyphens
+        pause_pattern = r'([,;:—\-–—])\s+'
+        parts = re.split(pause_pattern, sentence)
+        
+        chunks = []
+        current_chunk = ""
+        
+        for i in range(0, len(parts)):
+            part = parts[i]
+            
+            # Check if adding this part would exceed limit
+            if len(current_chunk) + len(part) > max_chars:
+                if current_chunk:
+                    # Determine if we should add continuation marker
+                    ends_with_punctuation = current_chunk.rstrip().endswith((',', ';', ':'))
+                    
+                    # For commas/semicolons/colons, keep them as they are natural pauses
+                    # No need for ellipsis since the pause is already there
+                    chunks.append(current_chunk.strip())
+                    
+                    # Start next chunk
+                    current_chunk = part
+                else:
+                    # Part itself is too long - split at word boundaries as last resort
+                    words = part.split()
+                    temp_chunk = ""
+                    for word in words:
+                        if len(temp_chunk) + len(word) + 1 > max_chars - 3:  # Reserve space for ...
+                            if temp_chunk:
+                                # Add ellipsis only if not ending with natural pause
+                                if not temp_chunk.rstrip().endswith((',', ';', ':', '—', '...')):
+                                    chunks.append(temp_chunk.strip() + '...')
+                                else:
+                                    chunks.append(temp_chunk.strip())
+                                temp_chunk = word
+                            else:
+                                # Single word too long - just take it
+                                chunks.append(word)
+                        else:
+                            temp_chunk += (" " if temp_chunk else "") + word
+                    if temp_chunk:
+                        current_chunk = temp_chunk
+            else:
+                current_chunk += part
+        
+        # Add final chunk
+        if current_chunk.strip():
+            chunks.append(current_chunk.strip())
+        
+        return chunks if chunks else [sentence]
@@ -3,15 +3,15 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
 import os
-import re
 import subprocess
 import sys
 import numpy as np
 from typing import List, Dict, Any
-from pydub import AudioSegment
 import soundfile as sf
 
-from app.core.voices import synthesize_text
+from app.core.assembly import merge_to_m4b, safe_name
+from app.core.audio_pipeline import AudioPipeline
+from app.engine.text_preprocessor import TextPreprocessor
 
 
 class AudioQualityChecker:
@@ -150,6 +150,7 @@ class AudioProcessingTab(ctk.CTkFrame):
         self.jobs: List[Dict[str, Any]] = []
         self.processing = False
         self.worker_thread = None
+        self.pipeline = None  # the running AudioPipeline, for stop_processing
         self.output_root = os.path.join("output", "audio")  # default output dir
         self.row_vars: Dict[int, tk.BooleanVar] = {}  # store checkbox states by row index
         self.checkbox_states: Dict[int, bool] = {}  # cache of checkbox states for thread-safe access
@@ -380,6 +381,8 @@ class AudioProcessingTab(ctk.CTkFrame):
         """Stop processing (gracefully)"""
         if self.processing:
             self.processing = False
+            if self.pipeline is not None:
+                self.pipeline.cancel()
             self.log_debug("[AudioProcessingTab] Stop requested...")
         else:
             messagebox.showinfo("Info", "No processing in progress.")
@@ -538,182 +541,104 @@ class AudioProcessingTab(ctk.CTkFrame):
 
     # ---------------- Synthesis loop ----------------
     def _process_loop(self):
-        chapters_map = {}
-        quality_checker = AudioQualityChecker()
+        """Run the selected jobs through the audio pipeline (synthesis -> quality check -> MP3).
 
-        for idx, job in self.jobs_to_process:
-            if not self.processing:  # Check if stopped
-                self.log_debug("[AudioProcessingTab] Processing stopped by user")
-                break
-                
-            try:
-                job["status"] = "Processing"
-                self._update_tree(idx, job)
+        Each chapter's MP3 is encoded as soon as its last line has passed the quality check,
+        while the TTS engine goes on with the next chapter.
+        """
+        # voices pulls in torch and TTS; import it on the worker thread, not at GUI startup
+        from app.core.voices import synthesize_text
 
-                chapter = job.get("chapter", "Chapter_Unknown")
-                chapter_dir = self._safe_name(chapter)
-                lines = job.get("lines", [])
-                speakers = job.get("speakers", ["Unknown"] * len(lines))
-                voice_entries = job.get("voice_entries", [{}] * len(lines))
-                voice_labels = job.get("voice_labels", [""] * len(lines))
-
-                # Preprocessing: Split long texts into chunks at sentence boundaries
-                processed_lines = []
-                processed_speakers = []
-                processed_voice_entries = []
-                processed_voice_labels = []
-                
-                for text, speaker, voice_entry, voice_label in zip(lines, speakers, voice_entries, voice_labels):
-                    if len(text) > 250:
-                        # Split long text into chunks (XTTS has 250 char limit for English)
-                        chunks = self._split_long_text(text, max_chars=249)
-                        self.log_debug(f"[AudioProcessingTab] Split long text ({len(text)} chars) into {len(chunks)} chunks")
-                        # Add each chunk with the same speaker/voice
-                        for chunk in chunks:
-                            processed_lines.append(chunk)
-                            processed_speakers.append(speaker)
-                            processed_voice_entries.append(voice_entry)
-                            processed_voice_labels.append(voice_label)
-                    else:
-                        # Keep as-is
-                        processed_lines.append(text)
-                        processed_speakers.append(speaker)
-                        processed_voice_entries.append(voice_entry)
-                        processed_voice_labels.append(voice_label)
-                
-                # Use processed data
-                lines = processed_lines
-                speakers = processed_speakers
-                voice_entries = processed_voice_entries
-                voice_labels = processed_voice_labels
-
-                produced_files = []
-                job_quality_scores = []
-                job_failed = 0
-                job_retried = 0
-                
-                for i, (text, speaker, voice_entry, voice_label) in enumerate(
-                    zip(lines, speakers, voice_entries, voice_labels), start=1
-                ):
-                    if not self.processing:  # Check if stopped
-                        break
-                    
-                    # Update progress (thread-safe)
-                    self._set_current_progress(
-                        f"Processing {chapter} - Line {i}/{len(lines)}: '{speaker}' - '{text[:50]}...'"
+        chapters_map = {}
+        quality_checker = AudioQualityChecker()
+        jobs = dict(self.jobs_to_process)
+        max_attempts = self.cached_max_retries + 1 if self.quality_check_enabled else 1
+
+        def synthesize(text, voice_entry, out_path):
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            synthesize_text(voice_entry, text, out_path)
+
+        def check(out_path, text):
+            validation = quality_checker.validate_audio(out_path, text)
+            if not validation["passed"]:
+                self.log_debug(
+                    f"[AudioProcessingTab] ⚠ {os.path.basename(out_path)} failed quality check "
+                    f"(score: {validation['score']:.1f}, issues: {validation['issues']})"
+                )
+            return validation["passed"], validation["score"]
+
+        def on_line(line):
+            if line.error is not None:
+                self.failed_lines += 1
+                self.log_debug(
+                    f"[AudioProcessingTab] Failed line {line.n} after {line.attempts} attempts: {line.error}"
+                )
+            else:
+                self.processed_lines += 1
+                if not line.passed:
+                    self.failed_lines += 1
+                    self.log_debug(
+                        f"[AudioProcessingTab] ✗ Line {line.n} failed after {line.attempts} attempts "
+                        f"(score: {line.score:.1f}). Accepting anyway."
                     )
-                    
-                    speaker_dir = self._safe_name(speaker)
-                    out_dir = os.path.join(self.output_root, chapter_dir, speaker_dir)
-                    os.makedirs(out_dir, exist_ok=True)
-                    base = f"line_{i:04d}.wav"
-                    out_path = os.path.join(out_dir, base)
-                    
-                    # Try to synthesize with retries for quality
-                    success = False
-                    attempts = 0
-                    max_attempts = self.cached_max_retries + 1 if self.quality_check_enabled else 1
-                    
-                    while not success and attempts < max_attempts:
-                        attempts += 1
-                        
-                        try:
-                            # Synthesize audio
-                            synthesize_text(voice_entry, text, out_path)
-                            
-                            # Validate quality if enabled
-                            if self.quality_check_enabled:
-                                validation = quality_checker.validate_audio(out_path, text)
-                                quality_score = validation['score']
-                                job_quality_scores.append(quality_score)
-                                
-                                if validation['passed']:
-                                    success = True
-                                    self.log_debug(
-                                        f"[AudioProcessingTab] ✓ Line {i} quality: {quality_score:.1f}/100"
-                                    )
-                                else:
-                                    if attempts < max_attempts:
-                                        job_retried += 1
-                                        self.retried_lines += 1
-                                        self.log_debug(
-                                            f"[AudioProcessingTab] ⚠ Line {i} failed quality check "
-                                            f"(score: {quality_score:.1f}, issues: {validation['issues']}). "
-                                            f"Retrying... (attempt {attempts}/{max_attempts})"
-                                        )
-                                    else:
-                                        # Accept after max retries
-                                        success = True
-                                        job_failed += 1
-                                        self.failed_lines += 1
-                                        self.log_debug(
-                                            f"[AudioProcessingTab] ✗ Line {i} failed after {attempts} attempts "
-                                            f"(score: {quality_score:.1f}). Accepting anyway."
-                                        )
-                            else:
-                                # No quality check - accept
-                                success = True
-                                job_quality_scores.append(100)
-                            
-                        except Exception as e:
-                            if attempts < max_attempts:
-                                self.log_debug(
-                                    f"[AudioProcessingTab] Error on line {i}, retrying: {e}"
-                                )
-                            else:
-                                job_failed += 1
-                                self.failed_lines += 1
-                                success = False  # Failed completely
-                                self.log_debug(
-                                    f"[AudioProcessingTab] Failed line {i} after {attempts} attempts: {e}"
-                                )
-                    
-                    if success and os.path.exists(out_path):
-                        produced_files.append((out_path, i))
-                        self.processed_lines += 1
-                    
-                    self._update_statistics()
-
-                chapters_map.setdefault(chapter_dir, []).extend(produced_files)
-
-                # Calculate average quality for this job
-                avg_quality = sum(job_quality_scores) / len(job_quality_scores) if job_quality_scores else 0
-                quality_display = f"{avg_quality:.0f}/100"
-                
-                status_parts = [f"Done ({len(produced_files)}/{len(lines)} files)"]
-                if job_failed > 0:
-                    status_parts.append(f"{job_failed} failed")
-                if job_retried > 0:
-                    status_parts.append(f"{job_retried} retried")
-                
-                job["status"] = ", ".join(status_parts)
-                job["quality_score"] = quality_display
-                job["files"] = [path for path, _ in produced_files]
-                self._update_tree(idx, job)
-
-            except Exception as e:
-                job["status"] = f"Error: {e}"
-                job["quality_score"] = "N/A"
-                self._update_tree(idx, job)
-                self.log_debug(f"[AudioProcessingTab] Error processing job: {e}")
+            self.retried_lines += line.attempts - 1
+            chapter = jobs[line.chapter].get("chapter", "Chapter_Unknown")
+            self._set_current_progress(f"Processing {chapter} - Line {line.n}: '{line.text[:50]}...'")
+            self._update_statistics()
+
+        def on_chapter(idx, lines):
+            job = jobs[idx]
+            produced = [(line.out_path, line.n) for line in lines if line.error is None]
+            chapters_map.setdefault(self._safe_name(job.get("chapter", "Chapter_Unknown")), []).extend(produced)
+            scores = [100 if line.score is None else line.score for line in lines if line.error is None]
+            failed = sum(1 for line in lines if line.error is not None or not line.passed)
+            retried = sum(line.attempts - 1 for line in lines)
+
+            status_parts = [f"Done ({len(produced)}/{len(lines)} files)"]
+            if failed > 0:
+                status_parts.append(f"{failed} failed")
+            if retried > 0:
+                status_parts.append(f"{retried} retried")
+            job["status"] = ", ".join(status_parts)
+            job["quality_score"] = f"{sum(scores) / len(scores):.0f}/100" if scores else "0/100"
+            job["files"] = [path for path, _ in produced]
+            self._update_tree(idx, job)
+
+        def on_encoded(idx, mp3_path, duration, error):
+            if error is None:
+                self.log_debug(f"[AudioProcessingTab] Exported MP3 → {mp3_path} ({duration:.1f}s)")
+            else:
+                self.log_debug(f"[AudioProcessingTab] Failed to merge {mp3_path}: {error}")
+
+        self.pipeline = AudioPipeline(
+            synthesize,
+            check if self.quality_check_enabled else None,
+            max_attempts=max_attempts,
+            on_line=on_line,
+            on_chapter=on_chapter,
+            on_encoded=on_encoded,
+        )
+        if not self.processing:  # stopped before the pipeline existed
+            self.pipeline.cancel()
+        try:
+            self.pipeline.run(self._pipeline_chapters())
+        except Exception as e:
+            for idx, job in self.jobs_to_process:
+                if job.get("status") == "Processing":
+                    self._mark_job_error(idx, job, e)
+            self.log_debug(f"[AudioProcessingTab] Processing failed: {e}")
+            self._set_overall_progress("Failed")
+            self._show_error("Error", f"Processing failed: {e}")
+            self.processing = False
+            return
+        finally:
+            self.pipeline = None
 
         if not self.processing:
             self._set_overall_progress("Stopped by user")
             self.processing = False
             return
 
-        # Merge each chapter into MP3
-        self._set_current_progress("Merging chapters into MP3 files...")
-        for chapter_dir, wav_files in chapters_map.items():
-            wav_files_sorted = [path for path, _ in sorted(wav_files, key=lambda x: x[1])]
-            merged_path = os.path.join(self.output_root, f"{chapter_dir}.mp3")
-            if self._merge_wavs(wav_files_sorted, merged_path, fmt="mp3"):
-                try:
-                    AudioSegment.from_file(merged_path, format="mp3")  # validation
-                    self.log_debug(f"[AudioProcessingTab] Validated {merged_path}")
-                except Exception as e:
-                    self.log_debug(f"[AudioProcessingTab] Validation failed: {e}")
-
         self.merge_all_to_m4b(chapters_map)
         self.processing = False
         self._set_overall_progress("✓ Complete!")
@@ -730,113 +655,53 @@ class AudioProcessingTab(ctk.CTkFrame):
             f"Output folder: {self.output_root}"
         )
 
+    def _pipeline_chapters(self):
+        """Pipeline chapters for the selected jobs, prepared one at a time as the pipeline asks for them."""
+        for idx, job in self.jobs_to_process:
+            job["status"] = "Processing"
+            self._update_tree(idx, job)
+
+            try:
+                chapter_dir = self._safe_name(job.get("chapter", "Chapter_Unknown"))
+                lines = job.get("lines", [])
+                speakers = job.get("speakers", ["Unknown"] * len(lines))
+                voice_entries = job.get("voice_entries", [{}] * len(lines))
+
+                pipeline_lines = []
+                for text, speaker, voice_entry in zip(lines, speakers, voice_entries):
+                    if len(text) > 250:
+                        # Split long text into chunks (XTTS has 250 char limit for English)
+                        chunks = self._split_long_text(text, max_chars=249)
+                        self.log_debug(
+                            f"[AudioProcessingTab] Split long text ({len(text)} chars) into {len(chunks)} chunks"
+                        )
+                    else:
+                        chunks = [text]
+                    for chunk in chunks:
+                        i = len(pipeline_lines) + 1
+                        out_dir = os.path.join(self.output_root, chapter_dir, self._safe_name(speaker))
+                        pipeline_lines.append((chunk, voice_entry, os.path.join(out_dir, f"line_{i:04d}.wav")))
+            except Exception as e:
+                self._mark_job_error(idx, job, e)
+                continue
+
+            yield {
+                "key": idx,
+                "lines": pipeline_lines,
+                "mp3": os.path.join(self.output_root, f"{chapter_dir}.mp3"),
+            }
+
+    def _mark_job_error(self, idx: int, job: Dict[str, Any], error: Exception):
+        job["status"] = f"Error: {error}"
+        job["quality_score"] = "N/A"
+        self._update_tree(idx, job)
+        self.log_debug(f"[AudioProcessingTab] Error processing job: {error}")
+
     # ---------------- Helpers ----------------
     def _split_long_text(self, text: str, max_chars: int = 200) -> list:
-        """
-        Split long text into chunks at sentence boundaries with expression awareness.
-        Tries to keep chunks under max_chars while respecting sentence boundaries and
-        preserving emotional/expressive punctuation context.
-        
-        Args:
-            text: The text to split
-            max_chars: Maximum characters per chunk (default 250 for XTTS limit)
-            
-        Returns:
-            List of text chunks with continuation markers where needed
-        """
-        if len(text) <= max_chars:
-            return [text]
-        
-        # Split into sentences (handles . ! ? followed by space or end)
-        import re
-        sentences = re.split(r'([.!?]+[\s"])', text)
-        
-        chunks = []
-        current_chunk = ""
-        
-        for i in range(0, len(sentences), 2):
-            sentence = sentences[i]
-            # Get the punctuation if it exists
-            punctuation = sentences[i + 1] if i + 1 < len(sentences) else ""
-            full_sentence = sentence + punctuation
-            
-            # If adding this sentence would exceed max_chars
-            if len(current_chunk) + len(full_sentence) > max_chars:
-                if current_chunk:
-                    # Save current chunk and start new one
-                    chunks.append(current_chunk.strip())
-                    current_chunk = full_sentence
-                else:
-                    # Single sentence is too long - split with expression awareness
-                    chunks.extend(self._split_long_sentence_smart(full_sentence, max_chars))
-                    current_chunk = ""
-            else:
-                current_chunk += full_sentence
-        
-        # Don't forget the last chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-        
-        return chunks if chunks else [text]
-    
-    def _split_long_sentence_smart(self, sentence: str, max_chars: int) -> list:
-        """
-        Split a long sentence at natural pause points (commas, semicolons, em-dashes)
-        while preserving expression. Falls back to word boundaries if needed.
-        """
-        import re
-        
-        # Try splitting at natural pause points first: commas, semicolons, em-dashes, colons, hyphens
-        pause_pattern = r'([,;:—\-–—])\s+'
-        parts = re.split(pause_pattern, sentence)
-        
-        chunks = []
-        current_chunk = ""
-        
-        for i in range(0, len(parts)):
-            part = parts[i]
-            
-            # Check if adding this part would exceed limit
-            if len(current_chunk) + len(part) > max_chars:
-                if current_chunk:
-                    # Determine if we should add continuation marker
-                    ends_with_punctuation = current_chunk.rstrip().endswith((',', ';', ':'))
-                    
-                    # For commas/semicolons/colons, keep them as they are natural pauses
-                    # No need for ellipsis since the pause is already there
-                    chunks.append(current_chunk.strip())
-                    
-                    # Start next chunk
-                    current_chunk = part
-                else:
-                    # Part itself is too long - split at word boundaries as last resort
-                    words = part.split()
-                    temp_chunk = ""
-                    for word in words:
-                        if len(temp_chunk) + len(word) + 1 > max_chars - 3:  # Reserve space for ...
-                            if temp_chunk:
-                                # Add ellipsis only if not ending with natural pause
-                                if not temp_chunk.rstrip().endswith((',', ';', ':', '—', '...')):
-                                    chunks.append(temp_chunk.strip() + '...')
-                                else:
-                                    chunks.append(temp_chunk.strip())
-                                temp_chunk = word
-                            else:
-                                # Single word too long - just take it
-                                chunks.append(word)
-                        else:
-                            temp_chunk += (" " if temp_chunk else "") + word
-                    if temp_chunk:
-                        current_chunk = temp_chunk
-            else:
-                current_chunk += part
-        
-        # Add final chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-        
-        return chunks if chunks else [sentence]
-    
+        """Split text into TTS-sized chunks (see TextPreprocessor.split_long_text)."""
+        return TextPreprocessor().split_long_text(text, max_chars=max_chars)
+
     def _update_tree(self, idx: int, job: Dict[str, Any]):
         """Thread-safe tree update - schedules UI update on main thread"""
         self.after(0, lambda: self._update_tree_ui(idx, job))
@@ -868,26 +733,7 @@ class AudioProcessingTab(ctk.CTkFrame):
         )
 
     def _safe_name(self, name: str) -> str:
-        name = name.strip() or "untitled"
-        name = re.sub(r"[^\w\-\. ]+", "_", name)
-        name = re.sub(r"\s+", "_", name)
-        return name[:80]
-
-    def _merge_wavs(self, wav_files, out_path, fmt="mp3"):
-        if not wav_files:
-            self.log_debug(f"[AudioProcessingTab] No WAV files to merge for {out_path}")
-            return False
-        try:
-            combined = AudioSegment.empty()
-            for wf in wav_files:
-                audio = AudioSegment.from_wav(wf)
-                combined += audio
-            combined.export(out_path, format=fmt, codec="libmp3lame", bitrate="192k")
-            self.log_debug(f"[AudioProcessingTab] Exported MP3 → {out_path}")
-            return True
-        except Exception as e:
-            self.log_debug(f"[AudioProcessingTab] Failed to merge: {e}")
-            return False
+        return safe_name(name)
 
     # ---------------- Output folder mgmt ----------------
     def select_output_folder(self):
@@ -923,19 +769,14 @@ class AudioProcessingTab(ctk.CTkFrame):
                         wav_files = [(f, i + 1) for i, f in enumerate(job["files"])]
                         chapters_map.setdefault(chapter, []).extend(wav_files)
 
-            combined = AudioSegment.empty()
-            chapter_files = []
-            for chapter_dir in sorted(chapters_map.keys()):
-                mp3_path = os.path.join(self.output_root, f"{chapter_dir}.mp3")
-                if os.path.exists(mp3_path):
-                    audio = AudioSegment.from_file(mp3_path, format="mp3")
-                    combined += audio
-                    chapter_files.append(mp3_path)
-                    self.log_debug(f"[AudioProcessingTab] Added {mp3_path}")
-
             out_file_name = list(chapters_map.keys())[0] if chapters_map else "Audiobook_Unknown"
             out_file = os.path.join(self.output_root, f"{out_file_name}.m4b")
-            combined.export(out_file, format="ipod", codec="aac", bitrate="192k")
+            chapter_files = merge_to_m4b(
+                [os.path.join(self.output_root, f"{chapter_dir}.mp3") for chapter_dir in sorted(chapters_map.keys())],
+                out_file,
+            )
+            for mp3_path in chapter_files:
+                self.log_debug(f"[AudioProcessingTab] Added {mp3_path}")
             self.log_debug(f"[AudioProcessingTab] Exported M4B → {out_file}")
             self._show_info("Merge Complete", f"Exported audiobook: {out_file}")
         except Exception as e:
@@ -176,17 +176,21 @@ class BookProcessingTab(ctk.CTkFrame):
             return
 
         try:
-            from app.core.chapter_chunker import smart_chapter_detection
+            from app.core.chapter_chunker import load_chapters, smart_chapter_detection
             
             self.update_status("Analyzing chapter structure...")
             self.master.update_idletasks()
             
-            # Use smart chapter detection
-            detected = smart_chapter_detection(
-                self.raw_text,
-                min_chapter_length=1000,
-                max_chunk_size=50000  # 50K chars per chunk max
-            )
+            if (self.current_book_path or "").lower().endswith(".epub"):
+                # EPUBs carry their own chapters (spine + TOC)
+                detected = load_chapters(self.current_book_path, max_chunk_size=50000)
+            else:
+                # Use smart chapter detection
+                detected = smart_chapter_detection(
+                    self.raw_text,
+                    min_chapter_length=1000,
+                    max_chunk_size=50000  # 50K chars per chunk max
+                )
             
             self.chapters = detected
             self.update_chapter_list([c["title"] for c in self.chapters])
@@ -235,13 +239,7 @@ class BookProcessingTab(ctk.CTkFrame):
         elif not selected_indices:
             messagebox.showerror(
                 "Selection Required", 
-                "Please select chapters to be sent to characters.\nPlease select 1 to 3 chapters."
-            )
-            return
-        elif len(selected_indices) > 3:
-            messagebox.showerror(
-                "Too Many Chapters", 
-                "Please select no more than 3 chapters to send to characters tab."
+                "Please select chapters to be sent to characters."
             )
             return
         else:
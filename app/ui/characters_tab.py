@@ -1,11 +1,75 @@
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import messagebox, simpledialog, ttk
 import customtkinter as ctk
 import random
 import os
+import re
 import json
+import queue
+import threading
+from bisect import bisect_left, bisect_right
+
+from app.core.autosave import backup_path, rotate_backups
+from app.core.character_registry import CharacterRegistry
+from app.core.line_index import LineIndex
+from app.core.project_store import (
+    PROJECT_EXT,
+    ProjectError,
+    ProjectStore,
+    import_json,
+    is_project_file,
+    load_texts,
+    snapshot_chapters,
+)
+
+
+# Rows never grow taller than this many text lines (the tooltip always has the full text)
+MAX_ROW_LINES = 10
+# Pixels a row needs on top of its text lines (text padding, frame border, gap between rows)
+ROW_PADDING = 12
+ROW_GAP = 2
+# Rows materialized above and below the viewport so small scrolls don't rebind widgets
+OVERSCAN_ROWS = 5
+
+# How often (ms) the UI drains progress events from the detection worker
+DETECTION_POLL_MS = 100
+# Stage count assumed for a chapter's progress until one chapter has finished
+DEFAULT_DETECTION_STAGES = 100
 
-from app.core import character_detection
+
+# -----------------------------
+# Character name highlighting
+# -----------------------------
+class NameHighlighter:
+    """Finds character-name spans in line text with one compiled regex per speaker/color set."""
+
+    def __init__(self, character_colors):
+        # Narrator only matches exactly; other names match on each part longer than 1 character.
+        # Later characters win when two share a part, like the tag priority of the old per-part search.
+        self.part_colors = {}
+        for char_name, color in character_colors.items():
+            if char_name == "Narrator":
+                self.part_colors[char_name] = color
+            else:
+                for part in char_name.split():
+                    if len(part) > 1:
+                        self.part_colors[part] = color
+
+        # Longest first so a full name wins over any of its parts
+        parts = sorted(self.part_colors, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(p) for p in parts)) if parts else None
+        self._spans = {}
+
+    def spans(self, text):
+        """Return [(start, end, color), ...] for every name occurrence in text (memoized per text)."""
+        if self.pattern is None or not text:
+            return []
+        spans = self._spans.get(text)
+        if spans is None:
+            spans = [(m.start(), m.end(), self.part_colors[m.group()]) for m in self.pattern.finditer(text)]
+            self._spans[text] = spans
+        return spans
 
 
 # -----------------------------
@@ -165,18 +229,130 @@ class ToolTip:
             self.tip_window = None
 
 
+class _LineRow:
+    """One reusable row (checkbox, speaker label, text) of the virtualized line list."""
+
+    def __init__(self, tab):
+        self.tab = tab
+        self.result = None
+
+        self.frame = tk.Frame(tab.canvas, relief="solid", borderwidth=1)
+        self.var = tk.IntVar(master=self.frame, value=0)
+        self.chk = tk.Checkbutton(self.frame, variable=self.var, command=self._on_toggle)
+        self.chk.pack(side="left", padx=5)
+
+        self.speaker_label = tk.Label(self.frame, width=15, anchor="w")
+        self.speaker_label.pack(side="left", padx=5)
+
+        self.text_widget = tk.Text(
+            self.frame,
+            wrap="word",
+            width=1,  # Will be controlled by pack
+            relief="flat",
+            borderwidth=0,
+            highlightthickness=0,
+            cursor="arrow",
+            padx=2,
+            pady=2
+        )
+        self.text_widget.pack(side="left", fill="both", expand=True, padx=2, pady=2)
+        self.text_widget.tag_configure("search_highlight", background="#FFFF00", foreground="#000000")
+
+        # Tooltip - always show full text in tooltip
+        self.tooltip = ToolTip(self.text_widget, "", characters_tab=tab)
+
+        self.window = tab.canvas.create_window(0, -10000, window=self.frame, anchor="nw")
+
+    def bind(self, result, style):
+        """Point this row at a result and repaint it with the current list style."""
+        self.result = result
+        is_quote = result.get("is_quote", False)
+        row_bg_color = style["quote_bg"] if is_quote else style["narration_bg"]
+        font = ("Arial", style["font_size"])
+        bold_font = ("Arial", style["font_size"], "bold")
+
+        self.frame.configure(bg=row_bg_color)
+        self.chk.configure(bg=row_bg_color)
+        self.var.set(1 if id(result) in self.tab._selected_lines else 0)
+
+        speaker = result.get("speaker", "Unknown")
+        self.speaker_label.configure(text=speaker, fg=self.tab._get_color(speaker), bg=row_bg_color, font=font)
+
+        text = result.get("text", "").strip()
+        search_text = style["search_text"]
+        # Show full text if searching (don't truncate), otherwise show preview
+        if search_text:
+            display_text = text
+        else:
+            display_text = text[:100] + "..." if len(text) > 100 else text
+
+        widget = self.text_widget
+        widget.configure(state="normal", bg=row_bg_color, fg=style["text_color"], font=font)
+        widget.delete("1.0", "end")
+        widget.insert("1.0", display_text)
+
+        for start, end, color in style["highlighter"].spans(display_text):
+            tag_name = f"char_{color}"
+            widget.tag_configure(tag_name, foreground=color, font=bold_font)
+            widget.tag_add(tag_name, f"1.0+{start}c", f"1.0+{end}c")
+
+        if search_text:
+            for m in re.finditer(re.escape(search_text), display_text, re.IGNORECASE):
+                widget.tag_add("search_highlight", f"1.0+{m.start()}c", f"1.0+{m.end()}c")
+            widget.tag_raise("search_highlight")
+
+        widget.configure(state="disabled")  # Make read-only
+        self.tooltip.text = text
+
+    def place(self, y, width, height):
+        self.tab.canvas.coords(self.window, 0, y)
+        self.tab.canvas.itemconfigure(self.window, width=width, height=height)
+
+    def hide(self):
+        self.result = None
+        self.tooltip.hide_tip()
+        self.tab.canvas.coords(self.window, 0, -10000)
+
+    def _on_toggle(self):
+        if self.result is not None:
+            self.tab._set_line_selected(self.result, self.var.get() == 1)
+
+
 class CharactersTab(ctk.CTkFrame):
-    def __init__(self, master, get_book_text, log_debug=None, gpu_enabled=True):
+    def __init__(self, master, get_book_text, log_debug=None, gpu_enabled=True, autosave=None):
         super().__init__(master)
         self.get_book_text = get_book_text
         self.log_debug = log_debug or (lambda msg: print(msg))
         self.gpu_enabled = gpu_enabled
+        self.autosave = autosave  # AutosaveService; without one the project is saved only on request
 
         self.chapters = []  # list of {"title": str, "text": str, "results": []}
         self.locked_lines = set()
         self.character_colors = {}
-        self.line_vars = []
-        self._text_labels = []  # Store references to text labels for dynamic resizing
+        self.project = None  # ProjectStore of the saved/opened project, if any
+
+        # Search/filter index over every chapter's result rows
+        self._line_index = LineIndex()
+
+        # Book-level character identity shared by every chapter's detection run
+        self._character_registry = CharacterRegistry()
+
+        # Virtualized line list: the filtered rows, their y offsets, and the pooled row widgets
+        self._visible_results = []
+        self._row_offsets = [0]
+        self._row_style = None
+        self._bound_rows = {}  # visible index -> _LineRow
+        self._free_rows = []
+        self._selected_lines = {}  # id(result) -> result
+        self._render_pending = False
+        self._highlighter = None
+        self._highlighter_key = None
+
+        # Background character detection (see detect_characters)
+        self._detect_thread = None
+        self._detect_events = None
+        self._detect_cancel = None
+        self._detect_state = None
 
         self.narrator_color = "#555555"
         
@@ -192,7 +368,11 @@ class CharactersTab(ctk.CTkFrame):
 
     # ---------- Book text setter ----------
     def set_book_text(self, chapters):
+        # a new book is not the open project; it gets one when it is saved
+        self._close_project()
         self.chapters = chapters
+        self._line_index.rebuild(self.chapters)
+        self._character_registry.clear()
         self.log_debug(
             f"[CharactersTab] Received {len(self.chapters)} chapter(s): "
             f"{[c['title'] for c in self.chapters]}"
@@ -242,6 +422,11 @@ class CharactersTab(ctk.CTkFrame):
             fg_color="green", hover_color="darkgreen"
         )
         self.detect_button.pack(pady=5)
+        self.cancel_detect_button = ctk.CTkButton(
+            char_frame, text="Cancel Detection", command=self.cancel_detection,
+            fg_color="red", hover_color="darkred", state="disabled"
+        )
+        self.cancel_detect_button.pack(pady=5)
         self.progress_bar = ctk.CTkProgressBar(char_frame, width=200)
         self.progress_bar.pack(pady=5)
         self.progress_bar.set(0)
@@ -327,20 +512,15 @@ class CharactersTab(ctk.CTkFrame):
         )
         self.tooltip_size_dropdown.pack(side="left", padx=2, pady=5)
 
-        # Canvas and scrollbar
-        self.canvas = tk.Canvas(right)
-        self.scrollbar = tk.Scrollbar(right, orient="vertical", command=self.canvas.yview)
-        self.scroll_frame = tk.Frame(self.canvas)
-        self.scroll_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        # Canvas and scrollbar (rows are pooled widgets placed as canvas windows, see show_lines)
+        self.canvas = tk.Canvas(right, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(right, orient="vertical", command=self._on_scrollbar)
         
-        # Create window and store the window ID for later updates
-        self.canvas_window = self.canvas.create_window((0, 0), window=self.scroll_frame, anchor="nw")
-        
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self._on_canvas_yscroll)
         self.canvas.pack(side="left", fill="both", expand=True)
         self.scrollbar.pack(side="right", fill="y")
         
-        # Bind canvas resize to update scroll frame width
+        # Bind canvas resize to update row widths and the visible range
         self.canvas.bind("<Configure>", self._on_canvas_resize)
 
         self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
@@ -348,13 +528,13 @@ class CharactersTab(ctk.CTkFrame):
         self.canvas.bind_all("<Button-5>", self._on_mousewheel_linux)
 
         self.placeholder_label = tk.Label(
-            self.scroll_frame,
+            self.canvas,
             text="No characters detected yet.\nClick 'Detect Characters' to begin.",
             fg="gray",
             wraplength=700,
             justify="center",
         )
-        self.placeholder_label.pack(pady=20)
+        self._placeholder_window = self.canvas.create_window(0, 20, window=self.placeholder_label, anchor="n")
 
         # Apply theme colors
         self._apply_theme_colors()
@@ -392,9 +572,9 @@ class CharactersTab(ctk.CTkFrame):
         if self.placeholder_label:
             self.placeholder_label.config(bg=bg_color, fg=fg_color)
         
-        # Apply to scroll frame background (processing queue background)
-        if self.scroll_frame:
-            self.scroll_frame.config(bg=queue_bg_color)
+        # Apply to line list background (processing queue background)
+        if self.canvas:
+            self.canvas.config(bg=queue_bg_color)
         
         # Regenerate character colors for new theme
         old_colors = self.character_colors.copy()
@@ -407,58 +587,26 @@ class CharactersTab(ctk.CTkFrame):
         # Refresh the character list display
         self._refresh_char_list()
 
+    def _get_name_highlighter(self):
+        """Return the NameHighlighter for the current character colors, rebuilding it only when they change."""
+        character_colors = dict(self.character_colors)
+        if "Narrator" not in character_colors:
+            character_colors["Narrator"] = self.narrator_color
+
+        key = tuple(character_colors.items())
+        if self._highlighter is None or key != self._highlighter_key:
+            self._highlighter = NameHighlighter(character_colors)
+            self._highlighter_key = key
+        return self._highlighter
+
     def _color_character_names_in_text(self, text_widget, text, font_size=11):
         """Apply character name coloring to a Text widget, including partial name matches."""
-        # Get all character names and their colors
-        characters = list(self.character_colors.keys())
-        if "Narrator" not in characters:
-            characters.append("Narrator")
-        character_colors = {}
-        
-        for char in characters:
-            if char in self.character_colors:
-                character_colors[char] = self.character_colors[char]
-            elif char == "Narrator":
-                character_colors[char] = self.narrator_color
-        
-        # Insert the text
         text_widget.insert("1.0", text)
-        
-        # Create a list of all name parts to match, with their associated character and color
-        name_parts = []
-        for char_name, color in character_colors.items():
-            if char_name == "Narrator":
-                # Special handling for Narrator - only match exact
-                name_parts.append((char_name, color, len(char_name)))
-            else:
-                # Split character name into parts (first, last, etc.)
-                parts = char_name.split()
-                for part in parts:
-                    if len(part) > 1:  # Only match parts longer than 1 character
-                        name_parts.append((part, color, len(part)))
-        
-        # Sort by length (longest first) to avoid partial matches overriding longer matches
-        name_parts.sort(key=lambda x: x[2], reverse=True)
-        
-        # Apply coloring to character name parts
-        applied_ranges = []  # Track ranges that have been colored to avoid overlaps
-        
-        for name_part, color, length in name_parts:
-            start_idx = "1.0"
-            while True:
-                # Find the name part
-                start_idx = text_widget.search(name_part, start_idx, nocase=False, stopindex="end")
-                if not start_idx:
-                    break
-                
-                end_idx = f"{start_idx}+{len(name_part)}c"
-                
-                # Apply color tag (simplified - no overlap prevention for now)
-                tag_name = f"char_{name_part.replace(' ', '_')}_{color}"
-                text_widget.tag_configure(tag_name, foreground=color, font=("Arial", font_size, "bold"))
-                text_widget.tag_add(tag_name, start_idx, end_idx)
-                
-                start_idx = end_idx
+
+        for start, end, color in self._get_name_highlighter().spans(text):
+            tag_name = f"char_{color}"
+            text_widget.tag_configure(tag_name, foreground=color, font=("Arial", font_size, "bold"))
+            text_widget.tag_add(tag_name, f"1.0+{start}c", f"1.0+{end}c")
 
     # ---------- Window Resize Handler ----------
     def _on_window_resize(self, event):
@@ -481,19 +629,14 @@ class CharactersTab(ctk.CTkFrame):
         self._last_width = new_width
     
     def _on_canvas_resize(self, event):
-        """Update scroll frame width to match canvas width when canvas is resized"""
-        # Set the scroll frame width to match canvas width (minus scrollbar)
-        canvas_width = event.width
-        self.canvas.itemconfig(self.canvas_window, width=canvas_width)
-        
-        # Update wraplength for all text labels
-        if hasattr(self, '_text_labels') and self._text_labels:
-            dynamic_wraplength = max(400, canvas_width - 250)
-            for label in self._text_labels:
-                if label.winfo_exists():
-                    label.config(wraplength=dynamic_wraplength)
-
-    # ---------- Mousewheel ----------
+        """Stretch rows to the new canvas width and fill any newly exposed rows."""
+        self.canvas.coords(self._placeholder_window, event.width // 2, 20)
+        self._update_scrollregion()
+        for idx, row in self._bound_rows.items():
+            row.place(self._row_offsets[idx], event.width, self._row_height(idx))
+        self._schedule_render()
+
+    # ---------- Mousewheel / scrolling ----------
     def _on_mousewheel(self, event):
         self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
@@ -503,6 +646,20 @@ class CharactersTab(ctk.CTkFrame):
         elif event.num == 5:
             self.canvas.yview_scroll(1, "units")
 
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+
+    def _on_canvas_yscroll(self, first, last):
+        """Canvas view moved (scrollbar, wheel or resize): sync the scrollbar and rebind visible rows."""
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+
+    def _schedule_render(self):
+        # Coalesce bursts of scroll events into one render per idle cycle
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render_visible_rows)
+
     # ---------- Character Management ----------
     def add_character(self):
         name = simpledialog.askstring("Add Character", "Enter character name:")
@@ -515,6 +672,7 @@ class CharactersTab(ctk.CTkFrame):
         self.character_colors[name] = color
         self.char_list.insert(tk.END, name)
         self.char_list.itemconfig(tk.END, fg=color)
+        self._project_changed()
         self.log_debug(f"[CharactersTab] Added character '{name}' with color {color}")
 
     def delete_selected(self):
@@ -531,6 +689,8 @@ class CharactersTab(ctk.CTkFrame):
                     for r in chapter["results"]:
                         if isinstance(r, dict) and r.get("speaker") == name:
                             r["speaker"] = "Unknown"
+                            self._line_index.update(r)
+        self._project_changed()
         self.show_lines()
 
     def merge_selected(self):
@@ -557,6 +717,7 @@ class CharactersTab(ctk.CTkFrame):
                     if isinstance(r, dict) and r.get("speaker") in names:
                         old_speaker = r["speaker"]
                         r["speaker"] = survivor
+                        self._line_index.update(r)
                         updated_count += 1
                         self.log_debug(f"  Updated line: '{old_speaker}' -> '{survivor}': {r.get('text', '')[:50]}")
         
@@ -574,6 +735,7 @@ class CharactersTab(ctk.CTkFrame):
         if survivor not in self.character_colors:
             self.character_colors[survivor] = self._get_color(survivor)
 
+        self._project_changed()
         self._refresh_char_list()
         self.show_lines()
 
@@ -608,6 +770,7 @@ class CharactersTab(ctk.CTkFrame):
                 for r in chapter["results"]:
                     if isinstance(r, dict) and r.get("speaker") == old_name:
                         r["speaker"] = new_name
+                        self._line_index.update(r)
                         updated_count += 1
         
         # Update character colors dictionary
@@ -615,6 +778,7 @@ class CharactersTab(ctk.CTkFrame):
             self.character_colors[new_name] = self.character_colors.pop(old_name)
         
         # Refresh display
+        self._project_changed()
         self._refresh_char_list()
         self.show_lines()
         
@@ -622,52 +786,104 @@ class CharactersTab(ctk.CTkFrame):
         messagebox.showinfo("Success", f"Renamed '{old_name}' to '{new_name}'\n{updated_count} lines updated.")
 
     def save_assignments(self):
-        """Save character assignments to a JSON file."""
+        """Save the chapters, their rows and the speaker colors to a project file."""
         if not self.chapters:
             messagebox.showwarning("Warning", "No chapters with assignments to save.")
             return
         
         from tkinter import filedialog
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            defaultextension=PROJECT_EXT,
+            initialfile=os.path.basename(self.project.path) if self.project else "",
+            filetypes=[("PolyVox projects", f"*{PROJECT_EXT}"), ("JSON files (legacy)", "*.json"), ("All files", "*.*")],
             title="Save Character Assignments"
         )
         if not file_path:
             return
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.chapters, f, indent=2, ensure_ascii=False)
+            if file_path.lower().endswith(".json"):
+                load_texts(self.chapters)
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.chapters, f, indent=2, ensure_ascii=False)
+            else:
+                self.save_project(file_path)
             messagebox.showinfo("Success", f"Assignments saved to {file_path}")
             self.log_debug(f"[CharactersTab] Saved assignments to {file_path}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save assignments: {e}")
             self.log_debug(f"[CharactersTab] Failed to save assignments: {e}")
 
+    def _project_changed(self):
+        """Queue an autosave of the open project; edits in quick succession are written once."""
+        if self.project is None or self.autosave is None:
+            return
+        project = self.project
+        autosave = self.autosave
+
+        def write(data):
+            chapters, colors = data
+            project.save_chapters(chapters)
+            project.save_speaker_colors(colors)
+            if autosave.backup_due(project.path):
+                rotate_backups(project.path, autosave.backups)
+                project.backup(backup_path(project.path, 1))
+
+        autosave.request(
+            project.path,
+            lambda: (snapshot_chapters(self.chapters, project), dict(self.character_colors)),
+            write,
+        )
+
+    def _close_project(self):
+        """Write out pending autosaves and let go of the open project."""
+        if self.project is None:
+            return
+        if self.autosave is not None:
+            self.autosave.flush()
+        self.project.close()
+        self.project = None
+
+    def save_project(self, file_path=None):
+        """Write the open project (or a new one at file_path); only changed rows are rewritten."""
+        if file_path and (self.project is None or os.path.abspath(file_path) != os.path.abspath(self.project.path)):
+            # the new file needs every chapter's text, and the old store can't be read once closed
+            load_texts(self.chapters)
+            self._close_project()
+            self.project = ProjectStore.create(file_path)
+        if self.project is None:
+            return 0
+        written = self.project.save_chapters(self.chapters)
+        self.project.save_speaker_colors(self.character_colors)
+        return written
+
     def load_assignments(self):
-        """Load character assignments from a JSON file."""
+        """Open a project file; a legacy JSON save is imported into a project next to it."""
         from tkinter import filedialog
         file_path = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=[("PolyVox projects", f"*{PROJECT_EXT}"), ("JSON files (legacy)", "*.json"), ("All files", "*.*")],
             title="Load Character Assignments"
         )
         if not file_path:
             return
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                loaded_chapters = json.load(f)
-            
-            # Validate structure
-            if not isinstance(loaded_chapters, list):
-                raise ValueError("Invalid file format")
-            
-            for chapter in loaded_chapters:
-                if not isinstance(chapter, dict) or "title" not in chapter or "text" not in chapter:
-                    raise ValueError("Invalid chapter structure")
+            if not is_project_file(file_path):
+                project_path = os.path.splitext(file_path)[0] + PROJECT_EXT
+                if os.path.exists(project_path):
+                    raise ProjectError(f"{os.path.basename(project_path)} already exists; open it instead")
+                file_path = import_json(file_path, project_path)
+                self.log_debug(f"[CharactersTab] Imported legacy JSON save into {file_path}")
+
+            project = ProjectStore(file_path)
+            loaded_chapters = project.load_chapters()
+            self._close_project()
+            self.project = project
+            self.character_colors.update(project.speaker_colors())
             
             self.chapters = loaded_chapters
+            self._line_index.rebuild(self.chapters)
+            self._character_registry.clear()
             self._refresh_char_list()
             self.show_lines()
             messagebox.showinfo("Success", f"Assignments loaded from {file_path}")
@@ -730,28 +946,26 @@ class CharactersTab(ctk.CTkFrame):
             return
         new_speaker = self.char_list.get(selection[0])
         
-        # Debug: check line_vars state
-        self.log_debug(f"[CharactersTab] Total line_vars: {len(self.line_vars)}")
-        selected_count = sum(1 for var, result in self.line_vars if var.get() == 1)
-        self.log_debug(f"[CharactersTab] Selected checkboxes: {selected_count}")
+        selected = self._get_selected_lines()
+        self.log_debug(f"[CharactersTab] Total visible lines: {len(self._visible_results)}")
+        self.log_debug(f"[CharactersTab] Selected checkboxes: {len(selected)}")
         
         reassigned = 0
-        for var, result in self.line_vars:
-            if var.get() == 1 and isinstance(result, dict):
+        for result in selected:
+            if isinstance(result, dict):
                 result["speaker"] = new_speaker
+                self._line_index.update(result)
                 reassigned += 1
         self.log_debug(f"[CharactersTab] Reassigned {reassigned} lines to {new_speaker}")
+        self._project_changed()
         self.show_lines()
 
     def split_selected_line(self):
         """Split a selected line into multiple lines at user-specified positions."""
-        # Debug: check line_vars state
-        self.log_debug(f"[CharactersTab] Total line_vars: {len(self.line_vars)}")
-        selected_count = sum(1 for var, result in self.line_vars if var.get() == 1)
-        self.log_debug(f"[CharactersTab] Selected checkboxes: {selected_count}")
-        
         # Find selected lines
-        selected = [(var, result) for var, result in self.line_vars if var.get() == 1]
+        selected = self._get_selected_lines()
+        self.log_debug(f"[CharactersTab] Total visible lines: {len(self._visible_results)}")
+        self.log_debug(f"[CharactersTab] Selected checkboxes: {len(selected)}")
         
         if len(selected) == 0:
             messagebox.showinfo("Info", "Please select a line to split.")
@@ -761,7 +975,7 @@ class CharactersTab(ctk.CTkFrame):
             messagebox.showinfo("Info", "Please select only ONE line to split.")
             return
         
-        var, result = selected[0]
+        result = selected[0]
         original_text = result.get("text", "").strip()
         original_speaker = result.get("speaker", "Unknown")
         
@@ -853,6 +1067,7 @@ class CharactersTab(ctk.CTkFrame):
                             
                             # Replace original with split results
                             chapter["results"][idx:idx+1] = new_results
+                            self._line_index.replace_rows([result], new_results)
                             found = True
                             self.log_debug(
                                 f"[CharactersTab] Split line from '{original_speaker}' "
@@ -868,6 +1083,7 @@ class CharactersTab(ctk.CTkFrame):
                 return
             
             # Refresh display
+            self._project_changed()
             self.show_lines()
             win.destroy()
             messagebox.showinfo(
@@ -889,13 +1105,10 @@ class CharactersTab(ctk.CTkFrame):
 
     def merge_selected_lines(self):
         """Merge multiple selected lines into one line with editable text."""
-        # Debug: check line_vars state
-        self.log_debug(f"[CharactersTab] Total line_vars: {len(self.line_vars)}")
-        selected_count = sum(1 for var, result in self.line_vars if var.get() == 1)
-        self.log_debug(f"[CharactersTab] Selected checkboxes: {selected_count}")
-        
         # Find selected lines
-        selected = [(var, result) for var, result in self.line_vars if var.get() == 1]
+        selected = self._get_selected_lines()
+        self.log_debug(f"[CharactersTab] Total visible lines: {len(self._visible_results)}")
+        self.log_debug(f"[CharactersTab] Selected checkboxes: {len(selected)}")
         
         if len(selected) < 2:
             messagebox.showinfo("Info", "Please select at least TWO lines to merge.")
@@ -906,7 +1119,7 @@ class CharactersTab(ctk.CTkFrame):
         speakers = []
         results_to_merge = []
         
-        for var, result in selected:
+        for result in selected:
             text = result.get("text", "").strip()
             speaker = result.get("speaker", "Unknown")
             texts.append(text)
@@ -1033,6 +1246,7 @@ class CharactersTab(ctk.CTkFrame):
                             
                             # Insert merged at position of first removed
                             chapter["results"].insert(min_idx, merged_result)
+                            self._line_index.replace_rows(results_to_merge, [merged_result])
                             
                             found = True
                             self.log_debug(
@@ -1048,6 +1262,7 @@ class CharactersTab(ctk.CTkFrame):
                 return
             
             # Refresh display
+            self._project_changed()
             self.show_lines()
             win.destroy()
             messagebox.showinfo(
@@ -1069,7 +1284,7 @@ class CharactersTab(ctk.CTkFrame):
     def delete_selected_lines(self):
         """Delete selected lines after confirmation."""
         # Find selected lines
-        selected = [(var, result) for var, result in self.line_vars if var.get() == 1]
+        selected = self._get_selected_lines()
         
         if len(selected) == 0:
             messagebox.showinfo("Info", "Please select line(s) to delete.")
@@ -1089,7 +1304,7 @@ class CharactersTab(ctk.CTkFrame):
         
         # Delete the selected lines from chapters
         deleted_count = 0
-        results_to_delete = [result for var, result in selected]
+        ids_to_delete = {id(result) for result in selected}
         
         for chapter in self.chapters:
             if isinstance(chapter.get("results"), list):
@@ -1097,13 +1312,15 @@ class CharactersTab(ctk.CTkFrame):
                 # Filter out the selected results
                 chapter["results"] = [
                     r for r in chapter["results"] 
-                    if r not in results_to_delete
+                    if id(r) not in ids_to_delete
                 ]
                 deleted_count += original_count - len(chapter["results"])
+        self._line_index.replace_rows(selected, [])
         
         self.log_debug(f"[CharactersTab] Deleted {deleted_count} line(s)")
         
         # Refresh display
+        self._project_changed()
         self.show_lines()
         
         # Show success message
@@ -1173,95 +1390,191 @@ class CharactersTab(ctk.CTkFrame):
 
     # ---------- Detection ----------
     def detect_characters(self):
+        """Run attribution for every chapter on a worker thread.
+
+        The worker posts events on a queue that _poll_detection drains with after(), so the UI
+        stays responsive; each chapter's lines are shown as soon as that chapter finishes.
+        """
         if not self.chapters:
             messagebox.showerror("Error", "No chapters selected. Please select chapters in Book Processing tab.")
             return
+        if self._detect_thread is not None and self._detect_thread.is_alive():
+            return
 
         self.detect_button.configure(state="disabled")
+        self.cancel_detect_button.configure(state="normal")
         self.progress_bar.set(0)
         self.progress_label.configure(text="Processing...")
-        self.update_idletasks()
-
-        total_chapters = len(self.chapters)
-        for i, chapter in enumerate(self.chapters):
-            text = chapter.get("text", "")
-            results = character_detection.run_attribution(text)
-
-            chapter["results"] = results or []
-            self.log_debug(f"[CharactersTab] Loaded {len(chapter['results'])} lines for chapter {chapter['title']}")
 
-            progress = (i + 1) / total_chapters
-            self.progress_bar.set(progress)
-            self.progress_label.configure(text=f"Processing chapter {i+1}/{total_chapters}")
-            self.update_idletasks()
+        chapters = self.chapters
+        jobs = [(i, chapter.get("text", "")) for i, chapter in enumerate(chapters)]
+        self._detect_events = queue.Queue()
+        self._detect_cancel = threading.Event()
+        self._detect_state = {
+            "chapters": chapters,
+            "total": len(jobs),
+            "done": 0,
+            "stages": 0,
+            "expected_stages": DEFAULT_DETECTION_STAGES,
+        }
+        self._detect_thread = threading.Thread(
+            target=self._detection_worker,
+            args=(jobs, self._detect_events, self._detect_cancel, self._character_registry),
+            daemon=True,
+        )
+        self._detect_thread.start()
+        self.after(DETECTION_POLL_MS, self._poll_detection)
+
+    def cancel_detection(self):
+        """Ask the detection worker to stop after the stage it is currently running."""
+        if self._detect_cancel is not None and not self._detect_cancel.is_set():
+            self._detect_cancel.set()
+            self.cancel_detect_button.configure(state="disabled")
+            self.progress_label.configure(text="Cancelling...")
+            self.log_debug("[CharactersTab] Detection cancel requested")
+
+    @staticmethod
+    def _detection_worker(jobs, events, cancel_event, registry):
+        """Worker thread: never touches Tk, only posts events for the UI thread.
+
+        Each chapter starts from the registry's snapshot and its additions are committed as
+        soon as it finishes, so later chapters reuse the names earlier ones settled on.
+        """
+        # Imported here, not at module level: character_detection is large and the GUI
+        # should not pay for it before the first detection (main_ui warms it up in the background)
+        from app.core import character_detection, nlp_segments
+
+        for idx, text in jobs:
+            if cancel_event.is_set():
+                events.put(("cancelled", idx))
+                return
+            events.put(("chapter_start", idx))
+            additions = registry.begin_chapter(idx)
+            try:
+                results = nlp_segments.attribute_chapter(
+                    text,
+                    progress=lambda stage, idx=idx: events.put(("stage", idx, stage)),
+                    cancel_event=cancel_event,
+                    registry=additions,
+                )
+            except character_detection.AttributionCancelled:
+                events.put(("cancelled", idx))
+                return
+            except Exception as e:
+                events.put(("chapter_error", idx, str(e)))
+                continue
+            registry.commit(additions)
+            events.put(("chapter_done", idx, results or []))
+        events.put(("finished",))
+
+    def _poll_detection(self):
+        """Drain worker events, update progress and stream finished chapters into the view."""
+        state = self._detect_state
+        chapters = state["chapters"]
+        total = state["total"]
+        finished = False
+        new_lines = False
 
-        self.detect_button.configure(state="normal")
-        self.progress_bar.set(1.0)
-        self.progress_label.configure(text="Completed")
-        self._refresh_char_list()
-        self.show_lines()
+        try:
+            while True:
+                event = self._detect_events.get_nowait()
+                kind = event[0]
+
+                if kind == "chapter_start":
+                    state["stages"] = 0
+                    title = chapters[event[1]].get("title", "")
+                    self.progress_label.configure(text=f"Processing chapter {event[1]+1}/{total}: {title}")
+                elif kind == "stage":
+                    state["stages"] += 1
+                    self.progress_label.configure(text=f"Chapter {event[1]+1}/{total}: {event[2]}")
+                elif kind == "chapter_done":
+                    idx, results = event[1], event[2]
+                    old_results = chapters[idx].get("results")
+                    chapters[idx]["results"] = results
+                    if chapters is self.chapters:
+                        self._line_index.replace_rows(old_results, results)
+                    state["done"] += 1
+                    state["expected_stages"] = max(state["stages"], 1)
+                    state["stages"] = 0
+                    new_lines = True
+                    self.log_debug(f"[CharactersTab] Loaded {len(results)} lines for chapter {chapters[idx]['title']}")
+                elif kind == "chapter_error":
+                    state["done"] += 1
+                    state["stages"] = 0
+                    self.log_debug(f"[CharactersTab] Detection failed for chapter {chapters[event[1]]['title']}: {event[2]}")
+                elif kind == "cancelled":
+                    self.log_debug(f"[CharactersTab] Detection cancelled at chapter {event[1]+1}/{total}")
+                    self.progress_label.configure(text=f"Cancelled ({state['done']}/{total} chapters done)")
+                    finished = True
+                    break
+                elif kind == "finished":
+                    self.progress_bar.set(1.0)
+                    self.progress_label.configure(text="Completed")
+                    finished = True
+                    break
+        except queue.Empty:
+            pass
 
-    # ---------- Show Lines ----------
-    def show_lines(self):
-        # Clear stored text label references
-        self._text_labels = []
-        
-        for widget in self.scroll_frame.winfo_children():
-            if widget is not self.placeholder_label:
-                widget.destroy()
+        if not finished:
+            partial = min(state["stages"] / state["expected_stages"], 0.95)
+            self.progress_bar.set((state["done"] + partial) / max(total, 1))
 
-        self.placeholder_label.pack_forget()
+        if new_lines and chapters is self.chapters:
+            self._project_changed()
+            self._refresh_char_list()
+            self.show_lines(preserve_view=True)
 
-        all_results = []
-        for chapter in self.chapters:
-            if isinstance(chapter.get("results"), list):
-                for r in chapter["results"]:
-                    if isinstance(r, dict):
-                        all_results.append(r)
+        if finished:
+            self._detect_thread = None
+            self.detect_button.configure(state="normal")
+            self.cancel_detect_button.configure(state="disabled")
+        else:
+            self.after(DETECTION_POLL_MS, self._poll_detection)
 
-        if not all_results:
-            self.placeholder_label.pack(pady=20)
+    # ---------- Show Lines ----------
+    def show_lines(self, preserve_view=False):
+        """Filter the detected lines and (re)bind the rows in the viewport.
+
+        Only the rows that are on screen exist as widgets; they are pooled and rebound as the
+        list scrolls, so the cost of a refresh does not grow with the number of lines.
+        With preserve_view (used while detection streams in chapters) the scroll position
+        and checked lines are kept instead of being reset.
+        """
+        top = self.canvas.canvasy(0) if preserve_view else 0
+        if not preserve_view:
+            self._selected_lines = {}
+        for row in self._bound_rows.values():
+            row.hide()
+            self._free_rows.append(row)
+        self._bound_rows = {}
+
+        total_lines = len(self._line_index)
+        if not total_lines:
+            self._set_visible_results([])
+            self._show_message("No characters detected yet.\nClick 'Detect Characters' to begin.")
             return
 
         # Get theme colors
         is_dark = ctk.get_appearance_mode() == "Dark"
         if is_dark:
-            bg_color = "#2b2b2b"
-            fg_color = "#ffffff"
-            select_bg = "#404040"
-            select_fg = "#ffffff"
-            # Dark grey background for processing queue (different from line backgrounds)
-            queue_bg_color = "#252525"
             # Lighter text color for better readability
             queue_text_color = "#f0f0f0"
         else:
-            bg_color = "#ffffff"
-            fg_color = "#000000"
-            select_bg = "#0078d4"
-            select_fg = "#ffffff"
-            queue_bg_color = bg_color
-            queue_text_color = fg_color
+            queue_text_color = "#000000"
 
         # Apply filters
         search_text = self.search_var.get().lower().strip()
         filter_character = self.filter_character_var.get()
         
-        self.log_debug(f"[CharactersTab] show_lines: Total lines={len(all_results)}, Search='{search_text}', Filter='{filter_character}'")
+        self.log_debug(f"[CharactersTab] show_lines: Total lines={total_lines}, Search='{search_text}', Filter='{filter_character}'")
         
-        filtered_results = []
-        for result in all_results:
-            speaker = result.get("speaker", "Unknown")
-            text = result.get("text", "").strip()
-            
-            # Apply character filter
-            if filter_character != "All Characters" and speaker != filter_character:
-                continue
-            
-            # Apply search filter
-            if search_text and search_text not in text.lower():
-                continue
-            
-            filtered_results.append(result)
+        filtered_results = self._line_index.query(
+            search_text,
+            speaker=None if filter_character == "All Characters" else filter_character,
+        )
+        # Assign colors up front so the highlighter below sees every speaker
+        for speaker in self._line_index.speakers():
+            self._get_color(speaker)
         
         self.log_debug(f"[CharactersTab] show_lines: Filtered down to {len(filtered_results)} lines")
         
@@ -1274,116 +1587,107 @@ class CharactersTab(ctk.CTkFrame):
                 no_results_msg = f"No lines found matching '{search_text}'"
             elif filter_character != "All Characters":
                 no_results_msg = f"No lines found for '{filter_character}'"
-            
-            no_results_label = tk.Label(
-                self.scroll_frame,
-                text=no_results_msg,
-                fg="gray",
-                font=("Arial", 12),
-                wraplength=700,
-                justify="center",
-                bg=bg_color
-            )
-            no_results_label.pack(pady=20)
+            self._set_visible_results([])
+            self._show_message(no_results_msg)
             return
 
-        self.line_vars = []
-        for idx, result in enumerate(filtered_results):
-            # Add visual distinction for quote vs non-quote rows
-            is_quote = result.get("is_quote", False)
-            row_bg_color = "#ffffff" if is_quote else "#f0f0f0"  # white for quotes, light gray for narrator
-            if is_dark:
-                row_bg_color = "#3a3a3a" if is_quote else "#2b2b2b"  # darker for dark theme
-            
-            frame = tk.Frame(self.scroll_frame, bg=row_bg_color, relief="solid", borderwidth=1)
-            frame.pack(fill="x", pady=1)
-
-            var = tk.IntVar(master=frame, value=0)
-            chk = tk.Checkbutton(frame, variable=var, bg=row_bg_color)
-            chk.pack(side="left", padx=5)
-            self.line_vars.append((var, result))
-
-            speaker = result.get("speaker", "Unknown")
-            color = self._get_color(speaker)
-            line_font_size = int(self.line_text_size_var.get())
-            spk_label = tk.Label(frame, text=speaker, fg=color, width=15, anchor="w", bg=row_bg_color, font=("Arial", line_font_size))
-            spk_label.pack(side="left", padx=5)
+        line_font_size = int(self.line_text_size_var.get())
+        self._row_style = {
+            # white for quotes, light gray for narrator (darker for dark theme)
+            "quote_bg": "#3a3a3a" if is_dark else "#ffffff",
+            "narration_bg": "#2b2b2b" if is_dark else "#f0f0f0",
+            "text_color": queue_text_color,
+            "font_size": line_font_size,
+            "line_height": tkfont.Font(family="Arial", size=line_font_size).metrics("linespace"),
+            "search_text": search_text,
+            "highlighter": self._get_name_highlighter(),
+        }
+
+        self._show_message(None)
+        self._set_visible_results(filtered_results)
+        self.canvas.yview_moveto(top / self._row_offsets[-1] if self._row_offsets[-1] else 0)
+        self._render_visible_rows()
+
+    def _row_line_count(self, result):
+        text = result.get("text", "").strip()
+        if not self._row_style["search_text"]:
+            text = text[:100]
+        return min(text.count("\n") + 1, MAX_ROW_LINES)
+
+    def _row_height(self, idx):
+        return self._row_offsets[idx + 1] - self._row_offsets[idx] - ROW_GAP
+
+    def _set_visible_results(self, results):
+        """Store the filtered rows and their y offsets, and size the scroll region to match."""
+        self._visible_results = results
+        offsets = [0]
+        if results:
+            line_height = self._row_style["line_height"]
+            y = 0
+            for result in results:
+                y += self._row_line_count(result) * line_height + ROW_PADDING
+                offsets.append(y)
+        self._row_offsets = offsets
+        self._update_scrollregion()
+
+    def _update_scrollregion(self):
+        width = max(self.canvas.winfo_width(), 1)
+        self.canvas.configure(scrollregion=(0, 0, width, self._row_offsets[-1]))
+
+    def _show_message(self, text):
+        """Show the centered placeholder/no-results message, or hide it when text is None."""
+        if text is None:
+            self.placeholder_label.configure(text="")
+            self.canvas.itemconfigure(self._placeholder_window, state="hidden")
+        else:
+            self.placeholder_label.configure(text=text)
+            self.canvas.itemconfigure(self._placeholder_window, state="normal")
+
+    def _render_visible_rows(self):
+        """Bind pooled row widgets to the rows that intersect the viewport and park the rest."""
+        self._render_pending = False
+        results = self._visible_results
+        if not results:
+            return
 
-            text = result.get("text", "").strip()
-            
-            # Show full text if searching (don't truncate), otherwise show preview
-            if search_text:
-                display_text = text  # Show full text when searching
-            else:
-                display_text = text[:100] + "..." if len(text) > 100 else text
-            
-            # Calculate dynamic wraplength based on canvas width (subtract space for checkbox + speaker label + padding)
-            canvas_width = self.canvas.winfo_width() if self.canvas.winfo_width() > 1 else 800
-            dynamic_wraplength = max(400, canvas_width - 250)  # Reserve 250px for checkbox and speaker label
-            
-            line_font_size = int(self.line_text_size_var.get())
-            
-            # Always use Text widget for character name coloring
-            txt_widget = tk.Text(
-                frame, 
-                wrap="word",
-                width=1,  # Will be controlled by pack
-                bg=row_bg_color, 
-                font=("Arial", line_font_size), 
-                fg=queue_text_color,  # Use lighter text color for better readability
-                relief="flat",
-                borderwidth=0,
-                highlightthickness=0,
-                cursor="arrow",
-                padx=2,
-                pady=2
-            )
-            
-            # Apply character name coloring
-            self._color_character_names_in_text(txt_widget, display_text, line_font_size)
-            
-            # Apply search highlighting if searching
-            if search_text:
-                # Configure tag for search highlighting (different from character coloring)
-                txt_widget.tag_configure("search_highlight", background="#FFFF00", foreground="#000000")
-                
-                # Find and highlight all occurrences of search text (case-insensitive)
-                txt_widget.configure(state="normal")
-                start_idx = "1.0"
-                while True:
-                    start_idx = txt_widget.search(search_text, start_idx, nocase=True, stopindex="end")
-                    if not start_idx:
-                        break
-                    end_idx = f"{start_idx}+{len(search_text)}c"
-                    txt_widget.tag_add("search_highlight", start_idx, end_idx)
-                    start_idx = end_idx
-                
-                txt_widget.configure(state="disabled")  # Make read-only
-            
-            # Calculate height based on content
-            num_lines = int(txt_widget.index('end-1c').split('.')[0])
-            txt_widget.configure(height=min(num_lines, 10))  # Max 10 lines visible
-            
-            txt_widget.pack(side="left", fill="both", expand=True, padx=2, pady=2)
-            self._text_labels.append(txt_widget)
-            
-            # Tooltip - always show full text in tooltip
-            ToolTip(txt_widget, text, characters_tab=self)
+        offsets = self._row_offsets
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), 1)
+        width = max(self.canvas.winfo_width(), 1)
+        first = max(0, bisect_right(offsets, top) - 1 - OVERSCAN_ROWS)
+        last = min(len(results), bisect_left(offsets, top + height) + OVERSCAN_ROWS)
+
+        for idx in list(self._bound_rows):
+            if not first <= idx < last:
+                row = self._bound_rows.pop(idx)
+                row.hide()
+                self._free_rows.append(row)
+
+        for idx in range(first, last):
+            if idx in self._bound_rows:
+                continue
+            row = self._free_rows.pop() if self._free_rows else _LineRow(self)
+            row.bind(results[idx], self._row_style)
+            row.place(offsets[idx], width, self._row_height(idx))
+            self._bound_rows[idx] = row
+
+    def _set_line_selected(self, result, selected):
+        if selected:
+            self._selected_lines[id(result)] = result
+        else:
+            self._selected_lines.pop(id(result), None)
 
-        self.canvas.update_idletasks()
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+    def _get_selected_lines(self):
+        """Return the checked lines in display order."""
+        if not self._selected_lines:
+            return []
+        return [r for r in self._visible_results if id(r) in self._selected_lines]
 
     # ---------- Character List ----------
     def _refresh_char_list(self):
         self.char_list.delete(0, tk.END)
-        all_results = []
-        for chapter in self.chapters:
-            for r in chapter.get("results", []):
-                if isinstance(r, dict):
-                    all_results.append(r)
-
         speakers = sorted(
-            set(r.get("speaker", "Unknown") for r in all_results),
+            self._line_index.speakers(),
             key=lambda s: (s != "Narrator", s),
         )
         for spk in speakers:
@@ -1,3 +1,7 @@
+import importlib
+import queue
+import threading
+
 import customtkinter as ctk
 import tkinter as tk
 
@@ -9,6 +13,22 @@ from app.ui.gpu_monitor_tab import GpuMonitorTab
 from app.ui.debug_tab import DebugTab
 from app.ui.settings_tab import SettingsTab
 from app.ui.clone_voices_tab import CloneVoicesTab
+from app.core.autosave import AutosaveService
+
+# Heavy back ends the tabs import on first use; imported in the background once the window is up
+# (app.core.voices imports torch/TTS only when the model loads, so they're warmed directly)
+WARMUP_MODULES = (
+    "app.core.character_detection",
+    "app.core.voices",
+    "torch",
+    "TTS.api",
+)
+# Give the window time to paint before the warm-up thread competes for the GIL
+WARMUP_DELAY_MS = 1500
+# How often (ms) due autosaves are snapshotted and handed to the writer thread
+AUTOSAVE_POLL_MS = 250
+# How long closing the window waits for pending saves
+AUTOSAVE_CLOSE_TIMEOUT = 10.0
 
 
 class PolyVoxApp(ctk.CTk):
@@ -37,6 +57,10 @@ class PolyVoxApp(ctk.CTk):
         self.gpu_enabled = True
         self.chapters = []
 
+        # Background saves for the tabs; failures come back through a queue to the UI thread
+        self._autosave_errors = queue.Queue()
+        self.autosave = AutosaveService(on_error=lambda key, e: self._autosave_errors.put((key, e)))
+
         # Tab order ? Book ? Characters ? Voices ? Audio ? Clone Voices ? GPU ? Debug ? Settings
         self.build_book_processing_tab()
         self.build_characters_tab()
@@ -47,6 +71,35 @@ class PolyVoxApp(ctk.CTk):
         self.build_debug_tab()
         self.build_settings_tab()
 
+        self.after(WARMUP_DELAY_MS, self._start_backend_warmup)
+        self.after(AUTOSAVE_POLL_MS, self._pump_autosave)
+
+    # --- Autosave ---
+    def _pump_autosave(self):
+        self.autosave.pump()
+        while True:
+            try:
+                key, error = self._autosave_errors.get_nowait()
+            except queue.Empty:
+                break
+            self.log_debug(f"[MainUI] Autosave of {key} failed: {error}")
+        self.after(AUTOSAVE_POLL_MS, self._pump_autosave)
+
+    # --- Background warm-up ---
+    def _start_backend_warmup(self):
+        threading.Thread(target=self._warm_up_backends, daemon=True).start()
+
+    @staticmethod
+    def _warm_up_backends():
+        """Import the heavy modules ahead of first use (models themselves still load lazily)."""
+        for name in WARMUP_MODULES:
+            try:
+                importlib.import_module(name)
+                print(f"[MainUI] Warmed up {name}")
+            except Exception as e:
+                # The tab that needs it will import it again and report the error there
+                print(f"[MainUI] Warm-up of {name} failed: {e}")
+
     # --- Tabs ---
     def build_book_processing_tab(self):
         self.notebook.add("Book Processing")
@@ -67,6 +120,7 @@ class PolyVoxApp(ctk.CTk):
             get_book_text=lambda: self.chapters,
             log_debug=self.log_debug,
             gpu_enabled=lambda: self.gpu_enabled,
+            autosave=self.autosave,
         )
         self.characters_tab.pack(fill="both", expand=True)
 
@@ -78,6 +132,7 @@ class PolyVoxApp(ctk.CTk):
             characters_tab=self.characters_tab,
             audio_tab=self.audio_processing_tab,  # may be None initially
             debug_callback=self.log_debug,
+            autosave=self.autosave,
         )
         self.voices_tab.pack(fill="both", expand=True)
 
@@ -133,6 +188,7 @@ class PolyVoxApp(ctk.CTk):
             gpu_tab=self.gpu_tab,
             voices_tab=self.voices_tab,
             log_debug=self.log_debug,
+            autosave=self.autosave,
         )
         self.settings_tab.pack(fill="both", expand=True)
 
@@ -174,6 +230,10 @@ class PolyVoxApp(ctk.CTk):
         """Clean up and close the application properly."""
         try:
             self.log_debug("[MainUI] Shutting down application...")
+
+            # Write out whatever edits are still waiting for their autosave
+            if not self.autosave.close(AUTOSAVE_CLOSE_TIMEOUT):
+                print("[MainUI] Autosave did not finish before shutdown")
             
             # Cancel any pending after() callbacks in tabs
             if self.gpu_tab:
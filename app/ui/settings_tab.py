@@ -4,14 +4,17 @@ from tkinter import messagebox, filedialog
 import json
 import os
 
+from app.core.autosave import DEFAULT_BACKUPS, write_json_atomic
+
 
 class SettingsTab(ctk.CTkFrame):
-    def __init__(self, master, gpu_tab=None, voices_tab=None, log_debug=None):
+    def __init__(self, master, gpu_tab=None, voices_tab=None, log_debug=None, autosave=None):
         super().__init__(master)
 
         self.gpu_tab = gpu_tab
         self.voices_tab = voices_tab
         self.log_debug = log_debug or (lambda msg: print(msg))
+        self.autosave = autosave
         
         # Default settings
         self.settings = {
@@ -32,6 +35,7 @@ class SettingsTab(ctk.CTkFrame):
         }
         
         self.load_settings()
+        self._apply_autosave_settings()
         self._build_layout()
         
         # Apply initial theme
@@ -320,6 +324,7 @@ class SettingsTab(ctk.CTkFrame):
                 self.autosave_var.set(1)
                 return
             self.settings["auto_save_interval"] = interval
+            self._apply_autosave_settings()
             self.log_debug(f"[SettingsTab] Auto-save interval set to {interval} minutes")
             messagebox.showinfo("Success", f"Auto-save interval set to {interval} minutes")
         except:
@@ -328,7 +333,17 @@ class SettingsTab(ctk.CTkFrame):
     def toggle_backup(self):
         enabled = self.backup_var.get()
         self.settings["auto_backup"] = enabled
+        self._apply_autosave_settings()
         self.log_debug(f"[SettingsTab] Auto backup {'enabled' if enabled else 'disabled'}")
+
+    def _apply_autosave_settings(self):
+        """Project backups rotate once per auto-save interval while auto backup is on."""
+        if self.autosave is None:
+            return
+        self.autosave.configure(
+            backup_interval=max(1, int(self.settings.get("auto_save_interval", 5))) * 60,
+            backups=DEFAULT_BACKUPS if self.settings.get("auto_backup", True) else 0,
+        )
     
     # === SETTINGS MANAGEMENT ===
     def save_all_settings(self):
@@ -423,8 +438,7 @@ class SettingsTab(ctk.CTkFrame):
         """Save settings to file."""
         settings_file = "polyvox_settings.json"
         try:
-            with open(settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=4)
+            write_json_atomic(settings_file, self.settings, indent=4)
             self.log_debug(f"[SettingsTab] Settings saved to {settings_file}")
         except Exception as e:
             self.log_debug(f"[SettingsTab] Error saving settings: {e}")
@@ -3,13 +3,16 @@ import json
 import customtkinter as ctk
 from tkinter import messagebox, ttk
 
+from app.core.autosave import write_json_atomic
+
 
 class VoicesTab(ctk.CTkFrame):
-    def __init__(self, master, characters_tab=None, audio_tab=None, debug_callback=None, **kwargs):
+    def __init__(self, master, characters_tab=None, audio_tab=None, debug_callback=None, autosave=None, **kwargs):
         # References to other tabs (wired in from main_ui)
         self.characters_tab = characters_tab
         self.audio_tab = audio_tab
         self.debug_callback = debug_callback
+        self.autosave = autosave  # AutosaveService; None writes synchronously
 
         # Clean out unused kwargs
         kwargs.pop("character_provider", None)
@@ -55,13 +58,32 @@ class VoicesTab(ctk.CTkFrame):
             except Exception as e:
                 self._log(f"[VoicesTab] Failed to load voice selections: {e}")
 
+    def _project(self):
+        return getattr(self.characters_tab, "project", None)
+
     def _save_selections(self):
+        project = self._project()
+
+        def write(selections):
+            write_json_atomic(self.selections_file, selections)
+            if project is not None:
+                project.save_voice_map(selections)
+            print(f"[VoicesTab] Saved selections: {selections}")
+
+        self._save("selections", lambda: dict(self.voice_selections), write)
+
+    def _save(self, key, snapshot, write):
+        """Write through the autosave service (coalesced, off the UI thread) or right away without one.
+
+        write may run on the autosave thread, so it must not touch Tk (it prints instead of _log).
+        """
+        if self.autosave is not None:
+            self.autosave.request(f"voices:{key}", snapshot, write)
+            return
         try:
-            with open(self.selections_file, "w", encoding="utf-8") as f:
-                json.dump(self.voice_selections, f, indent=2)
-            self._log(f"[VoicesTab] Saved selections: {self.voice_selections}")
+            write(snapshot())
         except Exception as e:
-            self._log(f"[VoicesTab] Failed to save selections: {e}")
+            self._log(f"[VoicesTab] Failed to save {key}: {e}")
 
     # ---------------- UI ----------------
     def _build_ui(self):
@@ -227,6 +249,10 @@ class VoicesTab(ctk.CTkFrame):
         characters = self.characters_tab.get_characters()
         self._log(f"[VoicesTab] Refreshing characters → {characters}")
 
+        # An open project carries its own speaker -> voice mapping
+        if self._project() is not None:
+            self.voice_selections.update(self._project().voice_map())
+
         # --- Ensure Narrator always has a default voice selection ---
         # If Narrator is present but has no selection yet, default it to the first available voice
         if "Narrator" in characters and "Narrator" not in self.voice_selections and self.voices:
@@ -538,17 +564,15 @@ class VoicesTab(ctk.CTkFrame):
     
     def _save_voices_json(self):
         """Save the current voices back to voices.json"""
-        try:
-            data = {
-                "narrators": self.narrators,
-                "voices": self.voices
-            }
-            with open(self.voices_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-            self._log(f"[VoicesTab] Saved voices.json")
-        except Exception as e:
-            self._log(f"[VoicesTab] Failed to save voices.json: {e}")
-            messagebox.showerror("Error", f"Failed to save voices: {e}")
+        def write(data):
+            write_json_atomic(self.voices_file, data)
+            print("[VoicesTab] Saved voices.json")
+
+        self._save(
+            "library",
+            lambda: {"narrators": [dict(v) for v in self.narrators], "voices": [dict(v) for v in self.voices]},
+            write,
+        )
 
     def _log(self, msg):
         print(msg)
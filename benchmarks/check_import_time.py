@@ -0,0 +1,83 @@
+"""
+Import-time budget for the GUI's first paint.
+
+    python -m benchmarks.check_import_time [--module app.ui.main_ui] [--budget-ms 1500]
+
+Imports the module in a fresh interpreter under ``python -X importtime`` and fails (exit 1)
+if its cumulative import time exceeds the budget, or if any of the heavy back ends that
+are meant to load lazily (torch, TTS, spaCy, character_detection, ...) were imported on
+the way. Run it in the full GUI environment; the heavy-module check is the part that
+catches regressions reliably, the time budget depends on the machine.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+
+DEFAULT_MODULE = "app.ui.main_ui"
+DEFAULT_BUDGET_MS = 1500.0
+
+# Top-level packages/modules that must not be imported before the window is up
+FORBIDDEN_AT_STARTUP = (
+    "torch",
+    "TTS",
+    "spacy",
+    "transformers",
+    "app.core.character_detection",
+    "app.core.voices",
+    "app.core.gpu_manager",
+    "app.core.english_booknlp",
+)
+
+_LINE_RX = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+
+def measure(module: str):
+    """(cumulative_us of module, {imported module: cumulative_us}) from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE_RX.match(line)
+        if m:
+            cumulative[m.group(4)] = int(m.group(2))
+    return cumulative.get(module, 0), cumulative
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--module", default=DEFAULT_MODULE)
+    ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    ap.add_argument("--top", type=int, default=10, help="show the N slowest imports")
+    args = ap.parse_args(argv)
+
+    total_us, cumulative = measure(args.module)
+    forbidden = sorted(
+        name
+        for name in cumulative
+        if any(name == f or name.startswith(f + ".") for f in FORBIDDEN_AT_STARTUP)
+    )
+
+    print(f"{args.module}: {total_us / 1000:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, us in sorted(cumulative.items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if forbidden:
+        print("FAIL: heavy modules imported at startup: " + ", ".join(forbidden))
+        failed = True
+    if total_us / 1000 > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
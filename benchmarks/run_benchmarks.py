@@ -0,0 +1,389 @@
+"""
+Throughput benchmarks for each pipeline layer on a synthetic novel.
+
+    python -m benchmarks.run_benchmarks [--out results.json] [--baseline old.json] [--layers chunking,tts_preprocess]
+
+Layers, each timed on its own (best of --repeat):
+
+    chunking        chapter detection and size chunking (app.core.chapter_chunker)
+    tts_preprocess  TextPreprocessor cleanup + splitting of every quote line
+    spacy           spaCy tagging as BookNLP runs it (SpacyPipeline, NER disabled)
+    booknlp         EnglishBookNLP end to end, split into its own stages: spacy, entities
+                    (entity BERT), quotes, attribution (speaker BERT), coref (coref BERT), ...
+    heuristics      run_attribution per chapter, split into BookNLP and each heuristic pass
+    stub_tts        synthesize_text() for every quote line on the fake engine (--tts-engine)
+    assembly        stub WAVs -> chapter MP3s (encode_chapters) -> M4B when pydub is installed
+
+Everything runs on the CPU (CUDA is hidden) and offline (Hugging Face hub is set to
+offline mode). Layers whose dependencies or model files are missing are reported as
+"skipped" with the reason instead of failing the run. With --baseline, each layer is
+compared with an earlier results file and the exit code is 1 if any got slower than
+--tolerance.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import QUOTE_STYLES, describe, generate_novel
+
+LAYERS = ("chunking", "tts_preprocess", "spacy", "booknlp", "heuristics", "stub_tts", "assembly")
+
+# Model files EnglishBookNLP would otherwise download on first use
+BOOKNLP_MODEL_FILES = {
+    "big": (
+        "entities_google_bert_uncased_L-6_H-768_A-12-v1.0.model",
+        "coref_google_bert_uncased_L-12_H-768_A-12-v1.0.model",
+        "speaker_google_bert_uncased_L-12_H-768_A-12-v1.0.1.model",
+    ),
+    "small": (
+        "entities_google_bert_uncased_L-4_H-256_A-4-v1.0.model",
+        "coref_google_bert_uncased_L-2_H-256_A-4-v1.0.model",
+        "speaker_google_bert_uncased_L-8_H-256_A-4-v1.0.1.model",
+    ),
+}
+BOOKNLP_MODEL_DIR = os.path.join(os.path.expanduser("~"), "booknlp_models")
+BOOKNLP_SPACY_MODEL = "en_core_web_md"
+
+DEFAULT_TTS_ENGINE = "fake"
+
+_STAGE_LINE_RX = re.compile(r"^--- (?P<stage>[\w ]+?): (?P<secs>[\d.]+) seconds ---")
+
+
+class Skip(Exception):
+    """A layer cannot run in this environment (missing package, model file or tool)."""
+
+
+def _force_cpu_offline():
+    os.environ["CUDA_VISIBLE_DEVICES"] = ""
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+
+def _require(module: str):
+    import importlib.util
+
+    if importlib.util.find_spec(module) is None:
+        raise Skip(f"{module} is not installed")
+
+
+def _timed(fn: Callable, repeat: int) -> Dict:
+    """Run fn repeat times; best/mean seconds plus whatever the last call returned."""
+    runs, extra = [], {}
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        extra = fn() or {}
+        runs.append(time.perf_counter() - t0)
+    return {"seconds": min(runs), "mean_seconds": sum(runs) / len(runs), "runs": len(runs), **extra}
+
+
+@contextlib.contextmanager
+def _in_dir(path: str):
+    """Run with cwd=path; the attribution pipeline writes output/ and logs relative to cwd."""
+    prev = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(prev)
+
+
+class Bench:
+    """One benchmark run: the novel, a scratch folder and the layer implementations."""
+
+    def __init__(self, novel: Dict, workdir: str, args):
+        self.novel = novel
+        self.text = novel["text"]
+        self.workdir = workdir
+        self.args = args
+        self.chapter_texts = [self.text[c["start"]:c["end"]] for c in novel["chapters"]]
+        self.wav_dirs: List[str] = []
+
+    # ---------- Layers ----------
+    def chunking(self):
+        from app.core.chapter_chunker import chunk_by_size, detect_chapters, smart_chapter_detection
+
+        def run():
+            found = smart_chapter_detection(self.text)
+            detect_chapters(self.text)
+            chunk_by_size(self.text, 5000)
+            return {"chapters_found": len(found)}
+
+        return _timed(run, self.args.repeat)
+
+    def tts_preprocess(self):
+        from app.engine.text_preprocessor import TextPreprocessor
+
+        pre = TextPreprocessor()
+        lines = [line["text"] for line in self.novel["lines"]]
+
+        def run():
+            pieces = 0
+            for line in lines:
+                pieces += len(pre.split_long_text(pre.prepare_for_tts(line), max_chars=200))
+            return {"lines": len(lines), "pieces": pieces}
+
+        return _timed(run, self.args.repeat)
+
+    def spacy(self):
+        _require("spacy")
+        import spacy
+
+        if not spacy.util.is_package(BOOKNLP_SPACY_MODEL):
+            raise Skip(f"spaCy model {BOOKNLP_SPACY_MODEL} is not installed")
+        from app.core.pipelines import SpacyPipeline
+
+        pipeline = SpacyPipeline(spacy.load(BOOKNLP_SPACY_MODEL, disable=["ner"]))
+        return _timed(lambda: {"tokens": len(pipeline.tag(self.text))}, self.args.repeat)
+
+    def _check_booknlp(self):
+        _require("torch")
+        _require("transformers")
+        _require("spacy")
+        missing = [
+            name for name in BOOKNLP_MODEL_FILES[self.args.booknlp_model]
+            if not os.path.isfile(os.path.join(BOOKNLP_MODEL_DIR, name))
+        ]
+        if missing:
+            raise Skip(f"BookNLP model files not in {BOOKNLP_MODEL_DIR}: {', '.join(missing)}")
+
+    def booknlp(self):
+        self._check_booknlp()
+        from app.core.english_booknlp import EnglishBookNLP
+
+        enlp = EnglishBookNLP({
+            "model": self.args.booknlp_model,
+            "spacy_model": BOOKNLP_SPACY_MODEL,
+            "pipeline": "entity,quote,coref",
+            "model_path": BOOKNLP_MODEL_DIR,
+        })
+        path = os.path.join(self.workdir, "novel.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.text)
+
+        def run():
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                enlp.process(path, os.path.join(self.workdir, "booknlp"), "novel")
+            stages = {}
+            for line in out.getvalue().splitlines():
+                m = _STAGE_LINE_RX.match(line)
+                if m and m.group("stage") != "TOTAL (excl":
+                    stages[m.group("stage")] = stages.get(m.group("stage"), 0.0) + float(m.group("secs"))
+            return {"stages": stages}
+
+        return _timed(run, self.args.repeat)
+
+    def heuristics(self):
+        self._check_booknlp()
+        from app.core import character_detection
+
+        chapters = self.chapter_texts[: self.args.attribution_chapters]
+
+        def run():
+            passes: Dict[str, float] = {}
+            rows = 0
+            for text in chapters:
+                last = [time.perf_counter()]
+
+                def on_stage(stage):
+                    now = time.perf_counter()
+                    passes[stage] = passes.get(stage, 0.0) + (now - last[0])
+                    last[0] = now
+
+                with _in_dir(self.workdir), contextlib.redirect_stdout(io.StringIO()):
+                    out = character_detection.run_attribution(text, model=self.args.booknlp_model, progress=on_stage)
+                on_stage("finalize")
+                rows += len(out or [])
+            heuristic = sum(s for name, s in passes.items() if name not in ("start", "booknlp"))
+            return {"chapters": len(chapters), "rows": rows, "heuristic_seconds": heuristic, "passes": passes}
+
+        return _timed(run, self.args.repeat)
+
+    def stub_tts(self):
+        from app.core.voices import synthesize_text
+        from app.engine.base import set_active_engine
+
+        set_active_engine(self.args.tts_engine)
+        by_chapter: Dict[int, List[Dict]] = {}
+        for line in self.novel["lines"]:
+            by_chapter.setdefault(line["chapter"], []).append(line)
+
+        def run():
+            self.wav_dirs = []
+            files = failed = 0
+            for c, lines in sorted(by_chapter.items()):
+                folder = os.path.join(self.workdir, "audio", f"{c + 1:03d}")
+                os.makedirs(folder, exist_ok=True)
+                for n, line in enumerate(lines, 1):
+                    voice = {"id": line["speaker"]}
+                    try:
+                        synthesize_text(voice, line["text"], os.path.join(folder, f"line_{n:04d}.wav"), job_idx=n)
+                        files += 1
+                    except Exception:
+                        failed += 1
+                self.wav_dirs.append(folder)
+            return {"engine": self.args.tts_engine, "files": files, "failed": failed}
+
+        return _timed(run, self.args.repeat)
+
+    def assembly(self):
+        if shutil.which("ffmpeg") is None:
+            raise Skip("ffmpeg is not on PATH")
+        import importlib.util
+
+        from app.core.assembly import encode_chapters
+
+        if not self.wav_dirs:
+            self.stub_tts()
+
+        def run():
+            # the path the app takes: chapter WAVs piped to one encoder process per chapter
+            jobs = []
+            for folder in self.wav_dirs:
+                wavs = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".wav"))
+                jobs.append((folder, wavs, folder + ".mp3"))
+            t0 = time.perf_counter()
+            mp3s = []
+            for _, mp3, _, error in encode_chapters(jobs):
+                if error is not None:
+                    raise error
+                mp3s.append(mp3)
+            stages = {"encode_chapters": time.perf_counter() - t0}
+            if importlib.util.find_spec("pydub") is not None:
+                from app.core.assembly import merge_to_m4b
+
+                t0 = time.perf_counter()
+                merge_to_m4b(sorted(mp3s), os.path.join(self.workdir, "novel.m4b"))
+                stages["merge_to_m4b"] = time.perf_counter() - t0
+            return {"chapters": len(mp3s), "stages": stages}
+
+        return _timed(run, self.args.repeat)
+
+    # ---------- Driver ----------
+    def run(self, layers) -> Dict:
+        results = {}
+        for name in layers:
+            t0 = time.perf_counter()
+            try:
+                result = {"status": "ok", **getattr(self, name)()}
+            except Skip as e:
+                result = {"status": "skipped", "reason": str(e)}
+            except Exception as e:
+                result = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+            result["wall_seconds"] = round(time.perf_counter() - t0, 3)
+            if result["status"] == "ok":
+                result["chars_per_second"] = round(len(self.text) / result["seconds"]) if result["seconds"] else None
+            results[name] = result
+            _print_layer(name, result)
+        return results
+
+
+def _print_layer(name: str, result: Dict):
+    if result["status"] != "ok":
+        print(f"  {name:<15} {result['status']}: {result.get('reason', '')}")
+        return
+    print(f"  {name:<15} {result['seconds'] * 1000:10.1f} ms")
+    for key in ("stages", "passes"):
+        for stage, secs in sorted((result.get(key) or {}).items(), key=lambda kv: -kv[1])[:15]:
+            print(f"      {stage:<40} {secs * 1000:10.1f} ms")
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Layers that got slower than baseline by more than tolerance (a fraction)."""
+    regressions = []
+    for name, now in results["layers"].items():
+        before = (baseline.get("layers") or {}).get(name) or {}
+        if now.get("status") != "ok" or before.get("status") != "ok" or not before.get("seconds"):
+            continue
+        ratio = now["seconds"] / before["seconds"]
+        print(f"  {name:<15} {ratio:6.2f}x baseline")
+        if ratio > 1.0 + tolerance:
+            regressions.append(f"{name} {ratio:.2f}x")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--out", default="benchmark_results.json")
+    ap.add_argument("--layers", default=",".join(LAYERS), help="comma-separated subset of: " + ", ".join(LAYERS))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--chapters", type=int, default=12)
+    ap.add_argument("--paragraphs", type=int, default=60)
+    ap.add_argument("--dialogue-density", type=float, default=0.5)
+    ap.add_argument("--speakers", type=int, default=6)
+    ap.add_argument("--alias-variety", type=float, default=0.4)
+    ap.add_argument("--quotes", choices=QUOTE_STYLES, default="straight")
+    ap.add_argument("--booknlp-model", choices=sorted(BOOKNLP_MODEL_FILES), default="small")
+    ap.add_argument(
+        "--tts-engine", default=DEFAULT_TTS_ENGINE, help="engine spec, e.g. fake:latency=0.01,failure_rate=0.05"
+    )
+    ap.add_argument("--attribution-chapters", type=int, default=2, help="chapters run through run_attribution")
+    ap.add_argument("--baseline", help="earlier results JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    ap.add_argument("--keep", action="store_true", help="keep the scratch folder")
+    args = ap.parse_args(argv)
+
+    layers = [name.strip() for name in args.layers.split(",") if name.strip()]
+    unknown = [name for name in layers if name not in LAYERS]
+    if unknown:
+        ap.error("unknown layer(s): " + ", ".join(unknown))
+
+    _force_cpu_offline()
+    novel = generate_novel(
+        seed=args.seed,
+        chapters=args.chapters,
+        paragraphs=args.paragraphs,
+        dialogue_density=args.dialogue_density,
+        speakers=args.speakers,
+        alias_variety=args.alias_variety,
+        quotes=args.quotes,
+    )
+    corpus = describe(novel)
+    print(f"corpus: {corpus['chars']} chars, {corpus['words']} words, {corpus['quote_lines']} quotes")
+
+    workdir = tempfile.mkdtemp(prefix="polyvox_bench_")
+    try:
+        layer_results = Bench(novel, workdir, args).run(layers)
+    finally:
+        if args.keep:
+            print(f"scratch folder: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "corpus": corpus,
+        "repeat": args.repeat,
+        "layers": layer_results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"results: {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("FAIL: slower than baseline: " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
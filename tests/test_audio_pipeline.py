@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from app.core.audio_pipeline import AudioPipeline
+
+
+def _chapter(key, n, mp3=None):
+    return {"key": key, "lines": [(f"line {i}", "voice", f"{key}/{i}.wav") for i in range(n)], "mp3": mp3}
+
+
+def test_lines_retry_until_they_pass_and_chapters_finish_in_order():
+    written, checked = [], {}
+    lock = threading.Lock()
+
+    def synthesize(text, voice, out_path):
+        with lock:
+            written.append(out_path)
+
+    def check(out_path, text):
+        with lock:
+            checked[out_path] = checked.get(out_path, 0) + 1
+            return (checked[out_path] > 1 or text != "line 2"), 90.0
+
+    finished = []
+    pipeline = AudioPipeline(
+        synthesize, check, max_attempts=3, synth_workers=2, on_chapter=lambda key, jobs: finished.append(key)
+    )
+    summary = pipeline.run([_chapter("a", 5), _chapter("b", 20)])
+
+    assert finished == ["a", "b"]
+    assert summary["a"] == {
+        "lines": 5, "produced": 5, "failed": 0, "retried": 1, "mp3": None, "duration": None, "error": None
+    }
+    assert summary["b"]["retried"] == 1
+    assert len(written) == 27
+
+
+def test_failing_lines_are_reported_after_the_last_attempt():
+    def synthesize(text, voice, out_path):
+        if text == "line 1":
+            raise RuntimeError("engine failed")
+
+    lines = []
+    summary = AudioPipeline(synthesize, max_attempts=2, on_line=lines.append).run([_chapter("a", 3)])
+
+    assert summary["a"]["produced"] == 2 and summary["a"]["failed"] == 1
+    failed = [job for job in lines if job.error is not None]
+    assert [(job.n, job.attempts) for job in failed] == [(2, 2)]
+
+
+def test_error_while_reading_chapters_is_raised_from_run():
+    def chapters():
+        yield _chapter("a", 3)
+        raise ValueError("bad job")
+
+    finished = []
+    pipeline = AudioPipeline(lambda *args: None, on_chapter=lambda key, jobs: finished.append(key))
+    with pytest.raises(ValueError, match="bad job"):
+        pipeline.run(chapters())
+    assert finished == ["a"]
@@ -0,0 +1,93 @@
+from app.core.character_registry import CharacterRegistry, ChapterAdditions
+from app.core.nlp_segments import count_tokens, paragraphs, plan_windows, reconcile_names, stitch_rows
+
+
+def _book(n=12):
+    return "".join(f"Paragraph {i} has a few words in it and ends here.\n\n" for i in range(n))
+
+
+def _rows(text):
+    """One row per paragraph, spans in chapter offsets (what attribution would return for the whole text)."""
+    rows = []
+    for start, end, _ in paragraphs(text):
+        piece = text[start:end].strip()
+        rows.append({"speaker": "Narrator", "text": piece, "_char_begin": start, "_char_end": start + len(piece)})
+    return rows
+
+
+def _window_rows(rows, window):
+    b, e = window
+    return [dict(r) for r in rows if b <= r["_char_begin"] and r["_char_end"] <= e]
+
+
+def test_plan_windows_keeps_the_text_whole_when_it_fits():
+    text = _book(3)
+    assert plan_windows(text, max_tokens=10_000, overlap_tokens=10) == [(0, len(text))]
+
+
+def test_plan_windows_cuts_at_paragraphs_within_budget_and_overlaps():
+    text = _book(12)
+    per_paragraph = paragraphs(text)[0][2]
+    windows = plan_windows(text, max_tokens=4 * per_paragraph, overlap_tokens=per_paragraph)
+    starts = {start for start, _, _ in paragraphs(text)}
+    ends = {end for _, end, _ in paragraphs(text)}
+
+    assert windows[0][0] == 0 and windows[-1][1] == len(text)
+    assert len(windows) > 1
+    for b, e in windows:
+        assert b in starts and e in ends
+        assert count_tokens(text[b:e]) <= 4 * per_paragraph
+    for (_, prev_end), (next_begin, _) in zip(windows, windows[1:]):
+        # each window repeats exactly one paragraph of the one before
+        assert next_begin < prev_end
+        assert count_tokens(text[next_begin:prev_end]) == per_paragraph
+
+
+def test_plan_windows_gives_an_oversized_paragraph_its_own_window():
+    text = "short one.\n\n" + "word " * 50 + "\n\nshort two."
+    windows = plan_windows(text, max_tokens=10, overlap_tokens=0)
+    assert [text[b:e].strip() for b, e in windows] == ["short one.", ("word " * 50).strip(), "short two."]
+
+
+def test_stitch_rows_keeps_each_overlapping_row_once():
+    text = _book(12)
+    per_paragraph = paragraphs(text)[0][2]
+    windows = plan_windows(text, max_tokens=4 * per_paragraph, overlap_tokens=2 * per_paragraph)
+    whole = _rows(text)
+
+    stitched = stitch_rows([_window_rows(whole, w) for w in windows], windows, text)
+
+    assert [(r["text"], r["_char_begin"], r["_char_end"]) for r in stitched] == [
+        (r["text"], r["_char_begin"], r["_char_end"]) for r in whole
+    ]
+
+
+def test_stitch_rows_trims_a_row_that_crosses_every_boundary_in_the_overlap():
+    text = "Alpha beta.\n\nGamma delta.\n\nEpsilon zeta.\n\nEta theta."
+    windows = [(0, text.index("Eta")), (text.index("Gamma"), len(text))]
+
+    def row(speaker, first, last):
+        begin, end = text.index(first), text.index(last) + len(last)
+        return {"speaker": speaker, "text": text[begin:end], "_char_begin": begin, "_char_end": end}
+
+    # no paragraph break in the overlap is free: the left row runs past the first two, the
+    # right row starts before the left one ends and runs past the last
+    left = [row("A", "Alpha", "zeta.")]
+    right = [row("B", "Gamma", "delta."), row("C", "Epsilon", "theta.")]
+
+    stitched = stitch_rows([left, right], windows, text)
+
+    assert [(r["speaker"], r["text"]) for r in stitched] == [("A", text[: text.index("\n\nEta")]), ("C", "Eta theta.")]
+    assert all(text[r["_char_begin"]:r["_char_end"]] == r["text"] for r in stitched)
+
+
+def test_reconcile_names_maps_a_single_name_to_the_one_full_name():
+    snapshot = CharacterRegistry().snapshot()
+    first, second = ChapterAdditions((0, 0), snapshot), ChapterAdditions((0, 1), snapshot)
+    first.add_canonical("Smith")
+    first.add_canonical("Lee")
+    second.add_canonical("John Smith")
+    second.add_canonical("Ann Lee")
+    second.add_canonical("Bob Lee")
+
+    assert reconcile_names([first, second]) == {"Smith": "John Smith"}
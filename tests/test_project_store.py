@@ -0,0 +1,133 @@
+import copy
+import json
+
+from app.core.project_store import (
+    ProjectChapter,
+    ProjectStore,
+    import_json,
+    is_project_file,
+    load_texts,
+    snapshot_chapters,
+)
+
+
+def _chapters():
+    return [
+        {
+            "title": "One",
+            "text": "“Hello,” she said. It rained.",
+            "results": [
+                {"speaker": "Anna", "text": "Hello,", "is_quote": True, "_char_begin": 1, "_char_end": 7},
+                {"speaker": "Narrator", "text": "she said. It rained.", "is_quote": False, "confidence": 0.5},
+            ],
+        },
+        {"title": "Two", "text": "Quiet.", "results": [{"speaker": "Narrator", "text": "Quiet."}], "kind": "body"},
+    ]
+
+
+def _plain(chapters):
+    return [{k: chapter[k] for k in ("title", "text", "results")} for chapter in chapters]
+
+
+def test_create_writes_a_project_file(tmp_path):
+    path = str(tmp_path / "book.polyvox")
+    with ProjectStore.create(path) as store:
+        store.save_chapters(_chapters())
+    assert is_project_file(path)
+    assert not is_project_file(str(tmp_path / "missing.polyvox"))
+
+
+def test_open_round_trips_chapters_with_lazy_text(tmp_path):
+    path = str(tmp_path / "book.polyvox")
+    with ProjectStore.create(path) as store:
+        store.save_chapters(_chapters())
+
+    with ProjectStore(path) as store:
+        chapters = store.load_chapters()
+        assert all(isinstance(c, ProjectChapter) and not c.text_loaded() for c in chapters)
+        assert _plain(chapters) == _plain(_chapters())
+        assert chapters[1]["kind"] == "body"
+
+
+def test_save_writes_only_changed_rows(tmp_path):
+    path = str(tmp_path / "book.polyvox")
+    with ProjectStore.create(path) as store:
+        assert store.save_chapters(_chapters()) == 3
+
+    with ProjectStore(path) as store:
+        chapters = store.load_chapters()
+        assert store.save_chapters(chapters) == 0
+        chapters[0]["results"][1]["speaker"] = "Anna"
+        assert store.save_chapters(chapters) == 1
+        assert not chapters[0].text_loaded()  # unchanged text is never read
+        del chapters[1]
+        store.save_chapters(chapters)
+
+    with ProjectStore(path) as store:
+        chapters = store.load_chapters()
+        assert [c["title"] for c in chapters] == ["One"]
+        assert chapters[0]["results"][1]["speaker"] == "Anna"
+        assert chapters[0]["text"] == _chapters()[0]["text"]
+
+
+def test_save_as_copies_unread_text_to_the_new_project(tmp_path):
+    old_path, new_path = str(tmp_path / "old.polyvox"), str(tmp_path / "new.polyvox")
+    with ProjectStore.create(old_path) as store:
+        store.save_chapters(_chapters())
+
+    old = ProjectStore(old_path)
+    chapters = old.load_chapters()
+    with ProjectStore.create(new_path) as new:
+        new.save_chapters(chapters)  # lazy chapters of another store
+    load_texts(chapters)
+    old.close()
+    with ProjectStore.create(str(tmp_path / "newer.polyvox")) as newer:
+        newer.save_chapters(snapshot_chapters(chapters))  # the old store is closed by now
+
+    for path in (new_path, str(tmp_path / "newer.polyvox")):
+        with ProjectStore(path) as store:
+            assert _plain(store.load_chapters()) == _plain(_chapters())
+
+
+def test_snapshot_keeps_only_the_stores_own_chapters_lazy(tmp_path):
+    path = str(tmp_path / "book.polyvox")
+    with ProjectStore.create(path) as store:
+        store.save_chapters(_chapters())
+
+    with ProjectStore(path) as store, ProjectStore.create(str(tmp_path / "other.polyvox")) as other:
+        chapters = store.load_chapters()
+        own = snapshot_chapters(chapters, store)
+        assert all(isinstance(c, ProjectChapter) and not c.text_loaded() for c in own)
+        foreign = snapshot_chapters(chapters, other)
+        assert [c["text"] for c in foreign] == [c["text"] for c in _chapters()]
+        assert not any(isinstance(c, ProjectChapter) for c in foreign)
+
+
+def test_opened_project_exports_to_json_that_imports_again(tmp_path):
+    path = str(tmp_path / "book.polyvox")
+    with ProjectStore.create(path) as store:
+        store.save_chapters(_chapters())
+
+    json_path = str(tmp_path / "export.json")
+    with ProjectStore(path) as store:
+        chapters = store.load_chapters()
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(chapters, f, ensure_ascii=False)
+
+    project = import_json(json_path)
+    with ProjectStore(project) as store:
+        assert _plain(store.load_chapters()) == _plain(_chapters())
+
+
+def test_whole_chapter_views_include_the_lazy_text(tmp_path):
+    path = str(tmp_path / "book.polyvox")
+    with ProjectStore.create(path) as store:
+        store.save_chapters(_chapters())
+
+    with ProjectStore(path) as store:
+        text = _chapters()[0]["text"]
+        for view in (dict, copy.copy, copy.deepcopy, lambda c: c.copy(), lambda c: dict(c.items())):
+            chapter = store.load_chapters()[0]
+            assert len(chapter) == 3
+            assert view(chapter)["text"] == text
+        assert "text" in list(store.load_chapters()[0])
@@ -0,0 +1,28 @@
+from app.core.source_spans import SourceText, place_spans
+
+SOURCE = "It was late. “Go away,” she said. Then she closed the door."
+
+
+def _slice(row):
+    return SOURCE[row["_char_begin"]:row["_char_end"]]
+
+
+def test_exact_spans_are_kept():
+    rows = [{"text": "“Go away,”", "_char_begin": 13, "_char_end": 23}]
+    place_spans(rows, SourceText(SOURCE))
+    assert _slice(rows[0]) == "“Go away,”"
+
+
+def test_span_of_the_right_length_in_the_wrong_place_is_reanchored():
+    rows = [
+        {"text": "“Go away,”", "_char_begin": 13, "_char_end": 23},
+        {"text": "she said.", "_char_begin": 22, "_char_end": 31},  # measured in another text
+    ]
+    place_spans(rows, SourceText(SOURCE))
+    assert [_slice(r) for r in rows] == ["“Go away,”", "she said."]
+
+
+def test_rows_without_spans_are_found_after_the_previous_row():
+    rows = [{"text": "It was late."}, {"text": '"Go away,"'}, {"text": "she"}]
+    place_spans(rows, SourceText(SOURCE))
+    assert [_slice(r) for r in rows] == ["It was late.", "“Go away,”", "she"]